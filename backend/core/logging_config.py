@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+日志配置模块 - PocketSpeak
+队列化的异步日志管道：事件循环里只把日志记录放入内存队列，由后台线程写stdout
+
+环境变量：
+- LOG_LEVEL: 全局级别（默认INFO）
+- LOG_LEVELS: 按模块设置级别，如 "services.voice_chat=WARNING,routers.voice_chat=DEBUG"
+- LOG_FORMAT: text（默认）或 json（每行一个JSON对象，便于采集）
+- LOG_RATE_LIMIT: 同一调用位置每秒最多输出的INFO/DEBUG条数（默认20，0为不限制）
+- LOG_QUEUE_SIZE: 日志队列上限（默认10000，队列满时丢弃并计数，不阻塞调用方）
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from utils import json_codec
+
+
+# LogRecord自带的属性，其余通过extra传入的属性作为结构化字段输出
+_RESERVED_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {"message", "asctime"}
+
+TEXT_FORMAT = '%(levelname)s:%(name)s:%(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_rate_filter: Optional["RateLimitFilter"] = None
+
+
+def _record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """提取通过extra传入的结构化字段"""
+    return {key: value for key, value in record.__dict__.items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")}
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    结构化日志格式
+
+    text: "INFO:name:message key=value ..."（与原有格式兼容）
+    json: {"ts", "level", "logger", "msg", 以及extra字段}
+    """
+
+    def __init__(self, fmt: str = "text"):
+        super().__init__(TEXT_FORMAT)
+        self.json_mode = fmt == "json"
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = _record_fields(record)
+        if self.json_mode:
+            entry = {
+                "ts": round(record.created, 3),
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage()
+            }
+            entry.update(fields)
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            elif record.exc_text:
+                entry["exc"] = record.exc_text
+            return json_codec.dumps(entry)
+
+        line = super().format(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    按调用位置限流（只限制WARNING以下级别）
+
+    每个调用位置（logger名+行号）每个时间窗口最多放行 limit 条；
+    被抑制的条数附加到下一条放行记录的 suppressed 字段上
+    """
+
+    def __init__(self, limit: int = 20, interval: float = 1.0):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self._windows: Dict[tuple, list] = {}  # 位置 -> [窗口开始时间, 已放行数, 已抑制数]
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, record.lineno)
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+
+            if window[1] < self.limit:
+                window[1] += 1
+                return True
+
+            window[2] += 1
+            self.suppressed_total += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """队列满时丢弃记录而不是阻塞或报错"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 只合并消息参数和异常文本，格式化留给后台线程
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_module_levels(spec: str) -> Dict[str, str]:
+    """解析 "a.b=DEBUG,c=WARNING" 格式的模块级别配置"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(level: Optional[str] = None,
+                  module_levels: Optional[Dict[str, str]] = None,
+                  fmt: Optional[str] = None,
+                  rate_limit: Optional[int] = None,
+                  queue_size: Optional[int] = None) -> QueueListener:
+    """
+    安装队列化日志管道（重复调用只更新级别）
+
+    Args:
+        level: 全局日志级别
+        module_levels: 模块级别，如 {"services.voice_chat": "WARNING"}
+        fmt: text 或 json
+        rate_limit: 同一调用位置每秒最多输出的INFO/DEBUG条数（0为不限制）
+        queue_size: 日志队列上限
+
+    Returns:
+        QueueListener: 后台写日志的监听器
+    """
+    global _listener, _queue_handler, _rate_filter
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if module_levels is None:
+        module_levels = _parse_module_levels(os.getenv("LOG_LEVELS", ""))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    if _listener is not None:
+        return _listener
+
+    fmt = fmt or os.getenv("LOG_FORMAT", "text")
+    rate_limit = int(os.getenv("LOG_RATE_LIMIT", "20")) if rate_limit is None else rate_limit
+    queue_size = int(os.getenv("LOG_QUEUE_SIZE", "10000")) if queue_size is None else queue_size
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(StructuredFormatter(fmt))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _rate_filter = RateLimitFilter(limit=rate_limit)
+    _queue_handler.addFilter(_rate_filter)
+
+    # 替换已有的同步handler（如basicConfig安装的StreamHandler）
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """停止后台线程并写完队列中剩余的日志"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """日志管道统计（队列积压、丢弃数、限流抑制数）"""
+    if _queue_handler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "queue_size": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "suppressed": _rate_filter.suppressed_total if _rate_filter else 0
+    }
@@ -0,0 +1,96 @@
+"""
+队列化日志管道 - 单元测试
+
+限流窗口与抑制计数、队列满时丢弃、text/json格式和模块级别解析
+"""
+
+import json
+import logging
+import queue
+import sys
+
+from core import logging_config
+from core.logging_config import NonBlockingQueueHandler, RateLimitFilter, StructuredFormatter
+
+
+def _record(msg: str = "hello", level: int = logging.INFO, created: float = 100.0, lineno: int = 10, **extra):
+    record = logging.LogRecord("voice", level, "voice.py", lineno, msg, None, None)
+    record.created = created
+    record.__dict__.update(extra)
+    return record
+
+
+def test_rate_limit_window_and_suppressed_count():
+    """测试同一位置每个窗口最多放行limit条，下个窗口的第一条带上被抑制数"""
+    rate_filter = RateLimitFilter(limit=2, interval=1.0)
+
+    passed = [rate_filter.filter(_record(created=100.0 + i * 0.1)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert rate_filter.suppressed_total == 3
+
+    # 其他调用位置和WARNING以上级别不受影响
+    assert rate_filter.filter(_record(created=100.5, lineno=11))
+    assert rate_filter.filter(_record(level=logging.WARNING, created=100.5))
+
+    next_window = _record(created=101.0)
+    assert rate_filter.filter(next_window)
+    assert next_window.suppressed == 3
+    assert not hasattr(_record(created=101.1), "suppressed")
+
+
+def test_rate_limit_disabled_with_zero_limit():
+    """测试limit为0时不限流"""
+    rate_filter = RateLimitFilter(limit=0)
+
+    assert all(rate_filter.filter(_record()) for _ in range(50))
+    assert rate_filter.suppressed_total == 0
+
+
+def test_queue_handler_drops_when_full():
+    """测试队列满时丢弃并计数，不阻塞调用方；入队前合并消息参数"""
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+    record = logging.LogRecord("voice", logging.INFO, "voice.py", 10, "frame %d", (1,), None)
+    handler.handle(record)
+    handler.handle(_record("second"))
+
+    queued = handler.queue.get_nowait()
+    assert queued.msg == "frame 1" and queued.args is None
+    assert handler.dropped == 1
+
+
+def test_text_format_appends_extra_fields():
+    """测试text格式兼容原有格式，extra字段以key=value追加"""
+    line = StructuredFormatter("text").format(_record(message_id="msg_1", start_chunk=3))
+
+    assert line == "INFO:voice:hello message_id=msg_1 start_chunk=3"
+
+
+def test_json_format_includes_extra_and_exc_text():
+    """测试json格式包含extra字段，后台线程收到的exc_text（已在入队时格式化）原样输出"""
+    record = _record(level=logging.ERROR, session="s1")
+    record.exc_text = "Traceback: boom"
+
+    entry = json.loads(StructuredFormatter("json").format(record))
+
+    assert entry == {"ts": 100.0, "level": "ERROR", "logger": "voice", "msg": "hello",
+                     "session": "s1", "exc": "Traceback: boom"}
+
+
+def test_json_format_formats_exc_info():
+    """测试未经过队列的记录直接格式化exc_info"""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("voice", logging.ERROR, "voice.py", 10, "failed", None, sys.exc_info())
+
+    entry = json.loads(StructuredFormatter("json").format(record))
+
+    assert "ValueError: boom" in entry["exc"]
+
+
+def test_parse_module_levels():
+    """测试模块级别解析：忽略空项和格式错误的项，级别转为大写"""
+    levels = logging_config._parse_module_levels(" services.voice_chat=warning, routers.voice_chat = DEBUG ,bad,=INFO,x=")
+
+    assert levels == {"services.voice_chat": "WARNING", "routers.voice_chat": "DEBUG"}
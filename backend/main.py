@@ -6,7 +6,6 @@ FastAPI 应用程序启动和配置
 # 必须在导入其他模块之前初始化路径
 import setup_paths  # noqa: F401
 
-import logging
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,12 +14,10 @@ from contextlib import asynccontextmanager
 from config.settings import settings
 from routers import device, ws_lifecycle, voice_chat, user, auth_router, word_router, audio_proxy, word_lookup_v2, speech_eval_router
 from core.device_manager import print_device_debug_info
+from core.logging_config import setup_logging
 
-# 配置应用日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(levelname)s:%(name)s:%(message)s'
-)
+# 配置应用日志（队列化：事件循环只入队，后台线程写stdout；级别/格式见 core/logging_config.py）
+setup_logging()
 
 
 @asynccontextmanager
@@ -34,10 +31,14 @@ async def lifespan(app: FastAPI):
     # 打印设备调试信息
     print_device_debug_info()
 
+    # 预热语音上游连接（设备已激活时）
+    await voice_chat.start_voice_services()
+
     yield
 
     # 关闭时执行
     print("\n👋 PocketSpeak Backend 正在关闭...")
+    await voice_chat.stop_voice_services()
 
 
 # 创建 FastAPI 应用
@@ -58,6 +59,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 多worker模式：语音接口请求交给会话持有者worker（单worker模式下直接放行）
+app.middleware("http")(voice_chat.route_to_session_owner)
+
 
 # 注册路由
 app.include_router(device.router)
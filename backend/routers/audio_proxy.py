@@ -4,6 +4,7 @@
 代理并缓存外部音频资源，解决外部API不稳定问题
 """
 
+import logging
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import Response
 import httpx
@@ -14,6 +15,8 @@ from typing import Optional, Literal
 from services.word_lookup.youdao_tts_client import YoudaoTTSClient
 from utils.api_config_loader import api_config_loader
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/audio", tags=["audio"])
 
 # 音频缓存目录
@@ -58,7 +61,7 @@ async def proxy_audio(url: str):
     # 检查缓存
     cache_path = get_cache_path(url)
     if cache_path.exists():
-        print(f"🎵 从缓存返回音频: {cache_path.name}")
+        logger.info(f"🎵 从缓存返回音频: {cache_path.name}")
         return Response(
             content=cache_path.read_bytes(),
             media_type="audio/mpeg",
@@ -70,7 +73,7 @@ async def proxy_audio(url: str):
 
     # 下载音频
     try:
-        print(f"⬇️ 下载音频: {url}")
+        logger.info(f"⬇️ 下载音频: {url}")
         async with httpx.AsyncClient(timeout=30.0) as client:
             response = await client.get(url, follow_redirects=True)
 
@@ -84,7 +87,7 @@ async def proxy_audio(url: str):
 
             # 保存到缓存
             cache_path.write_bytes(audio_data)
-            print(f"💾 音频已缓存: {cache_path.name} ({len(audio_data)} bytes)")
+            logger.info(f"💾 音频已缓存: {cache_path.name} ({len(audio_data)} bytes)")
 
             return Response(
                 content=audio_data,
@@ -96,10 +99,10 @@ async def proxy_audio(url: str):
             )
 
     except httpx.TimeoutException:
-        print(f"⏱️ 音频下载超时: {url}")
+        logger.info(f"⏱️ 音频下载超时: {url}")
         raise HTTPException(status_code=504, detail="音频下载超时")
     except Exception as e:
-        print(f"❌ 音频代理失败: {e}")
+        logger.error(f"❌ 音频代理失败: {e}")
         raise HTTPException(status_code=500, detail=f"音频获取失败: {str(e)}")
 
 
@@ -135,7 +138,7 @@ async def generate_tts(
 
     # 检查缓存
     if cache_path.exists():
-        print(f"🎵 [TTS] 从缓存返回: {text} ({voice})")
+        logger.info(f"🎵 [TTS] 从缓存返回: {text} ({voice})")
         return Response(
             content=cache_path.read_bytes(),
             media_type="audio/mpeg",
@@ -160,7 +163,7 @@ async def generate_tts(
 
         # 保存到缓存
         cache_path.write_bytes(audio_data)
-        print(f"💾 [TTS] 音频已缓存: {text} ({voice}) - {len(audio_data)} bytes")
+        logger.info(f"💾 [TTS] 音频已缓存: {text} ({voice}) - {len(audio_data)} bytes")
 
         return Response(
             content=audio_data,
@@ -174,5 +177,5 @@ async def generate_tts(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ [TTS] 生成异常: {e}")
+        logger.error(f"❌ [TTS] 生成异常: {e}")
         raise HTTPException(status_code=500, detail=f"TTS生成失败: {str(e)}")
@@ -4,12 +4,15 @@
 用户登录、注册相关 API 接口
 """
 
+import logging
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from typing import Dict
 
 from services.auth_service import auth_service
 
+logger = logging.getLogger(__name__)
+
 
 # 创建路由器
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
@@ -110,7 +113,7 @@ async def send_verification_code(request: SendCodeRequest):
     Raises:
         HTTPException: 发送失败
     """
-    print(f"\n📨 收到发送验证码请求: {request.email}")
+    logger.info(f"📨 收到发送验证码请求: {request.email}")
 
     result = auth_service.send_code(request.email)
 
@@ -141,7 +144,7 @@ async def login_with_email_code(request: LoginCodeRequest):
     Raises:
         HTTPException: 登录失败
     """
-    print(f"\n🔐 收到登录请求: {request.email}")
+    logger.info(f"🔐 收到登录请求: {request.email}")
 
     result = auth_service.login_with_email_code(request.email, request.code)
 
@@ -151,7 +154,7 @@ async def login_with_email_code(request: LoginCodeRequest):
             detail=result["message"]
         )
 
-    print(f"✅ 登录成功: {request.email}")
+    logger.info(f"✅ 登录成功: {request.email}")
 
     return LoginCodeResponse(
         success=result["success"],
@@ -174,7 +177,7 @@ async def login_with_apple(request: LoginAppleRequest):
     Raises:
         HTTPException: 501 - 功能未实现
     """
-    print(f"\n🍎 收到 Apple 登录请求")
+    logger.info(f"🍎 收到 Apple 登录请求")
 
     # TODO: 实现 Apple ID 登录逻辑
     # 1. 验证 Apple ID Token
@@ -201,7 +204,7 @@ async def logout():
         JWT 是无状态的，登出主要在前端清除 Token
         后端可以实现黑名单机制（预留）
     """
-    print(f"\n👋 收到登出请求")
+    logger.info(f"👋 收到登出请求")
 
     # TODO: 实现 Token 黑名单机制（可选）
 
@@ -3,6 +3,7 @@
 提供设备ID生成、设备信息查询等接口
 """
 
+import logging
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Dict, Optional
@@ -15,6 +16,8 @@ from services.zoe_device_manager import zoe_device_manager
 # 重构的设备生命周期管理器 - 替代旧的PocketSpeak激活逻辑
 from services.device_lifecycle import device_lifecycle_manager
 
+logger = logging.getLogger(__name__)
+
 # 保留旧的激活逻辑供兼容性使用
 try:
     from services.pocketspeak_activator import pocketspeak_activator
@@ -261,7 +264,7 @@ async def get_device_code():
         DeviceCodeResponse: 包含验证码的响应
     """
     try:
-        print("\n" + "🔄 开始获取设备激活码...")
+        logger.info("🔄 开始获取设备激活码...")
 
         # 使用设备生命周期管理器的核心入口方法
         result = await device_lifecycle_manager.get_or_create_device_activation()
@@ -300,7 +303,7 @@ async def get_device_code():
             )
 
     except Exception as e:
-        print(f"❌ API接口异常: {str(e)}")
+        logger.error(f"❌ API接口异常: {str(e)}")
         raise HTTPException(status_code=500, detail=f"获取设备验证码失败: {str(e)}")
 
 
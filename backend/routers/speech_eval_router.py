@@ -4,11 +4,14 @@
 提供语音评分接口（使用豆包AI - 性能优化版）
 """
 
+import logging
 from fastapi import APIRouter, HTTPException, Body
 from models.speech_eval_models import SpeechFeedbackRequest, SpeechFeedbackResponse
 from services.speech_eval.eval_service import SpeechEvaluationService
 from utils.api_config_loader import api_config_loader
 
+logger = logging.getLogger(__name__)
+
 # 创建路由器
 router = APIRouter(prefix="/api/eval", tags=["语音评分"])
 
@@ -17,13 +20,13 @@ config = api_config_loader.get_config()
 doubao_eval_config = config.get('doubao_eval', {})
 
 if not doubao_eval_config.get('enabled'):
-    print("⚠️ 豆包评分配置未启用，语音评分功能将不可用")
+    logger.warning("⚠️ 豆包评分配置未启用，语音评分功能将不可用")
 
 # 初始化评分服务
 eval_service = None
 if doubao_eval_config.get('enabled'):
     eval_service = SpeechEvaluationService(doubao_eval_config)
-    print("✅ 语音评分服务已启用（使用豆包AI）")
+    logger.info("✅ 语音评分服务已启用（使用豆包AI）")
 
 
 @router.post("/speech-feedback", response_model=SpeechFeedbackResponse)
@@ -67,12 +70,12 @@ async def evaluate_speech(
                 detail="transcript不能为空"
             )
 
-        print(f"\n🎯 收到评分请求: {request.transcript}")
+        logger.info(f"🎯 收到评分请求: {request.transcript}")
 
         # 执行评分
         result = await eval_service.evaluate(request.transcript)
 
-        print(f"✅ 评分成功返回: {result.overall_score}分")
+        logger.info(f"✅ 评分成功返回: {result.overall_score}分")
 
         return result
 
@@ -80,7 +83,7 @@ async def evaluate_speech(
         # 重新抛出HTTP异常
         raise
     except Exception as e:
-        print(f"❌ 评分接口异常: {e}")
+        logger.error(f"❌ 评分接口异常: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"评分失败: {str(e)}"
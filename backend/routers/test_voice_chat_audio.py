@@ -0,0 +1,88 @@
+"""
+语音路由音频接口 - 单元测试
+
+/conversation/current-audio 的Range处理（206/416/400）和 /conversation/incremental-audio 的delta模式
+"""
+
+import base64
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+voice_chat = pytest.importorskip("routers.voice_chat")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+PCM = bytes(range(10))
+
+
+class _FakeSession:
+    """只提供当前消息和媒体通道的会话替身（媒体任务直接在调用方执行）"""
+
+    def __init__(self, message):
+        self.current_message = message
+
+    async def run_media(self, fn, *args):
+        return fn(*args)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    message = voice_chat.VoiceMessage(message_id="msg_1", timestamp=datetime.now())
+    message._audio_store.append(PCM)
+    session = _FakeSession(message)
+    monkeypatch.setattr(voice_chat, "get_voice_session", lambda session_key=None: session)
+
+    app = FastAPI()
+    app.include_router(voice_chat.router)
+    return TestClient(app)
+
+
+def test_current_audio_open_range_returns_206(client):
+    """测试 bytes=<offset>- 返回新增部分，回复未完成时总长度为*"""
+    response = client.get("/api/voice/conversation/current-audio", headers={"Range": "bytes=4-"})
+
+    assert response.status_code == 206
+    assert response.content == PCM[4:]
+    assert response.headers["content-range"] == "bytes 4-9/*"
+    assert response.headers["x-audio-complete"] == "false"
+
+
+def test_current_audio_offset_at_end_returns_416(client):
+    """测试偏移已到末尾时返回416"""
+    response = client.get("/api/voice/conversation/current-audio", headers={"Range": "bytes=10-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+
+@pytest.mark.parametrize("range_header", ["bytes=abc-", "bytes=5-3", "bytes=-", "bytes=4"])
+def test_current_audio_malformed_range_returns_400(client, range_header):
+    """测试格式不合法的Range返回400而不是416"""
+    response = client.get("/api/voice/conversation/current-audio", headers={"Range": range_header})
+
+    assert response.status_code == 400
+
+
+def test_incremental_audio_delta_aligns_offset(client):
+    """测试delta模式只返回新增PCM，字节偏移向下对齐到采样边界"""
+    response = client.get(
+        "/api/voice/conversation/incremental-audio",
+        params={"mode": "delta", "byte_offset": 3, "audio_format": "pcm"}
+    )
+
+    data = response.json()["data"]
+    assert response.status_code == 200
+    assert data["byte_offset"] == 2
+    assert data["next_byte_offset"] == 10
+    assert base64.b64decode(data["audio_data"]) == PCM[2:]
+
+
+def test_incremental_audio_unknown_mode_returns_400(client):
+    """测试不支持的mode返回400"""
+    response = client.get("/api/voice/conversation/incremental-audio", params={"mode": "stream"})
+
+    assert response.status_code == 400
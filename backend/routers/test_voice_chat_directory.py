@@ -0,0 +1,49 @@
+"""
+语音路由会话目录访问 - 单元测试
+
+会话关闭回调中的目录释放在线程中执行，不阻塞事件循环
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+voice_chat = pytest.importorskip("routers.voice_chat")
+
+
+class _SlowDirectory:
+    """模拟SQLite锁等待的目录替身，记录调用所在线程"""
+
+    def __init__(self):
+        self.released = []
+        self.threads = set()
+
+    def release(self, key, worker):
+        time.sleep(0.05)
+        self.threads.add(threading.get_ident())
+        self.released.append(key)
+
+
+def test_session_closed_release_runs_off_event_loop(monkeypatch):
+    """测试注册表关闭回调立即返回，释放在线程中执行一次，完成后清除任务引用"""
+    directory = _SlowDirectory()
+    monkeypatch.setattr(voice_chat, "get_session_directory", lambda: directory)
+
+    async def run():
+        voice_chat._release_session_ownership("user:1")
+        voice_chat._release_session_ownership("user:1")
+        assert directory.released == []
+        assert set(voice_chat._release_tasks) == {"user:1"}
+
+        await voice_chat._release_tasks["user:1"]
+        await asyncio.sleep(0)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+
+    assert directory.released == ["user:1"]
+    assert loop_thread not in directory.threads
+    assert voice_chat._release_tasks == {}
@@ -0,0 +1,76 @@
+"""
+语音路由/ws控制消息 - 单元测试
+
+start_listening/stop_listening 转发给会话并回复listening消息，无法识别的消息不回复
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+voice_chat = pytest.importorskip("routers.voice_chat")
+
+
+class _FakeSession:
+    """记录监听控制调用的会话替身"""
+
+    def __init__(self, success: bool = True):
+        self.calls = []
+        self.success = success
+        self.state = SimpleNamespace(value="ready")
+
+    async def start_listening(self, source=None, mode=None):
+        self.calls.append(("start", source, mode))
+        self.state.value = "listening"
+        return self.success
+
+    async def stop_listening(self):
+        self.calls.append(("stop",))
+        self.state.value = "processing"
+        return self.success
+
+
+class _FakeWriter:
+    def __init__(self):
+        self.sent = []
+
+    def send_json(self, message):
+        self.sent.append(message)
+
+
+def _handle(session, message: str):
+    writer = _FakeWriter()
+    asyncio.run(voice_chat._handle_ws_command(session, writer, message))
+    return writer.sent
+
+
+def test_start_listening_uses_client_source():
+    """测试start_listening以client来源开始监听，携带mode并回复结果和状态"""
+    session = _FakeSession()
+
+    sent = _handle(session, '{"type": "start_listening", "mode": "realtime"}')
+
+    assert session.calls == [("start", voice_chat.UPLINK_SOURCE_CLIENT, "realtime")]
+    assert sent == [{"type": "listening", "data": {"action": "start_listening", "success": True, "state": "listening"}}]
+
+
+def test_stop_listening_reports_failure():
+    """测试stop_listening失败时回复success=false"""
+    session = _FakeSession(success=False)
+
+    sent = _handle(session, '{"type": "stop_listening"}')
+
+    assert session.calls == [("stop",)]
+    assert sent[0]["data"]["success"] is False
+    assert sent[0]["data"]["action"] == "stop_listening"
+
+
+@pytest.mark.parametrize("message", ["not json", '["start_listening"]', '{"type": "ping"}'])
+def test_unrecognized_message_ignored(message):
+    """测试无法解析或未知类型的文本消息不调用会话、不回复"""
+    session = _FakeSession()
+
+    assert _handle(session, message) == []
+    assert session.calls == []
@@ -6,6 +6,7 @@ V1.3 新增：GET /api/user/me 获取当前登录用户信息
 V1.4 新增：用户信息、学习统计、设置、登出等接口
 """
 
+import logging
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict
 from datetime import date
@@ -29,6 +30,8 @@ from schemas.user_schemas import (
     LogoutResponse
 )
 
+logger = logging.getLogger(__name__)
+
 
 # 创建路由器
 router = APIRouter(prefix="/api/user", tags=["user"])
@@ -50,7 +53,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user))
     Raises:
         HTTPException: 401 - 未认证或 Token 无效
     """
-    print(f"\n🔍 获取当前用户信息: {current_user.email}")
+    logger.info(f"🔍 获取当前用户信息: {current_user.email}")
 
     return {
         "success": True,
@@ -81,7 +84,7 @@ async def get_user_info(current_user: User = Depends(get_current_user)) -> UserI
     Returns:
         UserInfoResponse: 用户基础信息（昵称、头像、等级等）
     """
-    print(f"\n📋 获取用户信息: {current_user.email}")
+    logger.info(f"📋 获取用户信息: {current_user.email}")
 
     # 等级中文标签映射
     level_labels = {
@@ -119,7 +122,7 @@ async def get_user_stats_today(current_user: User = Depends(get_current_user)) -
     Note:
         当前返回 Mock 数据，后续版本接入真实学习记录
     """
-    print(f"\n📊 获取今日学习统计: {current_user.email}")
+    logger.info(f"📊 获取今日学习统计: {current_user.email}")
 
     # TODO: 后续版本从学习记录数据库获取真实数据
     # 当前返回 Mock 数据
@@ -141,7 +144,7 @@ async def get_user_settings(current_user: User = Depends(get_current_user)) -> U
     Returns:
         UserSettingsResponse: 设置页面配置项
     """
-    print(f"\n⚙️ 获取用户设置: {current_user.email}")
+    logger.info(f"⚙️ 获取用户设置: {current_user.email}")
 
     # 返回设置项配置（支持后期动态开关）
     return UserSettingsResponse(
@@ -166,7 +169,7 @@ async def logout_user(current_user: User = Depends(get_current_user)) -> LogoutR
         当前实现为客户端主动退出，服务端不维护 Token 黑名单
         客户端需要清除本地存储的 Token
     """
-    print(f"\n👋 用户退出登录: {current_user.email}")
+    logger.info(f"👋 用户退出登录: {current_user.email}")
 
     # TODO: 后续版本可以实现 Token 黑名单机制
     # 当前由客户端负责清除 Token
@@ -196,7 +199,7 @@ async def create_user_profile(request: UserProfileCreateRequest):
         HTTPException: 500 - 服务器内部错误
     """
     try:
-        print(f"\n📝 收到创建用户档案请求: user_id={request.user_id}")
+        logger.info(f"📝 收到创建用户档案请求: user_id={request.user_id}")
 
         # 检查用户是否已存在
         existing_profile = user_storage_service.get_user_profile(request.user_id)
@@ -235,7 +238,7 @@ async def create_user_profile(request: UserProfileCreateRequest):
                 detail="用户档案创建失败"
             )
 
-        print(f"✅ 用户档案创建成功: {request.user_id}")
+        logger.info(f"✅ 用户档案创建成功: {request.user_id}")
 
         return UserProfileResponse(
             success=True,
@@ -246,7 +249,7 @@ async def create_user_profile(request: UserProfileCreateRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 创建用户档案异常: {str(e)}")
+        logger.error(f"❌ 创建用户档案异常: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"创建用户档案失败: {str(e)}"
@@ -269,7 +272,7 @@ async def get_user_profile(user_id: str):
         HTTPException: 500 - 服务器内部错误
     """
     try:
-        print(f"\n🔍 查询用户档案: user_id={user_id}")
+        logger.info(f"🔍 查询用户档案: user_id={user_id}")
 
         # 获取用户档案
         user_profile = user_storage_service.get_user_profile(user_id)
@@ -283,7 +286,7 @@ async def get_user_profile(user_id: str):
         # 更新最后活跃时间
         user_storage_service.update_last_active(user_id)
 
-        print(f"✅ 用户档案查询成功: {user_id}")
+        logger.info(f"✅ 用户档案查询成功: {user_id}")
 
         return UserProfileResponse(
             success=True,
@@ -294,7 +297,7 @@ async def get_user_profile(user_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 获取用户档案异常: {str(e)}")
+        logger.error(f"❌ 获取用户档案异常: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"获取用户档案失败: {str(e)}"
@@ -319,7 +322,7 @@ async def update_user_profile(user_id: str, request: UserProfileUpdateRequest):
         HTTPException: 500 - 服务器内部错误
     """
     try:
-        print(f"\n✏️ 更新用户档案: user_id={user_id}")
+        logger.info(f"✏️ 更新用户档案: user_id={user_id}")
 
         # 检查用户是否存在
         existing_profile = user_storage_service.get_user_profile(user_id)
@@ -346,7 +349,7 @@ async def update_user_profile(user_id: str, request: UserProfileUpdateRequest):
         # 获取更新后的档案
         updated_profile = user_storage_service.get_user_profile(user_id)
 
-        print(f"✅ 用户档案更新成功: {user_id}")
+        logger.info(f"✅ 用户档案更新成功: {user_id}")
 
         return UserProfileResponse(
             success=True,
@@ -357,7 +360,7 @@ async def update_user_profile(user_id: str, request: UserProfileUpdateRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 更新用户档案异常: {str(e)}")
+        logger.error(f"❌ 更新用户档案异常: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"更新用户档案失败: {str(e)}"
@@ -380,7 +383,7 @@ async def delete_user_profile(user_id: str) -> Dict:
         HTTPException: 500 - 服务器内部错误
     """
     try:
-        print(f"\n🗑️ 删除用户档案: user_id={user_id}")
+        logger.info(f"🗑️ 删除用户档案: user_id={user_id}")
 
         # 检查用户是否存在
         existing_profile = user_storage_service.get_user_profile(user_id)
@@ -399,7 +402,7 @@ async def delete_user_profile(user_id: str) -> Dict:
                 detail="用户档案删除失败"
             )
 
-        print(f"✅ 用户档案删除成功: {user_id}")
+        logger.info(f"✅ 用户档案删除成功: {user_id}")
 
         return {
             "success": True,
@@ -409,7 +412,7 @@ async def delete_user_profile(user_id: str) -> Dict:
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 删除用户档案异常: {str(e)}")
+        logger.error(f"❌ 删除用户档案异常: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"删除用户档案失败: {str(e)}"
@@ -435,7 +438,7 @@ async def get_all_users() -> Dict:
         }
 
     except Exception as e:
-        print(f"❌ 获取用户列表异常: {str(e)}")
+        logger.error(f"❌ 获取用户列表异常: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"获取用户列表失败: {str(e)}"
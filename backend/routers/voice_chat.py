@@ -5,9 +5,14 @@ PocketSpeak 语音交互路由模块
 """
 
 import asyncio
+import base64
+import hmac
 import logging
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
+import os
+from typing import Dict, Any, List, Optional, Tuple
+import aiohttp
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -16,11 +21,37 @@ from services.voice_chat.voice_session_manager import (
     get_voice_session,
     initialize_voice_session,
     close_voice_session,
+    close_all_voice_sessions,
+    session_registry,
+    DEFAULT_SESSION_KEY,
     SessionState,
     SessionConfig,
-    VoiceMessage
+    VoiceMessage,
+    UPLINK_SOURCE_SERVER,
+    UPLINK_SOURCE_CLIENT,
+    LISTENING_MODE_MANUAL
 )
+from services.voice_chat.ws_framing import (
+    negotiate_audio_mode,
+    negotiate_audio_codec,
+    pack_audio_frame,
+    AUDIO_MODE_BINARY,
+    HEADER_SIZE,
+    CODEC_OPUS,
+    CODEC_NAMES
+)
+from services.voice_chat.client_writer import ClientOutboundWriter
+from services.voice_chat.ws_pool import start_upstream_pool, close_upstream_pool, get_upstream_pool
+from services.voice_chat.wav_utils import pcm_to_wav, wav_header, WAV_HEADER_SIZE
+from services.voice_chat.ogg_opus import iter_ogg_opus
+from services.voice_chat.session_directory import get_session_directory, WORKER_URL, WORKER_TTL
+from services.voice_chat.session_registry import SessionLimitError
+from services.voice_chat.media_workers import media_pool
 from services.device_lifecycle import PocketSpeakDeviceLifecycle, PocketSpeakDeviceManager
+from core.security import verify_token
+from core.logging_config import get_logging_stats
+from utils import json_codec
+from utils.json_response import FastJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +76,276 @@ def initialize_device_managers():
         logger.info("设备管理器已初始化")
 
 
+# ========== 会话路由 ==========
+
+def resolve_session_key(headers, query_params) -> str:
+    """
+    确定请求对应的语音会话key
+
+    优先级：已登录用户（Bearer Token 或 ?token=）> default
+    设备ID（X-Device-Id 头或 ?device_id=）只在已登录时生效，会话绑定到该用户下的设备
+    未携带身份信息的请求共用default会话，与原单用户行为一致
+
+    Raises:
+        HTTPException: Token无效（401），或未登录却携带设备ID（401）
+    """
+    token = query_params.get("token")
+    authorization = headers.get("authorization")
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+
+    device_id = headers.get("x-device-id") or query_params.get("device_id")
+
+    if token:
+        try:
+            payload = verify_token(token)
+        except Exception as e:
+            raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+        user_id = payload.get("user_id") if payload else None
+        if not user_id:
+            raise HTTPException(status_code=401, detail="Token 中缺少用户信息", headers={"WWW-Authenticate": "Bearer"})
+        if device_id:
+            return f"user:{user_id}:device:{device_id}"
+        return f"user:{user_id}"
+
+    if device_id:
+        # 未认证的设备ID可被任意伪造，不能用来选择会话
+        raise HTTPException(status_code=401, detail="设备会话需要登录Token", headers={"WWW-Authenticate": "Bearer"})
+
+    return DEFAULT_SESSION_KEY
+
+
+async def get_session_key(request: Request) -> str:
+    """依赖注入：当前请求的语音会话key（身份无效时401）"""
+    return resolve_session_key(request.headers, request.query_params)
+
+
+# ========== 多worker路由 ==========
+# 设置 VOICE_WORKER_URL 后启用：会话由认领它的worker持有，其他worker收到的请求
+# 转发（默认）或307重定向（VOICE_WORKER_ROUTING=redirect）到持有者；WebSocket始终转发
+
+WORKER_ROUTING_MODE = os.getenv("VOICE_WORKER_ROUTING", "proxy")
+
+# 已转发请求的标记头，收到的worker直接本地处理，避免循环转发
+# 头部值为worker间共享密钥 VOICE_WORKER_SECRET；未配置密钥时不信任该头（客户端可以任意设置）
+FORWARDED_HEADER = "x-pocketspeak-forwarded"
+WORKER_SECRET = os.getenv("VOICE_WORKER_SECRET", "")
+
+# 转发HTTP请求时两次读取之间的最长等待（秒），持有者无响应时返回504
+PROXY_READ_TIMEOUT = float(os.getenv("VOICE_PROXY_READ_TIMEOUT", "30"))
+
+# 查看会话明细（/sessions 中的会话key和统计）所需的管理令牌
+ADMIN_TOKEN = os.getenv("VOICE_ADMIN_TOKEN", "")
+
+# 不按会话路由的路径（worker本地信息）
+_UNROUTED_PATHS = {f"{router.prefix}/sessions"}
+
+# 不转发的逐跳头部
+_HOP_HEADERS = {
+    "host", "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade"
+}
+
+_proxy_session: Optional[aiohttp.ClientSession] = None
+_heartbeat_task: Optional[asyncio.Task] = None
+# 会话关闭后在线程中执行的目录释放任务（按会话key保留引用，重新认领前等待完成）
+_release_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _is_forwarded(headers) -> bool:
+    """请求是否由其他worker转发（携带正确的共享密钥）"""
+    value = headers.get(FORWARDED_HEADER)
+    return bool(WORKER_SECRET and value) and hmac.compare_digest(value.encode(), WORKER_SECRET.encode())
+
+
+def _is_admin_request(headers) -> bool:
+    """请求携带的X-Admin-Token与VOICE_ADMIN_TOKEN一致（未配置时始终为False）"""
+    token = headers.get("x-admin-token")
+    return bool(ADMIN_TOKEN and token) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+
+async def _remote_owner(session_key: str, headers) -> Optional[str]:
+    """会话由其他在线worker持有时返回其地址，否则返回None（本地处理）"""
+    directory = get_session_directory()
+    if directory is None or _is_forwarded(headers):
+        return None
+    # 目录查询会访问SQLite，不在事件循环中执行
+    owner = await asyncio.to_thread(directory.lookup, session_key)
+    return owner if owner and owner != WORKER_URL else None
+
+
+def _forward_headers(headers) -> Dict[str, str]:
+    forwarded = {
+        key: value for key, value in headers.items()
+        if key.lower() not in _HOP_HEADERS and not key.lower().startswith("sec-websocket")
+        and key.lower() != FORWARDED_HEADER
+    }
+    if WORKER_SECRET:
+        forwarded[FORWARDED_HEADER] = WORKER_SECRET
+    return forwarded
+
+
+def _get_proxy_session() -> aiohttp.ClientSession:
+    global _proxy_session
+    if _proxy_session is None or _proxy_session.closed:
+        # 不自动解压，响应体和Content-Encoding/Content-Length原样返回；
+        # 会话默认不限制读取时间（WebSocket转发是长连接），HTTP转发按请求设置读取超时
+        _proxy_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=5),
+            auto_decompress=False
+        )
+    return _proxy_session
+
+
+async def route_to_session_owner(request: Request, call_next):
+    """
+    HTTP中间件：把语音接口请求交给会话持有者worker
+
+    单worker模式、非语音接口、已转发的请求和会话归本worker时直接本地处理
+    """
+    path = request.url.path
+    if not path.startswith(router.prefix) or path in _UNROUTED_PATHS:
+        return await call_next(request)
+
+    try:
+        session_key = resolve_session_key(request.headers, request.query_params)
+    except HTTPException as e:
+        return JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
+
+    owner = await _remote_owner(session_key, request.headers)
+    if owner is None:
+        return await call_next(request)
+
+    target = owner + path + (f"?{request.url.query}" if request.url.query else "")
+    if WORKER_ROUTING_MODE == "redirect":
+        return RedirectResponse(target, status_code=307)
+
+    try:
+        upstream = await _get_proxy_session().request(
+            request.method,
+            target,
+            headers=_forward_headers(request.headers),
+            data=await request.body(),
+            allow_redirects=False,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=PROXY_READ_TIMEOUT)
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"❌ 会话持有者响应超时 ({owner})")
+        return JSONResponse(
+            status_code=504,
+            content={"success": False, "message": "会话持有者worker响应超时", "data": {"owner": owner}}
+        )
+    except aiohttp.ClientError as e:
+        logger.error(f"❌ 转发到会话持有者失败 ({owner}): {e}")
+        return JSONResponse(
+            status_code=502,
+            content={"success": False, "message": "会话持有者worker不可达", "data": {"owner": owner}}
+        )
+
+    async def relay_body():
+        try:
+            async for chunk in upstream.content.iter_any():
+                yield chunk
+        finally:
+            upstream.release()
+
+    return StreamingResponse(
+        relay_body(),
+        status_code=upstream.status,
+        headers={key: value for key, value in upstream.headers.items() if key.lower() not in _HOP_HEADERS}
+    )
+
+
+async def _proxy_websocket(websocket: WebSocket, owner: str):
+    """把前端WebSocket连接双向转发到会话持有者worker（子协议由持有者协商）"""
+    query = websocket.url.query
+    target = owner.replace("http", "ws", 1) + websocket.url.path + (f"?{query}" if query else "")
+    try:
+        upstream = await _get_proxy_session().ws_connect(
+            target,
+            protocols=websocket.scope.get("subprotocols") or (),
+            headers=_forward_headers(websocket.headers)
+        )
+    except aiohttp.ClientError as e:
+        logger.error(f"❌ WebSocket转发到会话持有者失败 ({owner}): {e}")
+        await websocket.close(code=1013)
+        return
+
+    await websocket.accept(subprotocol=upstream.protocol)
+    logger.info(f"🔀 WebSocket已转发到会话持有者: {owner}")
+
+    async def client_to_owner():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                await upstream.send_bytes(message["bytes"])
+            elif message.get("text") is not None:
+                await upstream.send_str(message["text"])
+
+    async def owner_to_client():
+        async for message in upstream:
+            if message.type == aiohttp.WSMsgType.BINARY:
+                await websocket.send_bytes(message.data)
+            elif message.type == aiohttp.WSMsgType.TEXT:
+                await websocket.send_text(message.data)
+            else:
+                return
+
+    tasks = [asyncio.create_task(client_to_owner()), asyncio.create_task(owner_to_client())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await upstream.close()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+async def _directory_heartbeat_loop():
+    """定期刷新本worker在会话目录中的心跳"""
+    directory = get_session_directory()
+    try:
+        while True:
+            try:
+                await asyncio.to_thread(directory.heartbeat, WORKER_URL)
+            except Exception as e:
+                logger.warning(f"⚠️ 会话目录心跳失败: {e}")
+            await asyncio.sleep(WORKER_TTL / 3)
+    except asyncio.CancelledError:
+        logger.debug("会话目录心跳任务已取消")
+        raise
+
+
+async def _release_directory_claim(session_key: str):
+    """释放目录中本worker对会话的持有记录（在线程中访问SQLite）"""
+    directory = get_session_directory()
+    if directory is None:
+        return
+    try:
+        await asyncio.to_thread(directory.release, session_key, WORKER_URL)
+    except Exception as e:
+        logger.warning(f"⚠️ 释放会话目录记录失败({session_key}): {e}")
+
+
+def _release_session_ownership(session_key: str):
+    """
+    会话关闭/回收时释放目录中的持有记录（注册表的同步回调）
+
+    释放提交为后台任务在线程中执行，不阻塞事件循环；同一会话再次认领前会等待该任务
+    """
+    if get_session_directory() is None or session_key in _release_tasks:
+        return
+    task = asyncio.create_task(_release_directory_claim(session_key))
+    _release_tasks[session_key] = task
+    task.add_done_callback(lambda _: _release_tasks.pop(session_key, None))
+
+
 # ========== 请求/响应模型 ==========
 
 class SessionInitRequest(BaseModel):
@@ -52,6 +353,10 @@ class SessionInitRequest(BaseModel):
     auto_play_tts: bool = False  # 移动端应用应该在前端播放音频,后端不播放
     save_conversation: bool = True
     enable_echo_cancellation: bool = True
+    uplink_source: str = UPLINK_SOURCE_SERVER  # client: 麦克风音频由前端通过/ws上传，服务器不需要声卡
+    listening_mode: str = LISTENING_MODE_MANUAL  # realtime: AI回复中可开始监听（打断当前回复）
+    enable_uplink_vad: bool = False  # 服务器端VAD：丢弃语音前后的静音帧
+    vad_auto_stop_ms: int = 0  # 语音后静音超过该时长自动停止监听（毫秒，0表示不自动停止）
 
 
 class VoiceResponse(BaseModel):
@@ -80,7 +385,8 @@ class VoiceMessageResponse(BaseModel):
 @router.post("/session/init", response_model=VoiceResponse)
 async def initialize_session(
     request: SessionInitRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    session_key: str = Depends(get_session_key)
 ):
     """
     初始化语音会话
@@ -109,17 +415,24 @@ async def initialize_session(
                 data={"activated": False}
             )
 
+        # 确保上游预热连接池已启动（后续初始化直接租用已认证连接）
+        start_upstream_pool(_device_manager)
+
         # 创建会话配置
         logger.info(f"📋 收到的初始化参数: auto_play_tts={request.auto_play_tts}, save_conversation={request.save_conversation}, enable_echo_cancellation={request.enable_echo_cancellation}")
         session_config = SessionConfig(
             auto_play_tts=request.auto_play_tts,
             save_conversation=request.save_conversation,
-            enable_echo_cancellation=request.enable_echo_cancellation
+            enable_echo_cancellation=request.enable_echo_cancellation,
+            uplink_source=request.uplink_source,
+            listening_mode=request.listening_mode,
+            enable_uplink_vad=request.enable_uplink_vad,
+            vad_auto_stop_ms=request.vad_auto_stop_ms
         )
         logger.info(f"📋 创建的会话配置: auto_play_tts={session_config.auto_play_tts}")
 
         # 检查是否已有会话
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if session and session.is_initialized:
             # 输出旧会话配置用于调试
             logger.warning(f"⚠️ 发现已有会话! 旧配置: auto_play_tts={session.config.auto_play_tts}, 新配置: auto_play_tts={session_config.auto_play_tts}")
@@ -127,7 +440,11 @@ async def initialize_session(
             # 检查配置是否相同
             if (session.config.auto_play_tts == session_config.auto_play_tts and
                 session.config.save_conversation == session_config.save_conversation and
-                session.config.enable_echo_cancellation == session_config.enable_echo_cancellation):
+                session.config.enable_echo_cancellation == session_config.enable_echo_cancellation and
+                session.config.uplink_source == session_config.uplink_source and
+                session.config.listening_mode == session_config.listening_mode and
+                session.config.enable_uplink_vad == session_config.enable_uplink_vad and
+                session.config.vad_auto_stop_ms == session_config.vad_auto_stop_ms):
                 logger.info("语音会话已存在且配置相同，复用现有会话")
                 return VoiceResponse(
                     success=True,
@@ -141,13 +458,41 @@ async def initialize_session(
             else:
                 # 配置不同，关闭旧会话
                 logger.warning("⚠️ 检测到配置变更，关闭旧会话并重新初始化")
-                await close_voice_session()
+                await close_voice_session(session_key)
+
+        # 多worker模式：先在会话目录中认领（并发初始化时只有一个worker成功）
+        directory = get_session_directory()
+        if directory:
+            # 旧会话的释放任务可能还在执行，等待完成后再认领，避免释放覆盖新的认领
+            pending_release = _release_tasks.get(session_key)
+            if pending_release:
+                await pending_release
+            owner = await asyncio.to_thread(directory.claim, session_key, WORKER_URL)
+            if owner != WORKER_URL:
+                logger.warning(f"⚠️ 语音会话已被其他worker认领: {owner}")
+                return VoiceResponse(
+                    success=False,
+                    message="语音会话正在其他worker上初始化，请稍后重试",
+                    data={"session_key": session_key, "owner": owner}
+                )
 
         # 初始化语音会话
-        success = await initialize_voice_session(_device_manager, session_config)
+        try:
+            success = await initialize_voice_session(_device_manager, session_config, session_key)
+        except SessionLimitError as e:
+            logger.warning(f"⚠️ {e}")
+            await _release_directory_claim(session_key)
+            return VoiceResponse(
+                success=False,
+                message=f"{e}，请稍后重试",
+                data={"session_key": session_key}
+            )
+
+        if not success:
+            await _release_directory_claim(session_key)
 
         if success:
-            session = get_voice_session()
+            session = get_voice_session(session_key)
             return VoiceResponse(
                 success=True,
                 message="语音会话初始化成功",
@@ -181,7 +526,7 @@ async def initialize_session(
 
 
 @router.post("/session/close", response_model=VoiceResponse)
-async def close_session():
+async def close_session(session_key: str = Depends(get_session_key)):
     """
     关闭语音会话
 
@@ -196,7 +541,7 @@ async def close_session():
     try:
         logger.info("🔚 关闭语音会话...")
 
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session:
             return VoiceResponse(
                 success=True,
@@ -208,7 +553,7 @@ async def close_session():
         stats = session.get_session_stats()
 
         # 关闭会话
-        await close_voice_session()
+        await close_voice_session(session_key)
 
         return VoiceResponse(
             success=True,
@@ -231,7 +576,7 @@ async def close_session():
 
 
 @router.get("/session/status", response_model=VoiceResponse)
-async def get_session_status():
+async def get_session_status(session_key: str = Depends(get_session_key)):
     """
     获取语音会话状态
 
@@ -239,7 +584,7 @@ async def get_session_status():
         VoiceResponse: 会话状态信息
     """
     try:
-        session = get_voice_session()
+        session = get_voice_session(session_key)
 
         if not session:
             return VoiceResponse(
@@ -277,7 +622,8 @@ async def get_session_status():
 
 
 @router.post("/recording/start", response_model=VoiceResponse)
-async def start_recording():
+async def start_recording(source: Optional[str] = None, mode: Optional[str] = None,
+                          session_key: str = Depends(get_session_key)):
     """
     开始录音并发送到AI
 
@@ -286,13 +632,17 @@ async def start_recording():
     2. 实时OPUS编码
     3. 通过WebSocket发送音频到AI
 
+    Args:
+        source: 上行音频来源（server/client），默认使用会话配置；client时音频由前端通过/ws上传
+        mode: 监听模式（manual/realtime），realtime时可在AI回复中调用，立即打断当前回复
+
     Returns:
         VoiceResponse: 操作结果
     """
     try:
         logger.info("🎤 开始录音...")
 
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session or not session.is_initialized:
             return VoiceResponse(
                 success=False,
@@ -301,7 +651,7 @@ async def start_recording():
             )
 
         # 开始监听
-        success = await session.start_listening()
+        success = await session.start_listening(source, mode)
 
         if success:
             return VoiceResponse(
@@ -309,7 +659,8 @@ async def start_recording():
                 message="开始录音",
                 data={
                     "state": session.state.value,
-                    "is_recording": session.recorder.is_recording
+                    "is_recording": session.recorder.is_recording,
+                    "uplink_source": session.uplink_source
                 }
             )
         else:
@@ -334,7 +685,7 @@ async def start_recording():
 
 
 @router.post("/recording/stop", response_model=VoiceResponse)
-async def stop_recording():
+async def stop_recording(session_key: str = Depends(get_session_key)):
     """
     停止录音
 
@@ -348,7 +699,7 @@ async def stop_recording():
     try:
         logger.info("⏹️ 停止录音...")
 
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session or not session.is_initialized:
             return VoiceResponse(
                 success=False,
@@ -390,7 +741,7 @@ async def stop_recording():
 
 
 @router.post("/message/send", response_model=VoiceResponse)
-async def send_text_message(request: SendTextRequest):
+async def send_text_message(request: SendTextRequest, session_key: str = Depends(get_session_key)):
     """
     发送文本消息到AI
 
@@ -403,7 +754,7 @@ async def send_text_message(request: SendTextRequest):
     try:
         logger.info(f"💬 发送文本消息: {request.text}")
 
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session or not session.is_initialized:
             return VoiceResponse(
                 success=False,
@@ -444,19 +795,97 @@ async def send_text_message(request: SendTextRequest):
         )
 
 
-@router.get("/conversation/history")
-async def get_conversation_history(limit: int = 50):
+def _find_message(session, message_id: str) -> Optional[VoiceMessage]:
+    """在历史记录和当前消息中查找消息"""
+    message = session.conversation_history.get(message_id)
+    if message is None and session.current_message and session.current_message.message_id == message_id:
+        message = session.current_message
+    return message
+
+
+def _serialize_history_message(msg: VoiceMessage, include_audio: bool, audio_inline: bool) -> Dict[str, Any]:
+    """
+    转换历史消息为可序列化格式
+
+    音频默认以URL引用（audio_url / audio_ogg_url），只有audio_inline时才内联base64 WAV
+    """
+    message_dict = {
+        "message_id": msg.message_id,
+        "timestamp": msg.timestamp.isoformat(),
+        "user_text": msg.user_text,
+        "ai_text": msg.ai_text,
+        "has_audio": msg.has_audio,
+        "message_type": msg.message_type.value if msg.message_type else None
+    }
+
+    if not include_audio or not msg.has_audio:
+        return message_dict
+
+    audio_path = f"{router.prefix}/conversation/history/{msg.message_id}/audio"
+    message_dict["audio_url"] = f"{audio_path}?format=wav"
+    if msg.encoded_format == "opus":
+        message_dict["audio_ogg_url"] = f"{audio_path}?format=opus"
+    message_dict["audio_sample_rate"] = msg.sample_rate
+    message_dict["audio_channels"] = msg.channels
+
+    if audio_inline:
+        # 兼容旧前端：内联base64 WAV（PCM按需解码，WAV头直接拼接）
+        pcm_view = msg.get_audio_view()
+        if len(pcm_view):
+            message_dict["audio_data"] = base64.b64encode(
+                pcm_to_wav(pcm_view, msg.sample_rate, msg.channels)
+            ).decode('utf-8')
+            message_dict["audio_format"] = "wav"
+
+    return message_dict
+
+
+def _serialize_history_page(page: List[VoiceMessage], include_audio: bool, audio_inline: bool) -> List[Dict[str, Any]]:
+    return [_serialize_history_message(msg, include_audio, audio_inline) for msg in page]
+
+
+def _paginate_history(history: List[VoiceMessage], limit: int, before: Optional[str]) -> Tuple[List[VoiceMessage], Optional[str]]:
+    """
+    游标分页：返回before（消息ID，不含）之前最近的limit条消息（时间正序）和下一页游标
+    """
+    end = len(history)
+    if before is not None:
+        for i, msg in enumerate(history):
+            if msg.message_id == before:
+                end = i
+                break
+
+    start = max(end - max(limit, 0), 0)
+    page = history[start:end]
+    next_cursor = page[0].message_id if page and start > 0 else None
+    return page, next_cursor
+
+
+@router.get("/conversation/history", response_class=FastJSONResponse)
+async def get_conversation_history(
+    limit: int = 50,
+    before: Optional[str] = None,
+    include_audio: bool = True,
+    audio_inline: bool = True,
+    stream: bool = False,
+    session_key: str = Depends(get_session_key)
+):
     """
     获取对话历史记录
 
     Args:
         limit: 返回的最大消息数量
+        before: 分页游标（上一页响应中的next_cursor），只返回该消息之前的记录
+        include_audio: 是否返回音频信息（False时只返回文本）
+        audio_inline: 是否内联base64 WAV（兼容旧前端，默认True）；
+                      False时只返回audio_url，音频通过 /conversation/history/{id}/audio 流式获取
+        stream: True时以NDJSON流式返回（每行一条消息，最后一行为分页信息）
 
     Returns:
         对话历史列表
     """
     try:
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session:
             return {
                 "success": False,
@@ -465,73 +894,40 @@ async def get_conversation_history(limit: int = 50):
             }
 
         history = session.get_conversation_history()
+        page, next_cursor = _paginate_history(history, limit, before)
+        total_count = len(history)
+
+        if stream:
+            async def iter_ndjson():
+                # 逐条序列化，内存中同时只有一条消息的音频；解码和base64编码在会话的媒体通道中执行
+                for msg in page:
+                    data = await session.run_media(_serialize_history_message, msg, include_audio, audio_inline)
+                    line = {"type": "message", "data": data}
+                    yield json_codec.dumps(line) + "\n"
+                yield json_codec.dumps({
+                    "type": "page",
+                    "data": {
+                        "count": len(page),
+                        "next_cursor": next_cursor,
+                        "total_count": total_count
+                    }
+                }) + "\n"
 
-        # 限制返回数量
-        if len(history) > limit:
-            history = history[-limit:]
-
-        # 转换为可序列化格式
-        messages = []
-        for msg in history:
-            message_dict = {
-                "message_id": msg.message_id,
-                "timestamp": msg.timestamp.isoformat(),
-                "user_text": msg.user_text,
-                "ai_text": msg.ai_text,
-                "has_audio": msg.ai_audio is not None,
-                "message_type": msg.message_type.value if msg.message_type else None
-            }
+            return StreamingResponse(iter_ndjson(), media_type="application/x-ndjson")
 
-            # 如果有音频数据，转换为WAV格式
-            if msg.ai_audio:
-                import base64
-                import wave
-                import io
-
-                try:
-                    # 如果已经是PCM格式,直接封装为WAV
-                    if msg.ai_audio.format == "pcm":
-                        pcm_data = msg.ai_audio.data
-                        logger.info(f"📦 使用已解码的PCM数据: {len(pcm_data)} bytes, 格式={msg.ai_audio.format}, sample_rate={msg.ai_audio.sample_rate}, channels={msg.ai_audio.channels}")
-                    else:
-                        # 其他格式(如OPUS)需要先解码
-                        import opuslib
-                        decoder = opuslib.Decoder(msg.ai_audio.sample_rate, msg.ai_audio.channels)
-                        pcm_data = decoder.decode(msg.ai_audio.data, frame_size=960, decode_fec=False)
-                        logger.info(f"🔄 OPUS解码为PCM: {len(msg.ai_audio.data)} bytes (OPUS) → {len(pcm_data)} bytes (PCM)")
-
-                    # 将PCM数据封装为WAV格式
-                    wav_buffer = io.BytesIO()
-                    with wave.open(wav_buffer, 'wb') as wav_file:
-                        wav_file.setnchannels(msg.ai_audio.channels)
-                        wav_file.setsampwidth(2)  # 16-bit
-                        wav_file.setframerate(msg.ai_audio.sample_rate)
-                        wav_file.writeframes(pcm_data)
-
-                    wav_data = wav_buffer.getvalue()
-
-                    message_dict["audio_data"] = base64.b64encode(wav_data).decode('utf-8')
-                    message_dict["audio_format"] = "wav"
-                    message_dict["audio_sample_rate"] = msg.ai_audio.sample_rate
-                    message_dict["audio_channels"] = msg.ai_audio.channels
-
-                    logger.info(f"✅ 音频转WAV成功: {len(pcm_data)} bytes (PCM) → {len(wav_data)} bytes (WAV), 参数: {msg.ai_audio.sample_rate}Hz, {msg.ai_audio.channels}ch")
-                except Exception as e:
-                    logger.error(f"❌ 音频转WAV失败: {e}")
-                    # 失败时仍返回原始数据
-                    message_dict["audio_data"] = base64.b64encode(msg.ai_audio.data).decode('utf-8')
-                    message_dict["audio_format"] = msg.ai_audio.format
-                    message_dict["audio_sample_rate"] = msg.ai_audio.sample_rate
-                    message_dict["audio_channels"] = msg.ai_audio.channels
-
-            messages.append(message_dict)
+        # 转换为可序列化格式（内联音频需要解码和base64编码，放到媒体线程）
+        if include_audio and audio_inline:
+            messages = await session.run_media(_serialize_history_page, page, include_audio, audio_inline)
+        else:
+            messages = _serialize_history_page(page, include_audio, audio_inline)
 
         return {
             "success": True,
             "message": f"获取到 {len(messages)} 条历史消息",
             "data": {
                 "messages": messages,
-                "total_count": len(session.conversation_history)
+                "next_cursor": next_cursor,
+                "total_count": total_count
             }
         }
 
@@ -549,8 +945,8 @@ async def get_conversation_history(limit: int = 50):
         )
 
 
-@router.get("/conversation/sentences")
-async def get_completed_sentences(last_sentence_index: int = 0):
+@router.get("/conversation/sentences", response_class=FastJSONResponse)
+async def get_completed_sentences(last_sentence_index: int = 0, session_key: str = Depends(get_session_key)):
     """
     获取已完成的句子及其音频（用于逐句播放）
 
@@ -561,7 +957,7 @@ async def get_completed_sentences(last_sentence_index: int = 0):
         已完成的句子列表
     """
     try:
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session:
             return {
                 "success": False,
@@ -584,11 +980,11 @@ async def get_completed_sentences(last_sentence_index: int = 0):
                 }
             }
 
-        # 获取已完成的句子
-        result = current_message.get_completed_sentences(last_sentence_index)
+        # 推迟编码的句子在这里补齐，放到会话的媒体通道中执行
+        result = await session.run_media(current_message.get_completed_sentences, last_sentence_index)
 
         if result["has_new_sentences"]:
-            logger.info(f"🎵 返回新完成的句子: {len(result['sentences'])}句, 总计{result['total_sentences']}句, 完成={result['is_complete']}")
+            logger.debug(f"🎵 返回新完成的句子: {len(result['sentences'])}句, 总计{result['total_sentences']}句, 完成={result['is_complete']}")
 
         return {
             "success": True,
@@ -608,19 +1004,88 @@ async def get_completed_sentences(last_sentence_index: int = 0):
         }
 
 
-@router.get("/conversation/incremental-audio")
-async def get_incremental_audio(last_chunk_index: int = 0):
+@router.get("/conversation/history/{message_id}/audio")
+async def get_history_audio(message_id: str, format: str = "wav", session_key: str = Depends(get_session_key)):
+    """
+    流式获取单条消息的AI音频
+
+    Args:
+        message_id: 消息ID
+        format: wav（PCM按需解码，默认）或 opus（原始OPUS包封装为Ogg-Opus，不解码）
+
+    Returns:
+        音频字节流
+    """
+    session = get_voice_session(session_key)
+    if not session:
+        raise HTTPException(status_code=503, detail="语音会话未初始化")
+
+    msg = _find_message(session, message_id)
+    if msg is None or not msg.has_audio:
+        raise HTTPException(status_code=404, detail=f"消息不存在或没有音频: {message_id}")
+
+    if format == "opus":
+        if msg.encoded_format != "opus":
+            raise HTTPException(status_code=415, detail=f"消息音频不是OPUS格式: {msg.encoded_format}")
+
+        # 快照当前包列表，流式封装期间不受新帧影响
+        packets = list(msg.encoded_frames)
+        return StreamingResponse(
+            iter_ogg_opus(packets, sample_rate=msg.sample_rate, channels=msg.channels),
+            media_type="audio/ogg",
+            headers={"Content-Disposition": f'inline; filename="{message_id}.opus"'}
+        )
+
+    if format != "wav":
+        raise HTTPException(status_code=400, detail=f"不支持的音频格式: {format}")
+
+    # 历史消息可能需要完整解码一次（结果进入共享LRU），在媒体线程中执行
+    pcm_view = await session.run_media(msg.get_audio_view)
+
+    def iter_wav(chunk_size: int = 64 * 1024):
+        yield wav_header(len(pcm_view), msg.sample_rate, msg.channels)
+        for offset in range(0, len(pcm_view), chunk_size):
+            yield bytes(pcm_view[offset:offset + chunk_size])
+
+    return StreamingResponse(
+        iter_wav(),
+        media_type="audio/wav",
+        headers={
+            "Content-Length": str(WAV_HEADER_SIZE + len(pcm_view)),
+            "Content-Disposition": f'inline; filename="{message_id}.wav"'
+        }
+    )
+
+
+@router.get("/conversation/incremental-audio", response_class=FastJSONResponse)
+async def get_incremental_audio(
+    last_chunk_index: int = 0,
+    mode: str = "full",
+    byte_offset: Optional[int] = None,
+    audio_format: str = "wav",
+    session_key: str = Depends(get_session_key)
+):
     """
     获取当前对话的增量音频数据（用于流式播放）
 
     Args:
         last_chunk_index: 前端已获取到的音频块索引
+        mode: full（默认，返回完整累积音频，兼容旧前端）或 delta（只返回新增部分）
+        byte_offset: delta模式下前端已获取到的PCM字节偏移（优先于last_chunk_index，向下对齐到采样边界）
+        audio_format: wav（默认）或 pcm（原始16-bit PCM，不带WAV头）
 
     Returns:
-        增量音频数据
+        增量音频数据；mode/audio_format不支持或byte_offset为负时返回400
     """
+    if mode not in ("full", "delta"):
+        raise HTTPException(status_code=400, detail=f"不支持的mode: {mode}")
+    if audio_format not in ("wav", "pcm"):
+        raise HTTPException(status_code=400, detail=f"不支持的音频格式: {audio_format}")
+    if byte_offset is not None and byte_offset < 0:
+        raise HTTPException(status_code=400, detail=f"byte_offset不能为负: {byte_offset}")
+
     try:
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session:
             return {
                 "success": False,
@@ -643,60 +1108,59 @@ async def get_incremental_audio(last_chunk_index: int = 0):
                 }
             }
 
-        # 获取增量音频
-        audio_info = current_message.get_incremental_audio(last_chunk_index)
+        def build_incremental_audio():
+            # 偏移落在采样中间时向下对齐（16-bit PCM，每个采样帧 2*声道数 字节），避免返回错位的样本
+            aligned_offset = byte_offset
+            if aligned_offset is not None:
+                sample_bytes = 2 * current_message.channels
+                aligned_offset -= aligned_offset % sample_bytes
+            # 获取增量音频（零拷贝视图），直接对PCM视图封装并编码一次，不再经过base64解码/再编码的往返
+            audio_info = current_message.get_incremental_audio(
+                last_chunk_index,
+                delta=(mode == "delta"),
+                byte_offset=aligned_offset
+            )
+            if not audio_info.get("has_new_audio"):
+                return audio_info, None
 
-        # 如果有新音频，需要将PCM封装为WAV格式
-        if audio_info.get("has_new_audio"):
-            import base64
-            import wave
-            import io
+            pcm_view = audio_info["pcm"]
+            if audio_format == "pcm":
+                payload = pcm_view
+            else:
+                payload = pcm_to_wav(pcm_view, audio_info["sample_rate"], audio_info["channels"])
+            return audio_info, base64.b64encode(payload).decode('utf-8')
 
-            try:
-                # 解码Base64得到PCM数据
-                pcm_data = base64.b64decode(audio_info["audio_data"])
-
-                # 将PCM封装为WAV格式
-                wav_buffer = io.BytesIO()
-                with wave.open(wav_buffer, 'wb') as wav_file:
-                    wav_file.setnchannels(audio_info["channels"])
-                    wav_file.setsampwidth(2)  # 16-bit PCM
-                    wav_file.setframerate(audio_info["sample_rate"])
-                    wav_file.writeframes(pcm_data)
-
-                wav_data = wav_buffer.getvalue()
-                wav_base64 = base64.b64encode(wav_data).decode('utf-8')
-
-                logger.info(
-                    f"🎵 返回增量音频: chunk_index {last_chunk_index}→{audio_info['chunk_count']}, "
-                    f"新增 {audio_info['new_audio_size']} bytes, "
-                    f"总计 {audio_info['total_audio_size']} bytes PCM → {len(wav_data)} bytes WAV, "
-                    f"完成={audio_info['is_complete']}"
-                )
+        # 解码补齐、WAV封装和base64编码在会话的媒体通道中执行（排在已提交的解码任务之后）
+        audio_info, audio_base64 = await session.run_media(build_incremental_audio)
 
-                return {
-                    "success": True,
-                    "message": "获取增量音频成功",
-                    "data": {
-                        "has_new_audio": True,
-                        "audio_data": wav_base64,
-                        "chunk_count": audio_info["chunk_count"],
-                        "is_complete": audio_info["is_complete"],
-                        "new_audio_size": audio_info["new_audio_size"],
-                        "total_audio_size": audio_info["total_audio_size"]
-                    }
-                }
+        if audio_info.get("has_new_audio"):
+            pcm_view = audio_info["pcm"]
 
-            except Exception as e:
-                logger.error(f"封装WAV格式失败: {e}", exc_info=True)
-                return {
-                    "success": False,
-                    "message": f"音频处理失败: {e}",
-                    "data": {
-                        "has_new_audio": False,
-                        "is_complete": audio_info.get("is_complete", False)
-                    }
+            logger.info(
+                f"🎵 返回增量音频({mode}): chunk_index {last_chunk_index}→{audio_info['chunk_count']}, "
+                f"新增 {audio_info['new_audio_size']} bytes, "
+                f"本次 {len(pcm_view)} bytes PCM, 总计 {audio_info['total_audio_size']} bytes, "
+                f"完成={audio_info['is_complete']}"
+            )
+
+            return {
+                "success": True,
+                "message": "获取增量音频成功",
+                "data": {
+                    "has_new_audio": True,
+                    "audio_data": audio_base64,
+                    "audio_format": "pcm" if audio_format == "pcm" else "wav",
+                    "mode": mode,
+                    "byte_offset": audio_info["byte_offset"],
+                    "next_byte_offset": audio_info["next_byte_offset"],
+                    "chunk_count": audio_info["chunk_count"],
+                    "is_complete": audio_info["is_complete"],
+                    "new_audio_size": audio_info["new_audio_size"],
+                    "total_audio_size": audio_info["total_audio_size"],
+                    "sample_rate": audio_info["sample_rate"],
+                    "channels": audio_info["channels"]
                 }
+            }
 
         # 没有新音频
         return {
@@ -704,6 +1168,7 @@ async def get_incremental_audio(last_chunk_index: int = 0):
             "message": "当前没有新音频",
             "data": {
                 "has_new_audio": False,
+                "next_byte_offset": audio_info["next_byte_offset"],
                 "chunk_count": audio_info["chunk_count"],
                 "is_complete": audio_info["is_complete"]
             }
@@ -723,8 +1188,144 @@ async def get_incremental_audio(last_chunk_index: int = 0):
         }
 
 
+class RangeNotSatisfiable(ValueError):
+    """Range语法正确但超出当前音频长度（416）"""
+
+
+def _parse_byte_range(range_header: Optional[str], total: int) -> Optional[Tuple[int, int]]:
+    """
+    解析单段HTTP Range头（bytes=start-end / bytes=start- / bytes=-suffix）
+
+    非bytes单位或多段Range按RFC 9110忽略（返回完整资源）
+
+    Returns:
+        (start, end) 闭区间；无Range头或忽略时返回None
+
+    Raises:
+        RangeNotSatisfiable: 起始偏移超出当前音频长度（416）
+        ValueError: Range格式不合法（400）
+    """
+    if not range_header:
+        return None
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, dash, end_str = spec.strip().partition("-")
+    start_str, end_str = start_str.strip(), end_str.strip()
+    digits_ok = all(part.isdigit() for part in (start_str, end_str) if part)
+    if not dash or not (start_str or end_str) or not digits_ok:
+        raise ValueError(f"Range格式不合法: {range_header}")
+
+    if start_str:
+        start = int(start_str)
+        end = int(end_str) if end_str else total - 1
+        if end_str and end < start:
+            raise ValueError(f"Range格式不合法: {range_header}")
+    else:
+        # 后缀范围: 最后N个字节
+        suffix = int(end_str)
+        if suffix == 0:
+            raise RangeNotSatisfiable(f"Range不可满足: {range_header}")
+        start = max(total - suffix, 0)
+        end = total - 1
+
+    if start >= total:
+        raise RangeNotSatisfiable(f"Range不可满足: {range_header}")
+    return start, min(end, total - 1)
+
+
+@router.get("/conversation/current-audio")
+async def get_current_audio(request: Request, session_key: str = Depends(get_session_key)):
+    """
+    当前AI回复的原始PCM音频资源（支持HTTP Range）
+
+    - 响应体为16-bit PCM（audio/L16），可用 Range: bytes=<offset>- 只拉取新增部分
+    - 回复仍在生成时，Content-Range的总长度为 *
+    - X-Audio-Complete 头表示TTS是否已完成
+
+    Returns:
+        200/206 原始PCM，416（偏移已到末尾），或400（Range格式不合法）
+    """
+    session = get_voice_session(session_key)
+    current_message = session.current_message if session else None
+    if not current_message:
+        raise HTTPException(status_code=404, detail="当前没有进行中的对话")
+
+    # 先在媒体线程中补齐解码，之后的读取只是切片
+    await session.run_media(current_message.decode_pending)
+    total = current_message.audio_size
+    is_complete = current_message.is_tts_complete
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "no-store",
+        "X-Audio-Complete": "true" if is_complete else "false",
+        "X-Audio-Sample-Rate": str(current_message.sample_rate),
+        "X-Audio-Channels": str(current_message.channels),
+        "X-Audio-Frame-Count": str(current_message.audio_frame_count)
+    }
+    media_type = f"audio/L16; rate={current_message.sample_rate}; channels={current_message.channels}"
+    total_label = str(total) if is_complete else "*"
+
+    try:
+        byte_range = _parse_byte_range(request.headers.get("range"), total)
+    except RangeNotSatisfiable:
+        headers["Content-Range"] = f"bytes */{total}"
+        return Response(status_code=416, headers=headers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if byte_range is None:
+        return Response(content=bytes(current_message.get_audio_view()), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{total_label}"
+    return Response(
+        content=bytes(current_message.get_audio_view(start, end + 1)),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+@router.get("/sessions", response_class=FastJSONResponse)
+async def list_voice_sessions(request: Request):
+    """
+    语音会话注册表统计
+
+    默认只返回汇总计数；携带与 VOICE_ADMIN_TOKEN 一致的 X-Admin-Token 头时
+    才返回每个会话的key、状态与统计信息（未配置VOICE_ADMIN_TOKEN时不提供明细）
+
+    Returns:
+        会话数、上限、回收统计、上游连接池和媒体线程池统计
+    """
+    pool = get_upstream_pool()
+    directory = get_session_directory()
+    registry_stats = session_registry.get_stats()
+    directory_sessions = await asyncio.to_thread(directory.list_sessions) if directory else None
+
+    data = {
+        **registry_stats,
+        "upstream_pool": pool.get_stats() if pool else None,
+        "media_workers": media_pool.get_stats(),
+        "worker": WORKER_URL or None
+    }
+    if _is_admin_request(request.headers):
+        data["directory"] = directory_sessions
+    else:
+        data.pop("sessions", None)
+        data["directory_sessions"] = len(directory_sessions) if directory_sessions is not None else None
+
+    return {
+        "success": True,
+        "message": f"当前 {len(session_registry)} 个语音会话",
+        "data": data
+    }
+
+
 @router.get("/health")
-async def voice_health_check():
+async def voice_health_check(session_key: str = Depends(get_session_key)):
     """
     语音系统健康检查
 
@@ -732,7 +1333,7 @@ async def voice_health_check():
         健康状态信息
     """
     try:
-        session = get_voice_session()
+        session = get_voice_session(session_key)
 
         if not session:
             return {
@@ -762,7 +1363,8 @@ async def voice_health_check():
                 "player": session.player.is_initialized
             },
             "state": session.state.value,
-            "stats": session.get_session_stats()
+            "stats": session.get_session_stats(),
+            "logging": get_logging_stats()
         }
 
     except Exception as e:
@@ -787,15 +1389,49 @@ async def websocket_endpoint(websocket: WebSocket):
     WebSocket端点用于实时语音交互
 
     功能：
-    1. 接收前端发送的录音数据
+    1. 接收前端采集的麦克风OPUS帧（二进制消息）和 start_listening/stop_listening 控制消息
     2. 推送AI响应到前端
     3. 实时状态同步
+
+    音频下发模式（连接时协商）：
+    - json（默认）：{"type": "audio_frame", "data": "<base64 PCM>"}
+    - binary：子协议 "pocketspeak.audio.v1" 或 ?audio_format=binary，
+      音频以二进制消息发送（见 services/voice_chat/ws_framing.py），控制事件仍为JSON
+
+    音频编码：
+    - pcm（默认）：服务端解码后的PCM
+    - opus：子协议 "pocketspeak.audio.v1.opus" 或 ?codec=opus，原样转发小智OPUS包，服务端不解码
     """
-    await websocket.accept()
-    logger.info("WebSocket客户端已连接")
+    subprotocols = websocket.scope.get("subprotocols")
+    audio_mode, subprotocol = negotiate_audio_mode(
+        subprotocols,
+        websocket.query_params.get("audio_format")
+    )
+    audio_codec = negotiate_audio_codec(subprotocols, websocket.query_params.get("codec"))
+    try:
+        session_key = resolve_session_key(websocket.headers, websocket.query_params)
+    except HTTPException as e:
+        logger.warning(f"⚠️ WebSocket连接身份无效，拒绝连接: {e.detail}")
+        await websocket.close(code=1008)
+        return
+
+    # 多worker模式：会话在其他worker上时整条连接转发过去
+    owner = await _remote_owner(session_key, websocket.headers)
+    if owner:
+        await _proxy_websocket(websocket, owner)
+        return
+
+    await websocket.accept(subprotocol=subprotocol)
+    logger.info(f"WebSocket客户端已连接 (session={session_key}, audio_mode={audio_mode}, codec={CODEC_NAMES[audio_codec]})")
+
+    session = None
+    writer: Optional[ClientOutboundWriter] = None
+    on_user_text_received = on_text_received = on_emoji_received = on_state_change = on_speech_activity = None
+    on_playback_flush = on_audio_frame = None
+    audio_callback_attr = "on_opus_frame_received" if audio_codec == CODEC_OPUS else "on_audio_frame_received"
 
     try:
-        session = get_voice_session()
+        session = get_voice_session(session_key)
         if not session or not session.is_initialized:
             await websocket.send_json({
                 "type": "error",
@@ -804,58 +1440,112 @@ async def websocket_endpoint(websocket: WebSocket):
             await websocket.close()
             return
 
+        # 有前端连接的会话不会被空闲回收
+        session_registry.connection_opened(session_key)
+
+        # 每个连接一个出站写入协程：有界队列，控制事件优先于音频，慢连接丢弃过期音频
+        writer = ClientOutboundWriter(websocket, json_dumps=json_codec.dumps)
+        writer.start()
+
+        # 告知客户端协商结果
+        writer.send_json({
+            "type": "audio_format",
+            "data": {
+                "mode": audio_mode,
+                "codec": CODEC_NAMES[audio_codec],
+                "sample_rate": 24000,
+                "channels": 1,
+                "frame_duration_ms": 40,
+                "subprotocol": subprotocol,
+                "header_size": HEADER_SIZE if audio_mode == AUDIO_MODE_BINARY else 0,
+                # 前端上传麦克风音频时的格式（每个二进制消息一个OPUS包）
+                "uplink": {
+                    "codec": "opus",
+                    "sample_rate": 16000,
+                    "channels": 1,
+                    "frame_duration_ms": 40
+                }
+            }
+        })
+
+        # 二进制帧序号（连接内递增）
+        frame_sequence = 0
+
         # 🚀 设置回调函数推送消息到前端（完全模仿py-xiaozhi）
+        # 所有回调只做入队，实际发送由writer按序完成
         def on_user_text_received(text: str):
             """收到用户语音识别文字立即推送"""
-            # ✅ 精简：移除高频日志
-            asyncio.create_task(websocket.send_json({
+            writer.send_json({
                 "type": "user_text",
                 "data": text
-            }))
+            })
 
         def on_text_received(text: str):
             """收到AI文本立即推送"""
-            # ✅ 精简：移除高频日志
-            asyncio.create_task(websocket.send_json({
+            writer.send_json({
                 "type": "text",
                 "data": text
-            }))
+            })
 
         def on_emoji_received(emoji: str, emotion: str):
             """收到AI emoji立即推送（🎭 新增）"""
             logger.info(f"🎭 推送emoji: {emoji}")
-            asyncio.create_task(websocket.send_json({
+            writer.send_json({
                 "type": "llm",
                 "text": emoji,
                 "emotion": emotion
-            }))
+            })
 
         def on_state_change(state):
-            """状态变化推送"""
-            # ✅ 精简：移除高频状态日志
-            asyncio.create_task(websocket.send_json({
+            """状态变化推送（未发出的旧状态被最新状态合并）"""
+            writer.send_json({
                 "type": "state_change",
                 "data": {"state": state.value}
-            }))
+            }, coalesce_key="state_change")
+
+        def on_speech_activity(event: str, offset_ms: int):
+            """上行VAD检测到语音开始/结束"""
+            writer.send_json({
+                "type": "vad",
+                "data": {"event": event, "offset_ms": offset_ms}
+            })
+
+        def on_playback_flush(message_id: str):
+            """用户打断：丢弃还没发出的音频帧，并通知前端清空播放队列"""
+            dropped = writer.clear_audio()
+            writer.send_json({
+                "type": "flush_playback",
+                "data": {"message_id": message_id, "dropped_frames": dropped}
+            })
 
         def on_audio_frame(audio_data: bytes):
-            """收到音频帧立即推送（模仿py-xiaozhi的即时播放）"""
-            import base64
+            """收到音频帧立即推送（模仿py-xiaozhi的即时播放）；OPUS直通时audio_data为原始OPUS包"""
+            nonlocal frame_sequence
             try:
-                # 🔥 关键修复：使用 run_coroutine_threadsafe 确保任务真正执行
-                loop = asyncio.get_event_loop()
-
-                async def _send():
-                    try:
-                        await websocket.send_json({
-                            "type": "audio_frame",
-                            "data": base64.b64encode(audio_data).decode('utf-8')
-                        })
-                        # ✅ 精简：移除高频音频帧日志
-                    except Exception as e:
-                        logger.error(f"❌ WebSocket发送音频帧失败: {e}")
-
-                asyncio.run_coroutine_threadsafe(_send(), loop)
+                if audio_mode == AUDIO_MODE_BINARY:
+                    # 二进制模式：紧凑头部 + 原始音频，无base64/JSON开销
+                    current_message = session.current_message
+                    frame = pack_audio_frame(
+                        audio_data,
+                        sequence=frame_sequence,
+                        sentence_index=current_message.current_sentence_index if current_message else 0,
+                        sample_rate=24000,
+                        channels=1,
+                        codec=audio_codec
+                    )
+                    frame_sequence += 1
+                    writer.send_audio(frame)
+                elif audio_codec == CODEC_OPUS:
+                    writer.send_audio({
+                        "type": "audio_frame",
+                        "format": "opus",
+                        "data": base64.b64encode(audio_data).decode('utf-8')
+                    })
+                else:
+                    writer.send_audio({
+                        "type": "audio_frame",
+                        "data": base64.b64encode(audio_data).decode('utf-8')
+                    })
             except Exception as e:
                 logger.error(f"❌ on_audio_frame 回调失败: {e}", exc_info=True)
 
@@ -864,47 +1554,165 @@ async def websocket_endpoint(websocket: WebSocket):
         session.on_text_received = on_text_received  # AI文本推送
         session.on_emoji_received = on_emoji_received  # 🎭 emoji推送（新增）
         session.on_state_changed = on_state_change  # 状态推送
-        session.on_audio_frame_received = on_audio_frame  # 音频帧推送
+        session.on_speech_activity = on_speech_activity  # VAD语音开始/结束推送
+        session.on_playback_flush = on_playback_flush  # 打断时清空播放
+        setattr(session, audio_callback_attr, on_audio_frame)  # 音频帧推送（PCM或OPUS直通）
 
         # 保持连接并处理消息
         while True:
             data = await websocket.receive()
 
-            if "text" in data:
-                message = data["text"]
-                # 处理文本命令
-                logger.info(f"收到WebSocket文本消息: {message}")
+            if data.get("type") == "websocket.disconnect":
+                break
+
+            if data.get("bytes") is not None:
+                # 前端麦克风音频：一个二进制消息 = 一个OPUS包，原样交给上行发送器
+                session.submit_client_audio(data["bytes"])
 
-            elif "bytes" in data:
-                # 处理音频数据
-                audio_data = data["bytes"]
-                logger.debug(f"收到WebSocket音频数据: {len(audio_data)} bytes")
+            elif data.get("text") is not None:
+                await _handle_ws_command(session, writer, data["text"])
 
     except WebSocketDisconnect:
         logger.info("WebSocket客户端已断开")
     except Exception as e:
         logger.error(f"WebSocket错误: {e}", exc_info=True)
     finally:
+        # 前端上传音频的监听随连接断开结束，避免上游一直等待音频
+        if (session is not None and writer is not None and session.uplink_source == UPLINK_SOURCE_CLIENT
+                and session.state == SessionState.LISTENING):
+            try:
+                await session.stop_listening()
+            except Exception as e:
+                logger.warning(f"连接断开时停止监听失败: {e}")
+
+        # 注销本连接的推送回调，避免会话继续向已断开的连接推送
+        if session is not None:
+            for attr, callback in (
+                ("on_user_speech_end", on_user_text_received),
+                ("on_text_received", on_text_received),
+                ("on_emoji_received", on_emoji_received),
+                ("on_state_changed", on_state_change),
+                ("on_speech_activity", on_speech_activity),
+                ("on_playback_flush", on_playback_flush),
+                (audio_callback_attr, on_audio_frame),
+            ):
+                if callback is not None and getattr(session, attr, None) is callback:
+                    setattr(session, attr, None)
+        if writer is not None:
+            session_registry.connection_closed(session_key)
+            logger.info(f"前端出站统计: {writer.get_stats()}")
+            await writer.close()
         logger.info("WebSocket连接已关闭")
 
 
+async def _handle_ws_command(session, writer: ClientOutboundWriter, message: str):
+    """
+    处理前端通过/ws发送的JSON控制消息
+
+    - {"type": "start_listening", "mode": "realtime"}：开始监听，之后的二进制消息作为麦克风OPUS帧上传
+      （mode可省略；realtime时AI回复中也可发送，立即打断当前回复）
+    - {"type": "stop_listening"}：停止监听，等待AI回复
+    """
+    try:
+        command = json_codec.loads(message)
+    except ValueError:
+        logger.warning(f"无法解析的WebSocket文本消息: {message[:100]}")
+        return
+
+    command_type = command.get("type") if isinstance(command, dict) else None
+    if command_type == "start_listening":
+        success = await session.start_listening(UPLINK_SOURCE_CLIENT, command.get("mode"))
+    elif command_type == "stop_listening":
+        success = await session.stop_listening()
+    else:
+        logger.info(f"收到WebSocket文本消息: {message}")
+        return
+
+    writer.send_json({
+        "type": "listening",
+        "data": {
+            "action": command_type,
+            "success": success,
+            "state": session.state.value
+        }
+    })
+
+
 # ========== 启动和关闭事件 ==========
 
+async def start_voice_services():
+    """启动语音服务的后台组件（设备已激活时预热上游连接池，多worker模式下的会话目录心跳），可重复调用"""
+    global _heartbeat_task
+
+    initialize_device_managers()
+
+    directory = get_session_directory()
+    if directory and (_heartbeat_task is None or _heartbeat_task.done()):
+        await asyncio.to_thread(directory.heartbeat, WORKER_URL)
+        session_registry.on_session_closed = _release_session_ownership
+        _heartbeat_task = asyncio.create_task(_directory_heartbeat_loop())
+        logger.info(f"🗂️ 多worker模式: 本worker={WORKER_URL}, 路由方式={WORKER_ROUTING_MODE}")
+        if not WORKER_SECRET:
+            logger.warning("⚠️ 未设置 VOICE_WORKER_SECRET：转发请求的标记头不被信任，所有请求都按会话目录路由")
+
+    try:
+        if start_upstream_pool(_device_manager):
+            logger.info("🔌 上游连接池预热已开始")
+    except Exception as e:
+        logger.warning(f"⚠️ 启动上游连接池失败（会话初始化时将直接建连）: {e}")
+
+
+async def stop_voice_services():
+    """关闭所有语音会话和上游连接池，可重复调用"""
+    try:
+        # 关闭所有语音会话
+        await close_all_voice_sessions()
+        await close_upstream_pool()
+        # 会话的媒体通道已在关闭会话时排空，这里只等待线程退出
+        await media_pool.aclose()
+        logger.info("语音会话已在应用关闭时释放")
+    except Exception as e:
+        logger.error(f"关闭语音会话时发生错误: {e}")
+
+    await _stop_worker_routing()
+
+
+async def _stop_worker_routing():
+    """停止目录心跳、注销本worker并关闭转发客户端"""
+    global _heartbeat_task, _proxy_session
+
+    if _heartbeat_task:
+        _heartbeat_task.cancel()
+        try:
+            await _heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        _heartbeat_task = None
+
+    if _release_tasks:
+        await asyncio.gather(*_release_tasks.values(), return_exceptions=True)
+
+    directory = get_session_directory()
+    if directory:
+        try:
+            await asyncio.to_thread(directory.remove_worker, WORKER_URL)
+        except Exception as e:
+            logger.warning(f"⚠️ 从会话目录注销worker失败: {e}")
+
+    if _proxy_session and not _proxy_session.closed:
+        await _proxy_session.close()
+    _proxy_session = None
+
+
 @router.on_event("startup")
 async def startup_event():
     """应用启动事件处理"""
     logger.info("语音交互路由模块启动")
-    initialize_device_managers()
+    await start_voice_services()
 
 
 @router.on_event("shutdown")
 async def shutdown_event():
     """应用关闭事件处理"""
     logger.info("语音交互路由模块关闭")
-
-    try:
-        # 关闭语音会话
-        await close_voice_session()
-        logger.info("语音会话已在应用关闭时释放")
-    except Exception as e:
-        logger.error(f"关闭语音会话时发生错误: {e}")
+    await stop_voice_services()
@@ -4,6 +4,7 @@
 提供AI驱动的单词查询功能
 """
 
+import logging
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
 
@@ -11,6 +12,9 @@ from models.word_entry import WordEntryResponse, WordDefinition, word_cache
 from services.word_lookup.deepseek_word_agent import DeepSeekWordAgent
 from services.word_lookup.youdao_audio_agent import YoudaoAudioAgent
 from utils.api_config_loader import api_config_loader
+from utils.json_response import FastJSONResponse
+
+logger = logging.getLogger(__name__)
 
 
 # 创建路由器
@@ -44,7 +48,7 @@ def get_youdao_audio_agent() -> YoudaoAudioAgent:
     )
 
 
-@router.get("/lookup", response_model=WordEntryResponse)
+@router.get("/lookup", response_model=WordEntryResponse, response_class=FastJSONResponse)
 async def lookup_word(word: str):
     """
     查询单词释义（V1.5.1版本）
@@ -71,13 +75,13 @@ async def lookup_word(word: str):
 
     word = word.strip().lower()
 
-    print(f"\n📖 收到单词查询请求（V1.5.1）: {word}")
+    logger.info(f"📖 收到单词查询请求（V1.5.1）: {word}")
 
     try:
         # 1. 检查缓存
         if word_cache.exists(word):
             cached_result = word_cache.get(word)
-            print(f"✅ 从缓存返回: {word}")
+            logger.info(f"✅ 从缓存返回: {word}")
             return cached_result
 
         # 2. 调用DeepSeek Agent
@@ -110,13 +114,13 @@ async def lookup_word(word: str):
         # 5. 缓存结果
         word_cache.set(word, result)
 
-        print(f"✅ 查询完成: {word}, {len(result.definitions)}条释义")
+        logger.info(f"✅ 查询完成: {word}, {len(result.definitions)}条释义")
         return result
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 查询单词异常: {e}")
+        logger.error(f"❌ 查询单词异常: {e}")
         raise HTTPException(status_code=500, detail=f"查询失败: {str(e)}")
 
 
@@ -4,6 +4,7 @@
 提供单词释义查询和生词本管理接口
 """
 
+import logging
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict
 
@@ -19,6 +20,7 @@ from models.word_models import (
 from services.word_lookup.youdao_client import YoudaoClient
 from services.word_lookup.vocab_storage import vocab_storage_service
 from utils.api_config_loader import api_config_loader
+from utils.json_response import FastJSONResponse
 from deps.dependencies import get_current_user
 from models.user_model import User
 
@@ -27,6 +29,8 @@ from services.word_lookup.deepseek_word_agent import DeepSeekWordAgent
 from services.word_lookup.youdao_audio_agent import YoudaoAudioAgent
 from models.word_entry import word_cache
 
+logger = logging.getLogger(__name__)
+
 
 # 创建路由器
 router = APIRouter(prefix="/api/words", tags=["words"])
@@ -48,7 +52,7 @@ def get_youdao_client() -> YoudaoClient:
     )
 
 
-@router.get("/lookup", response_model=WordLookupResultV2)
+@router.get("/lookup", response_model=WordLookupResultV2, response_class=FastJSONResponse)
 async def lookup_word(word: str):
     """
     查询单词释义（V1.5.1：使用DeepSeek AI，符合PRD要求）
@@ -68,13 +72,13 @@ async def lookup_word(word: str):
 
     word = word.strip().lower()
 
-    print(f"\n📖 收到单词查询请求（V1.5.1）: {word}")
+    logger.info(f"📖 收到单词查询请求（V1.5.1）: {word}")
 
     try:
         # V1.5.1: 检查缓存
         if word_cache.exists(word):
             cached_result = word_cache.get(word)
-            print(f"✅ 从缓存返回: {word}")
+            logger.info(f"✅ 从缓存返回: {word}")
             # 返回V1.5.1格式
             return WordLookupResultV2(
                 word=cached_result.word,
@@ -149,9 +153,7 @@ async def lookup_word(word: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 查询单词异常: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ 查询单词异常: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"查询失败: {str(e)}")
 
 
@@ -176,7 +178,7 @@ async def favorite_word(
         HTTPException: 401 - 未认证
         HTTPException: 400 - 收藏失败
     """
-    print(f"\n⭐ 收到收藏单词请求: {request.word} (用户: {current_user.email})")
+    logger.info(f"⭐ 收到收藏单词请求: {request.word} (用户: {current_user.email})")
 
     try:
         result = vocab_storage_service.add_word(
@@ -197,7 +199,7 @@ async def favorite_word(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 收藏单词异常: {e}")
+        logger.error(f"❌ 收藏单词异常: {e}")
         raise HTTPException(status_code=500, detail=f"收藏失败: {str(e)}")
 
 
@@ -217,7 +219,7 @@ async def get_favorites(current_user: User = Depends(get_current_user)):
     Raises:
         HTTPException: 401 - 未认证
     """
-    print(f"\n📚 获取生词本: 用户 {current_user.email}")
+    logger.info(f"📚 获取生词本: 用户 {current_user.email}")
 
     try:
         words = vocab_storage_service.get_words(current_user.user_id)
@@ -229,7 +231,7 @@ async def get_favorites(current_user: User = Depends(get_current_user)):
         )
 
     except Exception as e:
-        print(f"❌ 获取生词本异常: {e}")
+        logger.error(f"❌ 获取生词本异常: {e}")
         raise HTTPException(status_code=500, detail=f"获取失败: {str(e)}")
 
 
@@ -254,7 +256,7 @@ async def delete_favorite(
         HTTPException: 401 - 未认证
         HTTPException: 400 - 删除失败
     """
-    print(f"\n🗑️ 删除生词: {word} (用户: {current_user.email})")
+    logger.info(f"🗑️ 删除生词: {word} (用户: {current_user.email})")
 
     try:
         result = vocab_storage_service.delete_word(current_user.user_id, word)
@@ -267,7 +269,7 @@ async def delete_favorite(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ 删除生词异常: {e}")
+        logger.error(f"❌ 删除生词异常: {e}")
         raise HTTPException(status_code=500, detail=f"删除失败: {str(e)}")
 
 
@@ -287,7 +289,7 @@ async def clear_favorites(current_user: User = Depends(get_current_user)):
     Raises:
         HTTPException: 401 - 未认证
     """
-    print(f"\n🗑️ 清空生词本: 用户 {current_user.email}")
+    logger.info(f"🗑️ 清空生词本: 用户 {current_user.email}")
 
     try:
         result = vocab_storage_service.clear_words(current_user.user_id)
@@ -295,5 +297,5 @@ async def clear_favorites(current_user: User = Depends(get_current_user)):
         return result
 
     except Exception as e:
-        print(f"❌ 清空生词本异常: {e}")
+        logger.error(f"❌ 清空生词本异常: {e}")
         raise HTTPException(status_code=500, detail=f"清空失败: {str(e)}")
@@ -4,6 +4,7 @@
 处理用户登录、注册、验证码等业务逻辑
 """
 
+import logging
 import json
 import secrets
 from datetime import datetime, timedelta
@@ -15,6 +16,8 @@ from models.user_model import User, UserCreate, LoginType
 from core.security import create_access_token
 from utils.email_sender import send_verification_code
 
+logger = logging.getLogger(__name__)
+
 
 class AuthService:
     """认证服务类"""
@@ -36,18 +39,18 @@ class AuthService:
         """确保数据文件存在"""
         if not self.users_file.exists():
             self.users_file.write_text(json.dumps({}, indent=2, ensure_ascii=False))
-            print(f"✅ 创建用户数据文件: {self.users_file}")
+            logger.info(f"✅ 创建用户数据文件: {self.users_file}")
 
         if not self.codes_file.exists():
             self.codes_file.write_text(json.dumps({}, indent=2, ensure_ascii=False))
-            print(f"✅ 创建验证码数据文件: {self.codes_file}")
+            logger.info(f"✅ 创建验证码数据文件: {self.codes_file}")
 
     def _load_users(self) -> Dict:
         """加载用户数据"""
         try:
             return json.loads(self.users_file.read_text(encoding='utf-8'))
         except Exception as e:
-            print(f"❌ 加载用户数据失败: {e}")
+            logger.error(f"❌ 加载用户数据失败: {e}")
             return {}
 
     def _save_users(self, users: Dict) -> bool:
@@ -59,7 +62,7 @@ class AuthService:
             )
             return True
         except Exception as e:
-            print(f"❌ 保存用户数据失败: {e}")
+            logger.error(f"❌ 保存用户数据失败: {e}")
             return False
 
     def _load_codes(self) -> Dict:
@@ -67,7 +70,7 @@ class AuthService:
         try:
             return json.loads(self.codes_file.read_text(encoding='utf-8'))
         except Exception as e:
-            print(f"❌ 加载验证码数据失败: {e}")
+            logger.error(f"❌ 加载验证码数据失败: {e}")
             return {}
 
     def _save_codes(self, codes: Dict) -> bool:
@@ -79,7 +82,7 @@ class AuthService:
             )
             return True
         except Exception as e:
-            print(f"❌ 保存验证码数据失败: {e}")
+            logger.error(f"❌ 保存验证码数据失败: {e}")
             return False
 
     def generate_verification_code(self) -> str:
@@ -126,7 +129,7 @@ class AuthService:
         send_success = send_verification_code(email, code)
 
         if send_success:
-            print(f"✅ 验证码已发送到: {email}")
+            logger.info(f"✅ 验证码已发送到: {email}")
             return {
                 "success": True,
                 "message": "验证码已发送",
@@ -151,7 +154,7 @@ class AuthService:
         """
         # 万能测试验证码（开发环境）
         if code == "666666":
-            print(f"🔓 使用万能测试验证码: {email}")
+            logger.info(f"🔓 使用万能测试验证码: {email}")
             return {
                 "success": True,
                 "message": "验证码正确（测试模式）"
@@ -229,7 +232,7 @@ class AuthService:
 
         # 3. 如果用户不存在，创建新用户
         if not user_data:
-            print(f"📝 新用户注册: {email}")
+            logger.info(f"📝 新用户注册: {email}")
             user_id = str(uuid4())
             user_data = {
                 "user_id": user_id,
@@ -247,7 +250,7 @@ class AuthService:
             users[user_id] = user_data
         else:
             # 4. 如果用户存在，更新最后登录时间
-            print(f"✅ 老用户登录: {email}")
+            logger.info(f"✅ 老用户登录: {email}")
             user_data["last_login_at"] = datetime.now().isoformat()
             user_data["updated_at"] = datetime.now().isoformat()
             users[user_id] = user_data
@@ -294,7 +297,7 @@ class AuthService:
         try:
             return User(**user_data)
         except Exception as e:
-            print(f"❌ 解析用户数据失败: {e}")
+            logger.error(f"❌ 解析用户数据失败: {e}")
             return None
 
     def get_user_by_email(self, email: str) -> Optional[User]:
@@ -314,7 +317,7 @@ class AuthService:
                 try:
                     return User(**user_data)
                 except Exception as e:
-                    print(f"❌ 解析用户数据失败: {e}")
+                    logger.error(f"❌ 解析用户数据失败: {e}")
                     return None
 
         return None
@@ -351,7 +354,7 @@ class AuthService:
         try:
             return User(**user_data)
         except Exception as e:
-            print(f"❌ 解析用户数据失败: {e}")
+            logger.error(f"❌ 解析用户数据失败: {e}")
             return None
 
 
@@ -4,6 +4,7 @@ PocketSpeak 设备绑定生命周期管理器 - 完全重构版本
 解决每次重新生成设备信息的问题，确保验证码与服务器信息匹配
 """
 
+import logging
 import json
 import hashlib
 import hmac
@@ -17,6 +18,8 @@ from typing import Dict, Any, Optional, Tuple
 import psutil
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class DeviceInfo:
     """设备信息数据结构"""
@@ -55,18 +58,18 @@ class PocketSpeakDeviceManager:
         # ✅ 修复：如果设备不存在或未激活，删除旧信息并重新生成
         if device_info is None or not device_info.activated:
             if device_info is not None and not device_info.activated:
-                print("⚠️ 发现未激活的旧设备信息，将删除并重新生成全新设备...")
+                logger.warning("⚠️ 发现未激活的旧设备信息，将删除并重新生成全新设备...")
             else:
-                print("🆕 设备信息不存在，生成全新设备...")
+                logger.info("🆕 设备信息不存在，生成全新设备...")
 
             # 生成新的设备信息
             device_data = self.lifecycle_manager.generate_new_device_info()
             self.lifecycle_manager.save_device_info_to_local(device_data)
-            print(f"✅ 已生成全新设备信息: {device_data['device_id']}")
+            logger.info(f"✅ 已生成全新设备信息: {device_data['device_id']}")
             return device_data["serial_number"], device_data["hmac_key"], device_data["device_id"]
 
         # ✅ 只有已激活的设备才复用信息
-        print(f"✅ 设备已激活，复用现有设备信息: {device_info.device_id}")
+        logger.info(f"✅ 设备已激活，复用现有设备信息: {device_info.device_id}")
         return device_info.serial_number, device_info.hmac_key, device_info.device_id
 
     def get_device_id(self) -> str:
@@ -134,17 +137,17 @@ class PocketSpeakDeviceLifecycle:
         如果存在本地已激活设备文件（例如 device_info.json），读取并返回设备信息
         """
         if not self.device_info_file.exists():
-            print(f"🔍 设备信息文件不存在: {self.device_info_file}")
+            logger.info(f"🔍 设备信息文件不存在: {self.device_info_file}")
             return None
 
         try:
             with open(self.device_info_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 device_info = DeviceInfo(data)
-                print(f"✅ 成功从本地加载设备信息 - 激活状态: {'已激活' if device_info.activated else '未激活'}")
+                logger.info(f"✅ 成功从本地加载设备信息 - 激活状态: {'已激活' if device_info.activated else '未激活'}")
                 return device_info
         except Exception as e:
-            print(f"❌ 加载设备信息失败: {e}")
+            logger.error(f"❌ 加载设备信息失败: {e}")
             return None
 
     def save_device_info_to_local(self, device_info: Dict[str, Any]):
@@ -154,10 +157,10 @@ class PocketSpeakDeviceLifecycle:
         try:
             with open(self.device_info_file, 'w', encoding='utf-8') as f:
                 json.dump(device_info, f, indent=2, ensure_ascii=False)
-            print(f"✅ 设备信息已保存: {self.device_info_file}")
+            logger.info(f"✅ 设备信息已保存: {self.device_info_file}")
             return True
         except Exception as e:
-            print(f"❌ 保存设备信息失败: {e}")
+            logger.error(f"❌ 保存设备信息失败: {e}")
             return False
 
     def is_device_activated(self) -> bool:
@@ -221,10 +224,10 @@ class PocketSpeakDeviceLifecycle:
             "version": "1.0"
         }
 
-        print(f"🆕 生成新的虚拟设备信息:")
-        print(f"📱 设备ID: {device_info['device_id']}")
-        print(f"🏷️ 序列号: {device_info['serial_number']}")
-        print(f"🆔 客户端ID: {device_info['client_id']}")
+        logger.info(f"🆕 生成新的虚拟设备信息:")
+        logger.info(f"📱 设备ID: {device_info['device_id']}")
+        logger.info(f"🏷️ 序列号: {device_info['serial_number']}")
+        logger.info(f"🆔 客户端ID: {device_info['client_id']}")
 
         return device_info
 
@@ -235,7 +238,7 @@ class PocketSpeakDeviceLifecycle:
         """
         activation_method = device_info.get("activation_method", "zoe")
 
-        print(f"🌐 开始请求激活验证码 - 方式: {activation_method}")
+        logger.info(f"🌐 开始请求激活验证码 - 方式: {activation_method}")
 
         # 使用真正的激活注册流程，而不是OTA配置流程
         return await self._request_pocketspeak_activation_code(device_info)
@@ -270,9 +273,9 @@ class PocketSpeakDeviceLifecycle:
             }
         }
 
-        print(f"🌐 发送Zoe OTA配置请求: {self.zoe_ota_url}")
-        print(f"📱 设备ID: {device_id}")
-        print(f"🆔 客户端ID: {client_id}")
+        logger.info(f"🌐 发送Zoe OTA配置请求: {self.zoe_ota_url}")
+        logger.info(f"📱 设备ID: {device_id}")
+        logger.info(f"🆔 客户端ID: {client_id}")
 
         try:
             timeout = aiohttp.ClientTimeout(total=30)
@@ -285,8 +288,8 @@ class PocketSpeakDeviceLifecycle:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 响应状态: HTTP {status_code}")
-                    print(f"📄 响应内容: {response_text}")
+                    logger.info(f"📡 响应状态: HTTP {status_code}")
+                    logger.info(f"📄 响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -307,15 +310,15 @@ class PocketSpeakDeviceLifecycle:
                             return str(verification_code)
 
                         except Exception as e:
-                            print(f"❌ JSON解析失败: {e}")
+                            logger.error(f"❌ JSON解析失败: {e}")
                             # 生成6位纯数字备用验证码
                             return self._generate_numeric_code(device_id)
                     else:
-                        print(f"⚠️ HTTP请求失败 {status_code}, 生成备用验证码")
+                        logger.warning(f"⚠️ HTTP请求失败 {status_code}, 生成备用验证码")
                         return self._generate_numeric_code(device_id)
 
         except Exception as e:
-            print(f"❌ 网络请求失败: {e}")
+            logger.error(f"❌ 网络请求失败: {e}")
             # 生成6位纯数字备用验证码
             return self._generate_numeric_code(device_id)
 
@@ -343,9 +346,9 @@ class PocketSpeakDeviceLifecycle:
             }
         }
 
-        print(f"🌐 发送PocketSpeak激活请求: {self.pocketspeak_activate_url}")
-        print(f"📱 设备ID: {device_id}")
-        print(f"🏷️ 序列号: {serial_number}")
+        logger.info(f"🌐 发送PocketSpeak激活请求: {self.pocketspeak_activate_url}")
+        logger.info(f"📱 设备ID: {device_id}")
+        logger.info(f"🏷️ 序列号: {serial_number}")
 
         try:
             timeout = aiohttp.ClientTimeout(total=30)
@@ -358,8 +361,8 @@ class PocketSpeakDeviceLifecycle:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 响应状态: HTTP {status_code}")
-                    print(f"📄 响应内容: {response_text}")
+                    logger.info(f"📡 响应状态: HTTP {status_code}")
+                    logger.info(f"📄 响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -370,19 +373,19 @@ class PocketSpeakDeviceLifecycle:
                             message = response_data.get("message", "请在xiaozhi.me输入验证码")
 
                             if challenge and code:
-                                print(f"✅ 激活注册成功！挑战: {challenge}, 验证码: {code}")
+                                logger.info(f"✅ 激活注册成功！挑战: {challenge}, 验证码: {code}")
                                 return str(code)
                             else:
-                                print(f"⚠️ 激活响应格式异常: {response_data}")
+                                logger.warning(f"⚠️ 激活响应格式异常: {response_data}")
                         except Exception as e:
-                            print(f"❌ JSON解析失败: {e}")
+                            logger.error(f"❌ JSON解析失败: {e}")
 
                     # 生成备用验证码
                     code_hash = hashlib.md5(device_id.encode()).hexdigest()[:6]
                     return code_hash.upper()
 
         except Exception as e:
-            print(f"❌ PocketSpeak激活请求失败: {e}")
+            logger.error(f"❌ PocketSpeak激活请求失败: {e}")
             code_hash = hashlib.md5(device_id.encode()).hexdigest()[:6]
             return code_hash.upper()
 
@@ -392,15 +395,13 @@ class PocketSpeakDeviceLifecycle:
         1. 若已激活，返回设备信息与激活标记 ✅
         2. 若未激活，使用PocketSpeakActivator处理设备创建和验证码获取
         """
-        print("\n" + "="*60)
-        print("🔧 PocketSpeak 设备激活生命周期管理 - 使用py-xiaozhi实现")
-        print("="*60)
+        logger.info("🔧 PocketSpeak 设备激活生命周期管理 - 使用py-xiaozhi实现")
 
         try:
             # 使用pocketspeak_activator的py-xiaozhi完整实现
             from services.pocketspeak_activator import pocketspeak_activator
 
-            print("🌐 使用PocketSpeakActivator的py-xiaozhi激活逻辑...")
+            logger.info("🌐 使用PocketSpeakActivator的py-xiaozhi激活逻辑...")
             activation_result = await pocketspeak_activator.request_activation_code()
 
             if activation_result.get("success"):
@@ -411,7 +412,7 @@ class PocketSpeakDeviceLifecycle:
                 is_already_activated = activation_result.get("is_already_activated", False)
 
                 if is_already_activated:
-                    print("✅ 设备已激活，无需重新获取验证码")
+                    logger.info("✅ 设备已激活，无需重新获取验证码")
                     return {
                         "success": True,
                         "activated": True,
@@ -420,11 +421,10 @@ class PocketSpeakDeviceLifecycle:
                         "verification_code": None
                     }
                 else:
-                    print(f"✅ 验证码获取成功: {verification_code}")
-                    print(f"🎯 挑战字符串: {challenge}")
-                    print(f"📱 设备ID: {device_id}")
-                    print(f"🏷️ 序列号: {serial_number}")
-                    print("="*60)
+                    logger.info(f"✅ 验证码获取成功: {verification_code}")
+                    logger.info(f"🎯 挑战字符串: {challenge}")
+                    logger.info(f"📱 设备ID: {device_id}")
+                    logger.info(f"🏷️ 序列号: {serial_number}")
 
                     # ✅ 关键修复：保存challenge到device_info.json，用于后续HMAC确认
                     device_info = self.load_device_info_from_local()
@@ -432,7 +432,7 @@ class PocketSpeakDeviceLifecycle:
                         device_data = device_info.__dict__
                         device_data["challenge"] = challenge
                         self.save_device_info_to_local(device_data)
-                        print(f"💾 已保存challenge到设备信息: {challenge}")
+                        logger.info(f"💾 已保存challenge到设备信息: {challenge}")
 
                     return {
                         "success": True,
@@ -445,21 +445,21 @@ class PocketSpeakDeviceLifecycle:
                         "server_response": activation_result.get("server_response", {})
                     }
             else:
-                print(f"❌ PocketSpeakActivator激活失败，尝试使用OTA备用方案: {activation_result.get('message')}")
+                logger.error(f"❌ PocketSpeakActivator激活失败，尝试使用OTA备用方案: {activation_result.get('message')}")
 
                 # 备用方案：当激活端点失败时，尝试通过OTA端点获取验证码
-                print("🔄 使用OTA端点获取验证码作为备用方案...")
+                logger.info("🔄 使用OTA端点获取验证码作为备用方案...")
                 fallback_result = await self._fallback_ota_activation()
 
                 if fallback_result.get("success"):
-                    print(f"✅ OTA备用方案成功获取验证码: {fallback_result.get('verification_code')}")
+                    logger.info(f"✅ OTA备用方案成功获取验证码: {fallback_result.get('verification_code')}")
                     return fallback_result
                 else:
-                    print("❌ OTA备用方案也失败了")
+                    logger.error("❌ OTA备用方案也失败了")
                     return activation_result
 
         except Exception as e:
-            print(f"❌ 激活流程失败: {e}")
+            logger.error(f"❌ 激活流程失败: {e}")
             return {
                 "success": False,
                 "activated": False,
@@ -508,9 +508,9 @@ class PocketSpeakDeviceLifecycle:
                 }
             }
 
-            print(f"🔄 OTA备用激活: {self.zoe_ota_url}")
-            print(f"📱 设备ID: {device_id}")
-            print(f"🏷️ 序列号: {serial_number}")
+            logger.info(f"🔄 OTA备用激活: {self.zoe_ota_url}")
+            logger.info(f"📱 设备ID: {device_id}")
+            logger.info(f"🏷️ 序列号: {serial_number}")
 
             timeout = aiohttp.ClientTimeout(total=30)
             async with aiohttp.ClientSession(timeout=timeout) as session:
@@ -522,8 +522,8 @@ class PocketSpeakDeviceLifecycle:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 OTA备用响应状态: HTTP {status_code}")
-                    print(f"📄 OTA备用响应内容: {response_text}")
+                    logger.info(f"📡 OTA备用响应状态: HTTP {status_code}")
+                    logger.info(f"📄 OTA备用响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -542,7 +542,7 @@ class PocketSpeakDeviceLifecycle:
                                         device_data = device_info.__dict__
                                         device_data["challenge"] = challenge
                                         self.save_device_info_to_local(device_data)
-                                        print(f"💾 已从OTA响应保存challenge到设备信息: {challenge}")
+                                        logger.info(f"💾 已从OTA响应保存challenge到设备信息: {challenge}")
 
                                     return {
                                         "success": True,
@@ -564,7 +564,7 @@ class PocketSpeakDeviceLifecycle:
                             }
 
                         except Exception as e:
-                            print(f"❌ OTA响应解析失败: {e}")
+                            logger.error(f"❌ OTA响应解析失败: {e}")
                             return {
                                 "success": False,
                                 "message": f"OTA响应解析失败: {e}",
@@ -580,7 +580,7 @@ class PocketSpeakDeviceLifecycle:
                         }
 
         except Exception as e:
-            print(f"❌ OTA备用激活失败: {e}")
+            logger.error(f"❌ OTA备用激活失败: {e}")
             return {
                 "success": False,
                 "message": f"OTA备用激活失败: {str(e)}",
@@ -594,7 +594,7 @@ class PocketSpeakDeviceLifecycle:
         """
         device_info = self.load_device_info_from_local()
         if device_info is None:
-            print("❌ 无法标记激活：设备信息不存在")
+            logger.error("❌ 无法标记激活：设备信息不存在")
             return False
 
         # 更新激活状态
@@ -604,18 +604,18 @@ class PocketSpeakDeviceLifecycle:
 
         # ✅ 保存连接参数
         if connection_params:
-            print("💾 保存连接参数...")
+            logger.info("💾 保存连接参数...")
             device_data["connection_params"] = connection_params
             if "mqtt" in connection_params:
-                print(f"  MQTT服务器: {connection_params['mqtt'].get('server', 'N/A')}")
+                logger.info(f"  MQTT服务器: {connection_params['mqtt'].get('server', 'N/A')}")
             if "websocket" in connection_params:
-                print(f"  WebSocket URL: {connection_params['websocket'].get('url', 'N/A')}")
+                logger.info(f"  WebSocket URL: {connection_params['websocket'].get('url', 'N/A')}")
 
         success = self.save_device_info_to_local(device_data)
         if success:
-            print(f"✅ 设备已标记为激活状态: {device_info.device_id}")
+            logger.info(f"✅ 设备已标记为激活状态: {device_info.device_id}")
         else:
-            print("❌ 标记激活状态失败")
+            logger.error("❌ 标记激活状态失败")
 
         return success
 
@@ -625,7 +625,7 @@ class PocketSpeakDeviceLifecycle:
         """
         device_info = self.load_device_info_from_local()
         if device_info is None:
-            print("❌ 无法重置：设备信息不存在")
+            logger.error("❌ 无法重置：设备信息不存在")
             return False
 
         # 重置激活状态
@@ -635,9 +635,9 @@ class PocketSpeakDeviceLifecycle:
 
         success = self.save_device_info_to_local(device_data)
         if success:
-            print(f"✅ 激活状态已重置为未激活: {device_info.device_id}")
+            logger.info(f"✅ 激活状态已重置为未激活: {device_info.device_id}")
         else:
-            print("❌ 重置激活状态失败")
+            logger.error("❌ 重置激活状态失败")
 
         return success
 
@@ -694,19 +694,19 @@ class PocketSpeakDeviceLifecycle:
                 }
 
             # ✅ 关键修复：尝试通过HMAC确认激活状态并获取连接参数
-            print("🔍 尝试通过HMAC确认激活状态...")
+            logger.info("🔍 尝试通过HMAC确认激活状态...")
             from services.pocketspeak_activator import pocketspeak_activator
 
             # 从激活响应中获取challenge（如果有保存）
             challenge = device_info.__dict__.get("challenge") if hasattr(device_info, "__dict__") else None
 
             if challenge:
-                print(f"🎯 使用保存的challenge进行HMAC确认: {challenge}")
+                logger.info(f"🎯 使用保存的challenge进行HMAC确认: {challenge}")
                 confirm_result = await pocketspeak_activator.confirm_activation(challenge)
 
                 if confirm_result.get("success") and confirm_result.get("is_activated"):
                     # HMAC确认成功，设备已激活
-                    print("✅ HMAC确认成功！设备已激活")
+                    logger.info("✅ HMAC确认成功！设备已激活")
                     connection_params = confirm_result.get("connection_params", {})
 
                     # 保存激活状态和连接参数
@@ -725,9 +725,9 @@ class PocketSpeakDeviceLifecycle:
                         "server_response": confirm_result
                     }
                 else:
-                    print(f"⏳ HMAC确认尚未成功: {confirm_result.get('message')}")
+                    logger.info(f"⏳ HMAC确认尚未成功: {confirm_result.get('message')}")
             else:
-                print("⚠️ 未找到challenge，无法进行HMAC确认")
+                logger.warning("⚠️ 未找到challenge，无法进行HMAC确认")
 
             # 2. 如果本地未激活，向小智AI服务器查询激活状态
             device_id = device_info.device_id
@@ -760,9 +760,9 @@ class PocketSpeakDeviceLifecycle:
                 }
             }
 
-            print(f"🔍 轮询小智AI服务器激活状态...")
-            print(f"📱 设备ID: {device_id}")
-            print(f"🏷️ 序列号: {serial_number}")
+            logger.info(f"🔍 轮询小智AI服务器激活状态...")
+            logger.info(f"📱 设备ID: {device_id}")
+            logger.info(f"🏷️ 序列号: {serial_number}")
 
             # 4. 发送轮询请求到正确的激活状态查询端点
             import aiohttp
@@ -770,7 +770,7 @@ class PocketSpeakDeviceLifecycle:
             # 使用正确的激活状态查询URL - 不使用OTA端点进行状态查询
             activation_status_url = "https://api.tenclass.net/xiaozhi/activation/status"
 
-            print(f"🔍 使用激活状态查询URL: {activation_status_url}")
+            logger.info(f"🔍 使用激活状态查询URL: {activation_status_url}")
 
             timeout = aiohttp.ClientTimeout(total=15)
             async with aiohttp.ClientSession(timeout=timeout) as session:
@@ -782,8 +782,8 @@ class PocketSpeakDeviceLifecycle:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 轮询响应状态: HTTP {status_code}")
-                    print(f"📄 轮询响应内容: {response_text}")
+                    logger.info(f"📡 轮询响应状态: HTTP {status_code}")
+                    logger.info(f"📄 轮询响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -795,7 +795,7 @@ class PocketSpeakDeviceLifecycle:
 
                             if server_activated:
                                 # 服务器确认设备已激活，同步到本地
-                                print("✅ 服务器确认设备已激活，更新本地状态...")
+                                logger.info("✅ 服务器确认设备已激活，更新本地状态...")
                                 device_data = device_info.__dict__
                                 device_data["activated"] = True
                                 device_data["activated_at"] = datetime.now().isoformat()
@@ -821,7 +821,7 @@ class PocketSpeakDeviceLifecycle:
                                 }
 
                         except Exception as e:
-                            print(f"❌ 解析服务器响应失败: {e}")
+                            logger.error(f"❌ 解析服务器响应失败: {e}")
                             return {
                                 "is_activated": False,
                                 "device_id": device_id,
@@ -830,10 +830,10 @@ class PocketSpeakDeviceLifecycle:
                                 "error": str(e)
                             }
                     else:
-                        print(f"⚠️ 服务器轮询失败: HTTP {status_code}")
+                        logger.warning(f"⚠️ 服务器轮询失败: HTTP {status_code}")
                         # 如果专用状态查询端点失败，尝试使用OTA端点作为备用
                         if status_code == 404:
-                            print(f"⚠️ 激活状态端点不存在，尝试使用OTA端点作为备用...")
+                            logger.warning(f"⚠️ 激活状态端点不存在，尝试使用OTA端点作为备用...")
                             return await self._fallback_ota_polling(device_id, serial_number, client_id)
 
                         return {
@@ -845,13 +845,13 @@ class PocketSpeakDeviceLifecycle:
                         }
 
         except Exception as e:
-            print(f"❌ 轮询激活状态发生错误: {e}")
+            logger.error(f"❌ 轮询激活状态发生错误: {e}")
             # 如果主轮询失败，尝试使用OTA备用轮询
             try:
-                print(f"🔄 尝试使用OTA备用轮询...")
+                logger.info(f"🔄 尝试使用OTA备用轮询...")
                 return await self._fallback_ota_polling(device_id, serial_number, client_id)
             except Exception as fallback_e:
-                print(f"❌ OTA备用轮询也失败: {fallback_e}")
+                logger.error(f"❌ OTA备用轮询也失败: {fallback_e}")
                 device_info = self.load_device_info_from_local()
                 return {
                     "is_activated": False,
@@ -886,8 +886,8 @@ class PocketSpeakDeviceLifecycle:
             }
         }
 
-        print(f"🔄 OTA备用轮询: {ota_url}")
-        print(f"📱 设备ID: {device_id}")
+        logger.info(f"🔄 OTA备用轮询: {ota_url}")
+        logger.info(f"📱 设备ID: {device_id}")
 
         timeout = aiohttp.ClientTimeout(total=15)
         async with aiohttp.ClientSession(timeout=timeout) as session:
@@ -899,8 +899,8 @@ class PocketSpeakDeviceLifecycle:
                 response_text = await response.text()
                 status_code = response.status
 
-                print(f"📡 OTA备用响应状态: HTTP {status_code}")
-                print(f"📄 OTA备用响应内容: {response_text}")
+                logger.info(f"📡 OTA备用响应状态: HTTP {status_code}")
+                logger.info(f"📄 OTA备用响应内容: {response_text}")
 
                 if status_code == 200:
                     try:
@@ -920,7 +920,7 @@ class PocketSpeakDeviceLifecycle:
                                     if device_data.get("challenge") != challenge:
                                         device_data["challenge"] = challenge
                                         self.save_device_info_to_local(device_data)
-                                        print(f"💾 OTA轮询中保存challenge: {challenge}")
+                                        logger.info(f"💾 OTA轮询中保存challenge: {challenge}")
 
                             return {
                                 "is_activated": False,
@@ -933,7 +933,7 @@ class PocketSpeakDeviceLifecycle:
                         else:
                             # ✅ activation字段消失 = 激活完成！
                             # 提取并保存连接参数
-                            print("🎉 检测到OTA响应中activation字段已消失，设备已激活！")
+                            logger.info("🎉 检测到OTA响应中activation字段已消失，设备已激活！")
 
                             mqtt_params = response_data.get("mqtt", {})
                             websocket_params = response_data.get("websocket", {})
@@ -948,7 +948,7 @@ class PocketSpeakDeviceLifecycle:
                                 }
 
                                 # 标记设备为已激活并保存连接参数
-                                print("💾 保存连接参数并标记设备为已激活...")
+                                logger.info("💾 保存连接参数并标记设备为已激活...")
                                 self.mark_device_activated(
                                     device_id=device_id,
                                     connection_params=connection_params
@@ -966,7 +966,7 @@ class PocketSpeakDeviceLifecycle:
                                     "message": "设备激活成功，连接参数已保存"
                                 }
                             else:
-                                print("⚠️ OTA响应中没有activation字段，但也没有连接参数")
+                                logger.warning("⚠️ OTA响应中没有activation字段，但也没有连接参数")
                                 return {
                                     "is_activated": False,
                                     "device_id": device_id,
@@ -976,7 +976,7 @@ class PocketSpeakDeviceLifecycle:
                                 }
 
                     except Exception as e:
-                        print(f"❌ OTA响应解析失败: {e}")
+                        logger.error(f"❌ OTA响应解析失败: {e}")
                         return {
                             "is_activated": False,
                             "device_id": device_id,
@@ -3,11 +3,14 @@ PocketSpeak 设备激活客户端 - 完全复刻py-xiaozhi激活请求逻辑
 严格按照py-xiaozhi的HTTP请求格式和激活流程实现
 """
 
+import logging
 import aiohttp
 import asyncio
 from typing import Dict, Any, Optional
 from services.device_lifecycle import pocketspeak_device_manager
 
+logger = logging.getLogger(__name__)
+
 
 class PocketSpeakActivator:
     """完全复刻py-xiaozhi的设备激活逻辑"""
@@ -61,12 +64,12 @@ class PocketSpeakActivator:
             }
         }
 
-        print(f"🌐 发送激活请求: {self.activate_url}")
-        print(f"📱 设备ID: {device_id}")
-        print(f"🆔 客户端ID: {client_id}")
-        print(f"🏷️ 序列号: {serial_number}")
-        print(f"📋 请求头: {headers}")
-        print(f"📦 请求体: {request_body}")
+        logger.info(f"🌐 发送激活请求: {self.activate_url}")
+        logger.info(f"📱 设备ID: {device_id}")
+        logger.info(f"🆔 客户端ID: {client_id}")
+        logger.info(f"🏷️ 序列号: {serial_number}")
+        logger.info(f"📋 请求头: {headers}")
+        logger.info(f"📦 请求体: {request_body}")
 
         try:
             # 6. 发送HTTP POST请求
@@ -80,8 +83,8 @@ class PocketSpeakActivator:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 响应状态: HTTP {status_code}")
-                    print(f"📄 响应内容: {response_text}")
+                    logger.info(f"📡 响应状态: HTTP {status_code}")
+                    logger.info(f"📄 响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -172,10 +175,10 @@ class PocketSpeakActivator:
             }
         }
 
-        print(f"🔐 发送激活确认请求")
-        print(f"🏷️ 序列号: {serial_number}")
-        print(f"🎯 挑战: {challenge}")
-        print(f"🔑 HMAC签名: {hmac_signature}")
+        logger.info(f"🔐 发送激活确认请求")
+        logger.info(f"🏷️ 序列号: {serial_number}")
+        logger.info(f"🎯 挑战: {challenge}")
+        logger.info(f"🔑 HMAC签名: {hmac_signature}")
 
         try:
             timeout = aiohttp.ClientTimeout(total=30)
@@ -188,8 +191,8 @@ class PocketSpeakActivator:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 确认响应状态: HTTP {status_code}")
-                    print(f"📄 确认响应内容: {response_text}")
+                    logger.info(f"📡 确认响应状态: HTTP {status_code}")
+                    logger.info(f"📄 确认响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -284,9 +287,9 @@ class PocketSpeakActivator:
                 }
             }
 
-            print(f"🔍 轮询小智AI服务器激活状态...")
-            print(f"📱 设备ID: {device_id}")
-            print(f"🏷️ 序列号: {serial_number}")
+            logger.info(f"🔍 轮询小智AI服务器激活状态...")
+            logger.info(f"📱 设备ID: {device_id}")
+            logger.info(f"🏷️ 序列号: {serial_number}")
 
             # 4. 发送状态查询请求
             timeout = aiohttp.ClientTimeout(total=15)
@@ -299,8 +302,8 @@ class PocketSpeakActivator:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 轮询响应状态: HTTP {status_code}")
-                    print(f"📄 轮询响应内容: {response_text}")
+                    logger.info(f"📡 轮询响应状态: HTTP {status_code}")
+                    logger.info(f"📄 轮询响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -312,7 +315,7 @@ class PocketSpeakActivator:
 
                             if server_activated:
                                 # 服务器确认设备已激活，同步到本地
-                                print("✅ 服务器确认设备已激活，更新本地状态...")
+                                logger.info("✅ 服务器确认设备已激活，更新本地状态...")
                                 pocketspeak_device_manager.mark_device_as_activated()
 
                                 return {
@@ -335,7 +338,7 @@ class PocketSpeakActivator:
                                 }
 
                         except Exception as e:
-                            print(f"❌ 解析服务器响应失败: {e}")
+                            logger.error(f"❌ 解析服务器响应失败: {e}")
                             # JSON解析失败，返回本地状态
                             return {
                                 "is_activated": False,
@@ -345,7 +348,7 @@ class PocketSpeakActivator:
                                 "error": str(e)
                             }
                     else:
-                        print(f"⚠️ 服务器轮询失败: HTTP {status_code}")
+                        logger.warning(f"⚠️ 服务器轮询失败: HTTP {status_code}")
                         # 服务器请求失败，返回本地状态
                         return {
                             "is_activated": False,
@@ -356,7 +359,7 @@ class PocketSpeakActivator:
                         }
 
         except Exception as e:
-            print(f"❌ 轮询激活状态发生错误: {e}")
+            logger.error(f"❌ 轮询激活状态发生错误: {e}")
             # 网络错误等，返回本地状态
             device_info = pocketspeak_device_manager.get_device_info()
             return {
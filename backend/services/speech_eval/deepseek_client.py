@@ -4,10 +4,13 @@ DeepSeek语音评分客户端 - PocketSpeak V1.6
 调用DeepSeek AI API进行语音评分分析
 """
 
+import logging
 import json
 import httpx
 from typing import Dict, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class DeepSeekSpeechEvalClient:
     """DeepSeek语音评分客户端"""
@@ -73,7 +76,7 @@ class DeepSeekSpeechEvalClient:
                 - error: str - 错误信息(如果失败)
         """
         try:
-            print(f"\n🎯 DeepSeek评估语音: {sentence}")
+            logger.info(f"🎯 DeepSeek评估语音: {sentence}")
 
             # 构造提示词
             prompt = self.prompt_template.format(sentence=sentence)
@@ -93,7 +96,7 @@ class DeepSeekSpeechEvalClient:
             return result
 
         except Exception as e:
-            print(f"❌ DeepSeek评估异常: {e}")
+            logger.error(f"❌ DeepSeek评估异常: {e}")
             return {
                 'success': False,
                 'error': f'评估失败: {str(e)}'
@@ -136,8 +139,8 @@ class DeepSeekSpeechEvalClient:
                 )
 
                 if response.status_code != 200:
-                    print(f"❌ DeepSeek API错误: HTTP {response.status_code}")
-                    print(f"   响应: {response.text}")
+                    logger.error(f"❌ DeepSeek API错误: HTTP {response.status_code}")
+                    logger.info(f"   响应: {response.text}")
                     return None
 
                 data = response.json()
@@ -145,14 +148,14 @@ class DeepSeekSpeechEvalClient:
                 # 提取返回内容
                 if 'choices' in data and len(data['choices']) > 0:
                     content = data['choices'][0]['message']['content']
-                    print(f"✅ DeepSeek返回: {len(content)}字符")
+                    logger.info(f"✅ DeepSeek返回: {len(content)}字符")
                     return content
                 else:
-                    print(f"❌ DeepSeek返回格式异常: {data}")
+                    logger.error(f"❌ DeepSeek返回格式异常: {data}")
                     return None
 
         except Exception as e:
-            print(f"❌ DeepSeek API调用异常: {e}")
+            logger.error(f"❌ DeepSeek API调用异常: {e}")
             return None
 
     def _parse_response(self, response_text: str) -> Dict:
@@ -183,13 +186,13 @@ class DeepSeekSpeechEvalClient:
             required_fields = ['overall_score', 'grammar', 'pronunciation', 'expression']
             for field in required_fields:
                 if field not in data:
-                    print(f"⚠️ DeepSeek返回缺少必要字段: {field}")
+                    logger.warning(f"⚠️ DeepSeek返回缺少必要字段: {field}")
                     return {
                         'success': False,
                         'error': f'AI返回数据缺少字段: {field}'
                     }
 
-            print(f"✅ 评分解析成功: 综合得分 {data['overall_score']}")
+            logger.info(f"✅ 评分解析成功: 综合得分 {data['overall_score']}")
 
             return {
                 'success': True,
@@ -197,14 +200,14 @@ class DeepSeekSpeechEvalClient:
             }
 
         except json.JSONDecodeError as e:
-            print(f"❌ JSON解析失败: {e}")
-            print(f"   原始文本: {response_text[:200]}...")
+            logger.error(f"❌ JSON解析失败: {e}")
+            logger.info(f"   原始文本: {response_text[:200]}...")
             return {
                 'success': False,
                 'error': f'AI返回格式错误: {str(e)}'
             }
         except Exception as e:
-            print(f"❌ 解析响应异常: {e}")
+            logger.error(f"❌ 解析响应异常: {e}")
             return {
                 'success': False,
                 'error': f'解析失败: {str(e)}'
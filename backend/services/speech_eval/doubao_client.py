@@ -4,10 +4,13 @@
 调用豆包 AI API进行语音评分分析（性能优化版）
 """
 
+import logging
 import json
 import httpx
 from typing import Dict, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class DoubaoSpeechEvalClient:
     """豆包语音评分客户端"""
@@ -27,7 +30,7 @@ class DoubaoSpeechEvalClient:
         self.model = model
         self.timeout = timeout
 
-        print(f"🔧 豆包客户端初始化: model={model}, base_url={base_url}")
+        logger.info(f"🔧 豆包客户端初始化: model={model}, base_url={base_url}")
 
         # 加载提示词模板
         self.prompt_template = self._load_prompt_template()
@@ -99,7 +102,7 @@ class DoubaoSpeechEvalClient:
                 - error: str - 错误信息(如果失败)
         """
         try:
-            print(f"\n🎯 豆包评估语音: {sentence}")
+            logger.info(f"🎯 豆包评估语音: {sentence}")
 
             # 构造提示词
             prompt = self.prompt_template.format(sentence=sentence)
@@ -119,7 +122,7 @@ class DoubaoSpeechEvalClient:
             return result
 
         except Exception as e:
-            print(f"❌ 豆包评估异常: {e}")
+            logger.error(f"❌ 豆包评估异常: {e}")
             return {
                 'success': False,
                 'error': f'评估失败: {str(e)}'
@@ -164,8 +167,8 @@ class DoubaoSpeechEvalClient:
                 )
 
                 if response.status_code != 200:
-                    print(f"❌ 豆包API错误: HTTP {response.status_code}")
-                    print(f"   响应: {response.text}")
+                    logger.error(f"❌ 豆包API错误: HTTP {response.status_code}")
+                    logger.info(f"   响应: {response.text}")
                     return None
 
                 data = response.json()
@@ -173,14 +176,14 @@ class DoubaoSpeechEvalClient:
                 # 提取返回内容
                 if 'choices' in data and len(data['choices']) > 0:
                     content = data['choices'][0]['message']['content']
-                    print(f"✅ 豆包返回: {len(content)}字符")
+                    logger.info(f"✅ 豆包返回: {len(content)}字符")
                     return content
                 else:
-                    print(f"❌ 豆包返回格式异常: {data}")
+                    logger.error(f"❌ 豆包返回格式异常: {data}")
                     return None
 
         except Exception as e:
-            print(f"❌ 豆包API调用异常: {e}")
+            logger.error(f"❌ 豆包API调用异常: {e}")
             return None
 
     def _parse_response(self, response_text: str) -> Dict:
@@ -211,13 +214,13 @@ class DoubaoSpeechEvalClient:
             required_fields = ['overall_score', 'grammar', 'pronunciation', 'expression']
             for field in required_fields:
                 if field not in data:
-                    print(f"⚠️ 豆包返回缺少必要字段: {field}")
+                    logger.warning(f"⚠️ 豆包返回缺少必要字段: {field}")
                     return {
                         'success': False,
                         'error': f'AI返回数据缺少字段: {field}'
                     }
 
-            print(f"✅ 评分解析成功: 综合得分 {data['overall_score']}")
+            logger.info(f"✅ 评分解析成功: 综合得分 {data['overall_score']}")
 
             return {
                 'success': True,
@@ -225,14 +228,14 @@ class DoubaoSpeechEvalClient:
             }
 
         except json.JSONDecodeError as e:
-            print(f"❌ JSON解析失败: {e}")
-            print(f"   原始文本: {response_text[:200]}...")
+            logger.error(f"❌ JSON解析失败: {e}")
+            logger.info(f"   原始文本: {response_text[:200]}...")
             return {
                 'success': False,
                 'error': f'AI返回格式错误: {str(e)}'
             }
         except Exception as e:
-            print(f"❌ 解析响应异常: {e}")
+            logger.error(f"❌ 解析响应异常: {e}")
             return {
                 'success': False,
                 'error': f'解析失败: {str(e)}'
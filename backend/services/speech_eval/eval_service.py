@@ -4,6 +4,7 @@
 使用豆包AI评分，提供完整的评分服务（性能优化版）
 """
 
+import logging
 from typing import Dict
 from .doubao_client import DoubaoSpeechEvalClient
 from models.speech_eval_models import (
@@ -14,6 +15,8 @@ from models.speech_eval_models import (
     WordPronunciation
 )
 
+logger = logging.getLogger(__name__)
+
 
 class SpeechEvaluationService:
     """语音评分服务"""
@@ -32,7 +35,7 @@ class SpeechEvaluationService:
             timeout=doubao_config.get('timeout', 15)
         )
 
-        print("✅ 语音评分服务初始化完成（豆包AI）")
+        logger.info("✅ 语音评分服务初始化完成（豆包AI）")
 
     async def evaluate(self, transcript: str) -> SpeechFeedbackResponse:
         """
@@ -47,14 +50,14 @@ class SpeechEvaluationService:
         Raises:
             Exception: 评分失败时抛出异常
         """
-        print(f"\n📝 开始评分: {transcript}")
+        logger.info(f"📝 开始评分: {transcript}")
 
         # 调用豆包进行评分
         result = await self.doubao_client.evaluate_speech(transcript)
 
         if not result.get('success'):
             error_msg = result.get('error', '评分失败')
-            print(f"❌ 评分失败: {error_msg}")
+            logger.error(f"❌ 评分失败: {error_msg}")
             raise Exception(error_msg)
 
         # 转换为Pydantic模型
@@ -101,9 +104,9 @@ class SpeechEvaluationService:
                 expression=expression
             )
 
-            print(f"✅ 评分完成: 综合得分 {response.overall_score}")
+            logger.info(f"✅ 评分完成: 综合得分 {response.overall_score}")
             return response
 
         except Exception as e:
-            print(f"❌ 数据转换失败: {e}")
+            logger.error(f"❌ 数据转换失败: {e}")
             raise Exception(f"评分数据格式错误: {str(e)}")
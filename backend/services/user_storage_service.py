@@ -4,6 +4,7 @@
 提供用户档案的本地 JSON 文件存储和管理
 """
 
+import logging
 import json
 from pathlib import Path
 from typing import Optional, Dict
@@ -11,6 +12,8 @@ from datetime import datetime
 
 from models.user_profile import UserProfile, LearningGoal, EnglishLevel, AgeGroup
 
+logger = logging.getLogger(__name__)
+
 
 class UserStorageService:
     """
@@ -41,7 +44,7 @@ class UserStorageService:
         """确保存储文件存在"""
         if not self.storage_file.exists():
             self.storage_file.write_text(json.dumps({}, indent=2, ensure_ascii=False))
-            print(f"✅ 创建用户档案存储文件: {self.storage_file}")
+            logger.info(f"✅ 创建用户档案存储文件: {self.storage_file}")
 
     def _load_all_profiles(self) -> Dict[str, dict]:
         """
@@ -54,7 +57,7 @@ class UserStorageService:
             content = self.storage_file.read_text(encoding='utf-8')
             return json.loads(content)
         except Exception as e:
-            print(f"❌ 加载用户档案失败: {e}")
+            logger.error(f"❌ 加载用户档案失败: {e}")
             return {}
 
     def _save_all_profiles(self, profiles: Dict[str, dict]) -> bool:
@@ -74,7 +77,7 @@ class UserStorageService:
             )
             return True
         except Exception as e:
-            print(f"❌ 保存用户档案失败: {e}")
+            logger.error(f"❌ 保存用户档案失败: {e}")
             return False
 
     def create_user_profile(self, user_profile: UserProfile) -> bool:
@@ -93,7 +96,7 @@ class UserStorageService:
 
             # V1.3: 如果用户已存在（通过邮箱登录创建），则更新档案信息
             if user_profile.user_id in profiles:
-                print(f"ℹ️ 用户已存在，更新档案信息: {user_profile.user_id}")
+                logger.info(f"ℹ️ 用户已存在，更新档案信息: {user_profile.user_id}")
                 existing_user = profiles[user_profile.user_id]
 
                 # 更新 V1.2 引导流程的字段
@@ -123,13 +126,11 @@ class UserStorageService:
             success = self._save_all_profiles(profiles)
 
             if success:
-                print(f"✅ 用户档案保存成功: {user_profile.user_id}")
+                logger.info(f"✅ 用户档案保存成功: {user_profile.user_id}")
             return success
 
         except Exception as e:
-            print(f"❌ 创建用户档案失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error(f"❌ 创建用户档案失败: {e}", exc_info=True)
             return False
 
     def get_user_profile(self, user_id: str) -> Optional[UserProfile]:
@@ -146,7 +147,7 @@ class UserStorageService:
             profiles = self._load_all_profiles()
 
             if user_id not in profiles:
-                print(f"⚠️ 用户不存在: {user_id}")
+                logger.warning(f"⚠️ 用户不存在: {user_id}")
                 return None
 
             profile_data = profiles[user_id]
@@ -165,7 +166,7 @@ class UserStorageService:
             return user_profile
 
         except Exception as e:
-            print(f"❌ 获取用户档案失败: {e}")
+            logger.error(f"❌ 获取用户档案失败: {e}")
             return None
 
     def update_user_profile(
@@ -191,7 +192,7 @@ class UserStorageService:
             profiles = self._load_all_profiles()
 
             if user_id not in profiles:
-                print(f"⚠️ 用户不存在: {user_id}")
+                logger.warning(f"⚠️ 用户不存在: {user_id}")
                 return False
 
             profile = profiles[user_id]
@@ -203,7 +204,7 @@ class UserStorageService:
                     LearningGoal(learning_goal)
                     profile["learning_goal"] = learning_goal
                 except ValueError:
-                    print(f"❌ 无效的学习目标: {learning_goal}")
+                    logger.error(f"❌ 无效的学习目标: {learning_goal}")
                     return False
 
             if english_level is not None:
@@ -211,7 +212,7 @@ class UserStorageService:
                     EnglishLevel(english_level)
                     profile["english_level"] = english_level
                 except ValueError:
-                    print(f"❌ 无效的英语水平: {english_level}")
+                    logger.error(f"❌ 无效的英语水平: {english_level}")
                     return False
 
             if age_group is not None:
@@ -219,7 +220,7 @@ class UserStorageService:
                     AgeGroup(age_group)
                     profile["age_group"] = age_group
                 except ValueError:
-                    print(f"❌ 无效的年龄段: {age_group}")
+                    logger.error(f"❌ 无效的年龄段: {age_group}")
                     return False
 
             # 更新最后活跃时间
@@ -230,11 +231,11 @@ class UserStorageService:
             success = self._save_all_profiles(profiles)
 
             if success:
-                print(f"✅ 用户档案更新成功: {user_id}")
+                logger.info(f"✅ 用户档案更新成功: {user_id}")
             return success
 
         except Exception as e:
-            print(f"❌ 更新用户档案失败: {e}")
+            logger.error(f"❌ 更新用户档案失败: {e}")
             return False
 
     def update_last_active(self, user_id: str) -> bool:
@@ -257,7 +258,7 @@ class UserStorageService:
             return self._save_all_profiles(profiles)
 
         except Exception as e:
-            print(f"❌ 更新最后活跃时间失败: {e}")
+            logger.error(f"❌ 更新最后活跃时间失败: {e}")
             return False
 
     def delete_user_profile(self, user_id: str) -> bool:
@@ -274,18 +275,18 @@ class UserStorageService:
             profiles = self._load_all_profiles()
 
             if user_id not in profiles:
-                print(f"⚠️ 用户不存在: {user_id}")
+                logger.warning(f"⚠️ 用户不存在: {user_id}")
                 return False
 
             del profiles[user_id]
             success = self._save_all_profiles(profiles)
 
             if success:
-                print(f"✅ 用户档案删除成功: {user_id}")
+                logger.info(f"✅ 用户档案删除成功: {user_id}")
             return success
 
         except Exception as e:
-            print(f"❌ 删除用户档案失败: {e}")
+            logger.error(f"❌ 删除用户档案失败: {e}")
             return False
 
     def get_all_user_ids(self) -> list:
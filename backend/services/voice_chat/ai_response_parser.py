@@ -11,7 +11,7 @@ PocketSpeak AI响应接收与解析模块
 import asyncio
 import json
 import logging
-from typing import Optional, Callable, Dict, Any, Union, List
+from typing import Optional, Callable, Dict, Any, Union, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import base64
@@ -45,6 +45,30 @@ class AudioData:
         return len(self.data)
 
 
+class OpusPacket:
+    """
+    下行二进制音频帧（快速路径）
+
+    与AudioData接口相同（data/format/sample_rate/channels/size），使用__slots__，
+    每帧只分配一个小对象，不经过消息字典和AIResponse
+    """
+    __slots__ = ("data", "format", "sample_rate", "channels")
+
+    def __init__(self, data: bytes, format: str = "opus", sample_rate: int = 24000, channels: int = 1):
+        self.data = data
+        self.format = format
+        self.sample_rate = sample_rate
+        self.channels = channels
+
+    @property
+    def size(self) -> int:
+        """返回音频数据的字节大小"""
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"OpusPacket(size={len(self.data)}, format={self.format}, sample_rate={self.sample_rate})"
+
+
 @dataclass
 class AIResponse:
     """AI响应数据结构"""
@@ -67,8 +91,20 @@ class AIResponseParser:
     4. 处理小智AI特定的消息格式
     """
 
-    def __init__(self):
-        """初始化AI响应解析器"""
+    def __init__(self, downlink_sample_rate: int = 24000, downlink_channels: int = 1,
+                 json_loads: Optional[Callable[[Union[str, bytes]], Any]] = None):
+        """
+        初始化AI响应解析器
+
+        Args:
+            downlink_sample_rate: 二进制下行音频的采样率（hello中协商，小智AI为24kHz）
+            downlink_channels: 二进制下行音频的声道数
+            json_loads: 文本消息的JSON解析函数（None则使用标准库json.loads）
+        """
+        self.downlink_sample_rate = downlink_sample_rate
+        self.downlink_channels = downlink_channels
+        self.json_loads = json_loads or json.loads
+
         # 消息处理回调
         self.on_text_received: Optional[Callable[[str], None]] = None
         self.on_audio_received: Optional[Callable[[AudioData], None]] = None
@@ -87,8 +123,51 @@ class AIResponseParser:
             "unknown_messages": 0
         }
 
+        # 按type字段直接路由的消息类型（只收录不会被更高优先级规则匹配的类型，其余按规则识别）
+        self._type_routes: Dict[str, Callable[[Dict], Optional[MessageType]]] = {
+            "stt": lambda message: MessageType.STT,
+            "llm": lambda message: MessageType.EMOJI if self._is_emoji_message(message) else None,
+            "mcp": lambda message: MessageType.MCP,
+            "tts": lambda message: None if self._is_mcp_message(message) else MessageType.TTS,
+        }
+
+        # 按消息类型解析内容: MessageType -> (解析函数, 统计键)
+        self._parsers: Dict[MessageType, Tuple[Callable[[Dict, AIResponse], None], str]] = {
+            MessageType.TEXT: (self._parse_text_message, "text_messages"),
+            MessageType.AUDIO: (self._parse_audio_message, "audio_messages"),
+            MessageType.EMOJI: (self._parse_emoji_message, "emoji_messages"),
+            MessageType.STT: (self._parse_stt_message, "text_messages"),
+            MessageType.MCP: (self._parse_mcp_message, "mcp_messages"),
+            MessageType.TTS: (self._parse_tts_message, "audio_messages"),
+            MessageType.ERROR: (self._parse_error_message, "error_messages"),
+        }
+
         logger.info("AI响应解析器初始化完成")
 
+    def parse_audio_packet(self, data: bytes) -> OpusPacket:
+        """
+        解析一个二进制下行音频帧（快速路径）
+
+        直接构造OpusPacket交给音频回调，不创建消息字典/AIResponse，不做类型识别
+
+        Args:
+            data: 原始OPUS包
+
+        Returns:
+            OpusPacket: 音频帧
+        """
+        packet = OpusPacket(data, "opus", self.downlink_sample_rate, self.downlink_channels)
+        stats = self.stats
+        stats["total_messages"] += 1
+        stats["audio_messages"] += 1
+
+        if self.on_audio_received:
+            try:
+                self.on_audio_received(packet)
+            except Exception as e:
+                logger.error(f"触发音频回调失败: {e}")
+        return packet
+
     def parse_message(self, raw_message: Union[str, bytes, Dict]) -> Optional[AIResponse]:
         """
         解析收到的消息
@@ -119,36 +198,16 @@ class AIResponseParser:
             )
 
             # 根据消息类型解析内容
-            if message_type == MessageType.TEXT:
-                self._parse_text_message(message_dict, response)
-                self.stats["text_messages"] += 1
-
-            elif message_type == MessageType.AUDIO:
-                self._parse_audio_message(message_dict, response)
-                self.stats["audio_messages"] += 1
-
-            elif message_type == MessageType.EMOJI:
-                self._parse_emoji_message(message_dict, response)
-                self.stats["emoji_messages"] += 1  # 🎭 统计emoji消息
-                logger.info(f"😊 收到Emoji消息 (AI回复结束标志): {message_dict.get('text')} - {message_dict.get('emotion')}")
-
-            elif message_type == MessageType.STT:
-                self._parse_stt_message(message_dict, response)
-                self.stats["text_messages"] += 1
-                logger.info(f">> 用户说: {message_dict.get('text')}")
-
-            elif message_type == MessageType.MCP:
-                self._parse_mcp_message(message_dict, response)
-                self.stats["mcp_messages"] += 1
-
-            elif message_type == MessageType.TTS:
-                self._parse_tts_message(message_dict, response)
-                self.stats["audio_messages"] += 1
-
-            elif message_type == MessageType.ERROR:
-                self._parse_error_message(message_dict, response)
-                self.stats["error_messages"] += 1
-
+            parser = self._parsers.get(message_type)
+            if parser:
+                parse, stats_key = parser
+                parse(message_dict, response)
+                self.stats[stats_key] += 1
+
+                if message_type == MessageType.EMOJI:
+                    logger.info(f"😊 收到Emoji消息 (AI回复结束标志): {message_dict.get('text')} - {message_dict.get('emotion')}")
+                elif message_type == MessageType.STT:
+                    logger.info(f">> 用户说: {message_dict.get('text')}")
             else:
                 self.stats["unknown_messages"] += 1
                 logger.warning(f"未知消息类型: {message_dict}")
@@ -182,11 +241,11 @@ class AIResponseParser:
 
             # 如果是字符串，尝试JSON解析
             if isinstance(raw_message, str):
-                return json.loads(raw_message)
+                return self.json_loads(raw_message)
 
-            # 如果是字节，先解码再JSON解析
+            # 如果是字节，直接JSON解析（UTF-8）
             if isinstance(raw_message, bytes):
-                return json.loads(raw_message.decode('utf-8'))
+                return self.json_loads(raw_message)
 
             logger.warning(f"不支持的消息格式: {type(raw_message)}")
             return None
@@ -209,9 +268,17 @@ class AIResponseParser:
             MessageType: 消息类型
         """
         # 检查是否有错误字段
-        if "error" in message or message.get("type") == "error":
+        message_kind = message.get("type")
+        if "error" in message or message_kind == "error":
             return MessageType.ERROR
 
+        # 按type字段直接路由（小智AI的JSON消息都带type），无法确定时按规则识别
+        route = self._type_routes.get(message_kind)
+        if route:
+            message_type = route(message)
+            if message_type is not None:
+                return message_type
+
         # 检查是否为STT消息（用户语音识别结果）
         if self._is_stt_message(message):
             return MessageType.STT
@@ -335,6 +335,25 @@ class SentenceBuffer:
         except asyncio.TimeoutError:
             return None
 
+    def clear(self) -> int:
+        """
+        丢弃所有已缓冲的句子和音频（用户打断AI时）
+
+        Returns:
+            int: 丢弃的句子数
+        """
+        dropped = 0
+        while not self.sentence_queue.empty():
+            try:
+                self.sentence_queue.get_nowait()
+                dropped += 1
+            except asyncio.QueueEmpty:
+                break
+
+        self.audio_buffer.clear()
+        self.current_sentence_id = None
+        return dropped
+
     def should_preload(self) -> bool:
         """
         检查是否应该预加载下一句
@@ -0,0 +1,103 @@
+"""
+PocketSpeak 下行音频帧解码模块
+
+每个会话持有一个解码阶段（OpusDecodeStage）：
+小智AI下发的每个OPUS帧只解码一次，产出的PCMFrame按引用分发给
+实时推送、历史记录累积和句子缓冲队列，避免同一帧被重复解码
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+import opuslib
+
+from services.voice_chat.ai_response_parser import AudioData
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PCMFrame:
+    """已解码的PCM音频帧（不可变，供多个消费者共享引用）"""
+    pcm: bytes               # 16-bit PCM数据
+    sample_rate: int = 24000  # 采样率
+    channels: int = 1        # 声道数
+    index: int = 0           # 帧序号（会话内递增）
+
+    @property
+    def size(self) -> int:
+        """PCM数据字节大小"""
+        return len(self.pcm)
+
+    @property
+    def duration_ms(self) -> float:
+        """帧时长（毫秒）"""
+        return self.size / (self.sample_rate * self.channels * 2) * 1000
+
+
+class OpusDecodeStage:
+    """
+    会话级OPUS解码阶段
+
+    功能：
+    1. 复用单个OPUS解码器实例（参考py-xiaozhi的self.opus_decoder模式）
+    2. 每帧只解码一次，输出PCMFrame
+    3. 解码失败时跳过该帧，避免引入脏数据
+    """
+
+    def __init__(self, sample_rate: int = 24000, channels: int = 1, frame_size: int = 960):
+        """
+        初始化解码阶段
+
+        Args:
+            sample_rate: 下行音频采样率（小智AI为24kHz）
+            channels: 声道数
+            frame_size: 每帧样本数（24kHz下40ms = 960）
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frame_size = frame_size
+        self._decoder = opuslib.Decoder(sample_rate, channels)
+        self._next_index = 0
+
+        # 统计信息
+        self.stats = {
+            "decoded_frames": 0,
+            "failed_frames": 0,
+            "passthrough_frames": 0
+        }
+
+    def decode(self, audio_data: AudioData) -> Optional[PCMFrame]:
+        """
+        解码一帧音频
+
+        Args:
+            audio_data: 解析器输出的音频数据（通常为OPUS）
+
+        Returns:
+            PCMFrame: 解码后的PCM帧，解码失败时返回None
+        """
+        if audio_data.format != "opus":
+            # 非OPUS格式（已是PCM）直接透传
+            self.stats["passthrough_frames"] += 1
+            return self._make_frame(audio_data.data, audio_data.sample_rate, audio_data.channels)
+
+        try:
+            pcm = self._decoder.decode(audio_data.data, frame_size=self.frame_size, decode_fec=False)
+        except opuslib.OpusError as e:
+            self.stats["failed_frames"] += 1
+            logger.warning(f"Opus解码失败，跳过此帧: {e}")
+            return None
+
+        self.stats["decoded_frames"] += 1
+        return self._make_frame(pcm, self.sample_rate, self.channels)
+
+    def _make_frame(self, pcm: bytes, sample_rate: int, channels: int) -> PCMFrame:
+        frame = PCMFrame(pcm=pcm, sample_rate=sample_rate, channels=channels, index=self._next_index)
+        self._next_index += 1
+        return frame
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取解码统计信息"""
+        return self.stats.copy()
@@ -0,0 +1,261 @@
+"""
+前端WebSocket出站写入器
+
+每个前端连接一个写入协程，所有推送都经由它发送：
+1. 有界出站队列，保证同一连接内的消息顺序
+2. 消息优先级：控制事件（状态、文本、emoji等）优先于音频
+3. 慢消费者检测：发送耗时过长或音频积压时标记为慢连接，
+   丢弃过期音频，避免一个卡住的客户端拖垮服务器内存或延误其他事件
+4. 控制事件可按key合并（例如只保留最新的状态变化）
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 队列条目: (负载, 入队时间, 合并key)
+_Entry = Tuple[Union[Dict[str, Any], bytes], float, Optional[str]]
+
+
+class ClientOutboundWriter:
+    """
+    单个前端连接的出站写入器
+
+    websocket 只需提供 send_json(dict) 和 send_bytes(bytes) 两个协程方法
+    （即 starlette/FastAPI 的 WebSocket）；传入 json_dumps 时改用 send_text(str)
+    """
+
+    def __init__(self,
+                 websocket: Any,
+                 max_control_queue: int = 256,
+                 max_audio_queue: int = 50,
+                 slow_send_ms: float = 200.0,
+                 stale_audio_ms: float = 1000.0,
+                 json_dumps: Optional[Callable[[Any], str]] = None):
+        """
+        初始化出站写入器
+
+        Args:
+            websocket: 前端WebSocket连接
+            max_control_queue: 控制事件队列上限
+            max_audio_queue: 音频队列上限（40ms帧，默认约2秒）
+            slow_send_ms: 单次发送超过该耗时视为慢连接
+            stale_audio_ms: 慢连接下排队超过该时长的音频被丢弃
+            json_dumps: 控制事件序列化函数（None则使用websocket.send_json）
+        """
+        self.websocket = websocket
+        self.json_dumps = json_dumps
+        self.max_control_queue = max_control_queue
+        self.max_audio_queue = max_audio_queue
+        self.slow_send_ms = slow_send_ms
+        self.stale_audio_ms = stale_audio_ms
+
+        self._control: Deque[_Entry] = deque()
+        self._audio: Deque[_Entry] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+        # 慢消费者状态
+        self.is_slow = False
+
+        # 统计信息
+        self.stats = {
+            "control_sent": 0,
+            "audio_sent": 0,
+            "control_dropped": 0,
+            "control_coalesced": 0,
+            "audio_dropped": 0,
+            "stale_audio_dropped": 0,
+            "slow_events": 0,
+            "max_audio_queue_depth": 0,
+            "last_send_ms": 0.0,
+            "max_send_ms": 0.0,
+            "send_errors": 0
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """写入协程是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """启动写入协程（需在事件循环中调用）"""
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run())
+
+    def send_json(self, payload: Dict[str, Any], coalesce_key: Optional[str] = None):
+        """
+        排队发送一条控制事件（高优先级）
+
+        Args:
+            payload: JSON消息
+            coalesce_key: 合并key，队列中已有相同key的未发送消息时直接替换
+        """
+        self._dispatch(self._enqueue_control, payload, coalesce_key)
+
+    def send_audio(self, payload: Union[Dict[str, Any], bytes]):
+        """
+        排队发送一条音频消息（低优先级）
+
+        Args:
+            payload: 二进制音频帧，或JSON模式下的audio_frame消息
+        """
+        self._dispatch(self._enqueue_audio, payload)
+
+    def clear_audio(self) -> int:
+        """
+        丢弃所有排队中的音频（例如用户打断AI时）
+
+        Returns:
+            int: 丢弃的帧数
+        """
+        dropped = len(self._audio)
+        self._audio.clear()
+        self.stats["audio_dropped"] += dropped
+        return dropped
+
+    async def close(self):
+        """停止写入协程，丢弃未发送的消息"""
+        self._closed = True
+        self._control.clear()
+        self._audio.clear()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _dispatch(self, func, *args):
+        """保证入队操作在事件循环线程中执行"""
+        if self._closed:
+            return
+        loop = self._loop
+        if loop is None:
+            func(*args)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            func(*args)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(func, *args)
+
+    def _enqueue_control(self, payload: Dict[str, Any], coalesce_key: Optional[str]):
+        now = time.monotonic()
+
+        if coalesce_key is not None:
+            for i, (_, _, key) in enumerate(self._control):
+                if key == coalesce_key:
+                    self._control[i] = (payload, now, coalesce_key)
+                    self.stats["control_coalesced"] += 1
+                    self._wakeup.set()
+                    return
+
+        if len(self._control) >= self.max_control_queue:
+            self._control.popleft()
+            self.stats["control_dropped"] += 1
+            logger.warning("⚠️ 前端控制事件队列已满，丢弃最旧事件")
+
+        self._control.append((payload, now, coalesce_key))
+        self._wakeup.set()
+
+    def _enqueue_audio(self, payload: Union[Dict[str, Any], bytes]):
+        if len(self._audio) >= self.max_audio_queue:
+            self._audio.popleft()
+            self.stats["audio_dropped"] += 1
+            self._mark_slow("音频队列已满")
+
+        self._audio.append((payload, time.monotonic(), None))
+        depth = len(self._audio)
+        if depth > self.stats["max_audio_queue_depth"]:
+            self.stats["max_audio_queue_depth"] = depth
+        self._wakeup.set()
+
+    def _mark_slow(self, reason: str):
+        if not self.is_slow:
+            self.is_slow = True
+            self.stats["slow_events"] += 1
+            logger.warning(f"🐢 前端连接变慢({reason})，开始丢弃过期音频")
+
+    def _next_entry(self) -> Optional[_Entry]:
+        """按优先级取下一条消息：控制事件优先，慢连接下跳过过期音频"""
+        if self._control:
+            return self._control.popleft()
+
+        if self.is_slow:
+            deadline = time.monotonic() - self.stale_audio_ms / 1000
+            while self._audio and self._audio[0][1] < deadline:
+                self._audio.popleft()
+                self.stats["stale_audio_dropped"] += 1
+
+        if self._audio:
+            return self._audio.popleft()
+        return None
+
+    async def _run(self):
+        """写入循环"""
+        try:
+            while True:
+                entry = self._next_entry()
+                if entry is None:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                payload, _, _ = entry
+                started = time.monotonic()
+                try:
+                    if isinstance(payload, (bytes, bytearray, memoryview)):
+                        await self.websocket.send_bytes(payload)
+                        self.stats["audio_sent"] += 1
+                    else:
+                        if self.json_dumps is not None:
+                            await self.websocket.send_text(self.json_dumps(payload))
+                        else:
+                            await self.websocket.send_json(payload)
+                        if payload.get("type") == "audio_frame":
+                            self.stats["audio_sent"] += 1
+                        else:
+                            self.stats["control_sent"] += 1
+                except Exception as e:
+                    self.stats["send_errors"] += 1
+                    logger.error(f"❌ 前端WebSocket发送失败: {e}")
+                    continue
+
+                send_ms = (time.monotonic() - started) * 1000
+                self.stats["last_send_ms"] = send_ms
+                if send_ms > self.stats["max_send_ms"]:
+                    self.stats["max_send_ms"] = send_ms
+
+                if send_ms > self.slow_send_ms:
+                    self._mark_slow(f"单次发送耗时{send_ms:.0f}ms")
+                elif self.is_slow and not self._audio:
+                    # 积压清空且发送恢复正常，解除慢连接标记
+                    self.is_slow = False
+                    logger.info("✅ 前端连接已恢复正常")
+
+        except asyncio.CancelledError:
+            logger.debug("前端出站写入协程已取消")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取写入统计信息"""
+        return {
+            **self.stats,
+            "control_queue_depth": len(self._control),
+            "audio_queue_depth": len(self._audio),
+            "is_slow": self.is_slow,
+            "running": self.is_running
+        }
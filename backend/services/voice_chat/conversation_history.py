@@ -0,0 +1,320 @@
+"""
+PocketSpeak 对话历史存储
+
+内存中的对话历史只保留文本和压缩的OPUS包：
+1. 消息离开"当前回复"后被压缩（丢弃PCM存储和句子WAV缓存）
+2. 历史音频需要PCM/WAV时按需解码，最近解码的结果放入按字节上限淘汰的LRU
+3. 每个会话和全局都有OPUS字节预算，超出时先淘汰最旧消息的音频（保留文本）
+"""
+
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 全局预算和解码LRU上限（字节），可通过环境变量调整
+GLOBAL_AUDIO_BUDGET_BYTES = int(os.getenv("VOICE_HISTORY_GLOBAL_AUDIO_BUDGET", str(64 * 1024 * 1024)))
+DECODED_AUDIO_CACHE_BYTES = int(os.getenv("VOICE_DECODED_AUDIO_CACHE_BYTES", str(16 * 1024 * 1024)))
+
+
+class DecodedAudioCache:
+    """
+    最近解码的历史音频LRU（按PCM字节数上限淘汰）
+
+    key为消息ID，value为完整PCM；可在媒体线程中访问（内部加锁）
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        初始化LRU
+
+        Args:
+            max_bytes: 缓存PCM总字节上限
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0
+        }
+
+    @property
+    def byte_size(self) -> int:
+        """当前缓存的PCM字节数"""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """读取缓存（命中时移到最近使用端）"""
+        with self._lock:
+            pcm = self._entries.get(key)
+            if pcm is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return pcm
+
+    def put(self, key: str, pcm: bytes):
+        """写入缓存，超出上限时淘汰最久未使用的条目（单条超过上限时不缓存）"""
+        with self._lock:
+            self._discard(key)
+            if len(pcm) > self.max_bytes:
+                return
+
+            self._entries[key] = pcm
+            self._size += len(pcm)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.stats["evictions"] += 1
+
+    def discard(self, key: str):
+        """移除指定条目"""
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: str):
+        pcm = self._entries.pop(key, None)
+        if pcm is not None:
+            self._size -= len(pcm)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes
+        }
+
+
+class HistoryAudioBudget:
+    """
+    全局历史音频预算
+
+    跨所有会话的历史OPUS字节数上限，超出时从最旧音频所在的会话开始淘汰
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        初始化全局预算
+
+        Args:
+            max_bytes: 所有会话历史音频（OPUS）总字节上限
+        """
+        self.max_bytes = max_bytes
+        self._histories: "weakref.WeakSet[ConversationHistory]" = weakref.WeakSet()
+        self.stats = {
+            "evicted_messages": 0,
+            "evicted_bytes": 0
+        }
+
+    def register(self, history: "ConversationHistory"):
+        self._histories.add(history)
+
+    def unregister(self, history: "ConversationHistory"):
+        self._histories.discard(history)
+
+    @property
+    def used_bytes(self) -> int:
+        """所有会话历史音频的总字节数"""
+        return sum(history.audio_bytes for history in self._histories)
+
+    def enforce(self) -> int:
+        """
+        执行全局预算：淘汰最旧的历史音频直到不超过上限
+
+        Returns:
+            int: 释放的字节数
+        """
+        freed = 0
+        used = self.used_bytes
+        while used > self.max_bytes:
+            candidates = [h for h in self._histories if h.oldest_evictable_audio() is not None]
+            if not candidates:
+                break
+            oldest = min(candidates, key=lambda h: h.oldest_evictable_audio().timestamp)
+            released = oldest.evict_oldest_audio()
+            if released <= 0:
+                break
+            used -= released
+            freed += released
+            self.stats["evicted_messages"] += 1
+            self.stats["evicted_bytes"] += released
+
+        if freed:
+            logger.info(f"🧹 全局历史音频预算: 淘汰 {freed} bytes，当前 {used}/{self.max_bytes} bytes")
+        return freed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "sessions": len(self._histories),
+            "used_bytes": self.used_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+# 模块级共享实例（所有会话共用）
+decoded_audio_cache = DecodedAudioCache(DECODED_AUDIO_CACHE_BYTES)
+global_audio_budget = HistoryAudioBudget(GLOBAL_AUDIO_BUDGET_BYTES)
+
+
+class ConversationHistory:
+    """
+    单个会话的对话历史
+
+    消息对象需提供: message_id, timestamp, encoded_audio_size, compact(), drop_audio()
+    （即VoiceMessage）。最新一条消息可能仍在接收音频，不压缩也不淘汰其音频
+    """
+
+    def __init__(self,
+                 max_messages: int = 100,
+                 max_audio_bytes: int = 8 * 1024 * 1024,
+                 global_budget: Optional[HistoryAudioBudget] = None):
+        """
+        初始化对话历史
+
+        Args:
+            max_messages: 最大消息条数
+            max_audio_bytes: 本会话历史音频（OPUS）字节上限
+            global_budget: 全局预算（默认使用模块级共享实例）
+        """
+        self.max_messages = max_messages
+        self.max_audio_bytes = max_audio_bytes
+        self.global_budget = global_budget or global_audio_budget
+        self.global_budget.register(self)
+
+        self._messages: Deque[Any] = deque()
+        self._ids: Dict[str, Any] = {}
+
+        self.stats = {
+            "compacted_messages": 0,
+            "compacted_bytes": 0,
+            "evicted_audio_messages": 0,
+            "evicted_audio_bytes": 0,
+            "trimmed_messages": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._messages)
+
+    def to_list(self) -> List[Any]:
+        """按时间顺序返回消息列表（浅拷贝）"""
+        return list(self._messages)
+
+    def get(self, message_id: str) -> Optional[Any]:
+        """按消息ID查找"""
+        return self._ids.get(message_id)
+
+    @property
+    def audio_bytes(self) -> int:
+        """本会话历史音频（OPUS）总字节数"""
+        return sum(message.encoded_audio_size for message in self._messages)
+
+    def add(self, message: Any) -> bool:
+        """
+        保存消息到历史（同一消息重复保存时只更新预算）
+
+        新消息加入时，之前的消息已不再是当前回复，压缩为文本+OPUS
+
+        Returns:
+            bool: 是否为新加入的消息
+        """
+        is_new = message.message_id not in self._ids
+        if is_new:
+            for previous in self._messages:
+                freed = previous.compact()
+                if freed:
+                    self.stats["compacted_messages"] += 1
+                    self.stats["compacted_bytes"] += freed
+
+            self._messages.append(message)
+            self._ids[message.message_id] = message
+
+            while len(self._messages) > self.max_messages:
+                self._remove_oldest()
+
+        self._enforce_budget()
+        return is_new
+
+    def clear(self):
+        """清空历史"""
+        while self._messages:
+            self._remove_oldest()
+
+    def close(self):
+        """清空历史并从全局预算中注销"""
+        self.clear()
+        self.global_budget.unregister(self)
+
+    def oldest_evictable_audio(self) -> Optional[Any]:
+        """最旧的、可淘汰音频的消息（不含最新一条）"""
+        for message in list(self._messages)[:-1]:
+            if message.encoded_audio_size > 0:
+                return message
+        return None
+
+    def evict_oldest_audio(self) -> int:
+        """
+        淘汰最旧一条消息的音频（保留文本）
+
+        Returns:
+            int: 释放的OPUS字节数
+        """
+        message = self.oldest_evictable_audio()
+        if message is None:
+            return 0
+        freed = message.drop_audio()
+        decoded_audio_cache.discard(message.message_id)
+        self.stats["evicted_audio_messages"] += 1
+        self.stats["evicted_audio_bytes"] += freed
+        logger.debug(f"历史音频已淘汰: {message.message_id} ({freed} bytes)")
+        return freed
+
+    def _remove_oldest(self):
+        message = self._messages.popleft()
+        self._ids.pop(message.message_id, None)
+        decoded_audio_cache.discard(message.message_id)
+        self.stats["trimmed_messages"] += 1
+
+    def _enforce_budget(self):
+        """先执行本会话预算，再执行全局预算"""
+        used = self.audio_bytes
+        while used > self.max_audio_bytes:
+            freed = self.evict_oldest_audio()
+            if freed <= 0:
+                break
+            used -= freed
+
+        if self.global_budget.used_bytes > self.global_budget.max_bytes:
+            self.global_budget.enforce()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取历史统计信息"""
+        return {
+            **self.stats,
+            "messages": len(self._messages),
+            "audio_bytes": self.audio_bytes,
+            "max_audio_bytes": self.max_audio_bytes
+        }
@@ -0,0 +1,55 @@
+"""
+实时PCM推送的待发帧记录
+
+下行帧到达时记录需要实时推送PCM的帧索引；会话的解码任务完成后，
+按索引从消息的PCM存储中取出已解码的帧推送。
+
+设计说明:
+不依赖decode_pending()的返回值（只包含本次新解码的帧）：路由接口
+（增量音频、当前音频、历史序列化）在同一媒体通道中调用decode_pending()时
+可能先把这些帧解码掉，会话的解码任务随后只拿到空列表
+"""
+
+from typing import Dict, List
+
+
+class LivePCMTracker:
+    """按消息记录待推送的帧索引（只在事件循环中访问）"""
+
+    def __init__(self):
+        self._wanted: Dict[str, List[int]] = {}  # 消息ID -> 待推送帧索引（递增）
+
+    def __len__(self) -> int:
+        return sum(len(indices) for indices in self._wanted.values())
+
+    def want(self, message_id: str, index: int):
+        """记录一帧需要实时推送"""
+        self._wanted.setdefault(message_id, []).append(index)
+
+    def discard(self, message_id: str):
+        """放弃消息的全部待推送帧（回复被打断、消息已压缩）"""
+        self._wanted.pop(message_id, None)
+
+    def take_ready(self, message_id: str, decoded_frames: int) -> List[int]:
+        """
+        取出已解码的待推送帧索引
+
+        Args:
+            message_id: 消息ID
+            decoded_frames: 消息PCM存储中已解码的帧数
+
+        Returns:
+            List[int]: 可以推送的帧索引（按帧序），未解码的继续等待
+        """
+        indices = self._wanted.get(message_id)
+        if not indices:
+            return []
+
+        ready = 0
+        while ready < len(indices) and indices[ready] < decoded_frames:
+            ready += 1
+        taken = indices[:ready]
+        del indices[:ready]
+        if not indices:
+            del self._wanted[message_id]
+        return taken
@@ -0,0 +1,217 @@
+"""
+PocketSpeak 媒体处理线程池
+
+OPUS解码、WAV封装和base64编码都是CPU工作，放在事件循环上执行会拖慢所有会话的帧转发。
+这里把媒体工作交给有界线程池，事件循环只做I/O：
+1. 每个会话一条有序通道（MediaLane），同一通道的任务严格按提交顺序执行、按顺序返回结果
+2. 通道内排队的任务在一次线程池调用中批量执行；相同coalesce_key的未开始任务合并为一个
+3. 每条通道同一时刻最多一个批次在线程池中，线程池积压不超过会话数
+4. 统计排队深度、批次大小和耗时
+
+使用线程而不是进程：opuslib通过ctypes调用libopus（调用期间释放GIL），
+base64/WAV封装是C实现的内存拷贝，且任务需要直接读写会话内的音频存储
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 媒体线程数，可通过环境变量调整
+MEDIA_WORKERS = int(os.getenv("VOICE_MEDIA_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+@dataclass
+class _MediaJob:
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    future: asyncio.Future
+    coalesce_key: Optional[Hashable] = None
+
+
+def _run_batch(jobs: List[Tuple[Callable[..., Any], Tuple[Any, ...]]]) -> List[Tuple[bool, Any]]:
+    """在工作线程中按顺序执行一个批次，单个任务的异常不影响后续任务"""
+    results = []
+    for fn, args in jobs:
+        try:
+            results.append((True, fn(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class MediaLane:
+    """
+    有序媒体通道（每个会话一条）
+
+    submit()/run()需在事件循环中调用
+    """
+
+    def __init__(self, pool: "MediaWorkerPool", name: str = ""):
+        self.pool = pool
+        self.name = name
+        self._pending: List[_MediaJob] = []
+        self._runner: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        """排队中（尚未开始执行）的任务数"""
+        return len(self._pending)
+
+    def submit(self, fn: Callable[..., Any], *args, coalesce_key: Optional[Hashable] = None) -> asyncio.Future:
+        """
+        提交任务（不等待）
+
+        Args:
+            fn: 在工作线程中执行的函数
+            *args: 函数参数
+            coalesce_key: 合并键，已有相同键的任务在排队时直接复用它的Future
+
+        Returns:
+            asyncio.Future: 任务结果；同一通道的Future按提交顺序完成
+        """
+        if coalesce_key is not None:
+            for job in self._pending:
+                if job.coalesce_key == coalesce_key:
+                    self.pool.stats["coalesced"] += 1
+                    return job.future
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_MediaJob(fn, args, future, coalesce_key))
+        self.pool._on_enqueued()
+
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args, coalesce_key: Optional[Hashable] = None) -> Any:
+        """提交任务并等待结果（与通道内之前提交的任务保持顺序）"""
+        return await self.submit(fn, *args, coalesce_key=coalesce_key)
+
+    async def _run(self):
+        while self._pending:
+            batch, self._pending = self._pending, []
+            results = await self.pool._execute(batch)
+            for job, (ok, value) in zip(batch, results):
+                if job.future.done():
+                    continue
+                if ok:
+                    job.future.set_result(value)
+                else:
+                    job.future.set_exception(value)
+
+    async def close(self):
+        """等待已提交的任务完成"""
+        if self._runner and not self._runner.done():
+            try:
+                await self._runner
+            except Exception as e:
+                logger.debug(f"媒体通道关闭时任务出错({self.name}): {e}")
+
+
+class MediaWorkerPool:
+    """有界媒体线程池"""
+
+    def __init__(self, max_workers: int = MEDIA_WORKERS):
+        """
+        初始化线程池
+
+        Args:
+            max_workers: 工作线程数
+        """
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queued = 0
+        self._in_flight = 0
+
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "coalesced": 0,
+            "batches": 0,
+            "max_queue_depth": 0,
+            "max_batch_size": 0,
+            "busy_ms": 0.0
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        """已提交但尚未开始执行的任务数"""
+        return self._queued
+
+    def lane(self, name: str = "") -> MediaLane:
+        """创建一条有序通道"""
+        return MediaLane(self, name)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """执行一个不需要与会话任务排序的独立任务"""
+        return await self.lane("adhoc").run(fn, *args)
+
+    def _on_enqueued(self):
+        self._queued += 1
+        self.stats["submitted"] += 1
+        if self._queued > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = self._queued
+
+    async def _execute(self, batch: List[_MediaJob]) -> List[Tuple[bool, Any]]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="voice-media")
+
+        self._queued -= len(batch)
+        self._in_flight += len(batch)
+        self.stats["batches"] += 1
+        if len(batch) > self.stats["max_batch_size"]:
+            self.stats["max_batch_size"] = len(batch)
+
+        started = time.perf_counter()
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_batch, [(job.fn, job.args) for job in batch]
+            )
+        except Exception as e:
+            # 线程池已关闭等情况：整批失败
+            results = [(False, e)] * len(batch)
+        finally:
+            self._in_flight -= len(batch)
+            self.stats["busy_ms"] += (time.perf_counter() - started) * 1000
+
+        for ok, value in results:
+            if ok:
+                self.stats["completed"] += 1
+            else:
+                self.stats["failed"] += 1
+                logger.error(f"❌ 媒体任务失败: {value}")
+        return results
+
+    def shutdown(self):
+        """关闭线程池（等待正在执行的批次完成，阻塞调用方；事件循环中使用aclose()）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def aclose(self):
+        """在事件循环中关闭线程池：在默认执行器中等待正在执行的批次，不阻塞事件循环"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取线程池统计信息"""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "workers": self.max_workers,
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "avg_batch_size": round((self.stats["completed"] + self.stats["failed"]) / batches, 2) if batches else 0.0
+        }
+
+
+# 进程级媒体线程池（所有会话共用）
+media_pool = MediaWorkerPool()
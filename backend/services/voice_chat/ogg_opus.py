@@ -0,0 +1,119 @@
+"""
+Ogg-Opus封装工具
+
+把小智AI下发的原始OPUS包封装为标准Ogg-Opus流（RFC 7845），
+历史音频可以直接以 audio/ogg 下载，浏览器和常见播放器都能解码
+"""
+
+import struct
+from typing import Iterable, Iterator, List
+
+_PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+
+# Ogg页头标志
+_FLAG_BOS = 0x02
+_FLAG_EOS = 0x04
+
+# 每页最多255个lacing段
+_MAX_SEGMENTS = 255
+
+
+def _make_crc_table() -> List[int]:
+    table = []
+    for i in range(256):
+        r = i << 24
+        for _ in range(8):
+            r = ((r << 1) ^ 0x04C11DB7) if r & 0x80000000 else (r << 1)
+        table.append(r & 0xFFFFFFFF)
+    return table
+
+
+_CRC_TABLE = _make_crc_table()
+
+
+def ogg_crc(data: bytes) -> int:
+    """Ogg页校验和（多项式0x04C11DB7，初值0，不反转）"""
+    crc = 0
+    table = _CRC_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ table[((crc >> 24) ^ byte) & 0xFF]
+    return crc
+
+
+def _lacing(packet_size: int) -> List[int]:
+    """计算一个包的lacing段长度"""
+    return [255] * (packet_size // 255) + [packet_size % 255]
+
+
+def _page(packets: List[bytes], granule: int, serial: int, sequence: int, flags: int) -> bytes:
+    segments = []
+    for packet in packets:
+        segments.extend(_lacing(len(packet)))
+
+    header = _PAGE_HEADER.pack(b"OggS", 0, flags, granule, serial, sequence, 0, len(segments))
+    page = bytearray(header)
+    page.extend(segments)
+    for packet in packets:
+        page.extend(packet)
+
+    struct.pack_into("<I", page, 22, ogg_crc(page))
+    return bytes(page)
+
+
+def opus_head(sample_rate: int = 24000, channels: int = 1, pre_skip: int = 0) -> bytes:
+    """OpusHead标识头"""
+    return struct.pack("<8sBBHIhB", b"OpusHead", 1, channels, pre_skip, sample_rate, 0, 0)
+
+
+def opus_tags(vendor: str = "PocketSpeak") -> bytes:
+    """OpusTags注释头（无注释）"""
+    vendor_bytes = vendor.encode("utf-8")
+    return b"OpusTags" + struct.pack("<I", len(vendor_bytes)) + vendor_bytes + struct.pack("<I", 0)
+
+
+def iter_ogg_opus(packets: Iterable[bytes],
+                  sample_rate: int = 24000,
+                  channels: int = 1,
+                  frame_size: int = 960,
+                  serial: int = 0x50534B31,
+                  packets_per_page: int = 50) -> Iterator[bytes]:
+    """
+    逐页生成Ogg-Opus流
+
+    Args:
+        packets: 原始OPUS包（按时间顺序）
+        sample_rate: 原始采样率（写入OpusHead）
+        channels: 声道数
+        frame_size: 每包样本数（按sample_rate计，24kHz下40ms为960）
+        serial: Ogg逻辑流序列号
+        packets_per_page: 每页最多包含的OPUS包数
+
+    Yields:
+        bytes: 一个Ogg页
+    """
+    # Ogg-Opus的granule position固定以48kHz计数
+    granule_step = frame_size * 48000 // sample_rate
+
+    yield _page([opus_head(sample_rate, channels)], 0, serial, 0, _FLAG_BOS)
+    yield _page([opus_tags()], 0, serial, 1, 0)
+
+    sequence = 2
+    granule = 0
+    pending: List[bytes] = []
+    pending_segments = 0
+
+    for packet in packets:
+        segments = len(packet) // 255 + 1
+        if pending and (len(pending) >= packets_per_page or pending_segments + segments > _MAX_SEGMENTS):
+            yield _page(pending, granule, serial, sequence, 0)
+            sequence += 1
+            pending = []
+            pending_segments = 0
+
+        pending.append(bytes(packet))
+        pending_segments += segments
+        granule += granule_step
+
+    # 最后一页带EOS标志（没有音频包时为空的EOS页）
+    yield _page(pending, granule, serial, sequence, _FLAG_EOS)
+
@@ -0,0 +1,153 @@
+"""
+PCM音频追加存储
+
+用于累积AI回复的PCM音频：
+1. 预分配bytearray + 帧偏移表，追加为均摊O(1)，不再每帧重新拼接全部音频
+2. 句子/增量读取返回只读memoryview切片（零拷贝）
+3. 完整音频按需物化为bytes，并缓存到下一次追加为止
+
+设计说明:
+扩容时分配新的缓冲区并复制已写入数据，旧缓冲区不做resize，
+因此调用方持有的memoryview在扩容后仍然有效（已写入区域只追加不修改）
+"""
+
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PCMAudioStore:
+    """
+    只追加的PCM音频存储
+
+    帧（frame）指一次append写入的数据块，通常对应一个40ms的OPUS解码帧
+    """
+
+    def __init__(self, initial_capacity: int = 64 * 1024):
+        """
+        初始化PCM存储
+
+        Args:
+            initial_capacity: 初始预分配容量（字节），默认64KB（约1.3秒24kHz单声道音频）
+        """
+        self._buf = bytearray(max(initial_capacity, 1))
+        self._length = 0
+        # 每帧起始偏移，帧i的范围为 [_frame_offsets[i], _frame_offsets[i+1])
+        self._frame_offsets: List[int] = [0]
+        # 完整音频的物化缓存
+        self._materialized: Optional[bytes] = None
+
+    @property
+    def byte_length(self) -> int:
+        """已写入的字节数"""
+        return self._length
+
+    @property
+    def frame_count(self) -> int:
+        """已写入的帧数"""
+        return len(self._frame_offsets) - 1
+
+    @property
+    def capacity(self) -> int:
+        """当前缓冲区容量（字节）"""
+        return len(self._buf)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, pcm: bytes) -> int:
+        """
+        追加一帧PCM数据
+
+        Args:
+            pcm: PCM数据（任意bytes-like对象）
+
+        Returns:
+            int: 该帧的帧序号
+        """
+        size = len(pcm)
+        end = self._length + size
+        if end > len(self._buf):
+            self._grow(end)
+
+        self._buf[self._length:end] = pcm
+        self._length = end
+        self._frame_offsets.append(end)
+        self._materialized = None
+        return len(self._frame_offsets) - 2
+
+    def _grow(self, min_capacity: int):
+        """扩容：容量翻倍直到满足需求，复制已写入数据到新缓冲区"""
+        new_capacity = len(self._buf) * 2
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+
+        new_buf = bytearray(new_capacity)
+        new_buf[:self._length] = memoryview(self._buf)[:self._length]
+        self._buf = new_buf
+        logger.debug(f"PCM存储扩容: {new_capacity} bytes")
+
+    def frame_offset(self, frame_index: int) -> int:
+        """
+        获取帧的起始字节偏移
+
+        Args:
+            frame_index: 帧序号，允许等于frame_count（表示末尾）
+
+        Returns:
+            int: 字节偏移
+        """
+        frame_index = max(0, min(frame_index, self.frame_count))
+        return self._frame_offsets[frame_index]
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """
+        按字节范围获取只读视图（零拷贝）
+
+        Args:
+            start: 起始字节偏移
+            end: 结束字节偏移（不含），None表示到末尾
+
+        Returns:
+            memoryview: 只读视图
+        """
+        if end is None or end > self._length:
+            end = self._length
+        start = max(0, min(start, end))
+        return memoryview(self._buf)[start:end].toreadonly()
+
+    def frame_view(self, start_frame: int, end_frame: Optional[int] = None) -> memoryview:
+        """
+        按帧范围获取只读视图（零拷贝）
+
+        Args:
+            start_frame: 起始帧序号
+            end_frame: 结束帧序号（不含），None表示到末尾
+
+        Returns:
+            memoryview: 只读视图
+        """
+        if end_frame is None:
+            end_frame = self.frame_count
+        return self.view(self.frame_offset(start_frame), self.frame_offset(end_frame))
+
+    def to_bytes(self) -> bytes:
+        """
+        物化完整音频为bytes（缓存到下一次追加为止）
+
+        Returns:
+            bytes: 完整PCM数据
+        """
+        if self._materialized is None:
+            self._materialized = bytes(memoryview(self._buf)[:self._length])
+        return self._materialized
+
+    def clear(self):
+        """清空存储（保留已分配的容量）"""
+        if self._length:
+            # 已导出的视图仍引用旧缓冲区，这里换新缓冲区而不是原地覆盖
+            self._buf = bytearray(len(self._buf))
+        self._length = 0
+        self._frame_offsets = [0]
+        self._materialized = None
@@ -0,0 +1,250 @@
+"""
+PocketSpeak 语音会话目录
+
+多worker部署时记录每个语音会话由哪个worker持有：
+1. 会话初始化时由当前worker认领（claim），关闭/回收时释放
+2. 每个worker定期写入心跳，心跳超时的worker视为已下线，其会话可被其他worker重新认领
+3. 请求落到非持有者worker时，由路由层转发或重定向到持有者
+
+后端可替换：
+- SQLiteSessionDirectory：同一主机多进程共享（默认）
+- InMemorySessionDirectory：单进程/测试用的本地替身
+其他共享存储只需实现 SessionDirectory 接口，再通过 set_session_directory() 注入
+
+未设置 VOICE_WORKER_URL 时为单worker模式，不启用会话目录
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 当前worker对其他worker可达的地址（如 http://127.0.0.1:8001），为空表示单worker模式
+WORKER_URL = os.getenv("VOICE_WORKER_URL", "").rstrip("/")
+# 目录后端：sqlite | memory
+DIRECTORY_BACKEND = os.getenv("VOICE_SESSION_DIRECTORY", "sqlite")
+DIRECTORY_PATH = os.getenv("VOICE_SESSION_DIRECTORY_PATH", "data/voice_sessions.db")
+# worker心跳超时（秒）
+WORKER_TTL = float(os.getenv("VOICE_WORKER_TTL", "30"))
+
+
+class SessionDirectory(ABC):
+    """
+    会话目录接口
+
+    所有方法都是同步操作；SQLite等实现会访问磁盘，路由层在线程中调用（asyncio.to_thread）
+    """
+
+    def __init__(self, worker_ttl: float = WORKER_TTL):
+        self.worker_ttl = worker_ttl
+
+    @abstractmethod
+    def heartbeat(self, worker: str):
+        """刷新worker心跳"""
+        ...
+
+    @abstractmethod
+    def claim(self, key: str, worker: str) -> str:
+        """
+        认领会话
+
+        会话无持有者或持有者已下线时由worker认领
+
+        Returns:
+            str: 认领后的持有者（不是worker说明会话属于其他在线worker）
+        """
+        ...
+
+    @abstractmethod
+    def lookup(self, key: str) -> Optional[str]:
+        """查询会话的在线持有者，无持有者或持有者已下线时返回None"""
+        ...
+
+    @abstractmethod
+    def release(self, key: str, worker: str):
+        """释放会话（只释放worker自己持有的）"""
+        ...
+
+    @abstractmethod
+    def remove_worker(self, worker: str):
+        """worker下线：删除心跳和其持有的所有会话"""
+        ...
+
+    @abstractmethod
+    def list_sessions(self) -> Dict[str, str]:
+        """所有在线持有者的会话: {key: worker}"""
+        ...
+
+    def close(self):
+        pass
+
+
+class InMemorySessionDirectory(SessionDirectory):
+    """进程内会话目录（单进程部署和测试用的本地替身）"""
+
+    def __init__(self, worker_ttl: float = WORKER_TTL):
+        super().__init__(worker_ttl)
+        self._lock = threading.Lock()
+        self._workers: Dict[str, float] = {}
+        self._sessions: Dict[str, str] = {}
+
+    def _alive(self, worker: str) -> bool:
+        last_seen = self._workers.get(worker)
+        return last_seen is not None and time.time() - last_seen <= self.worker_ttl
+
+    def heartbeat(self, worker: str):
+        with self._lock:
+            self._workers[worker] = time.time()
+
+    def claim(self, key: str, worker: str) -> str:
+        with self._lock:
+            self._workers[worker] = time.time()
+            owner = self._sessions.get(key)
+            if owner is not None and owner != worker and self._alive(owner):
+                return owner
+            self._sessions[key] = worker
+            return worker
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            owner = self._sessions.get(key)
+            return owner if owner is not None and self._alive(owner) else None
+
+    def release(self, key: str, worker: str):
+        with self._lock:
+            if self._sessions.get(key) == worker:
+                del self._sessions[key]
+
+    def remove_worker(self, worker: str):
+        with self._lock:
+            self._workers.pop(worker, None)
+            for key in [k for k, owner in self._sessions.items() if owner == worker]:
+                del self._sessions[key]
+
+    def list_sessions(self) -> Dict[str, str]:
+        with self._lock:
+            return {key: owner for key, owner in self._sessions.items() if self._alive(owner)}
+
+
+class SQLiteSessionDirectory(SessionDirectory):
+    """
+    SQLite会话目录（同一主机的多个worker进程共享一个数据库文件）
+
+    使用WAL模式，读不阻塞写；认领在 BEGIN IMMEDIATE 事务中完成，多个worker同时认领时只有一个成功
+    """
+
+    def __init__(self, path: str = DIRECTORY_PATH, worker_ttl: float = WORKER_TTL):
+        super().__init__(worker_ttl)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS workers (worker TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "key TEXT PRIMARY KEY, worker TEXT NOT NULL, claimed_at REAL NOT NULL)"
+        )
+
+    def _live_owner(self, key: str) -> Optional[Tuple[str, float]]:
+        return self._conn.execute(
+            "SELECT s.worker, w.last_seen FROM sessions s JOIN workers w ON s.worker = w.worker "
+            "WHERE s.key = ? AND w.last_seen >= ?",
+            (key, time.time() - self.worker_ttl)
+        ).fetchone()
+
+    def heartbeat(self, worker: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO workers (worker, last_seen) VALUES (?, ?) "
+                "ON CONFLICT(worker) DO UPDATE SET last_seen = excluded.last_seen",
+                (worker, time.time())
+            )
+
+    def claim(self, key: str, worker: str) -> str:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO workers (worker, last_seen) VALUES (?, ?) "
+                    "ON CONFLICT(worker) DO UPDATE SET last_seen = excluded.last_seen",
+                    (worker, now)
+                )
+                row = self._live_owner(key)
+                if row is not None and row[0] != worker:
+                    self._conn.execute("COMMIT")
+                    return row[0]
+                self._conn.execute(
+                    "INSERT INTO sessions (key, worker, claimed_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET worker = excluded.worker, claimed_at = excluded.claimed_at",
+                    (key, worker, now)
+                )
+                self._conn.execute("COMMIT")
+                return worker
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._live_owner(key)
+        return row[0] if row else None
+
+    def release(self, key: str, worker: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE key = ? AND worker = ?", (key, worker))
+
+    def remove_worker(self, worker: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE worker = ?", (worker,))
+            self._conn.execute("DELETE FROM workers WHERE worker = ?", (worker,))
+
+    def list_sessions(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.key, s.worker FROM sessions s JOIN workers w ON s.worker = w.worker "
+                "WHERE w.last_seen >= ?",
+                (time.time() - self.worker_ttl,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ========== 全局会话目录 ==========
+
+_session_directory: Optional[SessionDirectory] = None
+
+
+def get_session_directory() -> Optional[SessionDirectory]:
+    """获取全局会话目录（单worker模式下为None）"""
+    global _session_directory
+
+    if _session_directory is None and WORKER_URL:
+        if DIRECTORY_BACKEND == "memory":
+            _session_directory = InMemorySessionDirectory()
+        else:
+            _session_directory = SQLiteSessionDirectory()
+        logger.info(f"🗂️ 语音会话目录已启用: backend={DIRECTORY_BACKEND}, worker={WORKER_URL}")
+    return _session_directory
+
+
+def set_session_directory(directory: Optional[SessionDirectory]):
+    """替换全局会话目录（接入其他共享存储或测试替身）"""
+    global _session_directory
+    _session_directory = directory
+
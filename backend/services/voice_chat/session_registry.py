@@ -0,0 +1,290 @@
+"""
+PocketSpeak 语音会话注册表
+
+按用户/设备管理多个语音会话，替代进程级单例：
+1. 每个key（已登录用户、设备ID或默认）一个独立的会话，独立初始化和关闭
+2. 空闲会话超时自动回收（有前端WebSocket连接或正在对话的会话不回收）
+3. 会话数上限：达到上限时回收最久未活动的空闲会话，仍无法腾出时拒绝创建
+4. 提供每个会话的统计信息
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 未登录且没有设备ID的请求使用的key（单用户部署的行为与原来的全局单例一致）
+DEFAULT_SESSION_KEY = "default"
+
+# 会话数上限和空闲超时（秒），可通过环境变量调整
+MAX_SESSIONS = int(os.getenv("VOICE_MAX_SESSIONS", "20"))
+SESSION_IDLE_TIMEOUT = float(os.getenv("VOICE_SESSION_IDLE_TIMEOUT", "1800"))
+
+# 这些状态下会话正在对话，不视为空闲
+_BUSY_STATES = {"listening", "processing", "speaking"}
+
+
+class SessionLimitError(Exception):
+    """会话数已达上限且没有可回收的空闲会话"""
+    pass
+
+
+@dataclass
+class SessionEntry:
+    """注册表条目"""
+    key: str
+    session: Any
+    created_at: float = field(default_factory=time.time)
+    last_active: float = field(default_factory=time.monotonic)
+    connections: int = 0  # 当前前端WebSocket连接数
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_active
+
+    @property
+    def is_busy(self) -> bool:
+        """有前端连接或正在对话"""
+        state = getattr(self.session, "state", None)
+        return self.connections > 0 or getattr(state, "value", None) in _BUSY_STATES
+
+
+class VoiceSessionRegistry:
+    """
+    语音会话注册表
+
+    会话对象需提供: initialize()、close() 协程，is_initialized、state 属性
+    和 get_session_stats()（即VoiceSessionManager）
+    """
+
+    def __init__(self,
+                 factory: Callable[..., Any],
+                 max_sessions: int = MAX_SESSIONS,
+                 idle_timeout: float = SESSION_IDLE_TIMEOUT,
+                 sweep_interval: float = 60.0):
+        """
+        初始化注册表
+
+        Args:
+            factory: 会话构造函数，create()的额外参数原样传入
+            max_sessions: 最大会话数
+            idle_timeout: 空闲超时（秒），<=0表示不自动回收
+            sweep_interval: 空闲检查间隔（秒）
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+
+        self._entries: Dict[str, SessionEntry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+
+        # 会话被移除时的回调（手动关闭、空闲/容量回收），参数为会话key
+        self.on_session_closed: Optional[Callable[[str], None]] = None
+
+        self.stats = {
+            "created": 0,
+            "closed": 0,
+            "idle_evicted": 0,
+            "capacity_evicted": 0,
+            "rejected": 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> List[str]:
+        return list(self._entries.keys())
+
+    def get(self, key: str = DEFAULT_SESSION_KEY, touch: bool = True) -> Optional[Any]:
+        """
+        获取会话
+
+        Args:
+            key: 会话key
+            touch: 是否刷新活动时间
+
+        Returns:
+            会话对象，不存在时返回None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if touch:
+            entry.last_active = time.monotonic()
+        return entry.session
+
+    async def create(self, key: str, *args, **kwargs) -> bool:
+        """
+        创建并初始化会话（已存在时直接返回True）
+
+        Args:
+            key: 会话key
+            *args, **kwargs: 传给factory的参数
+
+        Returns:
+            bool: 初始化是否成功
+
+        Raises:
+            SessionLimitError: 会话数已达上限且没有可回收的空闲会话
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key in self._entries:
+                logger.warning(f"语音会话已经初始化: {key}")
+                self._entries[key].last_active = time.monotonic()
+                return True
+
+            if len(self._entries) >= self.max_sessions:
+                await self._evict_for_capacity()
+
+            session = self.factory(*args, **kwargs)
+            entry = SessionEntry(key=key, session=session)
+            self._entries[key] = entry
+            self.stats["created"] += 1
+            self._ensure_sweeper()
+
+            try:
+                success = await session.initialize()
+            except Exception as e:
+                logger.error(f"语音会话初始化异常({key}): {e}", exc_info=True)
+                success = False
+
+            if not success:
+                # 初始化失败不占用名额（与原单例不同，失败的会话不保留）
+                self._entries.pop(key, None)
+                try:
+                    await session.close()
+                except Exception as e:
+                    logger.debug(f"关闭初始化失败的会话出错({key}): {e}")
+                return False
+
+            logger.info(f"✅ 语音会话已创建: {key} (当前 {len(self._entries)}/{self.max_sessions})")
+            return True
+
+    async def close(self, key: str = DEFAULT_SESSION_KEY) -> bool:
+        """
+        关闭并移除会话
+
+        Returns:
+            bool: 会话是否存在
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        try:
+            await entry.session.close()
+        except Exception as e:
+            logger.error(f"关闭语音会话失败({key}): {e}", exc_info=True)
+
+        self._locks.pop(key, None)
+        self.stats["closed"] += 1
+        if self.on_session_closed:
+            try:
+                self.on_session_closed(key)
+            except Exception as e:
+                logger.debug(f"会话关闭回调出错({key}): {e}")
+        logger.info(f"语音会话已关闭: {key} (剩余 {len(self._entries)})")
+        return True
+
+    async def close_all(self):
+        """关闭所有会话并停止空闲检查"""
+        if self._sweeper:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+        for key in list(self._entries.keys()):
+            await self.close(key)
+
+    def connection_opened(self, key: str):
+        """前端WebSocket连接建立（有连接的会话不会被回收）"""
+        entry = self._entries.get(key)
+        if entry:
+            entry.connections += 1
+            entry.last_active = time.monotonic()
+
+    def connection_closed(self, key: str):
+        """前端WebSocket连接断开（从此刻开始计算空闲时间）"""
+        entry = self._entries.get(key)
+        if entry:
+            entry.connections = max(entry.connections - 1, 0)
+            entry.last_active = time.monotonic()
+
+    async def evict_idle(self) -> List[str]:
+        """
+        回收空闲超时的会话
+
+        Returns:
+            List[str]: 被回收的会话key
+        """
+        if self.idle_timeout <= 0:
+            return []
+
+        expired = [
+            key for key, entry in self._entries.items()
+            if not entry.is_busy and entry.idle_seconds > self.idle_timeout
+        ]
+        for key in expired:
+            logger.info(f"🧹 回收空闲语音会话: {key}")
+            await self.close(key)
+            self.stats["idle_evicted"] += 1
+        return expired
+
+    async def _evict_for_capacity(self):
+        """达到上限时回收最久未活动的空闲会话"""
+        idle = [entry for entry in self._entries.values() if not entry.is_busy]
+        if not idle:
+            self.stats["rejected"] += 1
+            raise SessionLimitError(f"语音会话数已达上限({self.max_sessions})")
+
+        oldest = min(idle, key=lambda entry: entry.last_active)
+        logger.warning(f"⚠️ 语音会话数已达上限，回收最久未活动的会话: {oldest.key}")
+        await self.close(oldest.key)
+        self.stats["capacity_evicted"] += 1
+
+    def _ensure_sweeper(self):
+        if self.idle_timeout <= 0 or (self._sweeper and not self._sweeper.done()):
+            return
+        self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        try:
+            while True:
+                await asyncio.sleep(self.sweep_interval)
+                try:
+                    await self.evict_idle()
+                except Exception as e:
+                    logger.error(f"空闲会话回收失败: {e}", exc_info=True)
+        except asyncio.CancelledError:
+            logger.debug("空闲会话回收任务已取消")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取注册表和每个会话的统计信息"""
+        sessions = {}
+        for key, entry in self._entries.items():
+            state = getattr(entry.session, "state", None)
+            sessions[key] = {
+                "state": getattr(state, "value", None),
+                "connections": entry.connections,
+                "idle_seconds": round(entry.idle_seconds, 1),
+                "created_at": entry.created_at,
+                "stats": entry.session.get_session_stats()
+            }
+        return {
+            **self.stats,
+            "active_sessions": len(self._entries),
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout,
+            "sessions": sessions
+        }
@@ -0,0 +1,303 @@
+"""
+PocketSpeak 纯软件音频编解码后端
+
+与 py-xiaozhi AudioCodec 接口兼容的无声卡实现，用于容器部署和压测：
+1. 上行：从内存PCM或WAV文件读取音频，按帧OPUS编码后通过回调送出（可按实时节奏或尽快发送）
+2. 下行：OPUS解码后写入空设备（丢弃）或WAV文件，按音频时长模拟播放完成
+
+通过 RecordingConfig / PlaybackConfig 的 codec_backend="software" 选择，
+默认值可由环境变量 VOICE_AUDIO_BACKEND 设置；硬件后端只在选中时才导入
+"""
+
+import array
+import asyncio
+import logging
+import os
+import time
+import wave
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CODEC_BACKEND_HARDWARE = "hardware"
+CODEC_BACKEND_SOFTWARE = "software"
+
+# 默认编解码后端（容器部署可设为software）
+DEFAULT_CODEC_BACKEND = os.getenv("VOICE_AUDIO_BACKEND", CODEC_BACKEND_HARDWARE)
+
+
+def _resample_pcm16(pcm: bytes, src_rate: int, dst_rate: int) -> bytes:
+    """16-bit单声道PCM线性插值重采样（只在加载音频源时执行一次）"""
+    if src_rate == dst_rate or not pcm:
+        return pcm
+
+    src = array.array("h", pcm)
+    dst_len = max(1, len(src) * dst_rate // src_rate)
+    step = src_rate / dst_rate
+    last = len(src) - 1
+    dst = array.array("h", bytes(dst_len * 2))
+    for i in range(dst_len):
+        pos = i * step
+        j = int(pos)
+        if j >= last:
+            dst[i] = src[last]
+        else:
+            frac = pos - j
+            dst[i] = int(src[j] + (src[j + 1] - src[j]) * frac)
+    return dst.tobytes()
+
+
+def _downmix_pcm16(pcm: bytes, channels: int) -> bytes:
+    """多声道16-bit PCM混为单声道"""
+    if channels == 1:
+        return pcm
+    samples = array.array("h", pcm)
+    mono = array.array("h", (
+        sum(samples[i:i + channels]) // channels
+        for i in range(0, len(samples) - channels + 1, channels)
+    ))
+    return mono.tobytes()
+
+
+def load_wav_pcm(path: str, sample_rate: int = 16000) -> bytes:
+    """
+    读取WAV文件为指定采样率的16-bit单声道PCM
+
+    Raises:
+        ValueError: 不是16-bit PCM WAV
+    """
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"只支持16-bit PCM WAV: {path}")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        pcm = wav.readframes(wav.getnframes())
+
+    return _resample_pcm16(_downmix_pcm16(pcm, channels), rate, sample_rate)
+
+
+class SoftwareAudioCodec:
+    """
+    无声卡音频编解码器（AudioCodec的替身）
+
+    实现会话用到的接口：initialize / set_encoded_audio_callback / start_streams / stop_streams /
+    clear_audio_queue / write_audio / wait_for_audio_complete / toggle_aec / close
+    """
+
+    def __init__(self,
+                 source: Union[str, bytes, None] = None,
+                 sink_path: Optional[str] = None,
+                 input_sample_rate: int = 16000,
+                 output_sample_rate: int = 24000,
+                 channels: int = 1,
+                 frame_duration: int = 40,
+                 realtime: bool = True,
+                 loop_source: bool = False):
+        """
+        初始化软件编解码器
+
+        Args:
+            source: 上行音频源，WAV文件路径或16-bit PCM（input_sample_rate单声道）；None时发送静音
+            sink_path: 下行音频写入的WAV文件路径，None时丢弃
+            input_sample_rate: 上行采样率（小智AI为16kHz）
+            output_sample_rate: 下行采样率（小智AI为24kHz）
+            channels: 声道数
+            frame_duration: 帧时长（毫秒）
+            realtime: 是否按实时节奏发送上行帧/模拟播放时长（压测吞吐时可关闭）
+            loop_source: 音频源读完后是否循环（否则之后发送静音）
+        """
+        self.source = source
+        self.sink_path = sink_path
+        self.input_sample_rate = input_sample_rate
+        self.output_sample_rate = output_sample_rate
+        self.channels = channels
+        self.frame_duration = frame_duration
+        self.realtime = realtime
+        self.loop_source = loop_source
+
+        # 与AudioCodec一致的设备信息属性
+        self.device_input_sample_rate = input_sample_rate
+        self.device_output_sample_rate = output_sample_rate
+        self.mic_device_id = CODEC_BACKEND_SOFTWARE
+        self.speaker_device_id = CODEC_BACKEND_SOFTWARE
+
+        self._input_frame_bytes = input_sample_rate * frame_duration // 1000 * 2 * channels
+        self._output_frame_size = output_sample_rate * frame_duration // 1000
+        self._source_pcm = b""
+        self._source_pos = 0
+        self._encoder = None
+        self._decoder = None
+        self._encoded_callback: Optional[Callable[[bytes], None]] = None
+        self._capture_task: Optional[asyncio.Task] = None
+        self._sink: Optional[wave.Wave_write] = None
+        self._playback_deadline = 0.0
+
+        self.stats = {
+            "frames_encoded": 0,
+            "frames_played": 0,
+            "bytes_played": 0,
+            "decode_errors": 0
+        }
+
+    async def initialize(self):
+        """加载音频源并创建OPUS编码器"""
+        import opuslib
+
+        self._encoder = opuslib.Encoder(self.input_sample_rate, self.channels, opuslib.APPLICATION_VOIP)
+        if isinstance(self.source, str):
+            self._source_pcm = load_wav_pcm(self.source, self.input_sample_rate)
+            logger.info(f"🎧 软件音频源: {self.source} ({len(self._source_pcm)} bytes PCM)")
+        elif self.source:
+            self._source_pcm = bytes(self.source)
+        self._source_pos = 0
+
+    def set_encoded_audio_callback(self, callback: Callable[[bytes], None]):
+        self._encoded_callback = callback
+
+    # ========== 上行（采集 + 编码） ==========
+
+    def _next_input_frame(self) -> bytes:
+        """从音频源读取一帧PCM，源读完后循环或补静音"""
+        size = self._input_frame_bytes
+        if self._source_pos >= len(self._source_pcm) and self.loop_source and self._source_pcm:
+            self._source_pos = 0
+
+        frame = self._source_pcm[self._source_pos:self._source_pos + size]
+        self._source_pos += size
+        if len(frame) < size:
+            frame += bytes(size - len(frame))
+        return frame
+
+    def encode_frame(self, pcm: bytes) -> bytes:
+        """编码一帧PCM为OPUS包"""
+        samples = len(pcm) // (2 * self.channels)
+        return self._encoder.encode(pcm, samples)
+
+    async def _capture_loop(self):
+        interval = self.frame_duration / 1000
+        next_tick = time.monotonic()
+        try:
+            while True:
+                packet = self.encode_frame(self._next_input_frame())
+                self.stats["frames_encoded"] += 1
+                if self._encoded_callback:
+                    self._encoded_callback(packet)
+
+                if self.realtime:
+                    next_tick += interval
+                    await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+                else:
+                    await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            raise
+
+    async def start_streams(self):
+        """开始"采集"：有上行回调时按帧发送音频源"""
+        if self._encoder is None or self._encoded_callback is None:
+            return
+        if self._capture_task is None or self._capture_task.done():
+            self._capture_task = asyncio.create_task(self._capture_loop())
+
+    async def stop_streams(self):
+        if self._capture_task:
+            self._capture_task.cancel()
+            try:
+                await self._capture_task
+            except asyncio.CancelledError:
+                pass
+            self._capture_task = None
+
+    async def clear_audio_queue(self):
+        """清空待播放音频（模拟播放立即结束）"""
+        self._playback_deadline = 0.0
+
+    # ========== 下行（解码 + 播放） ==========
+
+    def _decode(self, data: bytes) -> Optional[bytes]:
+        import opuslib
+
+        if self._decoder is None:
+            self._decoder = opuslib.Decoder(self.output_sample_rate, self.channels)
+        try:
+            return self._decoder.decode(data, frame_size=self._output_frame_size, decode_fec=False)
+        except opuslib.OpusError as e:
+            self.stats["decode_errors"] += 1
+            logger.warning(f"软件播放解码失败，跳过此帧: {e}")
+            return None
+
+    def _open_sink(self) -> Optional[wave.Wave_write]:
+        if self.sink_path and self._sink is None:
+            directory = os.path.dirname(self.sink_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._sink = wave.open(self.sink_path, "wb")
+            self._sink.setnchannels(self.channels)
+            self._sink.setsampwidth(2)
+            self._sink.setframerate(self.output_sample_rate)
+        return self._sink
+
+    async def write_audio(self, data: bytes, format: str = "opus"):
+        """
+        "播放"一段音频：写入WAV文件或丢弃，并累计模拟播放时长
+
+        Args:
+            data: OPUS包或16-bit PCM
+            format: opus 或 pcm
+        """
+        pcm = self._decode(data) if format == "opus" else data
+        if not pcm:
+            return
+
+        sink = self._open_sink()
+        if sink:
+            sink.writeframes(pcm)
+
+        self.stats["frames_played"] += 1
+        self.stats["bytes_played"] += len(pcm)
+        duration = len(pcm) / (self.output_sample_rate * self.channels * 2)
+        self._playback_deadline = max(self._playback_deadline, time.monotonic()) + duration
+
+    async def wait_for_audio_complete(self, timeout: float = 10.0):
+        """等待模拟播放结束（realtime关闭时立即返回）"""
+        if not self.realtime:
+            return
+        remaining = self._playback_deadline - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(min(remaining, timeout))
+
+    # ========== AEC（软件后端无回声，接口兼容） ==========
+
+    def toggle_aec(self, enabled: bool) -> bool:
+        return False
+
+    def is_aec_enabled(self) -> bool:
+        return False
+
+    def get_aec_status(self) -> Dict[str, Any]:
+        return {"enabled": False, "backend": CODEC_BACKEND_SOFTWARE}
+
+    async def close(self):
+        await self.stop_streams()
+        if self._sink:
+            self._sink.close()
+            self._sink = None
+
+
+def create_audio_codec(backend: str, **software_options) -> Any:
+    """
+    按后端名称创建音频编解码器
+
+    Args:
+        backend: hardware（py-xiaozhi AudioCodec，需要声卡）或 software
+        **software_options: 传给SoftwareAudioCodec的参数
+
+    Raises:
+        ValueError: 未知后端
+    """
+    if backend == CODEC_BACKEND_SOFTWARE:
+        return SoftwareAudioCodec(**software_options)
+    if backend == CODEC_BACKEND_HARDWARE:
+        # 延迟导入：无声卡环境导入硬件后端可能失败
+        from libs.py_xiaozhi.src.audio_codecs.audio_codec import AudioCodec
+        return AudioCodec()
+    raise ValueError(f"未知的音频编解码后端: {backend}")
@@ -7,16 +7,23 @@ PocketSpeak 语音录制和发送模块
 
 import asyncio
 import logging
-from typing import Optional, Callable, Dict, Any
+import os
+import threading
+from collections import deque
+from typing import Optional, Callable, Dict, Any, Deque, List
 from dataclasses import dataclass
 import numpy as np
 
-# 导入py-xiaozhi的音频编解码器
-from libs.py_xiaozhi.src.audio_codecs.audio_codec import AudioCodec
 from libs.py_xiaozhi.src.constants.constants import AudioConfig
 
+# 音频编解码后端（硬件AudioCodec在选中时才导入）
+from services.voice_chat.software_audio_codec import create_audio_codec, DEFAULT_CODEC_BACKEND
+
 logger = logging.getLogger(__name__)
 
+# 常开采集（麦克风流保持运行，开始录音时先补发预录帧），可通过环境变量默认开启
+WARM_CAPTURE_DEFAULT = os.getenv("VOICE_WARM_CAPTURE", "0") == "1"
+
 
 @dataclass
 class RecordingConfig:
@@ -25,6 +32,11 @@ class RecordingConfig:
     channels: int = AudioConfig.CHANNELS  # 1
     frame_duration: int = AudioConfig.FRAME_DURATION  # 40ms
     enable_aec: bool = True  # 声学回声消除
+    codec_backend: str = DEFAULT_CODEC_BACKEND  # hardware（声卡）| software（无设备，见software_audio_codec）
+    source_path: Optional[str] = None  # software后端的上行音频源WAV，None时发送静音
+    loop_source: bool = False  # software后端音频源读完后循环
+    warm_capture: bool = WARM_CAPTURE_DEFAULT  # 常开采集：初始化后音频流一直运行，不在每次按下时启动
+    pre_roll_ms: int = 300  # 常开采集时保留的预录时长，开始录音时先发送
 
 
 class SpeechRecorder:
@@ -46,10 +58,19 @@ class SpeechRecorder:
             config: 录音配置，如果为None则使用默认配置
         """
         self.config = config or RecordingConfig()
-        self.audio_codec: Optional[AudioCodec] = None
+        self.audio_codec = None
         self.is_recording = False
         self.is_initialized = False
 
+        # 常开采集：未录音时编码帧进入预录环形缓冲（由音频线程写入）
+        self.is_warm = False
+        self._pre_roll: Deque[bytes] = deque(maxlen=max(1, self.config.pre_roll_ms // self.config.frame_duration))
+        self._capture_lock = threading.Lock()
+        self.stats = {
+            "pre_roll_flushed": 0,
+            "warm_starts": 0
+        }
+
         # 编码音频数据回调函数
         self.on_audio_encoded: Optional[Callable[[bytes], None]] = None
 
@@ -71,7 +92,14 @@ class SpeechRecorder:
             logger.info("正在初始化音频设备...")
 
             # 创建音频编解码器实例
-            self.audio_codec = AudioCodec()
+            self.audio_codec = create_audio_codec(
+                self.config.codec_backend,
+                source=self.config.source_path,
+                input_sample_rate=self.config.sample_rate,
+                channels=self.config.channels,
+                frame_duration=self.config.frame_duration,
+                loop_source=self.config.loop_source
+            )
 
             # 初始化音频设备
             await self.audio_codec.initialize()
@@ -86,6 +114,9 @@ class SpeechRecorder:
 
             self.is_initialized = True
             logger.info("音频设备初始化成功")
+
+            if self.config.warm_capture:
+                await self.start_warm_capture()
             return True
 
         except Exception as e:
@@ -103,11 +134,47 @@ class SpeechRecorder:
             encoded_data: OPUS编码的音频数据
         """
         try:
-            if self.is_recording and self.on_audio_encoded:
-                self.on_audio_encoded(encoded_data)
+            with self._capture_lock:
+                if self.is_recording:
+                    if self.on_audio_encoded:
+                        self.on_audio_encoded(encoded_data)
+                elif self.is_warm:
+                    self._pre_roll.append(encoded_data)
         except Exception as e:
             logger.error(f"处理编码音频数据失败: {e}")
 
+    async def start_warm_capture(self) -> bool:
+        """
+        开启常开采集：启动音频流并保持运行，未录音时只保留最近pre_roll_ms的编码帧
+
+        Returns:
+            bool: 是否成功开启
+        """
+        if not self.is_initialized:
+            return False
+        if self.is_warm:
+            return True
+
+        try:
+            await self.audio_codec.start_streams()
+            self.is_warm = True
+            logger.info(f"🔥 常开采集已开启 (预录 {self._pre_roll.maxlen * self.config.frame_duration}ms)")
+            return True
+        except Exception as e:
+            logger.error(f"开启常开采集失败，回退到按需启动音频流: {e}")
+            return False
+
+    async def stop_warm_capture(self):
+        """关闭常开采集并停止音频流"""
+        if not self.is_warm:
+            return
+        with self._capture_lock:
+            self.is_warm = False
+            self._pre_roll.clear()
+        if not self.is_recording:
+            await self.audio_codec.stop_streams()
+        logger.info("常开采集已关闭")
+
     async def start_recording(self) -> bool:
         """
         开始录音
@@ -127,11 +194,24 @@ class SpeechRecorder:
             return True
 
         try:
-            # 启动音频流
-            await self.audio_codec.start_streams()
-
-            self.is_recording = True
-            logger.info("开始录音")
+            if self.is_warm:
+                # 常开采集：音频流已在运行，先按顺序补发预录帧，再切换为实时发送
+                with self._capture_lock:
+                    pre_roll: List[bytes] = list(self._pre_roll)
+                    self._pre_roll.clear()
+                    if self.on_audio_encoded:
+                        for frame in pre_roll:
+                            self.on_audio_encoded(frame)
+                    self.is_recording = True
+                self.stats["warm_starts"] += 1
+                self.stats["pre_roll_flushed"] += len(pre_roll)
+                logger.info(f"开始录音（常开采集，补发预录 {len(pre_roll)} 帧）")
+            else:
+                # 启动音频流
+                await self.audio_codec.start_streams()
+
+                self.is_recording = True
+                logger.info("开始录音")
 
             if self.on_recording_started:
                 self.on_recording_started()
@@ -157,10 +237,12 @@ class SpeechRecorder:
             return True
 
         try:
-            self.is_recording = False
+            with self._capture_lock:
+                self.is_recording = False
 
-            # 停止音频流
-            await self.audio_codec.stop_streams()
+            # 停止音频流（常开采集时保持运行，继续填充预录缓冲）
+            if not self.is_warm:
+                await self.audio_codec.stop_streams()
 
             logger.info("停止录音")
 
@@ -218,7 +300,10 @@ class SpeechRecorder:
                 "channels": self.config.channels,
                 "frame_duration": self.config.frame_duration,
                 "enable_aec": self.config.enable_aec
-            }
+            },
+            "warm_capture": self.is_warm,
+            "pre_roll_frames": len(self._pre_roll),
+            "stats": dict(self.stats)
         }
 
         if self.audio_codec:
@@ -269,6 +354,7 @@ class SpeechRecorder:
         try:
             if self.is_recording:
                 await self.stop_recording()
+            await self.stop_warm_capture()
 
             if self.audio_codec:
                 await self.audio_codec.close()
@@ -0,0 +1,51 @@
+"""
+AI响应解析器 - 单元测试
+"""
+
+import pytest
+
+from ai_response_parser import AIResponseParser, MessageType, OpusPacket
+
+
+def test_audio_packet_fast_path():
+    """测试二进制音频直接以OpusPacket交给音频回调"""
+    parser = AIResponseParser(downlink_sample_rate=24000)
+    received = []
+    parser.on_audio_received = received.append
+
+    packet = parser.parse_audio_packet(b"\x01\x02\x03")
+
+    assert received == [packet]
+    assert isinstance(packet, OpusPacket)
+    assert (packet.data, packet.format, packet.sample_rate, packet.channels) == (b"\x01\x02\x03", "opus", 24000, 1)
+    assert packet.size == 3
+    assert not hasattr(packet, "__dict__")
+    assert parser.stats["audio_messages"] == 1 and parser.stats["total_messages"] == 1
+
+
+@pytest.mark.parametrize("message, expected", [
+    ({"type": "stt", "text": "你好"}, MessageType.STT),
+    ({"type": "llm", "text": "😊", "emotion": "happy"}, MessageType.EMOJI),
+    ({"type": "llm", "text": "普通文本"}, MessageType.TEXT),
+    ({"type": "tts", "state": "sentence_start", "text": "你好"}, MessageType.TTS),
+    ({"type": "tts", "content": {"text": "x"}}, MessageType.MCP),
+    ({"type": "mcp", "payload": {}}, MessageType.MCP),
+    ({"type": "tts", "state": "stop", "error": "x"}, MessageType.ERROR),
+    ({"type": "hello", "transport": "websocket"}, MessageType.UNKNOWN),
+])
+def test_type_routing_matches_rules(message, expected):
+    """测试按type路由与原有规则识别结果一致"""
+    assert AIResponseParser().parse_message(message).message_type == expected
+
+
+def test_tts_stop_and_sentence_text():
+    """测试TTS stop标记和句子文本回调"""
+    parser = AIResponseParser()
+    texts = []
+    parser.on_text_received = texts.append
+
+    parser.parse_message({"type": "tts", "state": "sentence_start", "text": "第一句"})
+    stop = parser.parse_message({"type": "tts", "state": "stop"})
+
+    assert texts == ["第一句"]
+    assert stop.raw_message["tts_stop"] is True
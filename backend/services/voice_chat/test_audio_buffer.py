@@ -326,6 +326,24 @@ def test_create_sentence_buffer_func():
     assert sentence_buffer.audio_buffer.maxsize == 500
 
 
+def test_sentence_buffer_clear():
+    """测试打断时清空句子和音频缓冲"""
+    async def run():
+        sentence_buffer = create_sentence_buffer()
+        for i in range(3):
+            chunk = AudioChunk(chunk_id=f"chunk_{i}", audio_data=b'\x00' * 960, text=f"句子{i}")
+            await sentence_buffer.add_sentence(f"sentence_{i}", f"句子{i}", chunk)
+        await sentence_buffer.get_next_sentence()
+        return sentence_buffer, sentence_buffer.clear()
+
+    sentence_buffer, dropped = asyncio.run(run())
+
+    assert dropped == 2
+    assert sentence_buffer.sentence_queue.qsize() == 0
+    assert sentence_buffer.audio_buffer.is_empty()
+    assert sentence_buffer.current_sentence_id is None
+
+
 # ============ 压力测试 ============
 
 @pytest.mark.asyncio
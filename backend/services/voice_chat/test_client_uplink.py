@@ -0,0 +1,66 @@
+"""
+前端上行音频门控 - 单元测试
+
+只有以client来源监听时，前端通过/ws上传的OPUS帧才进入上行缓冲
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# voice_session_manager 以 services.* 包路径导入依赖，需要backend目录在sys.path中（同 setup_paths.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+voice_session_manager = pytest.importorskip("services.voice_chat.voice_session_manager")
+
+from services.voice_chat.voice_session_manager import (  # noqa: E402
+    MAX_CLIENT_UPLINK_PACKET, UPLINK_SOURCE_CLIENT, UPLINK_SOURCE_SERVER, SessionState, VoiceSessionManager
+)
+from services.voice_chat.ws_client import WSConfig  # noqa: E402
+
+
+class _FakeSender:
+    """记录提交的上行帧"""
+
+    def __init__(self):
+        self.frames = []
+
+    def submit(self, frame: bytes) -> bool:
+        self.frames.append(frame)
+        return True
+
+
+def _listening_session(source: str = UPLINK_SOURCE_CLIENT) -> VoiceSessionManager:
+    session = VoiceSessionManager(device_manager=None, ws_config=WSConfig(capture_dir=None))
+    session.uplink_vad = None
+    session.uplink_sender = _FakeSender()
+    session.state = SessionState.LISTENING
+    session._uplink_source = source
+    return session
+
+
+def test_client_frame_forwarded_while_listening():
+    """测试client来源监听中的帧原样进入上行缓冲"""
+    session = _listening_session()
+
+    assert session.submit_client_audio(b"opus")
+
+    assert session.uplink_sender.frames == [b"opus"]
+    assert session.stats["uplink_client_frames"] == 1
+
+
+@pytest.mark.parametrize("state, source, frame", [
+    (SessionState.READY, UPLINK_SOURCE_CLIENT, b"opus"),
+    (SessionState.LISTENING, UPLINK_SOURCE_SERVER, b"opus"),
+    (SessionState.LISTENING, UPLINK_SOURCE_CLIENT, b""),
+    (SessionState.LISTENING, UPLINK_SOURCE_CLIENT, b"\x00" * (MAX_CLIENT_UPLINK_PACKET + 1)),
+])
+def test_client_frame_dropped(state, source, frame):
+    """测试未监听、本机录音来源、空帧和超长帧都被丢弃并计数"""
+    session = _listening_session(source)
+    session.state = state
+
+    assert not session.submit_client_audio(frame)
+
+    assert session.uplink_sender.frames == []
+    assert session.stats["uplink_client_frames_dropped"] == 1
@@ -0,0 +1,122 @@
+"""
+前端WebSocket出站写入器 - 单元测试
+"""
+
+import asyncio
+
+from client_writer import ClientOutboundWriter
+
+
+class FakeWebSocket:
+    """记录发送内容的假WebSocket"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def send_json(self, payload):
+        await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+    async def send_bytes(self, payload):
+        await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+
+def test_control_has_priority_over_audio():
+    """测试控制事件优先于音频"""
+    ws = FakeWebSocket()
+
+    async def run():
+        writer = ClientOutboundWriter(ws)
+        writer.send_audio(b'a1')
+        writer.send_audio(b'a2')
+        writer.send_json({"type": "text", "data": "hi"})
+        writer.start()
+        await asyncio.sleep(0.05)
+        await writer.close()
+
+    asyncio.run(run())
+
+    assert ws.sent == [{"type": "text", "data": "hi"}, b'a1', b'a2']
+
+
+def test_state_changes_coalesced():
+    """测试相同key的控制事件被合并"""
+    ws = FakeWebSocket()
+
+    async def run():
+        writer = ClientOutboundWriter(ws)
+        writer.send_json({"type": "state_change", "data": {"state": "listening"}}, coalesce_key="state")
+        writer.send_json({"type": "state_change", "data": {"state": "processing"}}, coalesce_key="state")
+        writer.start()
+        await asyncio.sleep(0.05)
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+
+    assert ws.sent == [{"type": "state_change", "data": {"state": "processing"}}]
+    assert writer.stats["control_coalesced"] == 1
+
+
+def test_audio_queue_bounded():
+    """测试音频队列有界并标记慢连接"""
+    ws = FakeWebSocket()
+
+    async def run():
+        writer = ClientOutboundWriter(ws, max_audio_queue=3)
+        writer.start()
+        for i in range(10):
+            writer.send_audio(bytes([i]))
+        stats = writer.get_stats()
+        await writer.close()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats["audio_queue_depth"] == 3
+    assert stats["audio_dropped"] == 7
+    assert stats["is_slow"]
+
+
+def test_stale_audio_dropped_for_slow_client():
+    """测试慢连接下丢弃过期音频"""
+    ws = FakeWebSocket(delay=0.03)
+
+    async def run():
+        writer = ClientOutboundWriter(ws, slow_send_ms=10, stale_audio_ms=20)
+        writer.start()
+        for i in range(5):
+            writer.send_audio(bytes([i]))
+        await asyncio.sleep(0.3)
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+
+    assert writer.stats["stale_audio_dropped"] > 0
+    assert len(ws.sent) < 5
+
+
+def test_custom_json_dumps_sends_text_frames():
+    """测试传入json_dumps时控制事件以文本帧发送"""
+    class TextWebSocket(FakeWebSocket):
+        async def send_text(self, payload):
+            self.sent.append(payload)
+
+    ws = TextWebSocket()
+
+    async def run():
+        writer = ClientOutboundWriter(ws, json_dumps=lambda payload: f"<{payload['type']}>")
+        writer.send_json({"type": "state_change"})
+        writer.send_audio(b'a1')
+        writer.start()
+        await asyncio.sleep(0.05)
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+
+    assert ws.sent == ["<state_change>", b'a1']
+    assert writer.stats["control_sent"] == 1
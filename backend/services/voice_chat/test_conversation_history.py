@@ -0,0 +1,96 @@
+"""
+对话历史存储 - 单元测试
+"""
+
+from datetime import datetime, timedelta
+
+from conversation_history import ConversationHistory, DecodedAudioCache, HistoryAudioBudget
+
+
+class FakeMessage:
+    """只实现历史存储所需接口的假消息"""
+
+    def __init__(self, message_id: str, audio_bytes: int, age_seconds: int = 0):
+        self.message_id = message_id
+        self.timestamp = datetime.now() - timedelta(seconds=age_seconds)
+        self.encoded_audio_size = audio_bytes
+        self.compacted = False
+
+    def compact(self) -> int:
+        if self.compacted:
+            return 0
+        self.compacted = True
+        return 100
+
+    def drop_audio(self) -> int:
+        freed = self.encoded_audio_size
+        self.encoded_audio_size = 0
+        return freed
+
+
+def test_lru_evicts_least_recently_used():
+    """测试LRU按字节上限淘汰最久未使用的条目"""
+    cache = DecodedAudioCache(max_bytes=10)
+    cache.put("a", b"x" * 4)
+    cache.put("b", b"x" * 4)
+    assert cache.get("a") is not None
+    cache.put("c", b"x" * 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.byte_size == 8
+    assert cache.stats["evictions"] == 1
+
+
+def test_add_is_idempotent_and_compacts_previous():
+    """测试同一消息重复保存只记一次，新消息加入时压缩之前的消息"""
+    history = ConversationHistory(global_budget=HistoryAudioBudget(10 ** 9))
+    first = FakeMessage("m1", 10)
+    second = FakeMessage("m2", 10)
+
+    assert history.add(first)
+    assert not history.add(first)
+    assert not first.compacted
+
+    assert history.add(second)
+    assert first.compacted
+    assert not second.compacted
+    assert len(history) == 2
+
+
+def test_max_messages_trims_oldest():
+    """测试超出条数上限时移除最旧消息"""
+    history = ConversationHistory(max_messages=2, global_budget=HistoryAudioBudget(10 ** 9))
+    for i in range(3):
+        history.add(FakeMessage(f"m{i}", 1))
+
+    assert [m.message_id for m in history] == ["m1", "m2"]
+    assert history.get("m0") is None
+
+
+def test_session_budget_evicts_oldest_audio_first():
+    """测试本会话预算先淘汰最旧音频，保留最新消息"""
+    history = ConversationHistory(max_audio_bytes=25, global_budget=HistoryAudioBudget(10 ** 9))
+    messages = [FakeMessage(f"m{i}", 10) for i in range(3)]
+    for message in messages:
+        history.add(message)
+
+    assert [m.encoded_audio_size for m in messages] == [0, 10, 10]
+    assert len(history) == 3
+    assert history.stats["evicted_audio_messages"] == 1
+
+
+def test_global_budget_spans_sessions():
+    """测试全局预算跨会话淘汰最旧音频"""
+    budget = HistoryAudioBudget(max_bytes=30)
+    history_a = ConversationHistory(global_budget=budget)
+    history_b = ConversationHistory(global_budget=budget)
+
+    old = FakeMessage("a1", 10, age_seconds=60)
+    history_a.add(old)
+    history_a.add(FakeMessage("a2", 10, age_seconds=50))
+    history_b.add(FakeMessage("b1", 10, age_seconds=40))
+    history_b.add(FakeMessage("b2", 10, age_seconds=30))
+
+    assert old.encoded_audio_size == 0
+    assert budget.used_bytes == 30
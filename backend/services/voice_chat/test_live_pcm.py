@@ -0,0 +1,82 @@
+"""
+实时PCM待推送帧记录 - 单元测试
+"""
+
+import asyncio
+
+from live_pcm import LivePCMTracker
+from media_workers import MediaWorkerPool
+from pcm_store import PCMAudioStore
+
+
+class _FakeMessage:
+    """与VoiceMessage相同的解码语义：decode_pending() 只返回本次新解码的帧"""
+
+    def __init__(self):
+        self.message_id = "msg"
+        self.encoded = []
+        self.store = PCMAudioStore(initial_capacity=16)
+
+    def append_audio_frame(self, packet: bytes) -> int:
+        self.encoded.append(packet)
+        return len(self.encoded) - 1
+
+    def decode_pending(self):
+        decoded = []
+        for packet in self.encoded[self.store.frame_count:]:
+            decoded.append(self.store.append(packet.upper()))
+        return decoded
+
+
+def test_take_ready_keeps_undecoded_frames():
+    """测试只取出已解码的帧，未解码的继续等待"""
+    tracker = LivePCMTracker()
+    for index in (0, 1, 2):
+        tracker.want("msg", index)
+
+    assert tracker.take_ready("msg", 2) == [0, 1]
+    assert tracker.take_ready("msg", 2) == []
+    assert len(tracker) == 1
+    assert tracker.take_ready("msg", 3) == [2]
+    assert len(tracker) == 0
+
+    tracker.want("msg", 3)
+    tracker.discard("msg")
+    assert tracker.take_ready("msg", 10) == []
+
+
+def test_router_decode_before_session_job_still_dispatches():
+    """测试路由接口的decode_pending先于会话解码任务执行时，帧仍按索引推送"""
+    pushed = []
+    session_results = []
+
+    async def run():
+        pool = MediaWorkerPool(max_workers=2)
+        lane = pool.lane("session")
+        tracker = LivePCMTracker()
+        message = _FakeMessage()
+
+        # 路由任务（如 /conversation/current-audio）已排在通道中
+        router_job = lane.submit(message.decode_pending)
+
+        # 帧到达：记录待推送索引并提交会话的解码任务
+        index = message.append_audio_frame(b"pcm0")
+        tracker.want(message.message_id, index)
+        session_job = lane.submit(message.decode_pending, coalesce_key=("decode", message.message_id))
+
+        def on_decoded(future):
+            session_results.append(future.result())
+            for i in tracker.take_ready(message.message_id, message.store.frame_count):
+                pushed.append(bytes(message.store.frame_view(i, i + 1)))
+
+        session_job.add_done_callback(on_decoded)
+        assert await router_job == [0]
+        await session_job
+        await asyncio.sleep(0)
+        pool.shutdown()
+
+    asyncio.run(run())
+
+    # 会话任务的decode_pending返回空列表，但帧仍从PCM存储取出推送
+    assert session_results == [[]]
+    assert pushed == [b"PCM0"]
@@ -0,0 +1,130 @@
+"""
+媒体处理线程池 - 单元测试
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from media_workers import MediaWorkerPool
+
+
+def test_lane_preserves_submission_order():
+    """测试同一通道的任务按提交顺序执行并按顺序完成"""
+    executed = []
+    completed = []
+
+    def job(i):
+        # 前面的任务更慢，多线程下也不能被后面的任务超过
+        time.sleep(0.002 * (5 - i))
+        executed.append(i)
+        return i
+
+    async def run():
+        pool = MediaWorkerPool(max_workers=4)
+        lane = pool.lane("test")
+        futures = [lane.submit(job, i) for i in range(5)]
+        for future in futures:
+            future.add_done_callback(lambda f: completed.append(f.result()))
+        results = await asyncio.gather(*futures)
+        pool.shutdown()
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == list(range(5))
+    assert executed == list(range(5))
+    assert completed == list(range(5))
+
+
+def test_jobs_run_off_the_event_loop_in_batches():
+    """测试任务在工作线程中执行，排队的任务合并为一个批次"""
+    async def run():
+        pool = MediaWorkerPool(max_workers=2)
+        lane = pool.lane("test")
+        loop_thread = threading.get_ident()
+        futures = [lane.submit(threading.get_ident) for _ in range(3)]
+        threads = await asyncio.gather(*futures)
+        stats = pool.get_stats()
+        pool.shutdown()
+        return loop_thread, threads, stats
+
+    loop_thread, threads, stats = asyncio.run(run())
+
+    assert loop_thread not in threads
+    assert stats["batches"] == 1
+    assert stats["max_batch_size"] == 3
+    assert stats["max_queue_depth"] == 3
+    assert stats["queue_depth"] == 0
+
+
+def test_coalesce_key_merges_pending_jobs():
+    """测试相同合并键的排队任务只执行一次"""
+    calls = []
+
+    async def run():
+        pool = MediaWorkerPool(max_workers=1)
+        lane = pool.lane("test")
+        first = lane.submit(calls.append, "decode", coalesce_key="decode")
+        second = lane.submit(calls.append, "decode", coalesce_key="decode")
+        await asyncio.gather(first, second)
+        stats = pool.get_stats()
+        pool.shutdown()
+        return first is second, stats
+
+    same_future, stats = asyncio.run(run())
+
+    assert same_future
+    assert calls == ["decode"]
+    assert stats["coalesced"] == 1
+
+
+def test_failed_job_does_not_break_lane():
+    """测试单个任务失败只影响自己的结果"""
+    def fail():
+        raise ValueError("bad frame")
+
+    async def run():
+        pool = MediaWorkerPool(max_workers=1)
+        lane = pool.lane("test")
+        failed = lane.submit(fail)
+        ok = lane.submit(lambda: "ok")
+        with pytest.raises(ValueError):
+            await failed
+        result = await ok
+        stats = pool.get_stats()
+        pool.shutdown()
+        return result, stats
+
+    result, stats = asyncio.run(run())
+
+    assert result == "ok"
+    assert stats["failed"] == 1
+    assert stats["completed"] == 1
+
+
+def test_aclose_does_not_block_event_loop():
+    """测试aclose()等待执行中的批次时事件循环仍可调度其他协程"""
+    ticks = []
+
+    async def run():
+        pool = MediaWorkerPool(max_workers=1)
+        job = pool.lane("test").submit(time.sleep, 0.05)
+        await asyncio.sleep(0.01)
+
+        async def ticker():
+            while not job.done():
+                ticks.append(1)
+                await asyncio.sleep(0.005)
+
+        ticker_task = asyncio.create_task(ticker())
+        await pool.aclose()
+        await job
+        await ticker_task
+        assert pool._executor is None
+
+    asyncio.run(run())
+
+    assert len(ticks) >= 2
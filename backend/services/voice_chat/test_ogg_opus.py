@@ -0,0 +1,64 @@
+"""
+Ogg-Opus封装 - 单元测试
+"""
+
+import struct
+
+from ogg_opus import iter_ogg_opus, ogg_crc
+
+
+def parse_pages(data: bytes):
+    """解析Ogg页，返回 (flags, granule, sequence, packets) 列表并校验CRC"""
+    pages = []
+    offset = 0
+    while offset < len(data):
+        assert data[offset:offset + 4] == b"OggS"
+        flags, granule, _, sequence, crc, count = struct.unpack_from("<BqIIIB", data, offset + 5)
+        segments = data[offset + 27:offset + 27 + count]
+        body_start = offset + 27 + count
+        body_len = sum(segments)
+
+        page = bytearray(data[offset:body_start + body_len])
+        page[22:26] = b"\x00\x00\x00\x00"
+        assert ogg_crc(bytes(page)) == crc
+
+        packets, current, pos = [], b"", body_start
+        for seg in segments:
+            current += data[pos:pos + seg]
+            pos += seg
+            if seg < 255:
+                packets.append(current)
+                current = b""
+        pages.append((flags, granule, sequence, packets))
+        offset = body_start + body_len
+    return pages
+
+
+def test_crc_matches_reference():
+    """测试CRC与CRC-32/CKSUM参考值一致（Ogg为无末尾异或的同一算法）"""
+    assert ogg_crc(b"123456789") ^ 0xFFFFFFFF == 0x765E7680
+
+
+def test_stream_structure():
+    """测试头部页、granule和EOS标志"""
+    packets = [bytes([i]) * (100 + i) for i in range(5)]
+    pages = parse_pages(b"".join(iter_ogg_opus(packets, packets_per_page=2)))
+
+    assert pages[0][0] == 0x02
+    assert pages[0][3][0].startswith(b"OpusHead")
+    assert pages[1][3][0].startswith(b"OpusTags")
+
+    audio_pages = pages[2:]
+    assert [p[3] for p in audio_pages] == [packets[0:2], packets[2:4], packets[4:5]]
+    assert [p[2] for p in audio_pages] == [2, 3, 4]
+    # 40ms @ 48kHz = 1920
+    assert [p[1] for p in audio_pages] == [3840, 7680, 9600]
+    assert audio_pages[-1][0] == 0x04
+
+
+def test_large_packet_lacing():
+    """测试超过255字节的包被正确分段"""
+    packets = [b"x" * 510, b"y" * 3]
+    pages = parse_pages(b"".join(iter_ogg_opus(packets)))
+
+    assert pages[2][3] == packets
@@ -0,0 +1,85 @@
+"""
+PCM音频追加存储 - 单元测试
+
+测试PCMAudioStore的追加、扩容、零拷贝视图和物化缓存
+"""
+
+from pcm_store import PCMAudioStore
+
+
+def test_append_and_frame_offsets():
+    """测试追加和帧偏移"""
+    store = PCMAudioStore(initial_capacity=16)
+
+    assert store.append(b'\x01' * 4) == 0
+    assert store.append(b'\x02' * 6) == 1
+
+    assert store.frame_count == 2
+    assert store.byte_length == 10
+    assert store.frame_offset(0) == 0
+    assert store.frame_offset(1) == 4
+    assert store.frame_offset(2) == 10
+    # 越界帧序号被截断到末尾
+    assert store.frame_offset(99) == 10
+
+
+def test_grow_preserves_data():
+    """测试扩容后数据完整"""
+    store = PCMAudioStore(initial_capacity=4)
+    frames = [bytes([i]) * 3 for i in range(10)]
+    for frame in frames:
+        store.append(frame)
+
+    assert store.capacity >= 30
+    assert store.to_bytes() == b''.join(frames)
+
+
+def test_views_survive_growth():
+    """测试扩容后已导出的视图仍然有效"""
+    store = PCMAudioStore(initial_capacity=4)
+    store.append(b'abcd')
+    view = store.frame_view(0, 1)
+
+    # 触发扩容
+    store.append(b'efghijkl')
+
+    assert bytes(view) == b'abcd'
+    assert bytes(store.frame_view(1)) == b'efghijkl'
+    assert view.readonly
+
+
+def test_frame_view_ranges():
+    """测试按帧范围读取"""
+    store = PCMAudioStore()
+    store.append(b'aa')
+    store.append(b'bbb')
+    store.append(b'c')
+
+    assert bytes(store.frame_view(0, 2)) == b'aabbb'
+    assert bytes(store.frame_view(1)) == b'bbbc'
+    assert bytes(store.frame_view(3)) == b''
+    assert bytes(store.view(2, 4)) == b'bb'
+
+
+def test_materialized_cache():
+    """测试物化缓存在追加后失效"""
+    store = PCMAudioStore()
+    store.append(b'xy')
+
+    first = store.to_bytes()
+    assert store.to_bytes() is first
+
+    store.append(b'z')
+    assert store.to_bytes() == b'xyz'
+
+
+def test_clear():
+    """测试清空"""
+    store = PCMAudioStore()
+    store.append(b'1234')
+    view = store.view()
+    store.clear()
+
+    assert store.byte_length == 0
+    assert store.frame_count == 0
+    assert bytes(view) == b'1234'
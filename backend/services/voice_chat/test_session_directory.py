@@ -0,0 +1,78 @@
+"""
+语音会话目录 - 单元测试
+"""
+
+import time
+
+import pytest
+
+from session_directory import InMemorySessionDirectory, SQLiteSessionDirectory
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_directory(request, tmp_path):
+    def factory(worker_ttl=30.0):
+        if request.param == "memory":
+            return InMemorySessionDirectory(worker_ttl=worker_ttl)
+        return SQLiteSessionDirectory(str(tmp_path / "sessions.db"), worker_ttl=worker_ttl)
+    return factory
+
+
+def test_claim_and_lookup(make_directory):
+    """测试认领后查询持有者，已被在线worker持有时认领失败"""
+    directory = make_directory()
+
+    assert directory.lookup("user:1") is None
+    assert directory.claim("user:1", "http://w1") == "http://w1"
+    assert directory.claim("user:1", "http://w2") == "http://w1"
+    assert directory.lookup("user:1") == "http://w1"
+    assert directory.list_sessions() == {"user:1": "http://w1"}
+
+
+def test_release_only_by_owner(make_directory):
+    """测试只有持有者能释放会话"""
+    directory = make_directory()
+    directory.claim("k", "http://w1")
+
+    directory.release("k", "http://w2")
+    assert directory.lookup("k") == "http://w1"
+
+    directory.release("k", "http://w1")
+    assert directory.lookup("k") is None
+
+
+def test_stale_worker_sessions_can_be_reclaimed(make_directory):
+    """测试心跳超时的worker持有的会话视为无主，可被重新认领"""
+    directory = make_directory(worker_ttl=0.05)
+    directory.claim("k", "http://w1")
+    time.sleep(0.1)
+
+    assert directory.lookup("k") is None
+    assert directory.claim("k", "http://w2") == "http://w2"
+    assert directory.lookup("k") == "http://w2"
+
+
+def test_remove_worker_drops_its_sessions(make_directory):
+    """测试worker下线时删除其所有会话"""
+    directory = make_directory()
+    directory.claim("a", "http://w1")
+    directory.claim("b", "http://w1")
+    directory.claim("c", "http://w2")
+
+    directory.remove_worker("http://w1")
+
+    assert directory.list_sessions() == {"c": "http://w2"}
+
+
+def test_sqlite_directory_shared_between_connections(tmp_path):
+    """测试同一SQLite文件的多个实例（模拟多个worker进程）看到相同的持有关系"""
+    path = str(tmp_path / "shared.db")
+    first = SQLiteSessionDirectory(path)
+    second = SQLiteSessionDirectory(path)
+
+    first.claim("k", "http://w1")
+
+    assert second.lookup("k") == "http://w1"
+    assert second.claim("k", "http://w2") == "http://w1"
+    first.close()
+    second.close()
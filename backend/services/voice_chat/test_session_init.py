@@ -0,0 +1,81 @@
+"""
+会话初始化计时和hello等待 - 单元测试
+
+检查初始化步骤耗时的记录，以及hello确认超时时不阻塞初始化
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# voice_session_manager 以 services.* 包路径导入依赖，需要backend目录在sys.path中（同 setup_paths.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+voice_session_manager = pytest.importorskip("services.voice_chat.voice_session_manager")
+
+from services.voice_chat.ws_client import WSConfig  # noqa: E402
+
+
+def _session(hello_timeout: float = 0.05):
+    return voice_session_manager.VoiceSessionManager(
+        device_manager=None,
+        ws_config=WSConfig(capture_dir=None, hello_timeout=hello_timeout)
+    )
+
+
+def test_timed_init_step_records_duration_on_failure():
+    """测试步骤抛出异常时仍记录耗时，异常原样抛出"""
+    session = _session()
+
+    async def slow_ok():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    async def run():
+        assert await session._timed_init_step("recorder", slow_ok()) == "ok"
+        with pytest.raises(RuntimeError):
+            await session._timed_init_step("player", failing())
+
+    asyncio.run(run())
+
+    timings = session.stats["init_timings"]
+    assert timings["recorder"] >= 20
+    assert "player" in timings
+
+
+def test_hello_timeout_does_not_fail_connect():
+    """测试hello超时：wait_authenticated按配置超时返回False，建连步骤仍视为成功并记录耗时"""
+    session = _session(hello_timeout=0.05)
+
+    async def connected():
+        return True
+
+    session.ws_client.connect = connected
+
+    async def run():
+        return await session._connect_upstream()
+
+    assert asyncio.run(run())
+
+    timings = session.stats["init_timings"]
+    assert "websocket_connect" in timings
+    assert timings["hello"] >= 50
+
+
+def test_wait_authenticated_wakes_on_hello():
+    """测试等待期间收到hello时立即返回True"""
+    session = _session(hello_timeout=5)
+    client = session.ws_client
+
+    async def run():
+        waiter = asyncio.create_task(client.wait_authenticated())
+        await asyncio.sleep(0)
+        await client._process_message({"type": "hello", "session_id": "s1"})
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    assert asyncio.run(run())
+    assert client.session_id == "s1"
@@ -0,0 +1,117 @@
+"""
+语音会话注册表 - 单元测试
+"""
+
+import asyncio
+from enum import Enum
+
+import pytest
+
+from session_registry import VoiceSessionRegistry, SessionLimitError
+
+
+class FakeState(Enum):
+    READY = "ready"
+    SPEAKING = "speaking"
+
+
+class FakeSession:
+    """只实现注册表所需接口的假会话"""
+
+    def __init__(self, name: str, ok: bool = True):
+        self.name = name
+        self.ok = ok
+        self.state = FakeState.READY
+        self.is_initialized = False
+        self.closed = False
+
+    async def initialize(self) -> bool:
+        self.is_initialized = self.ok
+        return self.ok
+
+    async def close(self):
+        self.closed = True
+
+    def get_session_stats(self):
+        return {"name": self.name}
+
+
+def test_sessions_are_isolated_per_key():
+    """测试不同key对应独立会话，重复创建复用已有会话"""
+    async def run():
+        registry = VoiceSessionRegistry(FakeSession, idle_timeout=0)
+        assert await registry.create("user:1", "a")
+        assert await registry.create("user:2", "b")
+        assert await registry.create("user:1", "ignored")
+        return registry
+
+    registry = asyncio.run(run())
+
+    assert registry.get("user:1").name == "a"
+    assert registry.get("user:2").name == "b"
+    assert registry.get("missing") is None
+    assert registry.stats["created"] == 2
+
+
+def test_failed_initialize_is_not_kept():
+    """测试初始化失败的会话不占用名额"""
+    async def run():
+        registry = VoiceSessionRegistry(FakeSession, idle_timeout=0)
+        assert not await registry.create("k", "a", ok=False)
+        return registry
+
+    registry = asyncio.run(run())
+
+    assert len(registry) == 0
+
+
+def test_capacity_evicts_least_recently_active_idle_session():
+    """测试达到上限时回收最久未活动的空闲会话，忙碌会话不回收"""
+    async def run():
+        registry = VoiceSessionRegistry(FakeSession, max_sessions=2, idle_timeout=0)
+        await registry.create("a", "a")
+        await registry.create("b", "b")
+        first = registry.get("a")
+        registry.connection_opened("a")
+        await registry.create("c", "c")
+        return registry, first
+
+    registry, first = asyncio.run(run())
+
+    assert sorted(registry.keys()) == ["a", "c"]
+    assert not first.closed
+    assert registry.stats["capacity_evicted"] == 1
+
+
+def test_capacity_rejects_when_all_busy():
+    """测试所有会话都忙时拒绝创建"""
+    async def run():
+        registry = VoiceSessionRegistry(FakeSession, max_sessions=1, idle_timeout=0)
+        await registry.create("a", "a")
+        registry.get("a").state = FakeState.SPEAKING
+        with pytest.raises(SessionLimitError):
+            await registry.create("b", "b")
+        return registry
+
+    registry = asyncio.run(run())
+
+    assert registry.stats["rejected"] == 1
+
+
+def test_idle_sessions_evicted():
+    """测试空闲超时回收，有连接的会话保留"""
+    async def run():
+        registry = VoiceSessionRegistry(FakeSession, idle_timeout=0.01, sweep_interval=3600)
+        await registry.create("idle", "idle")
+        await registry.create("connected", "connected")
+        registry.connection_opened("connected")
+        idle = registry.get("idle")
+        await asyncio.sleep(0.03)
+        evicted = await registry.evict_idle()
+        await registry.close_all()
+        return evicted, idle
+
+    evicted, idle = asyncio.run(run())
+
+    assert evicted == ["idle"]
+    assert idle.closed
@@ -0,0 +1,95 @@
+"""
+纯软件音频编解码后端 - 单元测试
+"""
+
+import array
+import asyncio
+import wave
+
+import pytest
+
+from software_audio_codec import SoftwareAudioCodec, load_wav_pcm, create_audio_codec
+
+
+def _write_wav(path, samples, rate, channels=1):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(array.array("h", samples).tobytes())
+
+
+def test_load_wav_downmixes_and_resamples(tmp_path):
+    """测试WAV源混为单声道并重采样到上行采样率"""
+    path = tmp_path / "stereo.wav"
+    # 32kHz立体声，左右声道平均为1000
+    _write_wav(path, [800, 1200] * 3200, rate=32000, channels=2)
+
+    pcm = array.array("h", load_wav_pcm(str(path), sample_rate=16000))
+
+    assert len(pcm) == 1600
+    assert set(pcm) == {1000}
+
+
+def test_source_frames_pad_with_silence_or_loop():
+    """测试音频源按帧读取，读完后补静音或循环"""
+    frame_bytes = 16000 * 40 // 1000 * 2
+    source = b"\x01\x00" * (frame_bytes // 2 + 10)
+
+    codec = SoftwareAudioCodec(source=source)
+    codec._source_pcm = source
+    frames = [codec._next_input_frame() for _ in range(3)]
+    assert all(len(f) == frame_bytes for f in frames)
+    assert frames[1][:20] == source[:20] and frames[1][20:] == bytes(frame_bytes - 20)
+    assert frames[2] == bytes(frame_bytes)
+
+    looping = SoftwareAudioCodec(source=source, loop_source=True)
+    looping._source_pcm = source
+    frames = [looping._next_input_frame() for _ in range(3)]
+    assert frames[2] == source[:frame_bytes]
+
+
+def test_pcm_playback_to_file_sink(tmp_path):
+    """测试下行PCM写入WAV文件，非实时模式不等待播放时长"""
+    sink = tmp_path / "out" / "tts.wav"
+    pcm = b"\x10\x00" * 960
+
+    async def run():
+        codec = SoftwareAudioCodec(sink_path=str(sink), realtime=False)
+        await codec.write_audio(pcm, format="pcm")
+        await codec.write_audio(pcm, format="pcm")
+        await codec.wait_for_audio_complete()
+        await codec.close()
+        return codec
+
+    codec = asyncio.run(run())
+
+    assert codec.stats["frames_played"] == 2
+    with wave.open(str(sink), "rb") as wav:
+        assert wav.getframerate() == 24000
+        assert wav.readframes(wav.getnframes()) == pcm * 2
+
+
+def test_capture_loop_encodes_frames():
+    """测试上行按帧OPUS编码并通过回调送出"""
+    pytest.importorskip("opuslib")
+    packets = []
+
+    async def run():
+        codec = create_audio_codec("software", source=b"\x00\x01" * 16000, realtime=False)
+        await codec.initialize()
+        codec.set_encoded_audio_callback(packets.append)
+        await codec.start_streams()
+        while len(packets) < 5:
+            await asyncio.sleep(0)
+        await codec.close()
+
+    asyncio.run(run())
+
+    assert len(packets) >= 5
+    assert all(isinstance(p, bytes) and p for p in packets)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        create_audio_codec("alsa")
@@ -0,0 +1,99 @@
+"""
+语音录制器常开采集 - 单元测试
+
+测试预录帧的补发顺序，以及补发期间音频线程到达的帧与is_recording切换的先后
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# speech_recorder 以 libs.* / services.* 包路径导入依赖，需要backend目录在sys.path中（同 setup_paths.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+pytest.importorskip("libs.py_xiaozhi.src.constants.constants")
+
+from services.voice_chat.speech_recorder import RecordingConfig, SpeechRecorder  # noqa: E402
+
+
+class _FakeCodec:
+    """只记录音频流启停的编解码器替身"""
+
+    def __init__(self):
+        self.streams_started = 0
+
+    async def start_streams(self):
+        self.streams_started += 1
+
+    async def stop_streams(self):
+        pass
+
+
+def _warm_recorder(pre_roll_ms: int = 120) -> SpeechRecorder:
+    recorder = SpeechRecorder(RecordingConfig(frame_duration=40, pre_roll_ms=pre_roll_ms, warm_capture=False))
+    recorder.audio_codec = _FakeCodec()
+    recorder.is_initialized = True
+    asyncio.run(recorder.start_warm_capture())
+    return recorder
+
+
+def test_pre_roll_flushed_in_order_before_live_frames():
+    """测试开始录音时按顺序补发最近的预录帧，之后的实时帧排在后面"""
+    recorder = _warm_recorder(pre_roll_ms=120)  # 3帧
+    sent = []
+    recorder.on_audio_encoded = sent.append
+
+    for frame in (b"p0", b"p1", b"p2", b"p3"):
+        recorder._on_encoded_audio(frame)
+    assert sent == []
+
+    assert asyncio.run(recorder.start_recording())
+    recorder._on_encoded_audio(b"live")
+
+    assert sent == [b"p1", b"p2", b"p3", b"live"]
+    assert recorder.stats["pre_roll_flushed"] == 3
+    assert recorder.audio_codec.streams_started == 1
+
+
+def test_frame_arriving_during_flush_follows_pre_roll():
+    """测试补发期间音频线程送来的帧等待锁，在is_recording置位后发送，不丢失也不插队"""
+    recorder = _warm_recorder()
+    sent = []
+    audio_thread = None
+
+    def on_audio_encoded(frame: bytes):
+        nonlocal audio_thread
+        sent.append(frame)
+        if audio_thread is None:
+            # 补发第一帧时音频线程送来新帧（此时仍持有采集锁）
+            audio_thread = threading.Thread(target=recorder._on_encoded_audio, args=(b"live",))
+            audio_thread.start()
+            audio_thread.join(timeout=0.05)
+            assert audio_thread.is_alive()
+
+    recorder.on_audio_encoded = on_audio_encoded
+    recorder._on_encoded_audio(b"p0")
+    recorder._on_encoded_audio(b"p1")
+
+    assert asyncio.run(recorder.start_recording())
+    audio_thread.join(timeout=1)
+
+    assert sent == [b"p0", b"p1", b"live"]
+
+
+def test_stop_recording_returns_frames_to_pre_roll():
+    """测试停止录音后音频流保持运行，新帧重新进入预录缓冲"""
+    recorder = _warm_recorder()
+    sent = []
+    recorder.on_audio_encoded = sent.append
+
+    asyncio.run(recorder.start_recording())
+    asyncio.run(recorder.stop_recording())
+    recorder._on_encoded_audio(b"after")
+
+    assert sent == []
+    assert list(recorder._pre_roll) == [b"after"]
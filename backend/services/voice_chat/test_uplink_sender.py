@@ -0,0 +1,107 @@
+"""
+上行音频有序发送器 - 单元测试
+"""
+
+import asyncio
+
+from uplink_sender import UplinkAudioSender, OverflowPolicy
+
+
+def test_frames_sent_in_order():
+    """测试帧严格按提交顺序发送"""
+    sent = []
+
+    async def send(frame: bytes) -> bool:
+        # 让出事件循环，模拟网络发送
+        await asyncio.sleep(0)
+        sent.append(frame)
+        return True
+
+    async def run():
+        sender = UplinkAudioSender(send, maxsize=100)
+        sender.start()
+        for i in range(20):
+            sender.submit(bytes([i]))
+        assert await sender.flush(timeout=1.0)
+        await sender.stop()
+        return sender
+
+    sender = asyncio.run(run())
+
+    assert sent == [bytes([i]) for i in range(20)]
+    stats = sender.get_stats()
+    assert stats["frames_sent"] == 20
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] >= 1
+
+
+def test_drop_oldest_policy():
+    """测试溢出时丢弃最旧帧"""
+    async def run():
+        sender = UplinkAudioSender(lambda f: asyncio.sleep(0, True), maxsize=3)
+        for i in range(5):
+            assert sender.submit(bytes([i]))
+        return sender
+
+    sender = asyncio.run(run())
+
+    assert sender.queue_depth == 3
+    assert [f for f, _ in sender._queue] == [b'\x02', b'\x03', b'\x04']
+    assert sender.stats["frames_dropped"] == 2
+
+
+def test_drop_newest_policy():
+    """测试溢出时丢弃新帧"""
+    async def run():
+        sender = UplinkAudioSender(lambda f: asyncio.sleep(0, True), maxsize=2,
+                                   overflow_policy=OverflowPolicy.DROP_NEWEST)
+        results = [sender.submit(bytes([i])) for i in range(4)]
+        return sender, results
+
+    sender, results = asyncio.run(run())
+
+    assert results == [True, True, False, False]
+    assert [f for f, _ in sender._queue] == [b'\x00', b'\x01']
+
+
+def test_send_failure_counted():
+    """测试发送失败计数"""
+    async def send(frame: bytes) -> bool:
+        return False
+
+    async def run():
+        sender = UplinkAudioSender(send)
+        sender.start()
+        sender.submit(b'x')
+        await sender.flush(timeout=1.0)
+        await sender.stop()
+        return sender
+
+    sender = asyncio.run(run())
+
+    assert sender.stats["send_failures"] == 1
+    assert sender.stats["frames_sent"] == 0
+
+
+def test_overflow_logged_once_per_episode(caplog):
+    """测试持续溢出时只在开始和恢复时各记一条告警，丢帧数计入统计"""
+    async def run():
+        sender = UplinkAudioSender(lambda f: asyncio.sleep(0, True), maxsize=2)
+        for i in range(10):
+            sender.submit(bytes([i]))
+        # 发送协程取走一帧后缓冲区恢复
+        sender._queue.popleft()
+        sender.submit(b'\xff')
+        sender.submit(b'\xfe')
+        return sender
+
+    with caplog.at_level("WARNING", logger="uplink_sender"):
+        sender = asyncio.run(run())
+
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 3
+    assert "开始丢弃最旧帧" in warnings[0]
+    assert "共丢弃 8 帧" in warnings[1]
+    assert "开始丢弃最旧帧" in warnings[2]
+    assert sender.stats["frames_dropped"] == 9
+    assert sender.stats["overflow_episodes"] == 2
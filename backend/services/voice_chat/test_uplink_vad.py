@@ -0,0 +1,57 @@
+"""
+上行VAD - 单元测试
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("opuslib")
+
+from uplink_vad import UplinkVAD, VADConfig
+
+FRAME_SAMPLES = 640  # 16kHz 40ms
+
+
+def _silence():
+    return np.zeros(FRAME_SAMPLES, dtype=np.int16)
+
+
+def _tone():
+    t = np.arange(FRAME_SAMPLES) / 16000
+    return (np.sin(2 * np.pi * 300 * t) * 8000).astype(np.int16)
+
+
+def _feed(vad, frames):
+    sent = []
+    for i, pcm in enumerate(frames):
+        sent.extend(vad.process(f"p{i}".encode(), pcm))
+    return sent
+
+
+def test_analyze_separates_tone_from_silence():
+    """测试能量检测区分语音和静音"""
+    vad = UplinkVAD()
+    assert vad.analyze(_tone())
+    assert not vad.analyze(_silence())
+
+
+def test_leading_silence_dropped_with_pre_roll():
+    """测试语音前静音被丢弃，开始说话时补发预录帧"""
+    vad = UplinkVAD(VADConfig(pre_roll_frames=2, min_speech_frames=2))
+    sent = _feed(vad, [_silence()] * 10 + [_tone()] * 3)
+
+    # 2帧预录静音 + 确认前的语音帧 + 之后的语音帧
+    assert sent == [b"p8", b"p9", b"p10", b"p11", b"p12"]
+    assert vad.speech_onset_ms == 400
+    assert vad.stats["frames_dropped"] > 0
+
+
+def test_trailing_silence_hangover_and_auto_stop():
+    """测试语音后拖尾帧照常发送，之后的静音丢弃并标记说话结束"""
+    vad = UplinkVAD(VADConfig(min_speech_frames=1, hangover_frames=2, auto_stop_silence_ms=200))
+    sent = _feed(vad, [_tone()] * 3 + [_silence()] * 10)
+
+    assert sent == [b"p0", b"p1", b"p2", b"p3", b"p4"]
+    assert vad.speech_offset_ms == 120
+    assert vad.end_of_speech
+    assert not vad.in_speech
@@ -0,0 +1,59 @@
+"""
+上游会话录制 - 单元测试
+"""
+
+import base64
+import json
+
+from upstream_capture import CaptureWriter, DIRECTION_DOWN, DIRECTION_UP, load_capture, server_hello, split_turns
+
+
+def _write_session(path, events):
+    with open(path, "w", encoding="utf-8") as f:
+        for t, direction, data in events:
+            if isinstance(data, bytes):
+                entry = {"t": t, "dir": direction, "kind": "binary", "data": base64.b64encode(data).decode()}
+            else:
+                entry = {"t": t, "dir": direction, "kind": "text", "data": json.dumps(data)}
+            f.write(json.dumps(entry) + "\n")
+
+
+def test_writer_roundtrip(tmp_path):
+    """测试文本和二进制帧录制后原样读回"""
+    writer = CaptureWriter(str(tmp_path / "cap" / "session.jsonl"))
+    writer.record(DIRECTION_UP, '{"type": "hello"}')
+    writer.record(DIRECTION_DOWN, b"\x00\xffopus")
+    writer.close()
+    writer.record(DIRECTION_UP, b"ignored")
+
+    events = load_capture(writer.path)
+
+    assert [(e.direction, e.data) for e in events] == [(DIRECTION_UP, '{"type": "hello"}'), (DIRECTION_DOWN, b"\x00\xffopus")]
+    assert events[0].t_ms <= events[1].t_ms
+    assert writer.events == 2
+
+
+def test_split_turns_relative_to_listen_stop(tmp_path):
+    """测试按轮次切分，下行时间相对listen stop"""
+    path = tmp_path / "session.jsonl"
+    _write_session(path, [
+        (0, DIRECTION_UP, {"type": "hello"}),
+        (20, DIRECTION_DOWN, {"type": "hello", "session_id": "abc", "audio_params": {"sample_rate": 24000}}),
+        (100, DIRECTION_UP, {"type": "listen", "state": "start", "mode": "manual"}),
+        (140, DIRECTION_UP, b"f1"),
+        (180, DIRECTION_UP, b"f2"),
+        (200, DIRECTION_UP, {"type": "listen", "state": "stop"}),
+        (650, DIRECTION_DOWN, {"type": "stt", "text": "hi"}),
+        (900, DIRECTION_DOWN, b"tts1"),
+        (1000, DIRECTION_DOWN, {"type": "tts", "state": "stop"}),
+        (1200, DIRECTION_DOWN, {"type": "llm", "text": "late"}),
+    ])
+
+    events = load_capture(str(path))
+    turns = split_turns(events)
+
+    assert server_hello(events)["audio_params"] == {"sample_rate": 24000}
+    assert len(turns) == 1
+    assert turns[0].uplink_frames == 2
+    assert [e.t_ms for e in turns[0].downlink] == [450, 700, 800]
+    assert turns[0].downlink[1].data == b"tts1"
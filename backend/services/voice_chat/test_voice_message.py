@@ -0,0 +1,60 @@
+"""
+语音消息句子编码 - 单元测试
+
+句子关闭后由媒体线程编码一次，之后的轮询只做索引查找
+"""
+
+import base64
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# voice_session_manager 以 services.* 包路径导入依赖，需要backend目录在sys.path中（同 setup_paths.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+voice_session_manager = pytest.importorskip("services.voice_chat.voice_session_manager")
+
+from services.voice_chat.ai_response_parser import AudioData  # noqa: E402
+from services.voice_chat.wav_utils import WAV_HEADER_SIZE  # noqa: E402
+
+
+def _pcm_frame(value: int) -> AudioData:
+    return AudioData(data=bytes([value]) * 4, format="pcm", sample_rate=24000, channels=1)
+
+
+def test_sentence_encoded_exactly_once(monkeypatch):
+    """测试每句只封装编码一次：会话编码任务、重复轮询和TTS结束都不重复编码"""
+    encoded = []
+    real_pcm_to_wav = voice_session_manager.pcm_to_wav
+
+    def counting_pcm_to_wav(pcm, *args):
+        encoded.append(bytes(pcm))
+        return real_pcm_to_wav(pcm, *args)
+
+    monkeypatch.setattr(voice_session_manager, "pcm_to_wav", counting_pcm_to_wav)
+    message = voice_session_manager.VoiceMessage(message_id="msg_1", timestamp=datetime.now())
+
+    message.add_text_sentence("你好。")
+    message.append_audio_frame(_pcm_frame(1))
+    message.append_audio_frame(_pcm_frame(2))
+    message.add_text_sentence("今天天气不错。")
+    message.append_audio_frame(_pcm_frame(3))
+
+    # 第一句关闭：会话提交的编码任务执行，轮询两次
+    message.encode_closed_sentences()
+    first = message.get_completed_sentences(0)
+    again = message.get_completed_sentences(0)
+    assert encoded == [b"\x01" * 4 + b"\x02" * 4]
+    assert first["sentences"] == again["sentences"]
+
+    # TTS结束关闭第二句：首次读取时补齐编码，之后不再编码
+    message.mark_tts_complete()
+    result = message.get_completed_sentences(1)
+    message.encode_closed_sentences()
+    message.get_completed_sentences(0)
+
+    assert encoded == [b"\x01" * 4 + b"\x02" * 4, b"\x03" * 4]
+    assert result["total_sentences"] == 2 and result["is_complete"]
+    wav = base64.b64decode(result["sentences"][0]["audio_data"])
+    assert wav[WAV_HEADER_SIZE:] == b"\x03" * 4
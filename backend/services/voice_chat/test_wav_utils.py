@@ -0,0 +1,35 @@
+"""
+WAV封装工具 - 单元测试
+
+按RIFF/fmt/data各字段检查44字节头部
+"""
+
+import struct
+
+from wav_utils import WAV_HEADER_SIZE, pcm_to_wav, wav_header
+
+
+def test_wav_header_fields():
+    """测试头部各字段：块大小、PCM格式、字节率、块对齐和位深"""
+    header = wav_header(1000, sample_rate=16000, channels=2, sample_width=2)
+
+    assert len(header) == WAV_HEADER_SIZE == 44
+    assert header[0:4] == b"RIFF"
+    assert struct.unpack_from("<I", header, 4)[0] == 36 + 1000
+    assert header[8:16] == b"WAVEfmt "
+    fmt_size, audio_format, channels, sample_rate, byte_rate, block_align, bits = struct.unpack_from("<IHHIIHH", header, 16)
+    assert (fmt_size, audio_format, channels, sample_rate) == (16, 1, 2, 16000)
+    assert byte_rate == 16000 * 2 * 2
+    assert block_align == 4
+    assert bits == 16
+    assert header[36:40] == b"data"
+    assert struct.unpack_from("<I", header, 40)[0] == 1000
+
+
+def test_pcm_to_wav_accepts_memoryview():
+    """测试memoryview输入：头部记录数据长度，PCM原样跟在头部之后"""
+    pcm = bytes(range(6))
+    wav = pcm_to_wav(memoryview(pcm))
+
+    assert wav[:WAV_HEADER_SIZE] == wav_header(len(pcm))
+    assert wav[WAV_HEADER_SIZE:] == pcm
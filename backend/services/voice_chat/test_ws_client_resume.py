@@ -0,0 +1,177 @@
+"""
+上游断线续接 - 单元测试
+
+用假的WebSocket连接模拟断线、重连和hello确认，检查重放顺序、重放缓冲溢出和重连次数
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("websockets")
+pytest.importorskip("aiohttp")
+pytest.importorskip("psutil")
+
+# ws_client 以 services.* 包路径导入依赖，需要backend目录在sys.path中（同 setup_paths.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.voice_chat import ws_client as ws_client_module  # noqa: E402
+from services.voice_chat.ws_client import ConnectionState, WSConfig, XiaozhiWebSocketClient  # noqa: E402
+
+
+class _FakeWebSocket:
+    """记录发送的帧；接收端一直等待直到关闭"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+        self.close_code = None
+        self._closed_event = asyncio.Event()
+
+    async def send(self, data):
+        self.sent.append(data)
+
+    async def close(self):
+        self.closed = True
+        self._closed_event.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self._closed_event.wait()
+        raise StopAsyncIteration
+
+
+def _authenticated_client(**config) -> XiaozhiWebSocketClient:
+    client = XiaozhiWebSocketClient(WSConfig(capture_dir=None, **config))
+    client.enable_auto_reconnect(True, max_attempts=5)
+    client.websocket = _FakeWebSocket()
+    client.state = ConnectionState.AUTHENTICATED
+    client.session_id = "s1"
+    return client
+
+
+async def _lose_connection(client: XiaozhiWebSocketClient):
+    """断线：重连由测试手动完成"""
+    async def no_reconnect():
+        pass
+    client._schedule_reconnect = no_reconnect
+    await client._handle_connection_loss("test")
+
+
+async def _reconnect(client: XiaozhiWebSocketClient) -> _FakeWebSocket:
+    """新连接收到hello确认，等待续接任务完成"""
+    websocket = _FakeWebSocket()
+    client.websocket = websocket
+    await client._process_message({"type": "hello", "session_id": "s2"})
+    while client._resuming:
+        await asyncio.sleep(0)
+    return websocket
+
+
+def test_resume_replays_unacknowledged_frames_in_order():
+    """测试重连后重新开始监听，按序重放断线前后的帧并补发停止监听"""
+    async def run():
+        client = _authenticated_client()
+        await client.send_start_listening("manual")
+        await client.send_audio(b"a1")
+        await client.send_audio(b"a2")
+
+        await _lose_connection(client)
+        assert client.is_reconnecting
+        assert await client.send_audio(b"a3")
+        assert await client.send_stop_listening()
+
+        websocket = await _reconnect(client)
+        return client, websocket.sent
+
+    client, sent = asyncio.run(run())
+
+    assert '"state":"start"' in sent[0].replace(" ", "") and "manual" in sent[0]
+    assert sent[1:4] == [b"a1", b"a2", b"a3"]
+    assert '"state":"stop"' in sent[4].replace(" ", "")
+    assert client.stats["resumed_turns"] == 1
+    assert client.stats["replayed_frames"] == 3
+    assert client.stats["gap_buffered_frames"] == 1
+
+
+def test_stt_clears_replay_buffer():
+    """测试服务器识别后不再重放本轮的帧"""
+    async def run():
+        client = _authenticated_client()
+        await client.send_start_listening("manual")
+        await client.send_audio(b"a1")
+        await client.send_stop_listening()
+        await client._process_message({"type": "stt", "text": "hi"})
+
+        await _lose_connection(client)
+        websocket = await _reconnect(client)
+        return client, websocket.sent
+
+    client, sent = asyncio.run(run())
+
+    assert sent == []
+    assert not client.has_pending_turn
+
+
+def test_replay_overflow_abandons_resume_and_reports_error():
+    """测试超出重放缓冲的轮次重连后放弃续接并通知错误"""
+    errors = []
+
+    async def run():
+        client = _authenticated_client(replay_buffer_frames=2)
+        client.on_error = errors.append
+        await client.send_start_listening("manual")
+        for frame in (b"a1", b"a2", b"a3"):
+            await client.send_audio(frame)
+
+        await _lose_connection(client)
+        websocket = await _reconnect(client)
+        return client, websocket.sent
+
+    client, sent = asyncio.run(run())
+
+    assert sent == []
+    assert not client.has_pending_turn
+    assert client.is_authenticated
+    assert len(errors) == 1 and "重放缓冲" in errors[0]
+
+
+def test_reconnect_attempts_reset_only_after_hello(monkeypatch):
+    """测试TCP建连不重置重连次数（避免握手失败时无延迟循环重连），hello确认后才重置"""
+    async def fake_connect(*args, **kwargs):
+        return _FakeWebSocket()
+
+    monkeypatch.setattr(ws_client_module.websockets, "connect", fake_connect)
+
+    async def run():
+        client = XiaozhiWebSocketClient(WSConfig(capture_dir=None))
+        client.device_info = SimpleNamespace(device_id="dev", client_id="cli", connection_params={})
+
+        async def prepared():
+            return True
+
+        async def no_hello():
+            pass
+
+        client._prepare_device_info = prepared
+        client._authenticate = no_hello
+        client.reconnect_attempts = 1
+
+        assert await client.connect()
+        after_connect = client.reconnect_attempts
+
+        await client._process_message({"type": "hello", "session_id": "s1"})
+        after_hello = client.reconnect_attempts
+
+        await client.disconnect()
+        return after_connect, after_hello
+
+    after_connect, after_hello = asyncio.run(run())
+
+    assert after_connect == 1
+    assert after_hello == 0
@@ -0,0 +1,66 @@
+"""
+前端WebSocket二进制音频帧格式 - 单元测试
+"""
+
+import pytest
+
+from ws_framing import (
+    pack_audio_frame,
+    unpack_audio_frame,
+    negotiate_audio_mode,
+    negotiate_audio_codec,
+    HEADER_SIZE,
+    CODEC_PCM,
+    CODEC_OPUS,
+    BINARY_AUDIO_SUBPROTOCOL,
+    OPUS_AUDIO_SUBPROTOCOL,
+    AUDIO_MODE_JSON,
+    AUDIO_MODE_BINARY
+)
+
+
+def test_pack_unpack_roundtrip():
+    """测试打包和解析往返"""
+    payload = b'\x01\x02' * 480
+    frame = pack_audio_frame(payload, sequence=42, sentence_index=3, sample_rate=24000)
+
+    assert len(frame) == HEADER_SIZE + len(payload)
+
+    header, body = unpack_audio_frame(frame)
+    assert header.sequence == 42
+    assert header.sentence_index == 3
+    assert header.sample_rate == 24000
+    assert header.channels == 1
+    assert bytes(body) == payload
+
+
+def test_codec_and_wraparound():
+    """测试编码类型和序号回绕"""
+    frame = pack_audio_frame(b'op', sequence=2 ** 32 + 5, sentence_index=2 ** 16 + 1, codec=CODEC_OPUS)
+    header, _ = unpack_audio_frame(frame)
+
+    assert header.codec == CODEC_OPUS
+    assert header.sequence == 5
+    assert header.sentence_index == 1
+
+
+def test_unpack_rejects_short_frame():
+    """测试过短数据"""
+    with pytest.raises(ValueError):
+        unpack_audio_frame(b'\x01\x00')
+
+
+def test_negotiate_audio_mode():
+    """测试模式协商"""
+    assert negotiate_audio_mode([BINARY_AUDIO_SUBPROTOCOL], None) == (AUDIO_MODE_BINARY, BINARY_AUDIO_SUBPROTOCOL)
+    assert negotiate_audio_mode([], "binary") == (AUDIO_MODE_BINARY, None)
+    assert negotiate_audio_mode(None, None) == (AUDIO_MODE_JSON, None)
+
+
+def test_negotiate_audio_codec():
+    """测试OPUS直通协商（显式开启）"""
+    assert negotiate_audio_codec([OPUS_AUDIO_SUBPROTOCOL], None) == CODEC_OPUS
+    assert negotiate_audio_mode([OPUS_AUDIO_SUBPROTOCOL], None) == (AUDIO_MODE_BINARY, OPUS_AUDIO_SUBPROTOCOL)
+    assert negotiate_audio_codec(None, "opus") == CODEC_OPUS
+    assert negotiate_audio_codec([BINARY_AUDIO_SUBPROTOCOL], None) == CODEC_PCM
+    assert negotiate_audio_codec(None, None) == CODEC_PCM
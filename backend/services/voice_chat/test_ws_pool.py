@@ -0,0 +1,157 @@
+"""
+上游连接池 - 单元测试
+
+用假的WebSocket连接模拟已认证的上游连接，检查租用、健康检查、空闲回收、失败退避和归还时的状态清理
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("websockets")
+pytest.importorskip("aiohttp")
+pytest.importorskip("psutil")
+
+# ws_pool 以 services.* 包路径导入依赖，需要backend目录在sys.path中（同 setup_paths.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.voice_chat.ws_client import ConnectionState, WSConfig, XiaozhiWebSocketClient  # noqa: E402
+from services.voice_chat.ws_pool import UpstreamConnectionPool  # noqa: E402
+
+
+class _FakeWebSocket:
+    """记录发送的帧；ping按设定立即返回或一直不回应"""
+
+    def __init__(self, pong: bool = True):
+        self.sent = []
+        self.pong = pong
+        self.closed = False
+        self.close_code = None
+
+    async def send(self, data):
+        self.sent.append(data)
+
+    async def ping(self):
+        waiter = asyncio.get_running_loop().create_future()
+        if self.pong:
+            waiter.set_result(None)
+        return waiter
+
+    async def close(self):
+        self.closed = True
+        self.close_code = 1000
+
+
+def _authenticated_client(pong: bool = True) -> XiaozhiWebSocketClient:
+    client = XiaozhiWebSocketClient(WSConfig(capture_dir=None))
+    client.websocket = _FakeWebSocket(pong)
+    client.state = ConnectionState.AUTHENTICATED
+    client.session_id = "s1"
+    return client
+
+
+def _pool(**kwargs) -> UpstreamConnectionPool:
+    kwargs.setdefault("size", 2)
+    return UpstreamConnectionPool(device_manager=None, ws_config=WSConfig(capture_dir=None, ping_timeout=0.05), **kwargs)
+
+
+def _add_idle(pool: UpstreamConnectionPool, client: XiaozhiWebSocketClient, since: float = None):
+    pool._attach(client)
+    pool._idle.append((client, time.monotonic() if since is None else since))
+
+
+def test_lease_skips_unhealthy_and_detaches():
+    """测试租用时丢弃已断开的连接，返回的健康连接不再带有池的回调；池空时记一次未命中"""
+    async def run():
+        pool = _pool()
+        dead, healthy = _authenticated_client(), _authenticated_client()
+        dead.websocket.close_code = 1006
+        _add_idle(pool, dead)
+        _add_idle(pool, healthy)
+
+        leased = await pool.lease()
+        missed = await pool.lease()
+        return pool, healthy, leased, missed
+
+    pool, healthy, leased, missed = asyncio.run(run())
+
+    assert leased is healthy
+    assert leased.on_disconnected is None and leased.on_error is None
+    assert missed is None
+    assert pool.stats["leased"] == 1
+    assert pool.stats["discarded_unhealthy"] == 1
+    assert pool.stats["lease_misses"] == 1
+
+
+def test_check_idle_recycles_expired_and_drops_failed_ping():
+    """测试健康检查：超过空闲上限的连接回收，ping无回应的连接丢弃，其余保留"""
+    async def run():
+        pool = _pool(size=3, max_idle_seconds=60)
+        expired, silent, healthy = _authenticated_client(), _authenticated_client(pong=False), _authenticated_client()
+        _add_idle(pool, expired, since=time.monotonic() - 120)
+        _add_idle(pool, silent)
+        _add_idle(pool, healthy)
+
+        await pool._check_idle()
+        return pool, expired, silent, healthy
+
+    pool, expired, silent, healthy = asyncio.run(run())
+
+    assert [client for client, _ in pool._idle] == [healthy]
+    assert pool.stats["recycled_idle"] == 1
+    assert pool.stats["discarded_unhealthy"] == 1
+    assert expired.websocket is None and silent.websocket is None
+
+
+def test_release_resets_reconnect_and_turn_state():
+    """测试未开始对话的连接归还入池时关闭自动重连，清除重连次数和进行中的轮次"""
+    async def run():
+        pool = _pool()
+        _add_idle(pool, _authenticated_client())
+        client = await pool.lease()
+        client.enable_auto_reconnect(True, max_attempts=5)
+        client.reconnect_attempts = 2
+        client.on_authenticated = lambda: None
+        await client.send_start_listening("manual")
+        await client.send_audio(b"a1")
+
+        await pool.release(client, reusable=True)
+        return pool, client
+
+    pool, client = asyncio.run(run())
+
+    assert pool.idle_count == 1
+    assert not client._auto_reconnect_enabled
+    assert client.reconnect_attempts == 0
+    assert not client.has_pending_turn
+    assert client.on_authenticated is None
+
+
+def test_warm_failures_back_off_exponentially(monkeypatch):
+    """测试预热连续失败时按2的幂次退避"""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def run():
+        pool = _pool(size=1, health_interval=0.001)
+
+        async def fail_warm():
+            return None
+
+        async def record_sleep(delay):
+            delays.append(delay)
+            if len(delays) >= 3:
+                pool._closed = True
+            await real_sleep(0)
+
+        pool._warm_one = fail_warm
+        monkeypatch.setattr(asyncio, "sleep", record_sleep)
+        pool._replenish_event.set()
+        await pool._maintain_loop()
+
+    asyncio.run(run())
+
+    assert delays == [2, 4, 8]
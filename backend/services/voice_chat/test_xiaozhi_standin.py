@@ -0,0 +1,147 @@
+"""
+小智AI替身服务器 - 端到端测试
+
+真实的XiaozhiWebSocketClient连接替身服务器（speed=0，自动分配端口），
+走完hello、listen start、上行帧、listen stop和abort
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("websockets")
+pytest.importorskip("aiohttp")
+pytest.importorskip("psutil")
+
+# xiaozhi_standin / ws_client 以 services.* 包路径导入依赖，需要backend目录在sys.path中（同 setup_paths.py）
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from services.voice_chat.upstream_capture import CapturedTurn, CaptureEvent, DIRECTION_DOWN  # noqa: E402
+from services.voice_chat.ws_client import WSConfig, XiaozhiWebSocketClient  # noqa: E402
+from services.voice_chat.xiaozhi_standin import XiaozhiStandinServer  # noqa: E402
+
+
+def _turn(uplink_frames: int, delay_ms: float = 0.0) -> CapturedTurn:
+    """录制的一轮：STT、一帧TTS音频、tts stop（录制时的session_id为recorded）"""
+    events = [
+        {"type": "stt", "text": "你好", "session_id": "recorded"},
+        {"type": "tts", "state": "start", "session_id": "recorded"},
+        b"opus-1",
+        {"type": "tts", "state": "stop", "session_id": "recorded"},
+    ]
+    return CapturedTurn(uplink_frames, [
+        CaptureEvent(delay_ms if i else 0.0, DIRECTION_DOWN, e if isinstance(e, bytes) else json.dumps(e))
+        for i, e in enumerate(events)
+    ])
+
+
+class _Recorder:
+    """收集客户端收到的JSON消息和音频帧"""
+
+    def __init__(self, client: XiaozhiWebSocketClient):
+        self.messages = []
+        self.audio = []
+        self.tts_stopped = asyncio.Event()
+        client.on_message_received = self._on_message
+        client.on_audio_packet = self.audio.append
+
+    def _on_message(self, data):
+        self.messages.append(data)
+        if data.get("type") == "tts" and data.get("state") == "stop":
+            self.tts_stopped.set()
+
+
+async def _connect(server: XiaozhiStandinServer):
+    client = XiaozhiWebSocketClient(WSConfig(url=server.url, capture_dir=None))
+    client.device_info = SimpleNamespace(device_id="dev", client_id="cli", connection_params={})
+
+    async def prepared():
+        return True
+
+    client._prepare_device_info = prepared
+    recorder = _Recorder(client)
+    assert await client.connect()
+    assert await client.wait_authenticated(2)
+    return client, recorder
+
+
+async def _with_server(server: XiaozhiStandinServer, scenario):
+    await server.start()
+    try:
+        client, recorder = await _connect(server)
+        try:
+            await scenario(client, recorder)
+        finally:
+            await client.disconnect()
+    finally:
+        await server.stop()
+
+
+def test_manual_turn_replays_capture_with_session_id():
+    """测试手动模式：listen stop后按序回放STT、TTS和音频帧，session_id替换为本连接的"""
+    server = XiaozhiStandinServer(turns=[_turn(2)], speed=0, port=0)
+    result = {}
+
+    async def scenario(client, recorder):
+        assert await client.send_start_listening("manual")
+        assert await client.send_audio(b"up-1")
+        assert await client.send_audio(b"up-2")
+        assert await client.send_stop_listening()
+        await asyncio.wait_for(recorder.tts_stopped.wait(), timeout=2)
+        result.update(session_id=client.session_id, messages=recorder.messages, audio=recorder.audio)
+
+    asyncio.run(_with_server(server, scenario))
+
+    assert [(m["type"], m.get("state")) for m in result["messages"]] == [
+        ("hello", None), ("stt", None), ("tts", "start"), ("tts", "stop")
+    ]
+    assert result["messages"][1]["text"] == "你好"
+    assert all(m["session_id"] == result["session_id"] != "recorded" for m in result["messages"])
+    assert result["audio"] == [b"opus-1"]
+    assert server.stats["uplink_frames"] == 2
+    assert server.stats["turns_played"] == 1
+
+
+def test_auto_mode_without_capture_replies_on_first_frame():
+    """测试无录制的最小回复：自动模式没有listen stop，收到第一帧上行音频即回复"""
+    server = XiaozhiStandinServer(speed=0, port=0)
+    received = []
+
+    async def scenario(client, recorder):
+        assert await client.send_start_listening("auto")
+        assert await client.send_audio(b"up-1")
+        await asyncio.wait_for(recorder.tts_stopped.wait(), timeout=2)
+        received.extend(m["type"] for m in recorder.messages)
+
+    asyncio.run(_with_server(server, scenario))
+
+    assert received == ["hello", "stt", "tts", "tts"]
+    assert server.stats["turns_played"] == 1
+
+
+def test_abort_stops_playback_and_sends_tts_stop():
+    """测试abort：停止当前回放，立即回复tts stop，之后的录制消息不再发送"""
+    server = XiaozhiStandinServer(turns=[_turn(1, delay_ms=5000)], speed=1, port=0)
+    result = {}
+
+    async def scenario(client, recorder):
+        assert await client.send_start_listening("manual")
+        assert await client.send_audio(b"up-1")
+        assert await client.send_stop_listening()
+        await asyncio.sleep(0.05)
+        assert await client.send_abort_speaking()
+        await asyncio.wait_for(recorder.tts_stopped.wait(), timeout=2)
+        await asyncio.sleep(0.05)
+        result.update(session_id=client.session_id, messages=recorder.messages, audio=recorder.audio)
+
+    asyncio.run(_with_server(server, scenario))
+
+    assert [(m["type"], m.get("state")) for m in result["messages"]] == [("hello", None), ("stt", None), ("tts", "stop")]
+    assert result["messages"][-1]["session_id"] == result["session_id"]
+    assert result["audio"] == []
+    assert server.stats["turns_aborted"] == 1
+    assert server.stats["turns_played"] == 0
@@ -14,10 +14,13 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 
-# 导入py-xiaozhi的音频编解码器
-from libs.py_xiaozhi.src.audio_codecs.audio_codec import AudioCodec
 from libs.py_xiaozhi.src.constants.constants import AudioConfig
 
+# 音频编解码后端（硬件AudioCodec在选中时才导入）
+from services.voice_chat.software_audio_codec import (
+    create_audio_codec, DEFAULT_CODEC_BACKEND, CODEC_BACKEND_SOFTWARE
+)
+
 # 导入AI响应解析器的音频数据结构
 from services.voice_chat.ai_response_parser import AudioData
 
@@ -41,6 +44,8 @@ class PlaybackConfig:
     enable_queue: bool = True  # 启用播放队列
     auto_play: bool = True     # 自动播放
     max_queue_size: int = 50   # 最大队列大小
+    codec_backend: str = DEFAULT_CODEC_BACKEND  # hardware（声卡）| software（无设备）
+    sink_path: Optional[str] = None  # software后端的播放输出WAV，None时丢弃
 
 
 @dataclass
@@ -74,7 +79,7 @@ class TTSPlayer:
             config: 播放配置，如果为None则使用默认配置
         """
         self.config = config or PlaybackConfig()
-        self.audio_codec: Optional[AudioCodec] = None
+        self.audio_codec = None
         self.is_initialized = False
 
         # 播放状态
@@ -115,7 +120,12 @@ class TTSPlayer:
             logger.info("正在初始化音频播放设备...")
 
             # 创建音频编解码器实例
-            self.audio_codec = AudioCodec()
+            self.audio_codec = create_audio_codec(
+                self.config.codec_backend,
+                sink_path=self.config.sink_path,
+                output_sample_rate=self.config.output_sample_rate,
+                channels=self.config.channels
+            )
 
             # 初始化音频设备
             await self.audio_codec.initialize()
@@ -192,10 +202,10 @@ class TTSPlayer:
         Returns:
             bool: 播放是否成功启动
         """
-        import traceback
-        logger.warning(f"⚠️ play_audio被调用！音频大小: {len(audio_data.data)} bytes")
-        logger.warning(f"⚠️ 后端不应该播放音频！直接返回False")
-        return False  # 后端禁止播放音频，音频应该由前端播放
+        if self.config.codec_backend != CODEC_BACKEND_SOFTWARE:
+            logger.warning(f"⚠️ play_audio被调用！音频大小: {len(audio_data.data)} bytes")
+            logger.warning(f"⚠️ 后端不应该播放音频！直接返回False")
+            return False  # 后端禁止在声卡上播放音频，音频应该由前端播放（software后端只写文件/丢弃）
 
         if not self.is_initialized:
             error_msg = "播放器未初始化，请先调用initialize()"
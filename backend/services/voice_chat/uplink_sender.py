@@ -0,0 +1,215 @@
+"""
+上行音频有序发送器
+
+每个会话一个长驻发送协程，由有界环形缓冲区供数：
+1. 严格按提交顺序发送OPUS帧（不会出现帧乱序）
+2. 缓冲区有界，溢出时按显式策略丢帧，避免上游变慢时任务/内存无限增长
+   （每次溢出只在开始和恢复时各记一条日志，丢帧数计入统计）
+3. 暴露队列深度和发送延迟统计
+
+替代原先"每帧一个asyncio.Task + Semaphore"的发送方式
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """缓冲区溢出策略"""
+    DROP_OLDEST = "drop_oldest"   # 丢弃最旧的帧，保证最新音频能进入（默认）
+    DROP_NEWEST = "drop_newest"   # 丢弃新提交的帧，保证已缓冲音频连续
+
+
+class UplinkAudioSender:
+    """
+    上行音频发送器
+
+    submit() 必须在事件循环线程中调用（音频线程通过 call_soon_threadsafe 转发）
+    """
+
+    def __init__(self,
+                 send_func: Callable[[bytes], Awaitable[bool]],
+                 maxsize: int = 50,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        """
+        初始化发送器
+
+        Args:
+            send_func: 实际发送函数（如 XiaozhiWebSocketClient.send_audio）
+            maxsize: 缓冲区最大帧数，默认50帧（40ms帧约2秒音频）
+            overflow_policy: 溢出策略
+        """
+        self._send_func = send_func
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+
+        # (帧数据, 入队时间)
+        self._queue: Deque[Tuple[bytes, float]] = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self._overflow_drops = 0  # 本次溢出已丢弃的帧数（0表示未处于溢出中）
+
+        # 统计信息
+        self.stats = {
+            "frames_submitted": 0,
+            "frames_sent": 0,
+            "frames_dropped": 0,
+            "overflow_episodes": 0,
+            "send_failures": 0,
+            "max_queue_depth": 0,
+            "last_send_lag_ms": 0.0,
+            "max_send_lag_ms": 0.0,
+            "total_send_lag_ms": 0.0
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        """当前缓冲的帧数"""
+        return len(self._queue)
+
+    @property
+    def is_running(self) -> bool:
+        """发送协程是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """启动发送协程（需在事件循环中调用）"""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"✅ 上行音频发送器已启动 (maxsize={self.maxsize}, policy={self.overflow_policy.value})")
+
+    def submit(self, frame: bytes) -> bool:
+        """
+        提交一帧待发送音频（非阻塞）
+
+        Args:
+            frame: OPUS编码的音频帧
+
+        Returns:
+            bool: 帧是否进入缓冲区
+        """
+        self.stats["frames_submitted"] += 1
+
+        if len(self._queue) >= self.maxsize:
+            self._record_overflow_drop()
+            if self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                return False
+            self._queue.popleft()
+        elif self._overflow_drops:
+            self._end_overflow()
+
+        self._queue.append((frame, time.monotonic()))
+        depth = len(self._queue)
+        if depth > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = depth
+
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    def _record_overflow_drop(self):
+        """溢出丢帧计数：每次溢出只在第一帧时告警"""
+        self.stats["frames_dropped"] += 1
+        if not self._overflow_drops:
+            self.stats["overflow_episodes"] += 1
+            dropped = "新帧" if self.overflow_policy == OverflowPolicy.DROP_NEWEST else "最旧帧"
+            logger.warning(f"⚠️ 上行音频缓冲区已满 ({self.maxsize} 帧)，开始丢弃{dropped}")
+        self._overflow_drops += 1
+
+    def _end_overflow(self):
+        """缓冲区恢复：汇总本次溢出丢弃的帧数"""
+        logger.warning(f"⚠️ 上行音频缓冲区已恢复，本次溢出共丢弃 {self._overflow_drops} 帧")
+        self._overflow_drops = 0
+
+    async def flush(self, timeout: float = 1.0) -> bool:
+        """
+        等待缓冲区中的帧全部发送完成
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 是否在超时前发送完毕
+        """
+        if not self._queue and self._idle.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"等待上行音频发送超时，剩余 {len(self._queue)} 帧")
+            return False
+
+    def clear(self):
+        """丢弃所有未发送的帧"""
+        dropped = len(self._queue)
+        self._queue.clear()
+        if self._overflow_drops:
+            self._end_overflow()
+        if dropped:
+            self.stats["frames_dropped"] += dropped
+            logger.info(f"🧹 已清空上行音频缓冲区 ({dropped} 帧)")
+
+    async def stop(self):
+        """停止发送协程（未发送的帧被丢弃）"""
+        self.clear()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._idle.set()
+
+    async def _run(self):
+        """发送循环：单协程顺序发送，保证帧顺序"""
+        try:
+            while True:
+                if not self._queue:
+                    self._idle.set()
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                frame, enqueued_at = self._queue.popleft()
+                try:
+                    sent = await self._send_func(frame)
+                except Exception as e:
+                    sent = False
+                    logger.error(f"上行音频发送异常: {e}")
+
+                if sent:
+                    lag_ms = (time.monotonic() - enqueued_at) * 1000
+                    self.stats["frames_sent"] += 1
+                    self.stats["last_send_lag_ms"] = lag_ms
+                    self.stats["total_send_lag_ms"] += lag_ms
+                    if lag_ms > self.stats["max_send_lag_ms"]:
+                        self.stats["max_send_lag_ms"] = lag_ms
+                else:
+                    self.stats["send_failures"] += 1
+
+        except asyncio.CancelledError:
+            logger.debug("上行音频发送协程已取消")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取发送统计信息"""
+        sent = self.stats["frames_sent"]
+        return {
+            **self.stats,
+            "queue_depth": self.queue_depth,
+            "max_size": self.maxsize,
+            "overflow_policy": self.overflow_policy.value,
+            "avg_send_lag_ms": self.stats["total_send_lag_ms"] / sent if sent else 0.0,
+            "running": self.is_running
+        }
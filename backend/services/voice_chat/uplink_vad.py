@@ -0,0 +1,208 @@
+"""
+PocketSpeak 上行语音活动检测（VAD）
+
+手动模式下按下到松开之间的每个40ms麦克风帧都会发给小智AI，包括开头和结尾的静音。
+这里在上行路径上做能量 + 过零率检测，减少上行字节并更早结束说话：
+1. 语音开始前的静音帧不发送，只保留少量预录帧，检测到语音时随首个语音帧一起补发
+2. 语音中的短停顿在拖尾帧数内照常发送，超过后丢弃（可配置每N帧保留一帧静音）
+3. 可选：语音后静音持续超过阈值时标记说话结束，由会话自动停止监听
+4. 记录语音开始/结束时间（以音频时间轴计，相对监听开始，毫秒）
+
+检测基于16kHz PCM，每帧切成10ms子帧，用NumPy一次计算所有子帧的能量和过零率
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+import opuslib
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VADConfig:
+    """VAD配置"""
+    sample_rate: int = 16000
+    frame_duration: int = 40            # 上行帧时长（毫秒）
+    subframe_duration: int = 10         # 分析子帧时长（毫秒）
+    energy_threshold_db: float = -40.0  # 语音能量阈值（dBFS）
+    weak_energy_margin_db: float = 10.0 # 低于阈值不超过该值、且过零率落在清音区间的子帧也算语音
+    zcr_min: float = 0.1                # 清音（摩擦音）过零率下限
+    zcr_max: float = 0.5                # 清音过零率上限（更高视为噪声）
+    min_speech_frames: int = 2          # 连续多少帧语音才判定开始说话
+    pre_roll_frames: int = 4            # 语音开始前补发的预录帧数
+    hangover_frames: int = 8            # 语音后继续发送的静音帧数（约320ms）
+    silence_keep_every: int = 0         # 丢弃阶段每N帧静音保留一帧（0表示全部丢弃）
+    auto_stop_silence_ms: int = 0       # 语音后静音超过该时长时标记说话结束（0表示不自动停止）
+
+
+class UplinkVAD:
+    """
+    上行VAD处理阶段（每个会话一个，单协程使用）
+
+    process()输入一个上行OPUS包，返回应当发送的OPUS包列表（可能为空或包含补发的预录帧）
+    """
+
+    def __init__(self, config: Optional[VADConfig] = None):
+        self.config = config or VADConfig()
+        cfg = self.config
+        self._frame_samples = cfg.sample_rate * cfg.frame_duration // 1000
+        self._subframe_samples = cfg.sample_rate * cfg.subframe_duration // 1000
+        self._decoder = None
+
+        # 预录缓冲同时暂存确认开始说话之前的语音帧
+        self._pre_roll: Deque[bytes] = deque(maxlen=cfg.pre_roll_frames + max(0, cfg.min_speech_frames - 1))
+        self.stats = {
+            "frames_in": 0,
+            "frames_sent": 0,
+            "frames_dropped": 0,
+            "bytes_in": 0,
+            "bytes_sent": 0,
+            "decode_errors": 0,
+            "utterances": 0
+        }
+        self.reset()
+
+    def reset(self):
+        """开始新一轮监听"""
+        self._frame_index = 0
+        self._speech_run = 0
+        self._silence_run = 0
+        self._in_speech = False
+        self._pre_roll.clear()
+        self.speech_onset_ms: Optional[int] = None
+        self.speech_offset_ms: Optional[int] = None
+        self.end_of_speech = False
+
+    # ========== 检测 ==========
+
+    def analyze(self, pcm: np.ndarray) -> bool:
+        """
+        判断一帧16-bit PCM是否包含语音
+
+        Args:
+            pcm: int16样本（一帧）
+
+        Returns:
+            bool: 任一子帧为语音时返回True
+        """
+        cfg = self.config
+        usable = len(pcm) - len(pcm) % self._subframe_samples
+        if usable <= 0:
+            return False
+
+        subframes = pcm[:usable].reshape(-1, self._subframe_samples).astype(np.float32) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(subframes * subframes, axis=1) + 1e-10)
+        signs = np.signbit(subframes)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self._subframe_samples - 1)
+
+        voiced = energy_db >= cfg.energy_threshold_db
+        unvoiced = ((energy_db >= cfg.energy_threshold_db - cfg.weak_energy_margin_db)
+                    & (zcr >= cfg.zcr_min) & (zcr <= cfg.zcr_max))
+        return bool(np.any(voiced | unvoiced))
+
+    def _decode(self, packet: bytes) -> Optional[np.ndarray]:
+        if self._decoder is None:
+            self._decoder = opuslib.Decoder(self.config.sample_rate, 1)
+        try:
+            pcm = self._decoder.decode(packet, frame_size=self._frame_samples, decode_fec=False)
+        except opuslib.OpusError as e:
+            self.stats["decode_errors"] += 1
+            logger.debug(f"上行VAD解码失败，按语音处理: {e}")
+            return None
+        return np.frombuffer(pcm, dtype=np.int16)
+
+    # ========== 门控 ==========
+
+    def process(self, packet: bytes, pcm: Optional[np.ndarray] = None) -> List[bytes]:
+        """
+        处理一个上行OPUS包
+
+        Args:
+            packet: OPUS包
+            pcm: 已有的PCM样本（为None时解码packet）
+
+        Returns:
+            List[bytes]: 应发送的OPUS包（按顺序）
+        """
+        cfg = self.config
+        frame_start_ms = self._frame_index * cfg.frame_duration
+        self._frame_index += 1
+        self.stats["frames_in"] += 1
+        self.stats["bytes_in"] += len(packet)
+
+        if pcm is None:
+            pcm = self._decode(packet)
+        # 无法解码的帧按语音处理，宁可多发也不丢内容
+        is_speech = True if pcm is None else self.analyze(pcm)
+
+        if is_speech:
+            self._silence_run = 0
+            self._speech_run += 1
+            if self._in_speech:
+                self.speech_offset_ms = frame_start_ms + cfg.frame_duration
+                return self._send([packet])
+
+            if self._speech_run < cfg.min_speech_frames:
+                self._pre_roll.append(packet)
+                return []
+
+            # 判定开始说话：补发预录帧（包含之前几个语音帧）
+            self._in_speech = True
+            self.end_of_speech = False
+            self.stats["utterances"] += 1
+            if self.speech_onset_ms is None:
+                self.speech_onset_ms = max(0, frame_start_ms - (self._speech_run - 1) * cfg.frame_duration)
+            self.speech_offset_ms = frame_start_ms + cfg.frame_duration
+            packets = list(self._pre_roll) + [packet]
+            self._pre_roll.clear()
+            return self._send(packets)
+
+        self._speech_run = 0
+        if self.speech_onset_ms is not None:
+            # 已开始说话：累计语音后的静音时长
+            self._silence_run += 1
+            if (cfg.auto_stop_silence_ms and not self.end_of_speech
+                    and self._silence_run * cfg.frame_duration >= cfg.auto_stop_silence_ms):
+                self.end_of_speech = True
+
+        if self._in_speech and self._silence_run <= cfg.hangover_frames:
+            return self._send([packet])
+
+        # 拖尾结束：回到等待语音状态，之后的静音按开头静音处理
+        self._in_speech = False
+        return self._drop_silence(packet)
+
+    def _send(self, packets: List[bytes]) -> List[bytes]:
+        self.stats["frames_sent"] += len(packets)
+        self.stats["bytes_sent"] += sum(len(p) for p in packets)
+        return packets
+
+    def _drop_silence(self, packet: bytes) -> List[bytes]:
+        """静音帧：放入预录缓冲，按配置稀疏保留"""
+        keep_every = self.config.silence_keep_every
+        if keep_every and self._frame_index % keep_every == 0:
+            return self._send([packet])
+
+        if len(self._pre_roll) == self._pre_roll.maxlen:
+            self.stats["frames_dropped"] += 1
+        self._pre_roll.append(packet)
+        return []
+
+    @property
+    def in_speech(self) -> bool:
+        return self._in_speech
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取VAD统计信息"""
+        bytes_in = self.stats["bytes_in"]
+        return {
+            **self.stats,
+            "in_speech": self._in_speech,
+            "speech_onset_ms": self.speech_onset_ms,
+            "speech_offset_ms": self.speech_offset_ms,
+            "bytes_saved_ratio": round(1 - self.stats["bytes_sent"] / bytes_in, 3) if bytes_in else 0.0
+        }
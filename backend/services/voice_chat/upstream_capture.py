@@ -0,0 +1,188 @@
+"""
+上游会话录制与回放数据
+
+录制：XiaozhiWebSocketClient 在 WSConfig.capture_dir（或环境变量 XIAOZHI_CAPTURE_DIR）设置时，
+把每个连接收发的JSON和二进制帧连同时间戳写入一个JSONL文件：
+
+    {"t": 1234.5, "dir": "up" | "down", "kind": "text" | "binary", "data": "<文本或base64>"}
+
+t 为相对连接建立的毫秒数。回放：xiaozhi_standin.py 读取录制文件，按轮次重放下行消息
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import IO, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DIRECTION_UP = "up"
+DIRECTION_DOWN = "down"
+
+CAPTURE_DIR = os.getenv("XIAOZHI_CAPTURE_DIR") or None
+
+
+@dataclass
+class CaptureEvent:
+    """录制中的一条消息"""
+    t_ms: float
+    direction: str  # up: 客户端 -> 服务器，down: 服务器 -> 客户端
+    data: Union[str, bytes]
+
+    @property
+    def is_binary(self) -> bool:
+        return isinstance(self.data, (bytes, bytearray))
+
+    @property
+    def message(self) -> Optional[dict]:
+        """文本消息解析后的字典（二进制或无法解析时为None）"""
+        if self.is_binary:
+            return None
+        try:
+            message = json.loads(self.data)
+        except ValueError:
+            return None
+        return message if isinstance(message, dict) else None
+
+
+@dataclass
+class CapturedTurn:
+    """一轮对话：上行listen start到本轮tts stop之间的消息"""
+    uplink_frames: int
+    downlink: List[CaptureEvent]  # t_ms 已换算为相对本轮listen stop（无stop时为首条下行消息前的最后一个上行事件）
+
+
+class CaptureWriter:
+    """
+    录制写入器
+
+    每条消息写一行，行缓冲由文件对象负责；close() 时落盘
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file: Optional[IO[str]] = open(path, "w", encoding="utf-8")
+        self._started = time.monotonic()
+        self.events = 0
+        logger.info(f"🎙️ 录制上游会话: {path}")
+
+    @classmethod
+    def for_connection(cls, capture_dir: str) -> "CaptureWriter":
+        """在录制目录下为一个新连接创建文件"""
+        name = f"xiaozhi_{time.strftime('%Y%m%d_%H%M%S')}_{int(time.time() * 1000) % 1000:03d}.jsonl"
+        return cls(os.path.join(capture_dir, name))
+
+    def record(self, direction: str, data: Union[str, bytes]):
+        """记录一条消息"""
+        if self._file is None:
+            return
+        entry = {"t": round((time.monotonic() - self._started) * 1000, 1), "dir": direction}
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            entry["kind"] = "binary"
+            entry["data"] = base64.b64encode(bytes(data)).decode("ascii")
+        else:
+            entry["kind"] = "text"
+            entry["data"] = data
+        try:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.events += 1
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ 写入录制文件失败，停止录制: {e}")
+            self.close()
+
+    def close(self):
+        """关闭录制文件"""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+            logger.info(f"💾 上游会话录制完成: {self.path} ({self.events} 条)")
+
+
+def load_capture(path: str) -> List[CaptureEvent]:
+    """读取录制文件（跳过无法解析的行）"""
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                data = entry["data"]
+                if entry.get("kind") == "binary":
+                    data = base64.b64decode(data)
+                events.append(CaptureEvent(float(entry["t"]), entry["dir"], data))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"⚠️ 录制文件第{line_no}行无效: {e}")
+    return events
+
+
+def _listen_state(event: CaptureEvent) -> Optional[str]:
+    message = event.message
+    if message and message.get("type") == "listen":
+        return message.get("state")
+    return None
+
+
+def _is_tts_stop(event: CaptureEvent) -> bool:
+    message = event.message
+    return bool(message) and message.get("type") == "tts" and message.get("state") == "stop"
+
+
+def server_hello(events: List[CaptureEvent]) -> Optional[dict]:
+    """录制中服务器返回的hello（回放时沿用其audio_params）"""
+    for event in events:
+        message = event.message if event.direction == DIRECTION_DOWN else None
+        if message and message.get("type") == "hello":
+            return message
+    return None
+
+
+def split_turns(events: List[CaptureEvent]) -> List[CapturedTurn]:
+    """
+    按轮次切分录制
+
+    每轮从上行listen start开始，到下行tts stop结束；下行消息时间换算为相对本轮的
+    listen stop（回放服务器在收到客户端的listen stop时开始计时）
+    """
+    turns = []
+    current_frames = 0
+    anchor: Optional[float] = None
+    last_uplink_ms = 0.0
+    downlink: List[CaptureEvent] = []
+    in_turn = False
+
+    for event in events:
+        if event.direction == DIRECTION_UP:
+            last_uplink_ms = event.t_ms
+            state = _listen_state(event)
+            if state == "start":
+                if in_turn and downlink:
+                    turns.append(CapturedTurn(current_frames, downlink))
+                in_turn, current_frames, anchor, downlink = True, 0, None, []
+            elif state == "stop" and in_turn:
+                anchor = event.t_ms
+            elif event.is_binary and in_turn:
+                current_frames += 1
+            continue
+
+        if not in_turn:
+            continue
+        if anchor is None:
+            # 自动/实时模式没有listen stop：以首条下行消息前的最后一个上行事件为起点
+            anchor = last_uplink_ms
+        downlink.append(CaptureEvent(max(event.t_ms - anchor, 0.0), event.direction, event.data))
+        if _is_tts_stop(event):
+            turns.append(CapturedTurn(current_frames, downlink))
+            in_turn, downlink = False, []
+
+    if in_turn and downlink:
+        turns.append(CapturedTurn(current_frames, downlink))
+    return turns
@@ -6,21 +6,35 @@ PocketSpeak 语音会话管理器
 """
 
 import asyncio
+import base64
 import json
 import logging
+import threading
+import time
 from typing import Optional, Callable, Dict, Any, List, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
 # 导入语音通信模块
-from services.voice_chat.ws_client import XiaozhiWebSocketClient, ConnectionState, WSConfig
+from services.voice_chat.ws_client import XiaozhiWebSocketClient, ConnectionState, WSConfig, UPSTREAM_URL_OVERRIDE
 from services.voice_chat.speech_recorder import SpeechRecorder, RecordingConfig
 from services.voice_chat.ai_response_parser import AIResponseParser, AIResponse, MessageType, AudioData
 from services.voice_chat.tts_player import TTSPlayer, PlaybackConfig, TTSRequest
+from services.voice_chat.audio_frames import OpusDecodeStage, PCMFrame
+from services.voice_chat.pcm_store import PCMAudioStore
+from services.voice_chat.live_pcm import LivePCMTracker
+from services.voice_chat.wav_utils import pcm_to_wav
+from services.voice_chat.uplink_sender import UplinkAudioSender, OverflowPolicy
+from services.voice_chat.conversation_history import ConversationHistory, decoded_audio_cache
+from services.voice_chat.session_registry import VoiceSessionRegistry, DEFAULT_SESSION_KEY
+from services.voice_chat.ws_pool import UpstreamConnectionPool, get_upstream_pool
+from services.voice_chat.media_workers import media_pool
+from services.voice_chat.uplink_vad import UplinkVAD, VADConfig
 
 # 导入设备管理
 from services.device_lifecycle import PocketSpeakDeviceManager
+from utils import json_codec
 
 # ✅ 新增：导入音频缓冲管理器
 from services.voice_chat.audio_buffer_manager import create_sentence_buffer, AudioChunk
@@ -28,6 +42,18 @@ from services.voice_chat.audio_buffer_manager import create_sentence_buffer, Aud
 logger = logging.getLogger(__name__)
 
 
+# 上行音频来源
+UPLINK_SOURCE_SERVER = "server"  # 服务器本机麦克风（SpeechRecorder）
+UPLINK_SOURCE_CLIENT = "client"  # 前端采集并通过 /api/voice/ws 上传的OPUS帧
+
+# 监听模式（py-xiaozhi协议的listen.mode）
+LISTENING_MODE_MANUAL = "manual"      # 手动按压：按住说话/松开停止
+LISTENING_MODE_REALTIME = "realtime"  # 实时打断：AI回复中也可开始监听，先中止当前回复
+
+# 前端上传的单个OPUS包最大字节数（libopus单包上限1275字节/帧，60ms最多3帧）
+MAX_CLIENT_UPLINK_PACKET = 4000
+
+
 class SessionState(Enum):
     """会话状态枚举"""
     IDLE = "idle"                       # 空闲状态
@@ -40,6 +66,30 @@ class SessionState(Enum):
     CLOSED = "closed"                   # 会话已关闭
 
 
+@dataclass(frozen=True)
+class EncodedSentence:
+    """
+    已完成句子的编码产物（不可变）
+
+    句子关闭后由会话在媒体线程中一次性封装为WAV并base64编码
+    （只有OPUS直通客户端时推迟到首次读取），之后的轮询只做索引查找
+    """
+    text: str
+    audio_data: Optional[str]  # base64编码的WAV，空音频句子为None
+    start_chunk: int
+    end_chunk: int
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_data is not None
+
+    def to_response(self) -> Dict[str, Any]:
+        return {
+            "text": self.text,
+            "audio_data": self.audio_data
+        }
+
+
 @dataclass
 class VoiceMessage:
     """语音消息数据结构"""
@@ -47,101 +97,292 @@ class VoiceMessage:
     timestamp: datetime
     user_text: Optional[str] = None
     ai_text: Optional[str] = None
-    ai_audio: Optional[AudioData] = None
     message_type: Optional[MessageType] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
-    _pcm_chunks: List[bytes] = field(default_factory=list)  # 累积PCM数据块(已解码)
+    _audio_store: PCMAudioStore = field(default_factory=PCMAudioStore, repr=False)  # 累积PCM数据(只追加,按帧索引)
+    _encoded_frames: List[bytes] = field(default_factory=list, init=False, repr=False)  # 下行原始音频帧(OPUS包,与PCM帧一一对应)
+    _encoded_format: str = field(default="opus", init=False)  # 原始音频帧格式
+    _encoded_size: int = field(default=0, init=False)  # 原始音频帧总字节数
+    _decode_stage: Optional[OpusDecodeStage] = field(default=None, init=False, repr=False)  # 本消息的解码器(按需创建)
+    _media_lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)  # 解码/编码可能在媒体线程中执行
+    _is_compacted: bool = field(default=False, init=False)  # 已压缩为文本+OPUS（历史记录）
     _sample_rate: int = 24000
     _channels: int = 1
-    _opus_decoder: Optional[Any] = field(default=None, init=False, repr=False)  # 复用的OPUS解码器(参考py-xiaozhi标准实现)
     _is_tts_complete: bool = field(default=False, init=False)  # TTS是否完成（收到tts_stop信号）
     _sentences: List[Dict[str, Any]] = field(default_factory=list, init=False)  # 句子列表: [{"text": "...", "start_chunk": 0, "end_chunk": 5, "is_complete": True}, ...]
     _current_sentence_start: int = field(default=0, init=False)  # 当前句子的起始chunk索引
+    _encoded_sentences: List[EncodedSentence] = field(default_factory=list, init=False, repr=False)  # 已完成句子的编码产物（与完成顺序一致）
 
-    def append_audio_chunk(self, audio_data: AudioData):
+    def append_audio_frame(self, audio_data: AudioData) -> int:
         """
-        累积音频数据块 - 先解码OPUS为PCM再累积
+        累积一帧下行原始音频（OPUS包）
 
-        优化说明（参考py-xiaozhi标准实现）:
-        1. 复用OPUS解码器实例，避免每帧都创建新解码器
-        2. 解码失败时跳过该帧，避免引入脏数据
+        说明：这里只保存原始帧，不解码。PCM在真正需要时由decode_pending()
+        按顺序补齐（实时PCM推送、增量音频轮询、句子音频、历史音频），
+        只有OPUS直通客户端时整段回复都不必在服务端解码
+
+        Returns:
+            int: 该帧在本消息内的帧索引
         """
-        import opuslib
+        if not self._encoded_frames:
+            self._encoded_format = audio_data.format
+            self._sample_rate = audio_data.sample_rate
+            self._channels = audio_data.channels
+        self._encoded_frames.append(audio_data.data)
+        self._encoded_size += len(audio_data.data)
+        return len(self._encoded_frames) - 1
+
+    def _iter_encoded(self, start: int = 0):
+        for packet in self._encoded_frames[start:]:
+            yield AudioData(
+                data=packet,
+                format=self._encoded_format,
+                sample_rate=self._sample_rate,
+                channels=self._channels
+            )
 
-        try:
-            # 如果是OPUS格式,先解码为PCM
-            if audio_data.format == "opus":
-                # 初始化或复用解码器（参考py-xiaozhi的self.opus_decoder模式）
-                if self._opus_decoder is None:
-                    self._opus_decoder = opuslib.Decoder(audio_data.sample_rate, audio_data.channels)
-                    self._sample_rate = audio_data.sample_rate
-                    self._channels = audio_data.channels
-
-                # 使用960帧大小解码(24kHz下40ms的帧，与py-xiaozhi一致)
-                pcm_data = self._opus_decoder.decode(audio_data.data, frame_size=960, decode_fec=False)
-                self._pcm_chunks.append(pcm_data)
-
-                # 合并所有PCM块（注意：这里必须合并，因为前端需要完整音频）
-                merged_pcm = b''.join(self._pcm_chunks)
-                self.ai_audio = AudioData(
-                    data=merged_pcm,
-                    format="pcm",
+    def decode_pending(self) -> List[PCMFrame]:
+        """
+        将尚未解码的原始帧按顺序解码并追加到PCM存储
+
+        解码失败的帧以空PCM占位，保证PCM帧索引与原始帧索引一一对应；
+        可在媒体线程中调用（同一消息的解码串行执行）
+
+        Returns:
+            List[PCMFrame]: 本次新解码的帧（按帧序，index为消息内帧索引）
+        """
+        if len(self._encoded_frames) <= self._audio_store.frame_count or self._is_compacted:
+            return []
+
+        with self._media_lock:
+            store = self._audio_store
+            if len(self._encoded_frames) <= store.frame_count or self._is_compacted:
+                return []
+
+            if self._decode_stage is None:
+                self._decode_stage = OpusDecodeStage(sample_rate=self._sample_rate, channels=self._channels)
+
+            frames = []
+            for audio_data in self._iter_encoded(store.frame_count):
+                frame = self._decode_stage.decode(audio_data)
+                pcm = frame.pcm if frame is not None else b""
+                if frame is not None:
+                    self._sample_rate = frame.sample_rate
+                    self._channels = frame.channels
+                frames.append(PCMFrame(
+                    pcm=pcm,
                     sample_rate=self._sample_rate,
-                    channels=self._channels
-                )
-            else:
-                # 非OPUS格式直接累积
-                self._pcm_chunks.append(audio_data.data)
-                merged_data = b''.join(self._pcm_chunks)
-                self.ai_audio = AudioData(
-                    data=merged_data,
-                    format=audio_data.format,
-                    sample_rate=audio_data.sample_rate,
-                    channels=audio_data.channels
+                    channels=self._channels,
+                    index=store.append(pcm)
+                ))
+            return frames
+
+    @property
+    def decoded_frame_count(self) -> int:
+        """已解码到PCM存储的帧数（已压缩时为0）"""
+        return 0 if self._is_compacted else self._audio_store.frame_count
+
+    def get_pcm_frames(self, indices: List[int]) -> List[PCMFrame]:
+        """
+        按帧索引读取已解码的PCM帧（不触发解码，尚未解码的索引跳过）
+
+        Args:
+            indices: 消息内帧索引
+
+        Returns:
+            List[PCMFrame]: 已解码的帧（与indices顺序一致）
+        """
+        with self._media_lock:
+            store = self._audio_store
+            if self._is_compacted:
+                return []
+            return [
+                PCMFrame(
+                    pcm=bytes(store.frame_view(index, index + 1)),
+                    sample_rate=self._sample_rate,
+                    channels=self._channels,
+                    index=index
                 )
-        except opuslib.OpusError as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Opus解码失败，跳过此帧: {e}")
-            # 解码失败时跳过该帧（参考py-xiaozhi的错误处理）
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"音频处理失败，跳过此帧: {e}")
+                for index in indices if index < store.frame_count
+            ]
+
+    @property
+    def has_audio(self) -> bool:
+        """是否收到过AI音频（不触发解码）"""
+        return len(self._encoded_frames) > 0
+
+    @property
+    def encoded_audio_size(self) -> int:
+        """原始音频（OPUS）总字节数"""
+        return self._encoded_size
+
+    @property
+    def encoded_format(self) -> str:
+        """原始音频帧格式"""
+        return self._encoded_format
+
+    @property
+    def encoded_frames(self) -> List[bytes]:
+        """原始音频帧（OPUS包）列表，调用方不应修改"""
+        return self._encoded_frames
+
+    @property
+    def is_compacted(self) -> bool:
+        return self._is_compacted
+
+    def compact(self) -> int:
+        """
+        压缩为文本+OPUS（消息不再是当前回复时由历史记录调用）
+
+        丢弃PCM存储、物化缓存和句子WAV缓存，之后的PCM读取按需解码并放入共享LRU
+
+        Returns:
+            int: 释放的字节数（估算），已压缩时返回0
+        """
+        with self._media_lock:
+            if self._is_compacted:
+                return 0
+
+            freed = self._audio_store.capacity
+            freed += sum(len(sentence.audio_data or "") for sentence in self._encoded_sentences)
+            self._audio_store = PCMAudioStore(initial_capacity=1)
+            self._encoded_sentences = []
+            self._decode_stage = None
+            self._is_compacted = True
+            return freed
+
+    def drop_audio(self) -> int:
+        """
+        丢弃全部音频，只保留文本（历史音频超出预算时调用）
+
+        Returns:
+            int: 释放的原始音频字节数
+        """
+        freed = self._encoded_size
+        self.compact()
+        self._encoded_frames = []
+        self._encoded_size = 0
+        self.metadata["audio_evicted"] = True
+        return freed
+
+    def _compacted_pcm(self) -> bytes:
+        """压缩后的PCM读取：先查共享LRU，未命中时用独立解码器完整解码一次"""
+        pcm = decoded_audio_cache.get(self.message_id)
+        if pcm is None:
+            decode_stage = OpusDecodeStage(sample_rate=self._sample_rate, channels=self._channels)
+            frames = [decode_stage.decode(audio_data) for audio_data in self._iter_encoded()]
+            pcm = b"".join(frame.pcm for frame in frames if frame is not None)
+            decoded_audio_cache.put(self.message_id, pcm)
+        return pcm
+
+    @property
+    def ai_audio(self) -> Optional[AudioData]:
+        """
+        完整的AI回复音频（PCM）
+
+        按需物化：只在读取时解码并拼接一次，结果缓存到下一帧追加为止；
+        已压缩的历史消息从共享LRU读取
+        """
+        if self._is_compacted:
+            pcm = self._compacted_pcm() if self._encoded_frames else b""
+        else:
+            self.decode_pending()
+            pcm = self._audio_store.to_bytes() if self._audio_store.byte_length else b""
+        if not pcm:
+            return None
+        return AudioData(
+            data=pcm,
+            format="pcm",
+            sample_rate=self._sample_rate,
+            channels=self._channels
+        )
+
+    @property
+    def audio_frame_count(self) -> int:
+        """已收到的音频帧数（不触发解码）"""
+        return len(self._encoded_frames)
+
+    @property
+    def current_sentence_index(self) -> int:
+        """当前句子序号（正在接收音频的句子，尚无句子时为0）"""
+        return max(len(self._sentences) - 1, 0)
+
+    @property
+    def audio_size(self) -> int:
+        """已累积的PCM字节数（补齐解码，但不拼接）"""
+        if self._is_compacted:
+            return len(self._compacted_pcm()) if self._encoded_frames else 0
+        self.decode_pending()
+        return self._audio_store.byte_length
+
+    @property
+    def is_tts_complete(self) -> bool:
+        """TTS是否已完成（收到tts_stop信号）"""
+        return self._is_tts_complete
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self._channels
+
+    def get_audio_view(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """
+        按字节范围读取已累积的PCM（零拷贝只读视图）
+
+        Args:
+            start: 起始字节偏移
+            end: 结束字节偏移（不含），None表示到当前末尾
+        """
+        if self._is_compacted:
+            return memoryview(self._compacted_pcm() if self._encoded_frames else b"")[start:end]
+        self.decode_pending()
+        return self._audio_store.view(start, end)
 
-    def get_incremental_audio(self, last_chunk_index: int) -> Dict[str, Any]:
+    def get_incremental_audio(self, last_chunk_index: int, delta: bool = False,
+                              byte_offset: Optional[int] = None) -> Dict[str, Any]:
         """
         获取增量音频数据（用于流式播放）
 
         Args:
             last_chunk_index: 前端已获取到的PCM块索引
+            delta: True时只返回新增部分，False时返回完整累积音频（覆盖式播放，兼容旧前端）
+            byte_offset: 前端已获取到的字节偏移（delta模式下优先于last_chunk_index）
 
         Returns:
             Dict包含:
             - has_new_audio: 是否有新音频
-            - audio_data: Base64编码的新增PCM数据（如果有）
-            - chunk_count: 当前总块数
+            - pcm: PCM数据的只读视图（delta模式为新增部分，否则为完整音频）
+            - byte_offset: pcm在整段音频中的起始字节偏移
+            - next_byte_offset / chunk_count: 下次轮询应携带的偏移
             - is_complete: TTS是否完成
             - sample_rate: 采样率
             - channels: 声道数
         """
-        import base64
+        self.decode_pending()
+        store = self._audio_store
 
-        # 检查是否有新的音频块
-        if last_chunk_index < len(self._pcm_chunks):
-            # 获取新增的PCM块
-            new_chunks = self._pcm_chunks[last_chunk_index:]
-            merged_new_pcm = b''.join(new_chunks)
+        if byte_offset is not None:
+            start = max(0, min(byte_offset, store.byte_length))
+        else:
+            start = store.frame_offset(last_chunk_index)
 
-            # 合并从开始到现在的所有PCM（用于覆盖式播放）
-            merged_all_pcm = b''.join(self._pcm_chunks)
+        # 检查是否有新的音频数据
+        if start < store.byte_length:
+            # 新增PCM大小由偏移直接得出，无需拼接
+            new_audio_size = store.byte_length - start
+            pcm_start = start if delta else 0
 
             return {
                 "has_new_audio": True,
-                "audio_data": base64.b64encode(merged_all_pcm).decode('utf-8'),  # 返回完整累积音频
-                "new_audio_size": len(merged_new_pcm),
-                "total_audio_size": len(merged_all_pcm),
-                "chunk_count": len(self._pcm_chunks),
+                "pcm": store.view(pcm_start),
+                "byte_offset": pcm_start,
+                "next_byte_offset": store.byte_length,
+                "new_audio_size": new_audio_size,
+                "total_audio_size": store.byte_length,
+                "chunk_count": store.frame_count,
                 "is_complete": self._is_tts_complete,
                 "sample_rate": self._sample_rate,
                 "channels": self._channels
@@ -150,7 +391,8 @@ class VoiceMessage:
         # 没有新音频
         return {
             "has_new_audio": False,
-            "chunk_count": len(self._pcm_chunks),
+            "next_byte_offset": store.byte_length,
+            "chunk_count": store.frame_count,
             "is_complete": self._is_tts_complete
         }
 
@@ -162,25 +404,22 @@ class VoiceMessage:
         1. 标记上一句的音频已完成,开始新句子
         2. 追加文本到ai_text字段(用于聊天界面显示完整内容)
         """
-        import logging
-        logger = logging.getLogger(__name__)
-
         # 如果有上一句,标记其完成
         if len(self._sentences) > 0 and not self._sentences[-1]["is_complete"]:
-            self._sentences[-1]["end_chunk"] = len(self._pcm_chunks)
-            self._sentences[-1]["is_complete"] = True
-            logger.info(f"✅ 句子音频完成: '{self._sentences[-1]['text']}', chunks [{self._sentences[-1]['start_chunk']}, {self._sentences[-1]['end_chunk']})")
+            self._close_last_sentence()
+            logger.debug("✅ 句子音频完成", extra={"message_id": self.message_id, "start_chunk": self._sentences[-1]['start_chunk'],
+                                               "end_chunk": self._sentences[-1]['end_chunk']})
 
         # 添加新句子
         new_sentence = {
             "text": text,
-            "start_chunk": len(self._pcm_chunks),
+            "start_chunk": self.audio_frame_count,
             "end_chunk": None,
             "is_complete": False
         }
         self._sentences.append(new_sentence)
-        self._current_sentence_start = len(self._pcm_chunks)
-        logger.info(f"📝 新句子开始: '{text}', start_chunk={self._current_sentence_start}")
+        self._current_sentence_start = self.audio_frame_count
+        logger.debug("📝 新句子开始", extra={"message_id": self.message_id, "start_chunk": self._current_sentence_start})
 
         # ✅ 追加文本到ai_text字段(用于聊天界面显示)
         if self.ai_text:
@@ -190,21 +429,68 @@ class VoiceMessage:
 
     def mark_tts_complete(self):
         """标记TTS完成"""
-        import logging
-        logger = logging.getLogger(__name__)
-
         self._is_tts_complete = True
 
         # 标记最后一句完成
         if len(self._sentences) > 0 and not self._sentences[-1]["is_complete"]:
-            self._sentences[-1]["end_chunk"] = len(self._pcm_chunks)
-            self._sentences[-1]["is_complete"] = True
-            logger.info(f"✅ 最后一句音频完成: '{self._sentences[-1]['text']}', chunks [{self._sentences[-1]['start_chunk']}, {self._sentences[-1]['end_chunk']})")
+            self._close_last_sentence()
+            logger.debug("✅ 最后一句音频完成", extra={"message_id": self.message_id, "start_chunk": self._sentences[-1]['start_chunk'],
+                                                 "end_chunk": self._sentences[-1]['end_chunk']})
+
+    def _close_last_sentence(self):
+        """
+        关闭最后一句：只记录结束帧
+
+        编码由会话提交到媒体线程（encode_closed_sentences），
+        只有OPUS直通客户端时推迟到首次读取句子，仍然每句只编码一次
+        """
+        sentence = self._sentences[-1]
+        sentence["end_chunk"] = self.audio_frame_count
+        sentence["is_complete"] = True
+
+    @property
+    def has_unencoded_sentences(self) -> bool:
+        """是否有已关闭但尚未编码的句子"""
+        return (len(self._encoded_sentences) < len(self._sentences)
+                and self._sentences[len(self._encoded_sentences)]["is_complete"])
+
+    def encode_closed_sentences(self):
+        """按顺序编码所有已关闭但尚未编码的句子（可在媒体线程中调用）"""
+        with self._media_lock:
+            if self._is_compacted:
+                return
+
+            for sentence in self._sentences[len(self._encoded_sentences):]:
+                if not sentence["is_complete"]:
+                    break
+
+                start = sentence["start_chunk"]
+                end = sentence["end_chunk"]
+                if self._audio_store.frame_count < end:
+                    self.decode_pending()
+
+                audio_data = None
+                if self._audio_store.frame_offset(start) != self._audio_store.frame_offset(end):
+                    # 零拷贝读取这句话的PCM，封装WAV并编码（每句只做一次）
+                    sentence_pcm = self._audio_store.frame_view(start, end)
+                    wav_data = pcm_to_wav(sentence_pcm, self._sample_rate, self._channels)
+                    audio_data = base64.b64encode(wav_data).decode('utf-8')
+                else:
+                    logger.warning(f"⚠️ 句子'{sentence['text']}'音频为空(chunks [{start}, {end})),轮询时跳过")
+
+                self._encoded_sentences.append(EncodedSentence(
+                    text=sentence["text"],
+                    audio_data=audio_data,
+                    start_chunk=start,
+                    end_chunk=end
+                ))
 
     def get_completed_sentences(self, last_sentence_index: int) -> Dict[str, Any]:
         """
         获取已完成的句子及其音频
 
+        句子音频在关闭后已由媒体线程编码缓存（推迟编码的句子在这里补齐一次），这里只做索引查找
+
         Args:
             last_sentence_index: 前端已获取到的句子索引
 
@@ -222,67 +508,29 @@ class VoiceMessage:
                 "is_complete": TTS是否完成
             }
         """
-        import base64
-        import io
-        import wave
-
-        # 获取新完成的句子
-        completed_sentences = [s for s in self._sentences if s["is_complete"]]
-
-        if last_sentence_index < len(completed_sentences):
-            new_sentences = completed_sentences[last_sentence_index:]
-
-            result_sentences = []
-            for sentence in new_sentences:
-                # 提取这句话的音频chunks
-                start = sentence["start_chunk"]
-                end = sentence["end_chunk"]
-
-                # ✅ 跳过空音频句子(start == end表示没有音频数据)
-                if start == end:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"⚠️ 句子'{sentence['text']}'音频为空(chunks [{start}, {end})),跳过")
-                    continue
-
-                sentence_pcm_chunks = self._pcm_chunks[start:end]
-                sentence_pcm = b''.join(sentence_pcm_chunks)
-
-                # 转换为WAV格式
-                wav_buffer = io.BytesIO()
-                with wave.open(wav_buffer, 'wb') as wav_file:
-                    wav_file.setnchannels(self._channels)
-                    wav_file.setsampwidth(2)  # 16-bit PCM
-                    wav_file.setframerate(self._sample_rate)
-                    wav_file.writeframes(sentence_pcm)
-
-                wav_data = wav_buffer.getvalue()
-                wav_base64 = base64.b64encode(wav_data).decode('utf-8')
-
-                result_sentences.append({
-                    "text": sentence["text"],
-                    "audio_data": wav_base64
-                })
-
-            # ✅ 只有真正有音频的句子才返回
-            if result_sentences:
-                return {
-                    "has_new_sentences": True,
-                    "sentences": result_sentences,
-                    "total_sentences": len(completed_sentences),
-                    "is_complete": self._is_tts_complete
-                }
-            else:
-                # 所有新句子都被过滤了,返回无新句子
-                return {
-                    "has_new_sentences": False,
-                    "total_sentences": len(completed_sentences),
-                    "is_complete": self._is_tts_complete
-                }
+        if self.has_unencoded_sentences:
+            self.encode_closed_sentences()
+        completed_sentences = self._encoded_sentences
+        total = len(completed_sentences)
+
+        # ✅ 只有真正有音频的句子才返回(空音频句子在完成时已标记)
+        result_sentences = [
+            sentence.to_response()
+            for sentence in completed_sentences[last_sentence_index:]
+            if sentence.has_audio
+        ]
+
+        if result_sentences:
+            return {
+                "has_new_sentences": True,
+                "sentences": result_sentences,
+                "total_sentences": total,
+                "is_complete": self._is_tts_complete
+            }
 
         return {
             "has_new_sentences": False,
-            "total_sentences": len(completed_sentences),
+            "total_sentences": total,
             "is_complete": self._is_tts_complete
         }
 
@@ -293,8 +541,16 @@ class SessionConfig:
     auto_play_tts: bool = False         # 后端不自动播放TTS（音频由前端播放）
     save_conversation: bool = True       # 保存对话记录
     max_conversation_history: int = 100  # 最大对话历史条数
+    history_audio_budget_bytes: int = 8 * 1024 * 1024  # 本会话历史音频（OPUS）字节上限，超出时先淘汰最旧音频
     listening_timeout: float = 5.0       # 监听超时时间（秒）
     enable_echo_cancellation: bool = True # 启用回声消除
+    uplink_queue_size: int = 50          # 上行音频缓冲帧数（40ms帧，约2秒）
+    uplink_overflow_policy: str = OverflowPolicy.DROP_OLDEST.value  # 上行缓冲溢出策略
+    eager_downlink_decode: bool = False  # 无PCM实时消费者时也立即解码下行音频（False时只在需要PCM时按需解码）
+    uplink_source: str = UPLINK_SOURCE_SERVER  # 默认上行音频来源；client时不初始化本机录音（无声卡的服务器部署）
+    listening_mode: str = LISTENING_MODE_MANUAL  # 默认监听模式（realtime时允许打断AI回复）
+    enable_uplink_vad: bool = False      # 上行VAD：丢弃语音前后的静音帧（见uplink_vad）
+    vad_auto_stop_ms: int = 0            # 语音后静音超过该时长自动停止监听（毫秒，0表示不自动停止，需开启VAD）
 
 
 class VoiceSessionManager:
@@ -333,9 +589,21 @@ class VoiceSessionManager:
         # 初始化各个子模块
         self.ws_client = XiaozhiWebSocketClient(ws_config, device_manager)
         self.recorder = SpeechRecorder(recording_config)
-        self.parser = AIResponseParser()
+        self.parser = AIResponseParser(json_loads=json_codec.loads)
         self.player = TTSPlayer(playback_config)
 
+        # 下行音频解码阶段：当前消息之外到达的帧使用（消息内的帧由消息自己的解码器按需解码）
+        self.decode_stage = OpusDecodeStage(sample_rate=24000, channels=1)
+        # 媒体通道：解码和WAV/base64编码在媒体线程中按提交顺序执行，事件循环只做I/O
+        self.media_lane = media_pool.lane("session")
+        self._live_pcm = LivePCMTracker()  # 需要实时推送PCM的帧（按消息记录帧索引）
+        self._decode_future: Optional[asyncio.Future] = None
+        self._audio_frame_count = 0
+        self._first_audio_received = False
+        self._stop_listening_time: Optional[float] = None
+        self._discard_downlink = False  # 打断后丢弃被中止回复的剩余下行消息，直到其tts_stop或新一轮STT
+        self._upstream_reconnecting = False  # 上游断线且正在自动重连（期间不进入ERROR状态）
+
         # 会话状态
         self.state = SessionState.IDLE
         self.session_id: Optional[str] = None
@@ -346,10 +614,18 @@ class VoiceSessionManager:
 
         # 后台任务管理（参考py-xiaozhi标准实现）
         self._bg_tasks: Set[asyncio.Task] = set()
-        self._send_audio_semaphore: Optional[asyncio.Semaphore] = None  # 在initialize中创建
+        self.uplink_sender: Optional[UplinkAudioSender] = None  # 在initialize中创建
+
+        # 上游连接池（租用预热连接时记录，关闭时归还）
+        self._ws_pool: Optional[UpstreamConnectionPool] = None
+        self._conversation_started = False
+        self._uplink_source = self.config.uplink_source
 
         # 对话历史
-        self.conversation_history: List[VoiceMessage] = []
+        self.conversation_history = ConversationHistory(
+            max_messages=self.config.max_conversation_history,
+            max_audio_bytes=self.config.history_audio_budget_bytes
+        )
         self.current_message: Optional[VoiceMessage] = None
 
         # 回调函数
@@ -364,6 +640,14 @@ class VoiceSessionManager:
         # 🚀 新增：音频帧实时推送回调（模仿py-xiaozhi的即时播放）
         self.on_text_received: Optional[Callable[[str], None]] = None  # 文本推送回调
         self.on_audio_frame_received: Optional[Callable[[bytes], None]] = None
+        self.on_opus_frame_received: Optional[Callable[[bytes], None]] = None  # OPUS直通推送回调（原始OPUS包，不解码）
+        # 上行VAD（可选）：语音开始/结束时回调(事件名 speech_start/speech_end, 相对监听开始的毫秒数)
+        self.uplink_vad: Optional[UplinkVAD] = (
+            UplinkVAD(VADConfig(auto_stop_silence_ms=self.config.vad_auto_stop_ms))
+            if self.config.enable_uplink_vad else None
+        )
+        self.on_speech_activity: Optional[Callable[[str, int], None]] = None
+        self.on_playback_flush: Optional[Callable[[str], None]] = None  # 打断时通知前端丢弃未播放的音频(被中止的消息ID)
         self.on_emoji_received: Optional[Callable[[str, str], None]] = None  # 🎭 新增：emoji推送回调(emoji, emotion)
 
         # 统计信息
@@ -372,7 +656,16 @@ class VoiceSessionManager:
             "total_user_speech_time": 0.0,
             "total_ai_response_time": 0.0,
             "session_start_time": None,
-            "session_uptime": 0.0
+            "session_uptime": 0.0,
+            "downlink_frames": 0,
+            "downlink_decoded_frames": 0,
+            "downlink_passthrough_frames": 0,
+            "uplink_client_frames": 0,
+            "uplink_client_frames_dropped": 0,
+            "barge_ins": 0,
+            "last_barge_in_ms": 0.0,             # 打断处理耗时（中止发送 + 本地清理）
+            "downlink_discarded_frames": 0,
+            "init_timings": {}  # 初始化各步骤耗时（毫秒）
         }
 
         # ✅ 新增：初始化音频缓冲队列（渐进式优化）
@@ -399,14 +692,28 @@ class VoiceSessionManager:
         try:
             logger.info("🚀 开始初始化语音会话管理器...")
             self._update_state(SessionState.INITIALIZING)
+            init_started = time.perf_counter()
+            self.stats["init_timings"] = {}
 
             # 0. 保存事件循环引用
             self._loop = asyncio.get_running_loop()
             logger.info(f"✅ 事件循环已保存: {self._loop}")
 
-            # 0.1 初始化音频发送并发控制（参考py-xiaozhi标准实现）
-            self._send_audio_semaphore = asyncio.Semaphore(10)  # 最多10个并发发送任务
-            logger.info("✅ 音频发送并发控制已初始化 (max_concurrent=10)")
+            # 0.05 优先租用已完成hello握手的预热连接（省去建连和握手等待）
+            pool = get_upstream_pool()
+            if pool:
+                leased_client = await pool.lease()
+                if leased_client:
+                    self.ws_client = leased_client
+                    self._ws_pool = pool
+
+            # 0.1 启动上行音频有序发送器（单协程 + 有界缓冲，保证帧顺序）
+            self.uplink_sender = UplinkAudioSender(
+                self.ws_client.send_audio,
+                maxsize=self.config.uplink_queue_size,
+                overflow_policy=OverflowPolicy(self.config.uplink_overflow_policy)
+            )
+            self.uplink_sender.start()
 
             # 1. 检查设备激活状态
             if not self.device_manager.check_activation_status():
@@ -427,65 +734,54 @@ class VoiceSessionManager:
             connection_params = getattr(device_info, 'connection_params', {})
             websocket_params = connection_params.get('websocket', {})
 
-            if not websocket_params:
+            if not websocket_params and not UPSTREAM_URL_OVERRIDE:
                 error_msg = "设备连接参数中缺少WebSocket配置"
                 logger.error(error_msg)
                 self._trigger_error(error_msg)
                 return False
 
             # 3. 更新WebSocket配置
-            ws_url = websocket_params.get('url', 'wss://api.tenclass.net/xiaozhi/v1/')
+            ws_url = UPSTREAM_URL_OVERRIDE or websocket_params.get('url', 'wss://api.tenclass.net/xiaozhi/v1/')
             self.ws_client.config.url = ws_url
             logger.info(f"✅ WebSocket URL: {ws_url}")
 
-            # 4. 初始化录音模块
-            logger.info("初始化语音录制模块...")
-            if not await self.recorder.initialize():
-                error_msg = "语音录制模块初始化失败"
-                logger.error(error_msg)
-                self._trigger_error(error_msg)
-                return False
-            logger.info("✅ 语音录制模块初始化成功")
-
-            # 5. 初始化播放模块
-            logger.info("初始化TTS播放模块...")
-            if not await self.player.initialize():
-                error_msg = "TTS播放模块初始化失败"
-                logger.error(error_msg)
-                self._trigger_error(error_msg)
-                return False
-            logger.info("✅ TTS播放模块初始化成功")
-
-            # 6. 设置回调函数
+            # 4. 设置回调函数（需在建连前设置，hello响应会触发on_authenticated）
             self._setup_callbacks()
 
-            # 6.5 启用WebSocket自动重连（参照py-xiaozhi）
+            # 4.5 启用WebSocket自动重连（参照py-xiaozhi）
             self.ws_client.enable_auto_reconnect(enabled=True, max_attempts=5)
             logger.info("✅ WebSocket自动重连已启用 (max_attempts=5)")
 
-            # 7. 建立WebSocket连接
-            logger.info("建立WebSocket连接...")
-            if not await self.ws_client.connect():
-                error_msg = "WebSocket连接失败"
-                logger.error(error_msg)
-                self._trigger_error(error_msg)
-                return False
-            logger.info("✅ WebSocket连接建立成功")
-
-            # 8. 等待认证完成
-            await asyncio.sleep(2)  # 给认证过程一些时间
+            # 5. 并行初始化录音模块、播放模块和WebSocket连接（三者互不依赖）
+            #    上行音频来自前端时不需要本机录音设备
+            results = await asyncio.gather(
+                self._timed_init_step("recorder", self._initialize_recorder()),
+                self._timed_init_step("player", self.player.initialize()),
+                self._connect_upstream(),
+                return_exceptions=True
+            )
+            for name, result in zip(("语音录制模块", "TTS播放模块", "WebSocket连接"), results):
+                if isinstance(result, Exception) or not result:
+                    error_msg = f"{name}初始化失败" + (f": {result}" if isinstance(result, Exception) else "")
+                    logger.error(error_msg)
+                    self._trigger_error(error_msg)
+                    return False
+            logger.info("✅ 录音模块、播放模块和WebSocket连接初始化成功")
 
             if self.ws_client.state != ConnectionState.AUTHENTICATED:
                 logger.warning(f"WebSocket认证状态: {self.ws_client.state.value}")
 
-            # 9. 生成会话ID
+            # 6. 生成会话ID
             self.session_id = f"session_{int(datetime.now().timestamp() * 1000)}"
             self.stats["session_start_time"] = datetime.now()
 
             self.is_initialized = True
             self._update_state(SessionState.READY)
 
-            logger.info(f"🎉 语音会话管理器初始化完成 - Session ID: {self.session_id}")
+            timings = self.stats["init_timings"]
+            timings["total"] = round((time.perf_counter() - init_started) * 1000, 1)
+            logger.info(f"🎉 语音会话管理器初始化完成 - Session ID: {self.session_id} "
+                        f"(耗时 {timings['total']:.0f}ms: {timings})")
 
             if self.on_session_ready:
                 self.on_session_ready()
@@ -498,6 +794,45 @@ class VoiceSessionManager:
             self._trigger_error(error_msg)
             return False
 
+    async def _initialize_recorder(self) -> bool:
+        if self.config.uplink_source == UPLINK_SOURCE_CLIENT:
+            logger.info("⏭️ 上行音频来自前端，跳过本机录音模块初始化")
+            return True
+        return await self.recorder.initialize()
+
+    async def _timed_init_step(self, name: str, coro) -> Any:
+        """执行一个初始化步骤并记录耗时（毫秒）到stats["init_timings"]"""
+        started = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self.stats["init_timings"][name] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _connect_upstream(self) -> bool:
+        """
+        建立上游WebSocket连接并等待hello确认
+
+        租用的预热连接已认证，直接返回；hello超时只告警，由自动重连和状态回调兜底
+
+        Returns:
+            bool: 连接是否建立成功
+        """
+        if self._ws_pool is not None:
+            logger.info(f"⚡ 使用预热上游连接 (session_id={self.ws_client.session_id})")
+            self.stats["init_timings"]["websocket_connect"] = 0.0
+            self.stats["init_timings"]["hello"] = 0.0
+            return True
+
+        logger.info("建立WebSocket连接...")
+        if not await self._timed_init_step("websocket_connect", self.ws_client.connect()):
+            return False
+        logger.info("✅ WebSocket连接建立成功")
+
+        # 等待服务器hello确认（事件驱动，耗时即实际握手时间）
+        if not await self._timed_init_step("hello", self.ws_client.wait_authenticated()):
+            logger.warning(f"⚠️ {self.ws_client.config.hello_timeout}s内未收到hello确认")
+        return True
+
     def _setup_callbacks(self):
         """设置各模块的回调函数"""
         # 录音模块回调
@@ -508,6 +843,7 @@ class VoiceSessionManager:
 
         # WebSocket客户端回调
         self.ws_client.on_message_received = self._on_ws_message_received
+        self.ws_client.on_audio_packet = self._on_ws_audio_packet  # 二进制音频快速路径
         self.ws_client.on_authenticated = self._on_ws_authenticated  # 🔥 新增：重连成功回调
         self.ws_client.on_disconnected = self._on_ws_disconnected
         self.ws_client.on_error = self._on_ws_error
@@ -527,13 +863,20 @@ class VoiceSessionManager:
 
         logger.info("✅ 回调函数设置完成")
 
-    async def start_listening(self) -> bool:
+    async def start_listening(self, source: Optional[str] = None, mode: Optional[str] = None) -> bool:
         """
         开始监听用户语音输入
 
         遵循py-xiaozhi协议：
         1. 先发送start_listening消息通知服务器
-        2. 然后开始本地录音
+        2. 然后开始本地录音（source为client时不录音，由前端上传OPUS帧，见submit_client_audio）
+
+        realtime模式下AI回复中（PROCESSING/SPEAKING）也可以开始监听：先中止当前回复（见_interrupt_reply），
+        中止消息和开始监听消息在同一连接上依次发出，打断到开始监听只需一次往返
+
+        Args:
+            source: 上行音频来源（server/client），None时使用配置的uplink_source
+            mode: 监听模式（manual/realtime），None时使用配置的listening_mode
 
         Returns:
             bool: 是否成功开始监听
@@ -542,41 +885,68 @@ class VoiceSessionManager:
             logger.error("会话管理器未初始化，无法开始监听")
             return False
 
-        if self.state not in [SessionState.READY, SessionState.SPEAKING]:
-            logger.warning(f"当前状态 {self.state.value} 不适合开始监听")
+        mode = mode or self.config.listening_mode
+        if mode not in (LISTENING_MODE_MANUAL, LISTENING_MODE_REALTIME):
+            logger.error(f"不支持的监听模式: {mode}")
             return False
 
-        try:
-            logger.info("🎤 开始监听用户语音...")
+        allowed_states = [SessionState.READY, SessionState.SPEAKING]
+        if mode == LISTENING_MODE_REALTIME:
+            allowed_states.append(SessionState.PROCESSING)
+        if self.state not in allowed_states:
+            logger.warning(f"当前状态 {self.state.value} 不适合开始监听")
+            return False
 
-            # 步骤1：先开始本地录音（启动音频流）
-            # 优化：先启动录音再通知服务器，减少服务器等待时间
-            # 参考：py-xiaozhi 在发送 start_listening 前已经启动了音频流
-            if not await self.recorder.start_recording():
-                error_msg = "无法开始录音"
-                logger.error(error_msg)
-                self._trigger_error(error_msg)
-                return False
+        source = source or self.config.uplink_source
+        if source not in (UPLINK_SOURCE_SERVER, UPLINK_SOURCE_CLIENT):
+            logger.error(f"不支持的上行音频来源: {source}")
+            return False
 
-            # 步骤2：清空音频缓冲（参考py-xiaozhi标准实现）
-            # 确保发送的是新鲜的音频数据，不包含旧缓冲
-            await self.recorder.clear_audio_buffers()
+        try:
+            logger.info(f"🎤 开始监听用户语音... (source={source}, mode={mode})")
+
+            interrupted = False
+            if mode == LISTENING_MODE_REALTIME and self.state in (SessionState.PROCESSING, SessionState.SPEAKING):
+                await self._interrupt_reply()
+                interrupted = True
+
+            # 常开采集：音频流已在运行，监听消息发出后再开始录音（补发预录帧），不清空缓冲
+            warm_capture = source == UPLINK_SOURCE_SERVER and self.recorder.is_warm
+
+            if source == UPLINK_SOURCE_SERVER and not warm_capture:
+                # 步骤1：先开始本地录音（启动音频流）
+                # 优化：先启动录音再通知服务器，减少服务器等待时间
+                # 参考：py-xiaozhi 在发送 start_listening 前已经启动了音频流
+                if not await self.recorder.start_recording():
+                    error_msg = "无法开始录音"
+                    logger.error(error_msg)
+                    self._trigger_error(error_msg)
+                    return False
+
+                # 步骤2：清空音频缓冲（参考py-xiaozhi标准实现）
+                # 确保发送的是新鲜的音频数据，不包含旧缓冲
+                await self.recorder.clear_audio_buffers()
 
             # 步骤3：发送开始监听消息到服务器（遵循py-xiaozhi协议）
-            # 使用MANUAL模式（手动按压，匹配前端的按住说话交互）
-            # 重要：前端使用按住说话/松开停止的交互模式，必须使用 manual 模式
-            # auto 模式会等待 VAD 检测静音，导致延迟
-            mode = "manual"  # 可选: "auto"(VAD自动), "manual"(手动按压), "realtime"(实时打断)
+            # 默认MANUAL模式（手动按压，匹配前端的按住说话交互）；auto模式会等待服务器VAD检测静音，导致延迟
             success = await self.ws_client.send_start_listening(mode)
             if not success:
                 # 发送失败，回滚：停止录音
-                await self.recorder.stop_recording()
+                if source == UPLINK_SOURCE_SERVER and not warm_capture:
+                    await self.recorder.stop_recording()
+                if interrupted:
+                    # 没有新一轮STT来结束丢弃，恢复接收下行消息
+                    self._discard_downlink = False
                 error_msg = "发送开始监听消息失败"
                 logger.error(error_msg)
                 self._trigger_error(error_msg)
                 return False
 
             # 步骤4：更新状态
+            if self.uplink_vad:
+                self.uplink_vad.reset()
+            self._conversation_started = True
+            self._uplink_source = source
             self._update_state(SessionState.LISTENING)
 
             # 步骤5：创建新的消息对象
@@ -585,6 +955,21 @@ class VoiceSessionManager:
                 timestamp=datetime.now()
             )
 
+            if warm_capture and not await self.recorder.start_recording():
+                # 回滚：监听消息已发出，通知服务器结束本轮并回到就绪状态
+                error_msg = "无法开始录音"
+                logger.error(f"❌ {error_msg}，撤销本轮监听")
+                await self.ws_client.send_stop_listening()
+                self.current_message = None
+                self._update_state(SessionState.READY)
+                if self.on_session_error:
+                    self.on_session_error(error_msg)
+                return False
+
+            if source == UPLINK_SOURCE_CLIENT and self.on_user_speech_start:
+                # 本机录音时由录音模块的开始回调触发
+                self.on_user_speech_start()
+
             logger.info(f"✅ 监听已开始: mode={mode}")
             return True
 
@@ -594,6 +979,44 @@ class VoiceSessionManager:
             self._trigger_error(error_msg)
             return False
 
+    async def _interrupt_reply(self):
+        """
+        打断正在进行的AI回复
+
+        1. 向小智AI发送abort（不等待确认，随后的listen start在同一连接上按序到达）
+        2. 丢弃已缓冲的下行音频（句子缓冲队列、本地播放），之后到达的被中止回复的消息也丢弃
+        3. 以已收到的内容结束当前消息（标记interrupted）并保存到历史
+        4. 通知前端清空播放队列
+        """
+        started = time.perf_counter()
+        logger.info("✋ 用户打断AI回复")
+
+        if not await self.ws_client.send_abort_speaking():
+            logger.warning("发送中止消息失败，继续开始监听")
+        self._discard_downlink = True
+
+        if self.sentence_buffer:
+            self.sentence_buffer.clear()
+        if self.player.is_playing():
+            await self.player.stop_playback()
+
+        message = self.current_message
+        if message:
+            message.metadata["interrupted"] = True
+            message.mark_tts_complete()
+            self._live_pcm.discard(message.message_id)
+            self._schedule_sentence_encode(message)
+            if self.config.save_conversation:
+                self._save_to_history(message)
+
+        if self.on_playback_flush:
+            self.on_playback_flush(message.message_id if message else "")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats["barge_ins"] += 1
+        self.stats["last_barge_in_ms"] = elapsed_ms
+        logger.info(f"⏱️ 打断处理耗时: {elapsed_ms:.1f}ms")
+
     async def stop_listening(self) -> bool:
         """
         停止监听用户语音输入
@@ -612,15 +1035,19 @@ class VoiceSessionManager:
             return False
 
         try:
-            import time
             t0 = time.time()
             logger.info("⏹️ 停止监听用户语音...")
 
-            # 步骤1：停止本地录音
-            await self.recorder.stop_recording()
+            # 步骤1：停止本地录音（前端上传时由状态切换停止接收）
+            if self._uplink_source == UPLINK_SOURCE_SERVER:
+                await self.recorder.stop_recording()
             t1 = time.time()
             logger.info(f"⏱️ 停止录音耗时: {(t1-t0)*1000:.0f}ms")
 
+            # 步骤1.5：等待已缓冲的上行音频发完，避免stop消息越过最后几帧
+            if self.uplink_sender:
+                await self.uplink_sender.flush(timeout=0.5)
+
             # 步骤2：发送停止监听消息到服务器（遵循py-xiaozhi协议）
             success = await self.ws_client.send_stop_listening()
             t2 = time.time()
@@ -646,6 +1073,64 @@ class VoiceSessionManager:
             self._trigger_error(error_msg)
             return False
 
+    def submit_client_audio(self, frame: bytes) -> bool:
+        """
+        提交一帧前端采集的上行OPUS音频（在事件循环中调用）
+
+        只在以client来源监听时接收，帧原样交给上行发送器（不复制、不转码），
+        格式需与hello中声明的上行参数一致（OPUS 16kHz单声道）
+
+        Args:
+            frame: 一个OPUS包
+
+        Returns:
+            bool: 帧是否进入上行缓冲
+        """
+        if (self.state != SessionState.LISTENING or self._uplink_source != UPLINK_SOURCE_CLIENT
+                or not self.uplink_sender or not frame or len(frame) > MAX_CLIENT_UPLINK_PACKET):
+            self.stats["uplink_client_frames_dropped"] += 1
+            return False
+
+        self.stats["uplink_client_frames"] += 1
+        return self._forward_uplink_frame(frame)
+
+    def _forward_uplink_frame(self, frame: bytes) -> bool:
+        """
+        上行帧交给发送器（在事件循环中调用）
+
+        开启VAD时先经过VAD门控：静音帧被丢弃或暂存为预录帧，语音开始时补发；
+        检测到说话结束且配置了自动停止时，停止监听
+        """
+        vad = self.uplink_vad
+        if vad is None:
+            return self.uplink_sender.submit(frame)
+
+        onset_before = vad.speech_onset_ms
+        end_before = vad.end_of_speech
+        accepted = True
+        for packet in vad.process(frame):
+            accepted = self.uplink_sender.submit(packet) and accepted
+
+        if onset_before is None and vad.speech_onset_ms is not None:
+            logger.info(f"🗣️ 检测到语音开始: {vad.speech_onset_ms}ms")
+            if self.on_speech_activity:
+                self.on_speech_activity("speech_start", vad.speech_onset_ms)
+
+        if vad.end_of_speech and not end_before:
+            logger.info(f"🤫 检测到语音结束: {vad.speech_offset_ms}ms，自动停止监听")
+            if self.on_speech_activity:
+                self.on_speech_activity("speech_end", vad.speech_offset_ms)
+            if self.state == SessionState.LISTENING:
+                task = asyncio.create_task(self.stop_listening())
+                self._bg_tasks.add(task)
+                task.add_done_callback(self._bg_tasks.discard)
+        return accepted
+
+    @property
+    def uplink_source(self) -> str:
+        """当前（或最近一次）监听的上行音频来源"""
+        return self._uplink_source
+
     async def send_text_message(self, text: str) -> bool:
         """
         发送文本消息到AI
@@ -669,6 +1154,7 @@ class VoiceSessionManager:
                 "content": text
             }
             await self.ws_client.send_message(text_message)
+            self._conversation_started = True
 
             # 创建消息记录
             message = VoiceMessage(
@@ -695,6 +1181,13 @@ class VoiceSessionManager:
         self._update_state(SessionState.CLOSED)
 
         try:
+            # 停止上行音频发送器
+            if self.uplink_sender:
+                await self.uplink_sender.stop()
+
+            # 等待已提交的媒体任务完成
+            await self.media_lane.close()
+
             # 取消所有后台任务（参考py-xiaozhi标准实现）
             if self._bg_tasks:
                 logger.info(f"取消 {len(self._bg_tasks)} 个后台任务...")
@@ -712,15 +1205,18 @@ class VoiceSessionManager:
 
             # 停止播放
             if self.player.is_playing():
-                await self.player.stop()
+                await self.player.stop_playback()
 
-            # 断开WebSocket连接
-            if self.ws_client.state != ConnectionState.DISCONNECTED:
+            # 断开WebSocket连接（租用的连接归还给连接池，未开始对话的连接可重新入池）
+            if self._ws_pool is not None:
+                await self._ws_pool.release(self.ws_client, reusable=not self._conversation_started)
+                self._ws_pool = None
+            elif self.ws_client.state != ConnectionState.DISCONNECTED:
                 await self.ws_client.disconnect()
 
             # 清理资源
             await self.recorder.close()  # 修复：SpeechRecorder 使用 close() 不是 cleanup()
-            await self.player.cleanup()
+            await self.player.close()
 
             self.is_initialized = False
             logger.info("✅ 语音会话管理器已关闭")
@@ -730,13 +1226,26 @@ class VoiceSessionManager:
 
     def get_conversation_history(self) -> List[VoiceMessage]:
         """获取对话历史记录"""
-        return self.conversation_history.copy()
+        return self.conversation_history.to_list()
 
     def get_session_stats(self) -> Dict[str, Any]:
         """获取会话统计信息"""
         stats = self.stats.copy()
         if stats["session_start_time"]:
             stats["session_uptime"] = (datetime.now() - stats["session_start_time"]).total_seconds()
+        if self.uplink_sender:
+            stats["uplink"] = self.uplink_sender.get_stats()
+        stats["history"] = self.conversation_history.get_stats()
+        stats["media_queue_depth"] = self.media_lane.depth
+        if self.uplink_vad:
+            stats["uplink_vad"] = self.uplink_vad.get_stats()
+        stats["recording"] = {"warm_capture": self.recorder.is_warm, **self.recorder.stats}
+        ws_stats = self.ws_client.stats
+        stats["upstream"] = {
+            "reconnecting": self._upstream_reconnecting,
+            **{key: ws_stats.get(key) for key in ("reconnect_count", "last_reconnect_ms", "max_reconnect_ms",
+                                                   "resumed_turns", "replayed_frames", "gap_buffered_frames")}
+        }
         return stats
 
     def _update_state(self, new_state: SessionState):
@@ -758,57 +1267,22 @@ class VoiceSessionManager:
 
     def _on_audio_encoded(self, audio_data: bytes):
         """
-        当音频编码完成时的回调（优化版 - 参考py-xiaozhi标准实现）
+        当音频编码完成时的回调
 
         注意：此方法由音频硬件驱动线程调用，需要使用线程安全的方式提交到事件循环
 
-        优化说明：
-        1. 使用 call_soon_threadsafe 替代 run_coroutine_threadsafe（减少调度开销）
-        2. 添加并发控制信号量（避免任务风暴）
-        3. 统一管理后台任务（避免内存泄漏）
+        帧通过 call_soon_threadsafe 交给会话的上行发送器：
+        单协程按序发送，缓冲区有界，不再为每帧创建任务
 
         参考：libs/py_xiaozhi/src/application.py:388-412
         """
         try:
-            if self._loop and not self._loop.is_closed():
-                # 🟢 使用 call_soon_threadsafe 跨线程调度（参考py-xiaozhi）
-                self._loop.call_soon_threadsafe(
-                    self._schedule_audio_send_task, audio_data
-                )
+            if self._loop and not self._loop.is_closed() and self.uplink_sender:
+                self._loop.call_soon_threadsafe(self._forward_uplink_frame, audio_data)
             else:
                 logger.error("事件循环不可用，无法发送音频数据")
         except Exception as e:
-            logger.error(f"调度音频发送任务失败: {e}")
-
-    def _schedule_audio_send_task(self, audio_data: bytes):
-        """
-        在主事件循环中创建音频发送任务（参考py-xiaozhi标准实现）
-
-        此方法由 _on_audio_encoded 通过 call_soon_threadsafe 调度，
-        确保在主事件循环中执行，可以安全地创建异步任务。
-
-        参考：libs/py_xiaozhi/src/application.py:397-412
-        """
-        try:
-            # 并发限制，避免任务风暴
-            async def _send():
-                async with self._send_audio_semaphore:
-                    await self.ws_client.send_audio(audio_data)
-
-            # 创建后台任务
-            task = asyncio.create_task(_send())
-            self._bg_tasks.add(task)
-
-            # 任务完成后从集合中移除
-            def done_callback(t):
-                self._bg_tasks.discard(t)
-                if not t.cancelled() and t.exception():
-                    logger.error(f"音频发送任务异常: {t.exception()}", exc_info=True)
-
-            task.add_done_callback(done_callback)
-
-        except Exception as e:
-            logger.error(f"创建音频发送任务失败: {e}", exc_info=True)
+            logger.error(f"提交上行音频帧失败: {e}")
 
     def _on_recording_started(self):
         """当录音开始时的回调"""
@@ -838,6 +1312,8 @@ class VoiceSessionManager:
             if parsed_response:
                 # ⭐ 特殊处理：STT消息（用户语音识别结果）
                 if parsed_response.message_type == MessageType.STT:
+                    # 新一轮识别结果到达：被中止的回复已结束
+                    self._discard_downlink = False
                     if self.current_message and parsed_response.text_content:
                         # 立即保存用户文字
                         self.current_message.user_text = parsed_response.text_content
@@ -858,27 +1334,19 @@ class VoiceSessionManager:
                 # 文本通过_on_text_received → on_text_received推送
                 # 音频通过on_audio_frame_received直接推送
 
+                if self._discard_downlink:
+                    # 被打断回复的剩余消息：丢弃，收到它的tts_stop后恢复
+                    if parsed_response.raw_message and parsed_response.raw_message.get("tts_stop") == True:
+                        self._discard_downlink = False
+                        logger.info("🧹 被中止回复的剩余消息已丢弃完毕")
+                    return
+
                 # 更新当前消息
                 if self.current_message:
                     # ⚠️ 注意：文本和音频都通过解析器回调处理
                     # - 文本：_on_text_received → self.on_text_received(text)
-                    # - 音频：_on_audio_received → self.on_audio_frame_received(pcm_data)
-
-                    if parsed_response.audio_data:
-                        # 使用append方法累积音频数据（用于历史记录保存）
-                        self.current_message.append_audio_chunk(parsed_response.audio_data)
-
-                        # 🔥 关键：记录第一帧音频到达时间
-                        if not hasattr(self, '_first_audio_received'):
-                            self._first_audio_received = True
-                            if hasattr(self, '_stop_listening_time'):
-                                import time
-                                delay = (time.time() - self._stop_listening_time) * 1000
-                                logger.info(f"⏱️ 【首帧延迟】{delay:.0f}ms")
-
-                        # ✅ 新增：同步到缓冲队列（异步，不阻塞）
-                        if self.sentence_buffer:
-                            asyncio.create_task(self._add_to_buffer_safe(parsed_response))
+                    # - 音频：_on_audio_received → 解码一次后分发给推送/历史/缓冲队列
+
                     self.current_message.message_type = parsed_response.message_type
 
                     # 检查是否收到TTS stop信号(音频播放完成的官方标志)
@@ -892,8 +1360,9 @@ class VoiceSessionManager:
                         logger.info(f"🛑 收到TTS stop信号，AI回复完成，保存完整音频到历史记录")
                         # 标记TTS完成（用于增量音频API）
                         self.current_message.mark_tts_complete()
+                        self._schedule_sentence_encode(self.current_message)
                         if self.config.save_conversation:
-                            logger.info(f"💾 保存对话到历史记录 (音频: {self.current_message.ai_audio.size if self.current_message.ai_audio else 0} bytes)")
+                            logger.info(f"💾 保存对话到历史记录 (音频: {self.current_message.audio_frame_count} 帧)")
                             self._save_to_history(self.current_message)
                             # 状态转为READY,允许下一轮对话
                             self._update_state(SessionState.READY)
@@ -905,6 +1374,16 @@ class VoiceSessionManager:
         except Exception as e:
             logger.error(f"处理WebSocket消息失败: {e}", exc_info=True)
 
+    def _on_ws_audio_packet(self, data: bytes):
+        """
+        下行二进制音频帧（快速路径，每个会话约25帧/秒）
+
+        解析器直接构造OpusPacket交给_on_audio_received，不创建消息字典/AIResponse，不做类型识别
+        """
+        packet = self.parser.parse_audio_packet(data)
+        if self.config.auto_play_tts and not self._discard_downlink:
+            asyncio.create_task(self.player.play_audio(packet))
+
     def _on_ws_authenticated(self):
         """
         当WebSocket认证成功时的回调（包括重连后的认证）
@@ -912,6 +1391,15 @@ class VoiceSessionManager:
         """
         logger.info("✅ WebSocket认证成功")
 
+        if self._upstream_reconnecting:
+            self._upstream_reconnecting = False
+            if self.ws_client.has_pending_turn:
+                # 本轮语音由客户端在新连接上重放，会话状态保持不变
+                logger.info(f"🔄 上游重连成功，续接本轮对话 (重连耗时 {self.ws_client.stats['last_reconnect_ms']}ms)")
+            elif self.state in [SessionState.PROCESSING, SessionState.SPEAKING]:
+                # 旧连接上的回复无法续传：以已收到的内容结束
+                self._end_reply_after_reconnect()
+
         # 如果当前状态是error（断线导致的），恢复为ready状态
         if self.state == SessionState.ERROR:
             logger.info("🔄 WebSocket重连成功，恢复会话状态为ready")
@@ -920,19 +1408,45 @@ class VoiceSessionManager:
 
     def _on_ws_disconnected(self, reason: str):
         """当WebSocket断开连接时的回调"""
+        if self.ws_client.is_reconnecting:
+            # 客户端立即重连并续接本轮，不打断会话
+            self._upstream_reconnecting = True
+            logger.warning(f"⚠️ WebSocket连接已断开，正在重连: {reason}")
+            return
         logger.warning(f"WebSocket连接已断开: {reason}")
         self._trigger_error(f"连接断开: {reason}")
 
     def _on_ws_error(self, error: str):
         """当WebSocket出错时的回调"""
+        if self.ws_client.is_reconnecting:
+            logger.warning(f"⚠️ 重连过程中的WebSocket错误: {error}")
+            return
+        self._upstream_reconnecting = False
         logger.error(f"WebSocket错误: {error}")
         self._trigger_error(f"WebSocket错误: {error}")
 
+    def _end_reply_after_reconnect(self):
+        """上游重连后结束断线前未完成的AI回复（保留已收到的文本和音频）"""
+        message = self.current_message
+        if message and not message.is_tts_complete:
+            message.metadata["interrupted"] = True
+            message.mark_tts_complete()
+            self._schedule_sentence_encode(message)
+            if self.config.save_conversation:
+                self._save_to_history(message)
+        logger.warning("⚠️ 上游重连前的AI回复未完成，以已收到的内容结束")
+        self._update_state(SessionState.READY)
+
     # ========== 解析器回调 ==========
 
     def _on_text_received(self, text: str):
         """当收到文本消息时的回调"""
-        logger.info(f"📝 收到文本: {text}")
+        logger.debug(f"📝 收到文本: {text}")
+
+        if self._discard_downlink:
+            # 被中止回复的剩余句子（STT不经过这里，见解析器）
+            logger.debug(f"丢弃被中止回复的文本: {text}")
+            return
 
         # 🔥 关键逻辑：判断这是用户的语音识别结果还是AI的回复
         if self.current_message:
@@ -954,7 +1468,8 @@ class VoiceSessionManager:
 
                 self._last_ai_text = text
                 self.current_message.add_text_sentence(text)
-                logger.info(f"🤖 AI回复句子: {text}")
+                self._schedule_sentence_encode(self.current_message)
+                logger.info(f"🤖 AI回复句子: {text}", extra={"message_id": self.current_message.message_id})
 
                 # 🚀 立即推送AI文本给前端 (模仿py-xiaozhi)
                 if self.on_text_received:
@@ -967,38 +1482,131 @@ class VoiceSessionManager:
     def _on_audio_received(self, audio_data: AudioData):
         """
         当收到音频消息时的回调（解析器触发）
-        🚀 在这里立即解码并推送音频帧给前端（模仿py-xiaozhi）
+
+        🚀 原始帧先累积到当前消息，再按消费者分发：
+        1. OPUS直通客户端：原样转发OPUS包，不解码
+        2. PCM客户端（或配置了eager_downlink_decode）：每帧只解码一次（媒体线程中批量解码），PCMFrame按引用交给
+           前端实时推送和句子缓冲队列
+        没有PCM实时消费者时不解码，历史/轮询接口需要PCM时由消息按需补齐
         """
-        # 🚀 立即推送音频帧给前端（模仿py-xiaozhi的即时播放）
-        if self.on_audio_frame_received:
+        if self._discard_downlink:
+            self.stats["downlink_discarded_frames"] += 1
+            return
+
+        message = self.current_message
+        if message:
+            message.append_audio_frame(audio_data)
+
+        # 🔥 关键：记录第一帧音频到达时间
+        if not self._first_audio_received and self._stop_listening_time is not None:
+            self._first_audio_received = True
+            delay = (time.time() - self._stop_listening_time) * 1000
+            logger.info("⏱️ 【首帧延迟】", extra={"first_audio_ms": round(delay)})
+
+        self.stats["downlink_frames"] += 1
+
+        # 1. OPUS直通推送（原始包）
+        if self.on_opus_frame_received and audio_data.format == "opus":
             try:
-                # 解码OPUS为PCM（模仿py-xiaozhi的write_audio逻辑）
-                import opuslib
-                if not hasattr(self, '_streaming_opus_decoder'):
-                    # 初始化流式解码器（24kHz, 单声道）
-                    self._streaming_opus_decoder = opuslib.Decoder(24000, 1)
-                    logger.info("✅ 流式OPUS解码器已初始化")
-                    # 初始化帧计数器
-                    self._audio_frame_count = 0
-
-                # 解码OPUS为PCM（960帧 = 24000Hz * 0.04s）
-                pcm_data = self._streaming_opus_decoder.decode(
-                    audio_data.data,
-                    frame_size=960,
-                    decode_fec=False
+                self.on_opus_frame_received(audio_data.data)
+                self.stats["downlink_passthrough_frames"] += 1
+            except Exception as e:
+                logger.error(f"❌ OPUS帧推送回调失败: {e}", exc_info=True)
+
+        # 2. PCM推送（需要时才解码，解码在媒体线程中批量执行，完成后按帧序推送）
+        if self.on_audio_frame_received or self.config.eager_downlink_decode or audio_data.format != "opus":
+            if message:
+                # 只推送本帧：消息里积压的未解码帧只补齐到PCM存储，不重复推送给前端
+                self._live_pcm.want(message.message_id, message.audio_frame_count - 1)
+                self._schedule_decode(message)
+            else:
+                future = self.media_lane.submit(self.decode_stage.decode, audio_data)
+                future.add_done_callback(
+                    lambda f: self._dispatch_pcm_frames([f.result()] if not f.exception() and f.result() else [])
                 )
+        elif self.sentence_buffer:
+            # 未解码时缓冲队列保存原始OPUS包
+            asyncio.create_task(self._add_to_buffer_safe(AudioChunk(
+                chunk_id=f"chunk_{self.stats['downlink_frames']}",
+                audio_data=audio_data.data,
+                text="",
+                format=audio_data.format,
+                sample_rate=audio_data.sample_rate,
+                channels=audio_data.channels
+            )))
+
+        if not self.on_audio_frame_received and not self.on_opus_frame_received:
+            logger.debug("音频帧推送回调未设置，音频帧未推送")
+
+        # 每50帧（约2秒）输出一次调试日志
+        self._audio_frame_count += 1
+        if self._audio_frame_count % 50 == 0:
+            logger.debug("🎵 下行音频推送", extra={"frames": self._audio_frame_count})
+
+    def _schedule_decode(self, message: VoiceMessage):
+        """把消息的待解码帧提交到媒体通道（排队中的解码任务合并为一批）"""
+        future = self.media_lane.submit(message.decode_pending, coalesce_key=("decode", message.message_id))
+        if future is self._decode_future:
+            return
+        self._decode_future = future
+        future.add_done_callback(lambda f: self._dispatch_live_frames(message))
 
-                # 调用回调推送给前端
-                self.on_audio_frame_received(pcm_data)
+    def _dispatch_live_frames(self, message: VoiceMessage):
+        """
+        解码任务完成：按帧索引从消息的PCM存储取出待推送的帧
 
-                # 每10帧输出一次日志（避免日志过多）
-                self._audio_frame_count += 1
-                if self._audio_frame_count % 10 == 0:
-                    logger.info(f"🎵 已推送 {self._audio_frame_count} 帧音频")
-            except Exception as e:
-                logger.error(f"❌ 音频帧推送回调失败: {e}", exc_info=True)
-        else:
-            logger.warning("⚠️ on_audio_frame_received 回调未设置，音频帧未推送")
+        不使用decode_pending()的返回值，路由接口在同一媒体通道中可能已先解码了这些帧
+        """
+        if message.is_compacted:
+            self._live_pcm.discard(message.message_id)
+            return
+        indices = self._live_pcm.take_ready(message.message_id, message.decoded_frame_count)
+        if indices:
+            self._dispatch_pcm_frames(message.get_pcm_frames(indices))
+
+    def _dispatch_pcm_frames(self, frames: List[PCMFrame]):
+        """推送需要实时PCM的帧并同步到缓冲队列（事件循环中按帧序调用）"""
+        for frame in frames:
+            if not frame.pcm:
+                continue
+
+            self.stats["downlink_decoded_frames"] += 1
+            if self.on_audio_frame_received:
+                try:
+                    self.on_audio_frame_received(frame.pcm)
+                except Exception as e:
+                    logger.error(f"❌ 音频帧推送回调失败: {e}", exc_info=True)
+
+            # 同步到缓冲队列（异步，不阻塞）
+            if self.sentence_buffer:
+                asyncio.create_task(self._add_to_buffer_safe(AudioChunk(
+                    chunk_id=f"chunk_{self.stats['downlink_decoded_frames']}",
+                    audio_data=frame.pcm,
+                    text="",
+                    format="pcm",
+                    sample_rate=frame.sample_rate,
+                    channels=frame.channels
+                )))
+
+    def _schedule_sentence_encode(self, message: VoiceMessage):
+        """
+        句子关闭后在媒体线程中编码WAV（排在该句的解码任务之后）
+
+        没有PCM消费者（只有OPUS直通客户端）时不提交，首次读取句子时再编码
+        """
+        if not message.has_unencoded_sentences:
+            return
+        if not (self.on_audio_frame_received or self.config.eager_downlink_decode):
+            return
+        self.media_lane.submit(message.encode_closed_sentences, coalesce_key=("sentences", message.message_id))
+
+    async def run_media(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        在本会话的媒体通道中执行（与解码/句子编码任务保持顺序）
+
+        路由中读取音频前调用，保证读取时PCM已补齐、句子已编码
+        """
+        return await self.media_lane.run(fn, *args)
 
     def _on_emoji_received(self, emoji: str, emotion: str):
         """
@@ -1006,6 +1614,8 @@ class VoiceSessionManager:
         🎭 立即推送给前端用于播放Live2D表情
         """
         logger.info(f"🎭 收到Emoji: {emoji} ({emotion})")
+        if self._discard_downlink:
+            return
 
         # 🚀 立即推送emoji给前端（模仿py-xiaozhi）
         if self.on_emoji_received:
@@ -1067,86 +1677,77 @@ class VoiceSessionManager:
     # ========== 对话历史管理 ==========
 
     def _save_to_history(self, message: VoiceMessage):
-        """保存消息到对话历史"""
-        self.conversation_history.append(message)
-        self.stats["total_messages"] += 1
+        """
+        保存消息到对话历史
 
-        # 限制历史记录数量
-        if len(self.conversation_history) > self.config.max_conversation_history:
-            self.conversation_history.pop(0)
+        同一消息会在STT和tts_stop时各保存一次，历史按message_id去重；
+        之前的消息在此时压缩为文本+OPUS，并执行历史音频预算
+        """
+        if self.conversation_history.add(message):
+            self.stats["total_messages"] += 1
 
         logger.debug(f"消息已保存到历史记录: {message.message_id}")
 
     # ========== 音频缓冲队列同步 ==========
 
-    async def _add_to_buffer_safe(self, parsed_response):
+    async def _add_to_buffer_safe(self, chunk: AudioChunk):
         """
-        安全地将音频数据添加到缓冲队列
+        安全地将音频块添加到缓冲队列
 
         注意：此方法失败不影响主流程
         """
         try:
-            chunk = AudioChunk(
-                chunk_id=f"chunk_{int(datetime.now().timestamp() * 1000)}",
-                audio_data=parsed_response.audio_data.data,
-                text=parsed_response.text_content or "",
-                format=parsed_response.audio_data.format,
-                sample_rate=parsed_response.audio_data.sample_rate,
-                channels=parsed_response.audio_data.channels
-            )
-
             await self.sentence_buffer.audio_buffer.put(chunk)
-            logger.debug(f"✅ 音频已加入缓冲队列: {len(chunk.audio_data)} bytes")
+            logger.debug(f"✅ 音频已加入缓冲队列: {len(chunk.audio_data)} bytes ({chunk.format})")
 
         except Exception as e:
             # 失败仅记录日志，不抛出异常
             logger.debug(f"添加到缓冲队列失败（不影响功能）: {e}")
 
 
-# ========== 全局单例实例管理 ==========
+# ========== 会话注册表（按用户/设备） ==========
 
-_voice_session_manager: Optional[VoiceSessionManager] = None
+session_registry = VoiceSessionRegistry(factory=VoiceSessionManager)
 
 
 async def initialize_voice_session(
     device_manager: PocketSpeakDeviceManager,
-    session_config: Optional[SessionConfig] = None
+    session_config: Optional[SessionConfig] = None,
+    session_key: str = DEFAULT_SESSION_KEY
 ) -> bool:
     """
-    初始化全局语音会话管理器
+    初始化指定key的语音会话管理器
 
     Args:
         device_manager: 设备管理器实例
         session_config: 会话配置
+        session_key: 会话key（用户/设备），默认为单用户兼容的default
 
     Returns:
         bool: 初始化是否成功
-    """
-    global _voice_session_manager
-
-    if _voice_session_manager is not None:
-        logger.warning("语音会话管理器已经初始化")
-        return True
 
-    _voice_session_manager = VoiceSessionManager(device_manager, session_config)
-    return await _voice_session_manager.initialize()
+    Raises:
+        SessionLimitError: 会话数已达上限
+    """
+    return await session_registry.create(session_key, device_manager, session_config)
 
 
-def get_voice_session() -> Optional[VoiceSessionManager]:
+def get_voice_session(session_key: str = DEFAULT_SESSION_KEY) -> Optional[VoiceSessionManager]:
     """
-    获取全局语音会话管理器实例
+    获取指定key的语音会话管理器实例
 
     Returns:
         Optional[VoiceSessionManager]: 语音会话管理器实例，如果未初始化则返回None
     """
-    return _voice_session_manager
+    return session_registry.get(session_key)
+
 
+async def close_voice_session(session_key: str = DEFAULT_SESSION_KEY):
+    """关闭指定key的语音会话管理器"""
+    if await session_registry.close(session_key):
+        logger.info(f"语音会话管理器已关闭: {session_key}")
 
-async def close_voice_session():
-    """关闭全局语音会话管理器"""
-    global _voice_session_manager
 
-    if _voice_session_manager:
-        await _voice_session_manager.close()
-        _voice_session_manager = None
-        logger.info("全局语音会话管理器已关闭")
+async def close_all_voice_sessions():
+    """关闭所有语音会话（应用关闭时调用）"""
+    await session_registry.close_all()
@@ -0,0 +1,58 @@
+"""
+WAV封装工具
+
+直接拼接44字节RIFF头部和PCM数据，
+替代 wave.open(BytesIO) 的逐次封装（少一次缓冲区复制和文件对象开销）
+"""
+
+import struct
+
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+WAV_HEADER_SIZE = _WAV_HEADER.size
+
+
+def wav_header(data_size: int, sample_rate: int = 24000, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    生成PCM WAV文件头
+
+    Args:
+        data_size: PCM数据字节数
+        sample_rate: 采样率
+        channels: 声道数
+        sample_width: 每个样本字节数（16-bit为2）
+
+    Returns:
+        bytes: 44字节WAV头
+    """
+    block_align = channels * sample_width
+    return _WAV_HEADER.pack(
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,                          # fmt块大小
+        1,                           # PCM格式
+        channels,
+        sample_rate,
+        sample_rate * block_align,   # 字节率
+        block_align,
+        sample_width * 8,            # 位深
+        b"data",
+        data_size
+    )
+
+
+def pcm_to_wav(pcm, sample_rate: int = 24000, channels: int = 1, sample_width: int = 2) -> bytes:
+    """
+    将PCM数据封装为WAV
+
+    Args:
+        pcm: PCM数据（bytes或memoryview）
+        sample_rate: 采样率
+        channels: 声道数
+        sample_width: 每个样本字节数
+
+    Returns:
+        bytes: 完整WAV数据
+    """
+    return wav_header(len(pcm), sample_rate, channels, sample_width) + pcm
@@ -10,7 +10,9 @@ import json
 import logging
 import time
 import random
-from typing import Optional, Callable, Dict, Any, Union
+import os
+from collections import deque
+from typing import Optional, Callable, Deque, Dict, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 import websockets
@@ -19,9 +21,27 @@ from pathlib import Path
 
 # 导入设备管理相关模块
 from services.device_lifecycle import PocketSpeakDeviceManager, DeviceInfo
+from services.voice_chat.upstream_capture import CaptureWriter, CAPTURE_DIR, DIRECTION_UP, DIRECTION_DOWN
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
+# 上游地址覆盖（如指向本地回放服务器 ws://127.0.0.1:8765/xiaozhi/v1/），优先于设备连接参数
+UPSTREAM_URL_OVERRIDE = os.getenv("XIAOZHI_WS_URL") or None
+
+# 进程内共享的SSL上下文（创建上下文需要加载证书，所有连接复用同一个）
+_shared_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """获取共享的SSL上下文"""
+    global _shared_ssl_context
+    if _shared_ssl_context is None:
+        _shared_ssl_context = ssl.create_default_context()
+        _shared_ssl_context.check_hostname = False
+        _shared_ssl_context.verify_mode = ssl.CERT_NONE
+    return _shared_ssl_context
+
 
 class ConnectionState(Enum):
     """WebSocket连接状态枚举"""
@@ -43,6 +63,10 @@ class WSConfig:
     reconnect_max_delay: float = 60.0  # 最大重连延迟
     connection_timeout: int = 30
     monitor_interval: int = 5  # 连接监控间隔（秒）- 参照py-xiaozhi
+    hello_timeout: float = 10.0  # 等待服务器hello确认的超时（秒）
+    immediate_reconnect: bool = True  # 首次断线立即重连（之后才指数退避）
+    replay_buffer_frames: int = 750  # 断线续接的重放缓冲：本轮未被服务器确认的上行帧（40ms帧约30秒），超出时该轮不再续接
+    capture_dir: Optional[str] = CAPTURE_DIR  # 设置时把每个连接收发的消息录制到该目录（见upstream_capture.py）
 
 
 @dataclass
@@ -98,11 +122,28 @@ class XiaozhiWebSocketClient:
         # 会话ID（服务器hello响应中返回）
         self.session_id: str = ""
 
+        # hello确认事件（收到服务器hello/认证成功时置位，建连和断线时清除）
+        self._authenticated_event = asyncio.Event()
+
+        # 当前连接的录制器（未开启录制时为None）
+        self._capture: Optional[CaptureWriter] = None
+
+        # 断线续接：进行中的监听轮次及其未被服务器确认（尚未收到STT）的上行帧
+        self._turn_mode: Optional[str] = None  # 进行中轮次的监听模式，None表示没有待确认的轮次
+        self._turn_stopped = False  # 本轮是否已发送（或待发送）listen stop
+        self._replay_frames: Deque[bytes] = deque()
+        self._replay_overflow = False  # 本轮未确认的帧超出重放缓冲，断线后无法完整续接
+        self._resume_backlog: Deque[bytes] = deque()  # 重放期间新提交的帧，重放完成后按序发送
+        self._resuming = False
+        self._connection_lost_at: Optional[float] = None
+
         # 回调函数
         self.on_connected: Optional[Callable[[], None]] = None
         self.on_authenticated: Optional[Callable[[], None]] = None
         self.on_disconnected: Optional[Callable[[str], None]] = None
         self.on_message_received: Optional[Callable[[Dict[str, Any]], None]] = None
+        # 二进制音频快速路径：设置后下行OPUS包直接交给它（原始bytes），不再包装成消息字典
+        self.on_audio_packet: Optional[Callable[[bytes], None]] = None
         self.on_error: Optional[Callable[[str], None]] = None
 
         # 统计信息
@@ -113,7 +154,12 @@ class XiaozhiWebSocketClient:
             "messages_sent": 0,
             "messages_received": 0,
             "last_connected": None,
-            "uptime_start": None
+            "uptime_start": None,
+            "last_reconnect_ms": None,
+            "max_reconnect_ms": 0.0,
+            "resumed_turns": 0,
+            "replayed_frames": 0,
+            "gap_buffered_frames": 0
         }
 
         logger.info("XiaozhiWebSocketClient 初始化完成")
@@ -132,16 +178,15 @@ class XiaozhiWebSocketClient:
         try:
             logger.info(f"开始连接到小智AI服务器: {self.config.url}")
             self.state = ConnectionState.CONNECTING
+            self._authenticated_event.clear()
             self.stats["total_connections"] += 1
 
             # 准备设备信息
             if not await self._prepare_device_info():
                 return False
 
-            # 创建SSL上下文
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
+            # SSL上下文（进程内共享，只用于wss://地址）
+            ssl_context = get_ssl_context() if self.config.url.startswith("wss://") else None
 
             # 准备HTTP Headers（参照py-xiaozhi的协议）
             # 从connection_params获取access_token
@@ -186,8 +231,10 @@ class XiaozhiWebSocketClient:
 
             self.state = ConnectionState.CONNECTED
             self.stats["last_connected"] = time.time()
+            if self.config.capture_dir:
+                self._close_capture()
+                self._capture = CaptureWriter.for_connection(self.config.capture_dir)
             self.stats["uptime_start"] = time.time()
-            self.reconnect_attempts = 0
 
             logger.info(f"✅ WebSocket连接建立成功 (ping_interval={self.config.ping_interval}s, ping_timeout={self.config.ping_timeout}s)")
 
@@ -239,6 +286,18 @@ class XiaozhiWebSocketClient:
             self._max_reconnect_attempts = 0
             logger.info("❌ 禁用自动重连")
 
+    def reset_session_state(self):
+        """
+        清除会话相关的状态（连接归还连接池时调用）
+
+        关闭自动重连并丢弃进行中的监听轮次、重放缓冲和重连计数，连接本身保持不变
+        """
+        self._auto_reconnect_enabled = False
+        self._max_reconnect_attempts = 0
+        self.reconnect_attempts = 0
+        self._resuming = False
+        self._abandon_turn()
+
     async def disconnect(self):
         """断开WebSocket连接"""
         logger.info("开始断开WebSocket连接")
@@ -246,6 +305,8 @@ class XiaozhiWebSocketClient:
         self.should_reconnect = False
         self._is_closing = True  # 标记为主动关闭（参照py-xiaozhi）
         self.state = ConnectionState.DISCONNECTED
+        self._authenticated_event.clear()
+        self._abandon_turn()
 
         # 取消任务
         if self.connection_task:
@@ -273,9 +334,21 @@ class XiaozhiWebSocketClient:
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
+        self._close_capture()
 
         logger.info("✅ WebSocket连接已断开")
 
+    async def _send(self, data: Union[str, bytes]):
+        """在当前连接上发送一帧（开启录制时同时记录）"""
+        await self.websocket.send(data)
+        if self._capture:
+            self._capture.record(DIRECTION_UP, data)
+
+    def _close_capture(self):
+        if self._capture:
+            self._capture.close()
+            self._capture = None
+
     async def send_message(self, message: Dict[str, Any]) -> bool:
         """
         发送消息到WebSocket服务器
@@ -295,8 +368,8 @@ class XiaozhiWebSocketClient:
             return False
 
         try:
-            message_json = json.dumps(message, ensure_ascii=False)
-            await self.websocket.send(message_json)
+            message_json = json_codec.dumps(message)
+            await self._send(message_json)
             self.stats["messages_sent"] += 1
 
             logger.debug(f"📤 发送消息: {message_json}")
@@ -345,11 +418,15 @@ class XiaozhiWebSocketClient:
                 "mode": mode
             }
 
-            message_json = json.dumps(message, ensure_ascii=False)
-            await self.websocket.send(message_json)
+            message_json = json_codec.dumps(message)
+            await self._send(message_json)
+
+            # 新的监听轮次：之前未确认的帧不再需要重放
+            self._turn_mode = mode
+            self._turn_stopped = False
+            self._clear_replay()
 
             # 临时调试：记录开始监听时间点
-            import time
             self._listening_start_time = time.time()
             # 重置音频帧计数（用于追踪本轮对话）
             self._audio_frames_this_session = 0
@@ -364,13 +441,40 @@ class XiaozhiWebSocketClient:
                 self.on_error(error_msg)
             return False
 
+    async def send_abort_speaking(self, reason: str = "wake_word_detected") -> bool:
+        """
+        发送中止消息，打断服务器正在进行的TTS回复（遵循py-xiaozhi协议）
+
+        Args:
+            reason: 中止原因（py-xiaozhi在用户打断时使用wake_word_detected）
+
+        Returns:
+            bool: 发送是否成功
+        """
+        message = {
+            "session_id": self.session_id,
+            "type": "abort",
+            "reason": reason
+        }
+        success = await self.send_message(message)
+        if success:
+            logger.info(f"📤 发送中止消息: reason={reason}")
+        return success
+
     async def send_stop_listening(self) -> bool:
         """
         发送停止监听消息（遵循py-xiaozhi协议）
 
+        断线重连或重放期间只做标记，重放完本轮音频后再发送
+
         Returns:
             bool: 发送是否成功
         """
+        if self._turn_mode is not None and (self._resuming or self.is_reconnecting):
+            self._turn_stopped = True
+            logger.info("⏸️ 上游重连中，停止监听消息将在重放本轮音频后发送")
+            return True
+
         if self.state != ConnectionState.AUTHENTICATED:
             logger.warning("WebSocket未认证，无法发送停止监听消息")
             return False
@@ -391,11 +495,11 @@ class XiaozhiWebSocketClient:
                 "state": "stop"
             }
 
-            message_json = json.dumps(message, ensure_ascii=False)
-            await self.websocket.send(message_json)
+            message_json = json_codec.dumps(message)
+            await self._send(message_json)
+            self._turn_stopped = True
 
             # 临时调试：统计本轮发送的音频
-            import time
             total_frames = getattr(self, '_audio_frames_this_session', 0)
             if hasattr(self, '_listening_start_time'):
                 duration = (time.time() - self._listening_start_time) * 1000
@@ -420,8 +524,18 @@ class XiaozhiWebSocketClient:
             audio_data: OPUS编码的音频数据
 
         Returns:
-            bool: 发送是否成功
+            bool: 发送是否成功（断线重连或重放期间进入重放缓冲也视为成功）
         """
+        if self._turn_mode is not None:
+            if self._resuming:
+                self._resume_backlog.append(audio_data)
+                return True
+            if self.is_reconnecting:
+                # 断线期间的帧先缓冲，重连后随本轮未确认的帧一起重放
+                self._buffer_for_replay(audio_data)
+                self.stats["gap_buffered_frames"] += 1
+                return True
+
         if self.state != ConnectionState.AUTHENTICATED:
             logger.warning("WebSocket未认证，无法发送音频")
             return False
@@ -432,24 +546,22 @@ class XiaozhiWebSocketClient:
 
         try:
             # 发送二进制音频数据
-            await self.websocket.send(audio_data)
+            await self._send(audio_data)
             self.stats["messages_sent"] += 1
+            if self._turn_mode is not None:
+                self._buffer_for_replay(audio_data)
 
             # 临时调试：追踪本轮对话的音频发送
             if not hasattr(self, '_audio_frames_this_session'):
                 self._audio_frames_this_session = 0
             self._audio_frames_this_session += 1
 
-            # 每10帧打印一次，验证音频是否实时发送
-            if self._audio_frames_this_session % 10 == 0:
-                import time
+            # 每50帧（约2秒）输出一次调试日志，验证音频是否实时发送
+            if self._audio_frames_this_session % 50 == 0 and logger.isEnabledFor(logging.DEBUG):
+                fields = {"frames": self._audio_frames_this_session, "frame_bytes": len(audio_data)}
                 if hasattr(self, '_listening_start_time'):
-                    elapsed = (time.time() - self._listening_start_time) * 1000
-                    logger.info(f"📤 [实时发送] 本轮已发送 {self._audio_frames_this_session} 帧 (+{len(audio_data)}B) | 录音进行中: {elapsed:.0f}ms")
-                else:
-                    logger.info(f"📤 [实时发送] 本轮已发送 {self._audio_frames_this_session} 帧 (+{len(audio_data)}B)")
-
-            logger.debug(f"📤 发送音频数据: {len(audio_data)} bytes")
+                    fields["elapsed_ms"] = round((time.time() - self._listening_start_time) * 1000)
+                logger.debug("📤 [实时发送]", extra=fields)
             return True
 
         except Exception as e:
@@ -513,8 +625,8 @@ class XiaozhiWebSocketClient:
             }
 
             # 发送hello消息
-            message_json = json.dumps(hello_message, ensure_ascii=False)
-            await self.websocket.send(message_json)
+            message_json = json_codec.dumps(hello_message)
+            await self._send(message_json)
 
             logger.info(f"📤 发送hello握手消息: device={self.device_info.device_id}")
 
@@ -528,10 +640,12 @@ class XiaozhiWebSocketClient:
         """处理接收到的WebSocket消息"""
         try:
             async for message in self.websocket:
+                if self._capture:
+                    self._capture.record(DIRECTION_DOWN, message)
                 try:
                     if isinstance(message, str):
                         # 文本消息 - JSON格式
-                        data = json.loads(message)
+                        data = json_codec.loads(message)
                         self.stats["messages_received"] += 1
 
                         logger.debug(f"📥 收到JSON消息: {message[:200]}...")
@@ -548,7 +662,9 @@ class XiaozhiWebSocketClient:
                         self.stats["messages_received"] += 1
 
                         # 触发音频接收回调
-                        if self.on_message_received:
+                        if self.on_audio_packet:
+                            self.on_audio_packet(message)
+                        elif self.on_message_received:
                             # 将音频包装成消息格式传递给解析器
                             audio_message = {
                                 "type": "audio",
@@ -614,26 +730,24 @@ class XiaozhiWebSocketClient:
                 logger.warning("⚠️ 服务器hello响应中没有session_id")
                 logger.info("✅ 收到服务器hello确认")
 
-            self.state = ConnectionState.AUTHENTICATED
-            self.stats["successful_auths"] += 1
-
-            if self.on_authenticated:
-                self.on_authenticated()
+            self._mark_authenticated()
 
         elif message_type == "auth_response":
             # 处理认证响应
             success = data.get("success", False)
             if success:
                 logger.info("✅ 设备认证成功")
-                self.state = ConnectionState.AUTHENTICATED
-                self.stats["successful_auths"] += 1
-
-                if self.on_authenticated:
-                    self.on_authenticated()
+                self._mark_authenticated()
             else:
                 error_msg = data.get("message", "认证失败")
                 logger.error(f"❌ 设备认证失败: {error_msg}")
 
+        elif message_type == "stt":
+            # 服务器已识别本轮语音：之前的上行帧不再需要重放
+            self._clear_replay()
+            if self._turn_stopped:
+                self._turn_mode = None
+
         elif message_type == "pong":
             # 处理心跳响应
             logger.debug("💓 收到心跳pong响应")
@@ -646,6 +760,118 @@ class XiaozhiWebSocketClient:
             if self.on_error:
                 self.on_error(f"服务器错误: {error_msg}")
 
+    def _mark_authenticated(self):
+        """标记认证完成：更新状态、唤醒等待者并触发回调"""
+        # 只有hello确认后才算重连成功（TCP建连后握手失败仍按退避继续重试）
+        self.reconnect_attempts = 0
+        resume_error = None
+        if self._connection_lost_at is not None:
+            reconnect_ms = (time.monotonic() - self._connection_lost_at) * 1000
+            self._connection_lost_at = None
+            self.stats["last_reconnect_ms"] = round(reconnect_ms, 1)
+            self.stats["max_reconnect_ms"] = max(self.stats["max_reconnect_ms"], round(reconnect_ms, 1))
+            logger.info(f"🔄 上游重连完成，耗时 {reconnect_ms:.0f}ms")
+            if self._turn_mode is not None and self._replay_overflow:
+                resume_error = f"上游重连后无法续接本轮对话：未确认的上行音频超出重放缓冲 ({self.config.replay_buffer_frames} 帧)"
+                self._abandon_turn()
+            elif self._turn_mode is not None:
+                # 先置位：认证回调之后提交的帧排在重放帧之后发送
+                self._resuming = True
+                asyncio.create_task(self._resume_turn())
+
+        if resume_error:
+            # 在认证回调之前通知，会话随后由认证回调恢复为就绪
+            logger.error(f"❌ {resume_error}")
+            if self.on_error:
+                self.on_error(resume_error)
+
+        self.state = ConnectionState.AUTHENTICATED
+        self.stats["successful_auths"] += 1
+        self._authenticated_event.set()
+
+        if self.on_authenticated:
+            self.on_authenticated()
+
+    @property
+    def is_authenticated(self) -> bool:
+        return self.state == ConnectionState.AUTHENTICATED
+
+    @property
+    def is_reconnecting(self) -> bool:
+        """连接已断开且正在自动重连"""
+        return (self._connection_lost_at is not None and self._auto_reconnect_enabled
+                and self.should_reconnect and not self._is_closing)
+
+    @property
+    def has_pending_turn(self) -> bool:
+        """是否有尚未被服务器确认的监听轮次（重连后会续接）"""
+        return self._turn_mode is not None
+
+    async def _resume_turn(self):
+        """
+        重连后续接进行中的监听轮次
+
+        在新连接上重新发送listen start，按序重放未确认的上行帧和重放期间新提交的帧，
+        本轮已停止时最后补发listen stop
+        """
+        replayed = 0
+        try:
+            await self._send(json_codec.dumps({
+                "session_id": self.session_id,
+                "type": "listen",
+                "state": "start",
+                "mode": self._turn_mode
+            }))
+            for frame in list(self._replay_frames):
+                await self._send(frame)
+                replayed += 1
+            while self._resume_backlog:
+                frame = self._resume_backlog.popleft()
+                await self._send(frame)
+                self._buffer_for_replay(frame)
+                replayed += 1
+            if self._turn_stopped:
+                await self._send(json_codec.dumps({
+                    "session_id": self.session_id,
+                    "type": "listen",
+                    "state": "stop"
+                }))
+
+            self.stats["resumed_turns"] += 1
+            self.stats["replayed_frames"] += replayed
+            self.stats["messages_sent"] += replayed
+            logger.info(f"▶️ 已续接本轮对话: 重放 {replayed} 帧" + ("，并补发停止监听" if self._turn_stopped else ""))
+
+        except Exception as e:
+            logger.error(f"续接本轮对话失败: {e}")
+        finally:
+            # 未发出的帧留在重放缓冲中，下次重连时重放
+            for frame in self._resume_backlog:
+                self._buffer_for_replay(frame)
+            self._resume_backlog.clear()
+            self._resuming = False
+
+    async def wait_authenticated(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待服务器hello确认
+
+        Args:
+            timeout: 超时（秒），None时使用配置的hello_timeout
+
+        Returns:
+            bool: 是否在超时前完成认证
+        """
+        if self.is_authenticated:
+            return True
+        try:
+            await asyncio.wait_for(
+                self._authenticated_event.wait(),
+                timeout=self.config.hello_timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            return False
+        return self.is_authenticated
+
     async def _heartbeat_loop(self):
         """
         心跳循环（已弃用）
@@ -665,8 +891,8 @@ class XiaozhiWebSocketClient:
                             "timestamp": int(time.time())
                         }
 
-                        message_json = json.dumps(ping_message)
-                        await self.websocket.send(message_json)
+                        message_json = json_codec.dumps(ping_message)
+                        await self._send(message_json)
 
                         logger.debug("💓 发送心跳ping")
 
@@ -755,6 +981,7 @@ class XiaozhiWebSocketClient:
         self.connection_task = None
         self.heartbeat_task = None
         self.monitor_task = None
+        self._close_capture()
 
         logger.debug("✅ 连接资源清理完成")
 
@@ -776,12 +1003,17 @@ class XiaozhiWebSocketClient:
             logger.info("正在主动关闭连接，跳过重连逻辑")
             return
 
+        # 记录断线时刻（用于统计重连耗时），断线期间的上行帧进入重放缓冲
+        if self._connection_lost_at is None:
+            self._connection_lost_at = time.monotonic()
+
         # 🔥 清理连接资源（参照py-xiaozhi）
         await self._cleanup_connection()
 
         # 更新连接状态
         was_connected = self.state in [ConnectionState.CONNECTED, ConnectionState.AUTHENTICATED]
         self.state = ConnectionState.DISCONNECTED
+        self._authenticated_event.clear()
 
         # 通知连接状态变化
         if self.on_disconnected and was_connected:
@@ -795,6 +1027,7 @@ class XiaozhiWebSocketClient:
             # 检查重连次数限制
             if self._max_reconnect_attempts > 0 and self.reconnect_attempts >= self._max_reconnect_attempts:
                 logger.error(f"已达到最大重连次数 ({self._max_reconnect_attempts})，停止重连")
+                self._abandon_turn()
                 if self.on_error:
                     self.on_error(f"连接丢失且已达最大重连次数: {reason}")
             else:
@@ -803,31 +1036,60 @@ class XiaozhiWebSocketClient:
         else:
             # 未启用自动重连或should_reconnect为False
             logger.info("自动重连未启用或已禁止重连")
+            self._abandon_turn()
             if self.on_error:
                 self.on_error(f"连接丢失: {reason}")
 
+    def _buffer_for_replay(self, frame: bytes):
+        """记录本轮未确认的上行帧；超出重放缓冲时标记溢出，不再继续缓冲"""
+        if len(self._replay_frames) >= self.config.replay_buffer_frames:
+            if not self._replay_overflow:
+                logger.warning(f"⚠️ 本轮未确认的上行帧超出重放缓冲 ({self.config.replay_buffer_frames} 帧)，断线后将无法续接")
+            self._replay_overflow = True
+            return
+        self._replay_frames.append(frame)
+
+    def _clear_replay(self):
+        self._replay_frames.clear()
+        self._replay_overflow = False
+
+    def _abandon_turn(self):
+        """放弃续接：不再重连时丢弃进行中的轮次和重放缓冲"""
+        self._connection_lost_at = None
+        self._turn_mode = None
+        self._turn_stopped = False
+        self._clear_replay()
+        self._resume_backlog.clear()
+
     async def _schedule_reconnect(self):
-        """调度重连（指数退避）"""
+        """调度重连（每次断线的第一次重连立即进行，之后指数退避；hello确认后才重置次数）"""
         if self.reconnect_attempts >= self.config.max_reconnect_attempts:
             logger.error("达到最大重连次数，停止重连")
+            self._abandon_turn()
+            if self.on_error:
+                self.on_error("重连失败，已达最大重连次数")
             return
 
-        # 计算重连延迟（指数退避）
-        delay = min(
-            self.config.reconnect_base_delay * (2 ** self.reconnect_attempts),
-            self.config.reconnect_max_delay
-        )
+        if self.reconnect_attempts == 0 and self.config.immediate_reconnect:
+            total_delay = 0.0
+        else:
+            # 计算重连延迟（指数退避）
+            delay = min(
+                self.config.reconnect_base_delay * (2 ** self.reconnect_attempts),
+                self.config.reconnect_max_delay
+            )
 
-        # 添加随机抖动
-        jitter = random.uniform(0, delay * 0.1)
-        total_delay = delay + jitter
+            # 添加随机抖动
+            jitter = random.uniform(0, delay * 0.1)
+            total_delay = delay + jitter
 
         self.reconnect_attempts += 1
         self.stats["reconnect_count"] += 1
 
         logger.info(f"🔄 将在 {total_delay:.1f} 秒后尝试第 {self.reconnect_attempts} 次重连")
 
-        await asyncio.sleep(total_delay)
+        if total_delay > 0:
+            await asyncio.sleep(total_delay)
 
         if self.should_reconnect:
             await self.connect()
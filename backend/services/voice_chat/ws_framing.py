@@ -0,0 +1,167 @@
+"""
+前端WebSocket二进制音频帧格式
+
+/api/voice/ws 支持两种音频下发模式：
+1. json（默认，兼容旧客户端）：{"type": "audio_frame", "data": "<base64 PCM>"}
+2. binary：音频以二进制WebSocket消息发送，控制事件仍为JSON文本消息
+
+binary模式通过WebSocket子协议 "pocketspeak.audio.v1" 或查询参数
+audio_format=binary 协商
+
+音频编码（两种模式均适用）：
+- pcm（默认）：服务端解码后的24kHz 16-bit PCM
+- opus：原样转发小智AI下发的OPUS包（每包40ms），服务端不解码，下行带宽约为PCM的1/10。
+  通过子协议 "pocketspeak.audio.v1.opus" 或查询参数 codec=opus 协商
+
+二进制帧 = 14字节头部（网络字节序）+ 音频负载:
+    version       uint8   协议版本（当前为1）
+    codec         uint8   0=PCM s16le, 1=OPUS
+    channels      uint8   声道数
+    flags         uint8   保留位（当前为0）
+    sequence      uint32  连接内递增的帧序号
+    sentence      uint16  所属句子序号（当前AI回复内）
+    sample_rate   uint32  采样率
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# WebSocket子协议名称
+BINARY_AUDIO_SUBPROTOCOL = "pocketspeak.audio.v1"
+OPUS_AUDIO_SUBPROTOCOL = "pocketspeak.audio.v1.opus"
+
+# 音频下发模式
+AUDIO_MODE_JSON = "json"
+AUDIO_MODE_BINARY = "binary"
+
+AUDIO_FRAME_VERSION = 1
+
+CODEC_PCM = 0
+CODEC_OPUS = 1
+
+CODEC_NAMES = {CODEC_PCM: "pcm", CODEC_OPUS: "opus"}
+
+_HEADER = struct.Struct("!BBBBIHI")
+HEADER_SIZE = _HEADER.size
+
+
+@dataclass(frozen=True)
+class AudioFrameHeader:
+    """二进制音频帧头部"""
+    sequence: int
+    sentence_index: int
+    sample_rate: int
+    channels: int = 1
+    codec: int = CODEC_PCM
+    flags: int = 0
+    version: int = AUDIO_FRAME_VERSION
+
+
+def pack_audio_frame(payload: bytes,
+                     sequence: int,
+                     sentence_index: int = 0,
+                     sample_rate: int = 24000,
+                     channels: int = 1,
+                     codec: int = CODEC_PCM,
+                     flags: int = 0) -> bytes:
+    """
+    打包二进制音频帧
+
+    Args:
+        payload: 音频负载（PCM或OPUS）
+        sequence: 帧序号（超出uint32范围时回绕）
+        sentence_index: 句子序号（超出uint16范围时回绕）
+        sample_rate: 采样率
+        channels: 声道数
+        codec: 编码类型（CODEC_PCM / CODEC_OPUS）
+        flags: 保留标志位
+
+    Returns:
+        bytes: 头部 + 负载
+    """
+    header = _HEADER.pack(
+        AUDIO_FRAME_VERSION,
+        codec,
+        channels,
+        flags,
+        sequence & 0xFFFFFFFF,
+        sentence_index & 0xFFFF,
+        sample_rate
+    )
+    return header + payload
+
+
+def unpack_audio_frame(data: bytes) -> Tuple[AudioFrameHeader, memoryview]:
+    """
+    解析二进制音频帧
+
+    Args:
+        data: 完整的二进制消息
+
+    Returns:
+        (头部, 负载的只读视图)
+
+    Raises:
+        ValueError: 数据过短或协议版本不支持
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"音频帧过短: {len(data)} bytes")
+
+    version, codec, channels, flags, sequence, sentence_index, sample_rate = _HEADER.unpack_from(data)
+    if version != AUDIO_FRAME_VERSION:
+        raise ValueError(f"不支持的音频帧版本: {version}")
+
+    header = AudioFrameHeader(
+        sequence=sequence,
+        sentence_index=sentence_index,
+        sample_rate=sample_rate,
+        channels=channels,
+        codec=codec,
+        flags=flags,
+        version=version
+    )
+    return header, memoryview(data)[HEADER_SIZE:].toreadonly()
+
+
+def negotiate_audio_mode(subprotocols: Optional[list], audio_format: Optional[str]) -> Tuple[str, Optional[str]]:
+    """
+    协商音频下发模式
+
+    Args:
+        subprotocols: 客户端请求的WebSocket子协议列表
+        audio_format: 查询参数audio_format的值
+
+    Returns:
+        (音频模式, 需要在accept时回应的子协议)
+    """
+    if subprotocols and OPUS_AUDIO_SUBPROTOCOL in subprotocols:
+        return AUDIO_MODE_BINARY, OPUS_AUDIO_SUBPROTOCOL
+
+    if subprotocols and BINARY_AUDIO_SUBPROTOCOL in subprotocols:
+        return AUDIO_MODE_BINARY, BINARY_AUDIO_SUBPROTOCOL
+
+    if audio_format == AUDIO_MODE_BINARY:
+        return AUDIO_MODE_BINARY, None
+
+    return AUDIO_MODE_JSON, None
+
+
+def negotiate_audio_codec(subprotocols: Optional[list], codec: Optional[str]) -> int:
+    """
+    协商音频编码（OPUS直通为显式开启）
+
+    Args:
+        subprotocols: 客户端请求的WebSocket子协议列表
+        codec: 查询参数codec的值
+
+    Returns:
+        int: CODEC_PCM 或 CODEC_OPUS
+    """
+    if subprotocols and OPUS_AUDIO_SUBPROTOCOL in subprotocols:
+        return CODEC_OPUS
+
+    if codec == CODEC_NAMES[CODEC_OPUS]:
+        return CODEC_OPUS
+
+    return CODEC_PCM
@@ -0,0 +1,345 @@
+"""
+PocketSpeak 小智AI上游连接池
+
+预先建立并完成hello握手的上游WebSocket连接，会话初始化时直接租用，
+省去TCP/TLS建连和hello握手的等待：
+1. 后台维持固定数量的已认证空闲连接
+2. 定期健康检查（连接状态 + WebSocket ping），失效连接丢弃并补充
+3. 空闲超过上限的连接主动回收重建，避免被服务器静默断开
+4. 所有连接共用同一个SSL上下文
+
+安全说明：已开始对话的连接带有上游会话上下文，归还时关闭而不是放回池中，
+只有从未使用过的连接（例如会话初始化中途失败）才会重新入池
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from services.voice_chat.ws_client import XiaozhiWebSocketClient, ConnectionState, WSConfig, UPSTREAM_URL_OVERRIDE
+from services.device_lifecycle import PocketSpeakDeviceManager
+
+logger = logging.getLogger(__name__)
+
+# 连接池参数，可通过环境变量调整
+POOL_SIZE = int(os.getenv("VOICE_UPSTREAM_POOL_SIZE", "1"))
+POOL_MAX_IDLE_SECONDS = float(os.getenv("VOICE_UPSTREAM_MAX_IDLE", "240"))
+POOL_HEALTH_INTERVAL = float(os.getenv("VOICE_UPSTREAM_HEALTH_INTERVAL", "15"))
+POOL_HELLO_TIMEOUT = float(os.getenv("VOICE_UPSTREAM_HELLO_TIMEOUT", "10"))
+
+
+def resolve_ws_url(device_manager: PocketSpeakDeviceManager) -> Optional[str]:
+    """从设备连接参数中读取上游WebSocket地址（XIAOZHI_WS_URL优先）"""
+    if UPSTREAM_URL_OVERRIDE:
+        return UPSTREAM_URL_OVERRIDE
+    device_info = device_manager.lifecycle_manager.load_device_info_from_local()
+    if not device_info:
+        return None
+    connection_params = getattr(device_info, 'connection_params', {}) or {}
+    websocket_params = connection_params.get('websocket', {})
+    if not websocket_params:
+        return None
+    return websocket_params.get('url', 'wss://api.tenclass.net/xiaozhi/v1/')
+
+
+class UpstreamConnectionPool:
+    """
+    已认证上游连接池
+
+    池中的客户端处于AUTHENTICATED状态、未设置会话回调、未开启自动重连；
+    租出后由会话负责设置回调和重连策略
+    """
+
+    def __init__(self,
+                 device_manager: PocketSpeakDeviceManager,
+                 size: int = POOL_SIZE,
+                 max_idle_seconds: float = POOL_MAX_IDLE_SECONDS,
+                 health_interval: float = POOL_HEALTH_INTERVAL,
+                 hello_timeout: float = POOL_HELLO_TIMEOUT,
+                 ws_config: Optional[WSConfig] = None):
+        """
+        初始化连接池
+
+        Args:
+            device_manager: 设备管理器实例
+            size: 维持的空闲连接数
+            max_idle_seconds: 空闲连接最长保留时间（秒），超过后回收重建
+            health_interval: 健康检查间隔（秒）
+            hello_timeout: 等待hello确认的超时（秒）
+            ws_config: 上游连接配置模板（URL以设备连接参数为准）
+        """
+        self.device_manager = device_manager
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self.health_interval = health_interval
+        self.hello_timeout = hello_timeout
+        self.ws_config = ws_config or WSConfig()
+
+        # 空闲连接: (客户端, 入池时间)
+        self._idle: Deque[Tuple[XiaozhiWebSocketClient, float]] = deque()
+        self._warming = 0
+        self._maintainer: Optional[asyncio.Task] = None
+        self._replenish_event = asyncio.Event()
+        self._closed = False
+
+        self.stats = {
+            "warmed": 0,
+            "warm_failures": 0,
+            "leased": 0,
+            "lease_misses": 0,
+            "returned": 0,
+            "recycled_idle": 0,
+            "discarded_unhealthy": 0,
+            "last_warm_ms": 0.0,
+            "avg_warm_ms": 0.0
+        }
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @property
+    def is_running(self) -> bool:
+        return self._maintainer is not None and not self._maintainer.done()
+
+    def start(self):
+        """启动后台维护协程（需在事件循环中调用）"""
+        if self.is_running or self.size <= 0:
+            return
+        self._closed = False
+        self._maintainer = asyncio.create_task(self._maintain_loop())
+        self._replenish_event.set()
+        logger.info(f"🔌 上游连接池已启动 (size={self.size}, max_idle={self.max_idle_seconds}s)")
+
+    async def lease(self) -> Optional[XiaozhiWebSocketClient]:
+        """
+        租用一个已认证的连接（不等待建连）
+
+        Returns:
+            XiaozhiWebSocketClient: 已认证客户端；池中没有健康连接时返回None
+        """
+        while self._idle:
+            client, _ = self._idle.popleft()
+            if self._is_healthy(client):
+                self._detach(client)
+                self.stats["leased"] += 1
+                self._replenish_event.set()
+                logger.info(f"⚡ 租用预热上游连接 (剩余空闲 {len(self._idle)})")
+                return client
+            await self._discard(client)
+
+        self.stats["lease_misses"] += 1
+        self._replenish_event.set()
+        return None
+
+    async def release(self, client: XiaozhiWebSocketClient, reusable: bool = False):
+        """
+        归还连接
+
+        Args:
+            client: 之前租用的客户端
+            reusable: 连接是否从未开始对话（只有这种连接会重新入池）
+        """
+        self.stats["returned"] += 1
+        if (reusable and not self._closed and self._is_healthy(client)
+                and len(self._idle) < self.size):
+            self._attach(client)
+            self._idle.append((client, time.monotonic()))
+            return
+
+        await self._close_client(client)
+        self._replenish_event.set()
+
+    async def close(self):
+        """停止维护协程并关闭所有空闲连接"""
+        self._closed = True
+        if self._maintainer:
+            self._maintainer.cancel()
+            try:
+                await self._maintainer
+            except asyncio.CancelledError:
+                pass
+            self._maintainer = None
+
+        while self._idle:
+            client, _ = self._idle.popleft()
+            await self._close_client(client)
+        logger.info("上游连接池已关闭")
+
+    # ========== 内部实现 ==========
+
+    def _is_healthy(self, client: XiaozhiWebSocketClient) -> bool:
+        websocket = client.websocket
+        return (
+            client.state == ConnectionState.AUTHENTICATED
+            and websocket is not None
+            and websocket.close_code is None
+        )
+
+    def _attach(self, client: XiaozhiWebSocketClient):
+        """池中连接：清除会话留下的重连/轮次状态，断开/出错时只标记，由维护协程清理"""
+        client.reset_session_state()
+        client.on_connected = None
+        client.on_message_received = None
+        client.on_audio_packet = None
+        client.on_authenticated = None
+        client.on_disconnected = lambda reason: self._replenish_event.set()
+        client.on_error = lambda error: self._replenish_event.set()
+
+    def _detach(self, client: XiaozhiWebSocketClient):
+        client.on_disconnected = None
+        client.on_error = None
+
+    async def _warm_one(self) -> Optional[XiaozhiWebSocketClient]:
+        """建立一个新连接并等待hello确认"""
+        url = resolve_ws_url(self.device_manager)
+        if not url:
+            logger.warning("设备连接参数中缺少WebSocket配置，跳过连接预热")
+            return None
+
+        config = WSConfig(**{**self.ws_config.__dict__, "url": url})
+        client = XiaozhiWebSocketClient(config, self.device_manager)
+
+        started = time.monotonic()
+        # 预热失败由池重试，不使用客户端内置的退避重连
+        client.should_reconnect = False
+        try:
+            if not await client.connect():
+                raise ConnectionError("连接失败")
+            if not await client.wait_authenticated(self.hello_timeout):
+                raise TimeoutError(f"{self.hello_timeout}s内未收到hello确认")
+        except Exception as e:
+            self.stats["warm_failures"] += 1
+            logger.warning(f"⚠️ 上游连接预热失败: {e}")
+            await self._close_client(client)
+            return None
+        finally:
+            client.should_reconnect = True
+
+        warm_ms = (time.monotonic() - started) * 1000
+        self.stats["warmed"] += 1
+        self.stats["last_warm_ms"] = warm_ms
+        self.stats["avg_warm_ms"] += (warm_ms - self.stats["avg_warm_ms"]) / self.stats["warmed"]
+        logger.info(f"🔥 上游连接预热完成: {warm_ms:.0f}ms")
+        return client
+
+    async def _check_idle(self):
+        """健康检查和空闲回收"""
+        now = time.monotonic()
+        kept: Deque[Tuple[XiaozhiWebSocketClient, float]] = deque()
+        while self._idle:
+            client, since = self._idle.popleft()
+            if now - since > self.max_idle_seconds:
+                self.stats["recycled_idle"] += 1
+                await self._close_client(client)
+                continue
+            if not self._is_healthy(client) or not await self._ping(client):
+                await self._discard(client)
+                continue
+            kept.append((client, since))
+        self._idle = kept
+
+    async def _ping(self, client: XiaozhiWebSocketClient) -> bool:
+        try:
+            pong_waiter = await client.websocket.ping()
+            await asyncio.wait_for(pong_waiter, timeout=self.ws_config.ping_timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"上游连接ping失败: {e}")
+            return False
+
+    async def _discard(self, client: XiaozhiWebSocketClient):
+        self.stats["discarded_unhealthy"] += 1
+        await self._close_client(client)
+
+    async def _close_client(self, client: XiaozhiWebSocketClient):
+        self._detach(client)
+        try:
+            await client.disconnect()
+        except Exception as e:
+            logger.debug(f"关闭上游连接失败: {e}")
+
+    async def _maintain_loop(self):
+        """补充空闲连接，并定期执行健康检查"""
+        failures = 0
+        try:
+            while not self._closed:
+                try:
+                    await asyncio.wait_for(self._replenish_event.wait(), timeout=self.health_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._replenish_event.clear()
+
+                await self._check_idle()
+
+                while len(self._idle) + self._warming < self.size and not self._closed:
+                    self._warming += 1
+                    try:
+                        client = await self._warm_one()
+                    finally:
+                        self._warming -= 1
+
+                    if client is None:
+                        # 连续失败时退避，避免在服务器不可用时频繁建连
+                        failures += 1
+                        await asyncio.sleep(min(2 ** failures, 60))
+                        break
+                    failures = 0
+                    self._attach(client)
+                    self._idle.append((client, time.monotonic()))
+
+        except asyncio.CancelledError:
+            logger.debug("上游连接池维护任务已取消")
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息"""
+        return {
+            **self.stats,
+            "size": self.size,
+            "idle": len(self._idle),
+            "warming": self._warming,
+            "running": self.is_running
+        }
+
+
+# ========== 全局连接池 ==========
+
+_upstream_pool: Optional[UpstreamConnectionPool] = None
+
+
+def get_upstream_pool() -> Optional[UpstreamConnectionPool]:
+    """获取全局上游连接池（未启动时返回None）"""
+    return _upstream_pool
+
+
+def start_upstream_pool(device_manager: PocketSpeakDeviceManager, size: int = POOL_SIZE) -> Optional[UpstreamConnectionPool]:
+    """
+    启动全局上游连接池（已启动时直接返回）
+
+    设备未激活时不启动（没有连接参数）
+    """
+    global _upstream_pool
+
+    if _upstream_pool is not None:
+        _upstream_pool.start()
+        return _upstream_pool
+
+    if size <= 0 or not device_manager.check_activation_status():
+        return None
+
+    _upstream_pool = UpstreamConnectionPool(device_manager, size=size)
+    _upstream_pool.start()
+    return _upstream_pool
+
+
+async def close_upstream_pool():
+    """关闭全局上游连接池"""
+    global _upstream_pool
+
+    if _upstream_pool:
+        await _upstream_pool.close()
+        _upstream_pool = None
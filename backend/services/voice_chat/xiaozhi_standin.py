@@ -0,0 +1,212 @@
+"""
+小智AI本地替身服务器
+
+实现hello/listen/abort协议，按轮次回放 upstream_capture 录制的下行消息（JSON和OPUS帧），
+用于在没有 wss://api.tenclass.net 的离线环境中端到端运行
+XiaozhiWebSocketClient + VoiceSessionManager，并做可复现的延迟压测
+
+    python -m services.voice_chat.xiaozhi_standin --capture captures/xiaozhi_xxx.jsonl --speed 2
+    XIAOZHI_WS_URL=ws://127.0.0.1:8765/xiaozhi/v1/ uvicorn main:app
+
+- 收到listen stop（自动/实时模式下收到与录制轮次相同数量的上行帧，录制无上行帧时为第一帧）时开始回放下一轮，多轮循环使用
+- speed: 1为原始节奏，2为两倍速，0为不等待直接发送
+- 收到abort时停止当前回放并发送tts stop
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+
+import websockets
+
+from services.voice_chat.upstream_capture import CapturedTurn, CaptureEvent, DIRECTION_DOWN, load_capture, server_hello, split_turns
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIO_PARAMS = {"format": "opus", "sample_rate": 24000, "channels": 1, "frame_duration": 60}
+
+
+def _fallback_turn() -> CapturedTurn:
+    """没有录制时的最小回复：STT + 空的TTS"""
+    messages = [
+        {"type": "stt", "text": ""},
+        {"type": "tts", "state": "start"},
+        {"type": "tts", "state": "stop"}
+    ]
+    return CapturedTurn(0, [CaptureEvent(0.0, DIRECTION_DOWN, json.dumps(m)) for m in messages])
+
+
+class XiaozhiStandinServer:
+    """
+    小智AI替身服务器
+
+    每个连接独立的session_id；回放时把录制消息中的session_id替换为当前连接的
+    """
+
+    def __init__(self,
+                 turns: Optional[List[CapturedTurn]] = None,
+                 hello: Optional[Dict[str, Any]] = None,
+                 speed: float = 1.0,
+                 host: str = "127.0.0.1",
+                 port: int = 8765):
+        """
+        初始化替身服务器
+
+        Args:
+            turns: 按轮次切分的录制（None或空时使用最小回复）
+            hello: 录制中的服务器hello（沿用其audio_params）
+            speed: 回放速度倍数（0为不等待）
+            host: 监听地址
+            port: 监听端口（0为自动分配，启动后更新为实际端口）
+        """
+        self.turns = turns or [_fallback_turn()]
+        self.audio_params = (hello or {}).get("audio_params") or DEFAULT_AUDIO_PARAMS
+        self.speed = speed
+        self.host = host
+        self.port = port
+
+        self._server = None
+        self._next_turn = 0
+
+        self.stats = {
+            "connections": 0,
+            "uplink_frames": 0,
+            "turns_played": 0,
+            "turns_aborted": 0
+        }
+
+    @classmethod
+    def from_capture(cls, path: str, **kwargs) -> "XiaozhiStandinServer":
+        """从录制文件创建"""
+        events = load_capture(path)
+        turns = split_turns(events)
+        logger.info(f"📼 载入录制 {path}: {len(events)} 条消息, {len(turns)} 轮对话")
+        return cls(turns=turns, hello=server_hello(events), **kwargs)
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/xiaozhi/v1/"
+
+    async def start(self):
+        """开始监听"""
+        self._server = await websockets.serve(self._handle, self.host, self.port, max_size=10 * 1024 * 1024)
+        if self.port == 0:
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+        logger.info(f"🧪 小智AI替身服务器已启动: {self.url} (speed={self.speed})")
+
+    async def stop(self):
+        """停止服务器"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _take_turn(self) -> CapturedTurn:
+        turn = self.turns[self._next_turn % len(self.turns)]
+        self._next_turn += 1
+        return turn
+
+    async def _handle(self, websocket, path: Optional[str] = None):
+        """单个客户端连接"""
+        self.stats["connections"] += 1
+        session_id = uuid.uuid4().hex[:8]
+        playback: Optional[asyncio.Task] = None
+        mode: Optional[str] = None
+        frames_this_turn = 0
+        pending_turn: Optional[CapturedTurn] = None
+
+        def start_playback():
+            nonlocal playback, pending_turn, frames_this_turn
+            if playback and not playback.done():
+                playback.cancel()
+            turn = pending_turn or self._take_turn()
+            pending_turn, frames_this_turn = None, 0
+            playback = asyncio.create_task(self._play_turn(websocket, turn, session_id))
+
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    self.stats["uplink_frames"] += 1
+                    frames_this_turn += 1
+                    # 自动/实时模式没有listen stop：收到与录制轮次相同数量的帧后开始回复（录制无上行帧时收到第一帧即回复）
+                    if (mode in ("auto", "realtime") and pending_turn
+                            and frames_this_turn >= max(pending_turn.uplink_frames, 1)):
+                        start_playback()
+                    continue
+
+                try:
+                    command = json.loads(message)
+                except ValueError:
+                    continue
+                command_type = command.get("type")
+
+                if command_type == "hello":
+                    await websocket.send(json.dumps({
+                        "type": "hello",
+                        "transport": "websocket",
+                        "session_id": session_id,
+                        "audio_params": self.audio_params
+                    }))
+                elif command_type == "listen" and command.get("state") == "start":
+                    mode = command.get("mode")
+                    frames_this_turn = 0
+                    pending_turn = self._take_turn()
+                elif command_type == "listen" and command.get("state") == "stop":
+                    start_playback()
+                elif command_type == "abort":
+                    if playback and not playback.done():
+                        playback.cancel()
+                        self.stats["turns_aborted"] += 1
+                        await websocket.send(json.dumps({"type": "tts", "state": "stop", "session_id": session_id}))
+
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            if playback and not playback.done():
+                playback.cancel()
+
+    async def _play_turn(self, websocket, turn: CapturedTurn, session_id: str):
+        """按录制时间（除以speed）回放一轮下行消息"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for event in turn.downlink:
+            if self.speed > 0:
+                wait = started + event.t_ms / 1000 / self.speed - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            data = event.data
+            message = event.message
+            if message is not None and "session_id" in message:
+                message["session_id"] = session_id
+                data = json.dumps(message, ensure_ascii=False)
+            await websocket.send(data)
+        self.stats["turns_played"] += 1
+
+
+async def _serve(args):
+    if args.capture:
+        server = XiaozhiStandinServer.from_capture(args.capture, speed=args.speed, host=args.host, port=args.port)
+    else:
+        server = XiaozhiStandinServer(speed=args.speed, host=args.host, port=args.port)
+    await server.start()
+    try:
+        await asyncio.Future()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="小智AI本地替身服务器（回放录制的上游会话）")
+    parser.add_argument("--capture", help="upstream_capture录制文件（JSONL），不指定时只回复空TTS")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0, help="回放速度倍数，0为不等待")
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
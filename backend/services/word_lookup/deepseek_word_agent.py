@@ -4,11 +4,14 @@ DeepSeek单词查询Agent - PocketSpeak V1.5.1
 调用DeepSeek AI生成单词释义和联想记忆
 """
 
+import logging
 import json
 import httpx
 from typing import Dict, List, Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class DeepSeekWordAgent:
     """DeepSeek AI单词查询Agent"""
@@ -76,7 +79,7 @@ class DeepSeekWordAgent:
                 - error: str - 错误信息（如果失败）
         """
         try:
-            print(f"\n🤖 DeepSeek查询单词: {word}")
+            logger.info(f"🤖 DeepSeek查询单词: {word}")
 
             # 构造提示词
             prompt = self.prompt_template.format(word=word)
@@ -97,7 +100,7 @@ class DeepSeekWordAgent:
             return result
 
         except Exception as e:
-            print(f"❌ DeepSeek查询异常: {e}")
+            logger.error(f"❌ DeepSeek查询异常: {e}")
             return {
                 'success': False,
                 'word': word,
@@ -141,8 +144,8 @@ class DeepSeekWordAgent:
                 )
 
                 if response.status_code != 200:
-                    print(f"❌ DeepSeek API错误: HTTP {response.status_code}")
-                    print(f"   响应: {response.text}")
+                    logger.error(f"❌ DeepSeek API错误: HTTP {response.status_code}")
+                    logger.info(f"   响应: {response.text}")
                     return None
 
                 data = response.json()
@@ -150,14 +153,14 @@ class DeepSeekWordAgent:
                 # 提取返回内容
                 if 'choices' in data and len(data['choices']) > 0:
                     content = data['choices'][0]['message']['content']
-                    print(f"✅ DeepSeek返回: {len(content)}字符")
+                    logger.info(f"✅ DeepSeek返回: {len(content)}字符")
                     return content
                 else:
-                    print(f"❌ DeepSeek返回格式异常: {data}")
+                    logger.error(f"❌ DeepSeek返回格式异常: {data}")
                     return None
 
         except Exception as e:
-            print(f"❌ DeepSeek API调用异常: {e}")
+            logger.error(f"❌ DeepSeek API调用异常: {e}")
             return None
 
     def _parse_response(self, word: str, response_text: str) -> Dict:
@@ -187,14 +190,14 @@ class DeepSeekWordAgent:
 
             # 验证必要字段
             if 'definitions' not in data or 'mnemonic' not in data:
-                print(f"⚠️ DeepSeek返回缺少必要字段: {data}")
+                logger.warning(f"⚠️ DeepSeek返回缺少必要字段: {data}")
                 return {
                     'success': False,
                     'word': word,
                     'error': 'AI返回数据格式不完整'
                 }
 
-            print(f"✅ 解析成功: {len(data['definitions'])}条释义")
+            logger.info(f"✅ 解析成功: {len(data['definitions'])}条释义")
 
             return {
                 'success': True,
@@ -206,15 +209,15 @@ class DeepSeekWordAgent:
             }
 
         except json.JSONDecodeError as e:
-            print(f"❌ JSON解析失败: {e}")
-            print(f"   原始文本: {response_text[:200]}...")
+            logger.error(f"❌ JSON解析失败: {e}")
+            logger.info(f"   原始文本: {response_text[:200]}...")
             return {
                 'success': False,
                 'word': word,
                 'error': f'AI返回格式错误: {str(e)}'
             }
         except Exception as e:
-            print(f"❌ 解析响应异常: {e}")
+            logger.error(f"❌ 解析响应异常: {e}")
             return {
                 'success': False,
                 'word': word,
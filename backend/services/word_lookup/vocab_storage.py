@@ -4,6 +4,7 @@
 管理用户收藏的生词
 """
 
+import logging
 import json
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -11,6 +12,8 @@ from datetime import datetime
 
 from models.word_models import VocabFavorite
 
+logger = logging.getLogger(__name__)
+
 
 class VocabStorageService:
     """生词本存储服务"""
@@ -34,14 +37,14 @@ class VocabStorageService:
                 json.dumps({}, indent=2, ensure_ascii=False),
                 encoding='utf-8'
             )
-            print(f"✅ 创建生词本数据文件: {self.vocab_file}")
+            logger.info(f"✅ 创建生词本数据文件: {self.vocab_file}")
 
     def _load_data(self) -> Dict:
         """加载生词本数据"""
         try:
             return json.loads(self.vocab_file.read_text(encoding='utf-8'))
         except Exception as e:
-            print(f"❌ 加载生词本数据失败: {e}")
+            logger.error(f"❌ 加载生词本数据失败: {e}")
             return {}
 
     def _save_data(self, data: Dict) -> bool:
@@ -53,7 +56,7 @@ class VocabStorageService:
             )
             return True
         except Exception as e:
-            print(f"❌ 保存生词本数据失败: {e}")
+            logger.error(f"❌ 保存生词本数据失败: {e}")
             return False
 
     def add_word(self, user_id: str, word: str, definition: str, phonetic: str) -> Dict:
@@ -96,7 +99,7 @@ class VocabStorageService:
 
             # 保存数据
             if self._save_data(data):
-                print(f"✅ 用户 {user_id} 收藏单词: {word}")
+                logger.info(f"✅ 用户 {user_id} 收藏单词: {word}")
                 return {
                     'success': True,
                     'message': '收藏成功'
@@ -108,7 +111,7 @@ class VocabStorageService:
                 }
 
         except Exception as e:
-            print(f"❌ 添加生词异常: {e}")
+            logger.error(f"❌ 添加生词异常: {e}")
             return {
                 'success': False,
                 'message': f'添加失败: {str(e)}'
@@ -138,13 +141,13 @@ class VocabStorageService:
                 try:
                     words.append(VocabFavorite(**word_data))
                 except Exception as e:
-                    print(f"⚠️ 解析生词数据失败: {e}")
+                    logger.warning(f"⚠️ 解析生词数据失败: {e}")
                     continue
 
             return words
 
         except Exception as e:
-            print(f"❌ 获取生词列表异常: {e}")
+            logger.error(f"❌ 获取生词列表异常: {e}")
             return []
 
     def delete_word(self, user_id: str, word: str) -> Dict:
@@ -184,7 +187,7 @@ class VocabStorageService:
 
             # 保存数据
             if self._save_data(data):
-                print(f"✅ 用户 {user_id} 删除单词: {word}")
+                logger.info(f"✅ 用户 {user_id} 删除单词: {word}")
                 return {
                     'success': True,
                     'message': '删除成功'
@@ -196,7 +199,7 @@ class VocabStorageService:
                 }
 
         except Exception as e:
-            print(f"❌ 删除生词异常: {e}")
+            logger.error(f"❌ 删除生词异常: {e}")
             return {
                 'success': False,
                 'message': f'删除失败: {str(e)}'
@@ -219,7 +222,7 @@ class VocabStorageService:
                 data[user_id]['words'] = []
 
             if self._save_data(data):
-                print(f"✅ 用户 {user_id} 清空生词本")
+                logger.info(f"✅ 用户 {user_id} 清空生词本")
                 return {
                     'success': True,
                     'message': '清空成功'
@@ -231,7 +234,7 @@ class VocabStorageService:
                 }
 
         except Exception as e:
-            print(f"❌ 清空生词本异常: {e}")
+            logger.error(f"❌ 清空生词本异常: {e}")
             return {
                 'success': False,
                 'message': f'清空失败: {str(e)}'
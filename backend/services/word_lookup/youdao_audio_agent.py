@@ -4,8 +4,11 @@
 生成单词的音标和音频链接（使用有道TTS）
 """
 
+import logging
 from typing import Dict
 
+logger = logging.getLogger(__name__)
+
 
 class YoudaoAudioAgent:
     """有道音频Agent - 生成音标和音频URL"""
@@ -40,7 +43,7 @@ class YoudaoAudioAgent:
                 - us_audio_url: str - 美式发音URL
         """
         try:
-            print(f"🔊 生成音频URL: {word}")
+            logger.info(f"🔊 生成音频URL: {word}")
 
             # V1.5.1: 音频URL直接指向TTS接口（已在audio_proxy中实现）
             result = {
@@ -50,11 +53,11 @@ class YoudaoAudioAgent:
                 'us_audio_url': f'/api/audio/tts?text={word}&voice=us'
             }
 
-            print(f"✅ 音频URL生成成功")
+            logger.info(f"✅ 音频URL生成成功")
             return result
 
         except Exception as e:
-            print(f"❌ 生成音频URL异常: {e}")
+            logger.error(f"❌ 生成音频URL异常: {e}")
             return {
                 'uk_phonetic': '',
                 'us_phonetic': '',
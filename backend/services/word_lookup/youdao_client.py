@@ -4,12 +4,15 @@
 调用有道智云翻译API查询单词释义
 """
 
+import logging
 import hashlib
 import uuid
 import time
 import httpx
 from typing import Dict, List, Optional
 
+logger = logging.getLogger(__name__)
+
 
 class YoudaoClient:
     """有道翻译API客户端"""
@@ -74,7 +77,7 @@ class YoudaoClient:
             Exception: API调用失败
         """
         try:
-            print(f"\n🔍 查询单词: {word}")
+            logger.info(f"🔍 查询单词: {word}")
 
             # V1.5优化：只使用有道API（一次调用获取所有数据）
             result = await self._get_definitions_from_youdao(word)
@@ -89,7 +92,7 @@ class YoudaoClient:
             return result
 
         except Exception as e:
-            print(f"❌ 查询单词异常: {e}")
+            logger.error(f"❌ 查询单词异常: {e}")
             return {
                 'success': False,
                 'word': word,
@@ -174,8 +177,8 @@ class YoudaoClient:
                             # 构造格式：[词性] 定义
                             detailed_definitions.append(f"[{part_of_speech}] {definition}")
 
-                print(f"📖 音标: US={us_phonetic}, UK={uk_phonetic}")
-                print(f"📝 详细释义数: {len(detailed_definitions)}")
+                logger.info(f"📖 音标: US={us_phonetic}, UK={uk_phonetic}")
+                logger.info(f"📝 详细释义数: {len(detailed_definitions)}")
 
                 return {
                     'us': us_phonetic,
@@ -186,7 +189,7 @@ class YoudaoClient:
                 }
 
         except Exception as e:
-            print(f"⚠️ 获取音标失败: {e}")
+            logger.warning(f"⚠️ 获取音标失败: {e}")
 
         return {'us': '', 'uk': '', 'us_audio': '', 'uk_audio': ''}
 
@@ -227,7 +230,7 @@ class YoudaoClient:
             return ''
 
         except Exception as e:
-            print(f"⚠️ 翻译失败: {e}")
+            logger.warning(f"⚠️ 翻译失败: {e}")
             return ''
 
     async def _get_definitions_from_youdao(self, word: str) -> Dict:
@@ -258,23 +261,23 @@ class YoudaoClient:
             error_code = data.get('errorCode', '0')
             if error_code != '0':
                 error_msg = self._get_error_message(error_code)
-                print(f"❌ 有道API错误: {error_code} - {error_msg}")
+                logger.error(f"❌ 有道API错误: {error_code} - {error_msg}")
                 return {'definitions': []}
 
             # V1.5：打印有道API完整返回，方便调试
-            print(f"📋 有道API返回数据:")
-            print(f"   - errorCode: {error_code}")
-            print(f"   - translation: {data.get('translation', [])}")
-            print(f"   - basic: {data.get('basic', {})}")
-            print(f"   - web: {len(data.get('web', []))}条")
+            logger.info(f"📋 有道API返回数据:")
+            logger.info(f"   - errorCode: {error_code}")
+            logger.info(f"   - translation: {data.get('translation', [])}")
+            logger.info(f"   - basic: {data.get('basic', {})}")
+            logger.info(f"   - web: {len(data.get('web', []))}条")
 
             # 解析结果
             result = self._parse_response(word, data)
-            print(f"✅ 查询成功: {word}, 释义数: {len(result.get('definitions', []))}")
+            logger.info(f"✅ 查询成功: {word}, 释义数: {len(result.get('definitions', []))}")
             return result
 
         except Exception as e:
-            print(f"❌ 获取释义失败: {e}")
+            logger.error(f"❌ 获取释义失败: {e}")
             return {'definitions': []}
 
     def _parse_response(self, word: str, data: Dict) -> Dict:
@@ -308,12 +311,12 @@ class YoudaoClient:
         # 1. 优先使用 basic.explains（详细释义，已包含词性）
         if 'explains' in basic and basic['explains']:
             definitions = basic['explains']
-            print(f"✅ 使用basic.explains: {len(definitions)}条释义")
+            logger.info(f"✅ 使用basic.explains: {len(definitions)}条释义")
 
         # 2. 备用：使用 translation（简单翻译）
         elif 'translation' in data and data['translation']:
             definitions = data['translation']
-            print(f"⚠️ 只有translation字段: {definitions}")
+            logger.warning(f"⚠️ 只有translation字段: {definitions}")
 
         # 3. 最后尝试：从web释义中提取
         elif 'web' in data and data['web']:
@@ -323,12 +326,12 @@ class YoudaoClient:
                     web_definitions.append('；'.join(web_item['value']))
             if web_definitions:
                 definitions = web_definitions
-                print(f"⚠️ 使用web释义: {len(definitions)}条")
+                logger.warning(f"⚠️ 使用web释义: {len(definitions)}条")
 
         # 如果还是没有释义，使用单词本身
         if not definitions:
             definitions = [word]
-            print(f"❌ 无任何释义，使用单词本身")
+            logger.error(f"❌ 无任何释义，使用单词本身")
 
         return {
             'success': True,
@@ -4,12 +4,15 @@
 调用有道智云TTS API生成单词发音
 """
 
+import logging
 import hashlib
 import uuid
 import time
 import httpx
 from typing import Optional, Literal
 
+logger = logging.getLogger(__name__)
+
 
 class YoudaoTTSClient:
     """有道TTS API客户端"""
@@ -92,7 +95,7 @@ class YoudaoTTSClient:
                 'volume': volume
             }
 
-            print(f"🔊 [TTS] 合成语音: '{text}' (发音人:{voice_name})")
+            logger.info(f"🔊 [TTS] 合成语音: '{text}' (发音人:{voice_name})")
 
             # 发送POST请求
             async with httpx.AsyncClient(timeout=self.timeout) as client:
@@ -104,18 +107,18 @@ class YoudaoTTSClient:
                 if 'audio' in content_type:
                     # 成功：返回音频数据
                     audio_data = response.content
-                    print(f"✅ [TTS] 合成成功: {len(audio_data)} bytes")
+                    logger.info(f"✅ [TTS] 合成成功: {len(audio_data)} bytes")
                     return audio_data
                 else:
                     # 失败：返回JSON错误响应
                     try:
                         error_data = response.json()
                         error_code = error_data.get('errorCode', 'unknown')
-                        print(f"❌ [TTS] 合成失败: errorCode={error_code}")
+                        logger.error(f"❌ [TTS] 合成失败: errorCode={error_code}")
                     except:
-                        print(f"❌ [TTS] 合成失败: {response.status_code} - {response.text[:200]}")
+                        logger.error(f"❌ [TTS] 合成失败: {response.status_code} - {response.text[:200]}")
                     return None
 
         except Exception as e:
-            print(f"❌ [TTS] 合成异常: {e}")
+            logger.error(f"❌ [TTS] 合成异常: {e}")
             return None
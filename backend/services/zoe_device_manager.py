@@ -3,6 +3,7 @@ Zoe风格设备管理器 - 完全复刻Zoe项目的设备绑定实现
 严格按照https://github.com/adam-doco/Zoe/blob/Zoev4/xiaozhi.py实现
 """
 
+import logging
 import hashlib
 import hmac
 import random
@@ -11,6 +12,9 @@ import json
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+
 class ZoeDeviceManager:
     """完全复刻Zoe项目的设备管理逻辑"""
 
@@ -46,7 +50,7 @@ class ZoeDeviceManager:
             signature = hmac.new(key_bytes, data.encode('utf-8'), hashlib.sha256)
             return signature.hexdigest()
         except Exception as e:
-            print(f"HMAC计算失败: {e}")
+            logger.info(f"HMAC计算失败: {e}")
             return ""
 
     def get_or_create_identity(self) -> Dict[str, Any]:
@@ -56,9 +60,9 @@ class ZoeDeviceManager:
                 try:
                     with open(self.identity_file, 'r', encoding='utf-8') as f:
                         self._identity = json.load(f)
-                        print(f"从文件加载设备身份: {self.identity_file}")
+                        logger.info(f"从文件加载设备身份: {self.identity_file}")
                 except Exception as e:
-                    print(f"加载设备身份失败: {e}")
+                    logger.info(f"加载设备身份失败: {e}")
                     self._identity = None
 
             if self._identity is None:
@@ -75,9 +79,9 @@ class ZoeDeviceManager:
                 try:
                     with open(self.identity_file, 'w', encoding='utf-8') as f:
                         json.dump(self._identity, f, indent=2, ensure_ascii=False)
-                    print(f"创建新设备身份: {self.identity_file}")
+                    logger.info(f"创建新设备身份: {self.identity_file}")
                 except Exception as e:
-                    print(f"保存设备身份失败: {e}")
+                    logger.info(f"保存设备身份失败: {e}")
 
         return self._identity
 
@@ -104,14 +108,11 @@ class ZoeDeviceManager:
     def print_identity_info(self):
         """打印设备身份信息"""
         identity = self.get_or_create_identity()
-        print("\n" + "="*50)
-        print("🔧 Zoe设备身份信息")
-        print("="*50)
-        print(f"📱 设备ID: {identity['device_id']}")
-        print(f"🆔 客户端ID: {identity['client_id']}")
-        print(f"🏷️ 序列号: {identity['serial_number']}")
-        print(f"🔑 HMAC密钥: {identity['hmac_key_hex'][:16]}...")
-        print("="*50)
+        logger.info("🔧 Zoe设备身份信息")
+        logger.info(f"📱 设备ID: {identity['device_id']}")
+        logger.info(f"🆔 客户端ID: {identity['client_id']}")
+        logger.info(f"🏷️ 序列号: {identity['serial_number']}")
+        logger.info(f"🔑 HMAC密钥: {identity['hmac_key_hex'][:16]}...")
 
 
 # 全局实例
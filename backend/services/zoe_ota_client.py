@@ -3,11 +3,14 @@ Zoe风格OTA客户端 - 完全复刻Zoe项目的OTA配置请求实现
 严格按照https://github.com/adam-doco/Zoe/blob/Zoev4/xiaozhi.py实现
 """
 
+import logging
 import aiohttp
 import asyncio
 from typing import Dict, Any, Optional
 from services.zoe_device_manager import zoe_device_manager
 
+logger = logging.getLogger(__name__)
+
 
 class ZoeOTAClient:
     """完全复刻Zoe项目的OTA配置请求逻辑"""
@@ -55,11 +58,11 @@ class ZoeOTAClient:
             }
         }
 
-        print(f"🌐 发送OTA配置请求: {url}")
-        print(f"📱 设备ID: {device_id}")
-        print(f"🆔 客户端ID: {client_id}")
-        print(f"📋 请求头: {headers}")
-        print(f"📦 请求体: {request_body}")
+        logger.info(f"🌐 发送OTA配置请求: {url}")
+        logger.info(f"📱 设备ID: {device_id}")
+        logger.info(f"🆔 客户端ID: {client_id}")
+        logger.info(f"📋 请求头: {headers}")
+        logger.info(f"📦 请求体: {request_body}")
 
         try:
             # 发送HTTP POST请求
@@ -69,8 +72,8 @@ class ZoeOTAClient:
                     response_text = await response.text()
                     status_code = response.status
 
-                    print(f"📡 响应状态: HTTP {status_code}")
-                    print(f"📄 响应内容: {response_text}")
+                    logger.info(f"📡 响应状态: HTTP {status_code}")
+                    logger.info(f"📄 响应内容: {response_text}")
 
                     if status_code == 200:
                         try:
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+JSON编解码层 - PocketSpeak
+
+语音链路（上游WebSocket收发、前端/ws推送）和较大的HTTP响应统一通过这里编解码：
+- 安装了 orjson 时使用 orjson（C实现，直接输出UTF-8字节）
+- 否则回退到标准库 json，输出格式一致（UTF-8不转义、紧凑分隔符）
+
+环境变量 POCKETSPEAK_JSON=json 可强制使用标准库（排查兼容性问题）
+
+基准测试：python -m utils.json_codec
+"""
+
+import json
+import os
+import time
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖
+    orjson = None
+
+if os.getenv("POCKETSPEAK_JSON", "").lower() == "json":
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    """标准库回退时补齐orjson原生支持的类型（只补齐这些，bytes等两个后端都拒绝序列化）"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _std_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """序列化为UTF-8字节（HTTP响应体）"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """序列化为字符串（WebSocket文本帧）"""
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        """反序列化"""
+        return orjson.loads(data)
+
+    JSONDecodeError = orjson.JSONDecodeError  # json.JSONDecodeError的子类
+
+else:
+    def dumps_bytes(obj: Any) -> bytes:
+        """序列化为UTF-8字节（HTTP响应体）"""
+        return _std_dumps(obj).encode("utf-8")
+
+    def dumps(obj: Any) -> str:
+        """序列化为字符串（WebSocket文本帧）"""
+        return _std_dumps(obj)
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        """反序列化"""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    JSONDecodeError = json.JSONDecodeError
+
+
+def benchmark(payload: Any, iterations: int = 2000) -> Dict[str, Dict[str, float]]:
+    """
+    比较当前后端与标准库的编解码耗时
+
+    Args:
+        payload: 测试数据
+        iterations: 每项重复次数
+
+    Returns:
+        Dict: {后端名: {"dumps_us": 单次编码微秒, "loads_us": 单次解码微秒}}
+    """
+    encoded = _std_dumps(payload)
+    candidates = {"json": (_std_dumps, json.loads)}
+    if orjson is not None:
+        candidates["orjson"] = (dumps, loads)
+
+    results = {}
+    for name, (encode, decode) in candidates.items():
+        started = time.perf_counter()
+        for _ in range(iterations):
+            encode(payload)
+        dumps_us = (time.perf_counter() - started) / iterations * 1e6
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            decode(encoded)
+        loads_us = (time.perf_counter() - started) / iterations * 1e6
+
+        results[name] = {"dumps_us": round(dumps_us, 2), "loads_us": round(loads_us, 2)}
+    return results
+
+
+def _sample_payloads() -> Dict[str, Any]:
+    """基准测试用的典型负载：上游TTS消息、前端状态事件、一页对话历史"""
+    history_message = {
+        "message_id": "msg_1730000000000",
+        "timestamp": "2025-10-01T10:30:00",
+        "user_text": "How do I pronounce this word?",
+        "ai_text": "你可以把它分成两个音节来读，重音在第一个音节上。" * 3,
+        "has_audio": True,
+        "message_type": "tts",
+        "audio_url": "/api/voice/conversation/history/msg_1730000000000/audio?format=wav",
+        "audio_data": "UklGR" + "A" * 16000
+    }
+    return {
+        "tts_sentence": {"type": "tts", "state": "sentence_start", "text": "今天我们来练习一下日常对话。",
+                         "session_id": "a1b2c3d4"},
+        "state_change": {"type": "state_change", "data": {"state": "speaking"}},
+        "history_page": {"success": True, "message": "获取到 20 条历史消息",
+                         "data": {"messages": [history_message] * 20, "next_cursor": None, "total_count": 20}}
+    }
+
+
+if __name__ == "__main__":
+    print(f"当前JSON后端: {JSON_BACKEND}")
+    for name, payload in _sample_payloads().items():
+        results = benchmark(payload, iterations=200 if name == "history_page" else 5000)
+        line = "  ".join(f"{backend}: dumps {r['dumps_us']}us / loads {r['loads_us']}us" for backend, r in results.items())
+        print(f"{name:14s} {line}")
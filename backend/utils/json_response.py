@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+快速JSON响应 - PocketSpeak
+响应体较大的路由（对话历史、单词查询等）使用 json_codec 序列化
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from utils.json_codec import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 json_codec（orjson优先）渲染的JSONResponse"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
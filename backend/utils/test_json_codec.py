@@ -0,0 +1,59 @@
+"""
+JSON编解码层 - 单元测试
+
+orjson与标准库回退的输出必须一致（前端和上游看到的字节不随部署环境变化）
+"""
+
+from datetime import date, datetime, timezone
+from enum import Enum
+
+import pytest
+
+from utils import json_codec
+
+
+class _State(Enum):
+    SPEAKING = "speaking"
+
+
+_PAYLOAD = {
+    "type": "tts",
+    "text": "今天我们来练习一下日常对话。",
+    "state": _State.SPEAKING,
+    "timestamp": datetime(2025, 10, 1, 10, 30, 0, 123456),
+    "created_at": datetime(2025, 10, 1, 10, 30, tzinfo=timezone.utc),
+    "day": date(2025, 10, 1),
+    "counts": {1: 2, "total": 3},
+    "ratio": 0.5,
+    "flags": [True, False, None],
+    "nested": {"messages": [{"id": "msg_1", "has_audio": True}]}
+}
+
+
+def test_std_backend_output():
+    """测试标准库回退：紧凑分隔符、UTF-8不转义、补齐orjson原生类型"""
+    encoded = json_codec._std_dumps(_PAYLOAD)
+
+    assert encoded.startswith('{"type":"tts","text":"今天我们来练习一下日常对话。","state":"speaking"')
+    assert '"timestamp":"2025-10-01T10:30:00.123456"' in encoded
+    assert '"created_at":"2025-10-01T10:30:00+00:00"' in encoded
+    assert '"counts":{"1":2,"total":3}' in encoded
+
+
+@pytest.mark.skipif(json_codec.orjson is None, reason="orjson未安装")
+def test_orjson_matches_std_backend():
+    """测试orjson与标准库回退的编码结果逐字节一致，解码结果相同"""
+    encoded = json_codec._std_dumps(_PAYLOAD)
+
+    assert json_codec.dumps(_PAYLOAD) == encoded
+    assert json_codec.dumps_bytes(_PAYLOAD) == encoded.encode("utf-8")
+    assert json_codec.loads(encoded) == json_codec.json.loads(encoded)
+    assert json_codec.loads(memoryview(encoded.encode("utf-8"))) == json_codec.loads(encoded)
+
+
+def test_bytes_rejected_by_both_backends():
+    """测试bytes在两个后端都拒绝序列化（音频需先base64编码）"""
+    with pytest.raises(TypeError):
+        json_codec._std_dumps({"audio": b"\x00\x01"})
+    with pytest.raises(TypeError):
+        json_codec.dumps({"audio": b"\x00\x01"})